@@ -0,0 +1,429 @@
+"""
+Async-native query executor for ``api.db_helper``.
+
+``afetchall`` / ``afetchone`` historically pushed every query onto the
+default thread pool via ``asyncio.to_thread`` and, on PostgreSQL, checked
+a connection out of the pool per call.  Under load the shared executor
+saturates and unrelated ``to_thread`` work queues behind database calls.
+
+``AsyncDBExecutor`` follows the aiosqlite model instead: a fixed set of
+dedicated reader threads, each owning one long-lived connection, consume
+jobs from a queue and hand results back to the event loop with
+``call_soon_threadsafe``.  The same executor serves both backends:
+
+* **SQLite**: one ``sqlite3`` connection per reader thread (WAL, so
+  readers never block each other).
+* **PostgreSQL**: one autocommit ``psycopg2`` connection per reader
+  thread, kept open across queries and transparently reconnected after
+  an ``OperationalError`` / ``InterfaceError``.
+
+Concurrency is bounded by ``max_pending`` (callers beyond that wait on an
+``asyncio.Semaphore``) and every query has a timeout; a timed-out query is
+interrupted on its connection (``sqlite3.Connection.interrupt`` /
+``psycopg2`` ``cancel``) so the reader thread is freed promptly.
+
+Usage::
+
+    from api.async_db import init_executor, sqlite_connector
+
+    init_executor(sqlite_connector("saudi_stocks.db"), workers=4)
+    # api.db_helper.afetchall/afetchone now route through the executor
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import queue
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WORKERS = 4
+DEFAULT_MAX_PENDING = 64
+DEFAULT_QUERY_TIMEOUT = 10.0
+
+Connector = Callable[[], Any]
+QueryFn = Callable[[Any, str, Any], Any]
+
+_SHUTDOWN = object()
+
+
+class QueryTimeoutError(TimeoutError):
+    """Raised when a query exceeds its timeout."""
+
+
+class ExecutorClosedError(RuntimeError):
+    """Raised when a query is submitted to a closed executor."""
+
+
+def sqlite_connector(db_path: str, **options: Any) -> Connector:
+    """Return a connector opening read connections to *db_path*.
+
+    *options* are passed to ``services.sqlite_pool.open_connection``
+    (``read_only``, ``mmap_size``, ``cache_size_kib``, ``cached_statements``).
+    """
+
+    def _connect() -> sqlite3.Connection:
+        from services.sqlite_pool import open_connection
+
+        return open_connection(db_path, **options)
+
+    return _connect
+
+
+def postgres_connector(dsn: str) -> Connector:
+    """Return a connector opening autocommit psycopg2 connections to *dsn*.
+
+    Autocommit keeps long-lived reader connections from sitting
+    ``idle in transaction`` between queries.
+    """
+
+    def _connect():
+        import psycopg2
+
+        conn = psycopg2.connect(dsn)
+        conn.autocommit = True
+        return conn
+
+    return _connect
+
+
+def _is_disconnect(exc: BaseException) -> bool:
+    """Return True when *exc* means the connection itself is unusable."""
+    try:
+        import psycopg2
+
+        return isinstance(exc, (psycopg2.OperationalError, psycopg2.InterfaceError))
+    except ImportError:
+        return False
+
+
+def _interrupt(conn: Any) -> None:
+    """Abort the statement currently running on *conn* (thread-safe)."""
+    for name in ("interrupt", "cancel"):
+        fn = getattr(conn, name, None)
+        if fn is not None:
+            try:
+                fn()
+            except Exception as exc:  # noqa: BLE001 -- best effort
+                logger.debug("Failed to interrupt query: %s", exc)
+            return
+
+
+class _Job:
+    __slots__ = ("fn", "sql", "params", "loop", "future", "enqueued_at", "worker")
+
+    def __init__(self, fn, sql, params, loop, future) -> None:
+        self.fn = fn
+        self.sql = sql
+        self.params = params
+        self.loop = loop
+        self.future = future
+        self.enqueued_at = time.monotonic()
+        self.worker: Optional[_Worker] = None
+
+
+def _set_result(future: asyncio.Future, result: Any) -> None:
+    if not future.done():
+        future.set_result(result)
+
+
+def _set_exception(future: asyncio.Future, exc: BaseException) -> None:
+    if not future.done():
+        future.set_exception(exc)
+
+
+def _deliver(job: "_Job", setter: Callable, value: Any) -> None:
+    try:
+        job.loop.call_soon_threadsafe(setter, job.future, value)
+    except RuntimeError:
+        # Event loop already closed (e.g. during shutdown); nobody is waiting.
+        pass
+
+
+class _Worker(threading.Thread):
+    """Reader thread owning a single connection."""
+
+    def __init__(self, executor: "AsyncDBExecutor", index: int) -> None:
+        super().__init__(name=f"{executor.name}-reader-{index}", daemon=True)
+        self._executor = executor
+        self._conn: Any = None
+        self._current: Optional[_Job] = None
+        self._lock = threading.Lock()
+
+    def interrupt(self, job: _Job) -> None:
+        """Interrupt *job* if it is still the one running on this worker."""
+        with self._lock:
+            if self._current is job and self._conn is not None:
+                _interrupt(self._conn)
+
+    def _close_conn(self) -> None:
+        if self._conn is not None:
+            try:
+                self._conn.close()
+            except Exception:  # noqa: BLE001 -- connection may already be dead
+                pass
+            self._conn = None
+
+    def run(self) -> None:
+        ex = self._executor
+        while True:
+            job = ex._queue.get()
+            if job is _SHUTDOWN:
+                break
+            if job.future.done():
+                # Caller timed out or was cancelled while the job was queued.
+                continue
+            ex._record_wait(time.monotonic() - job.enqueued_at)
+            try:
+                if self._conn is None:
+                    self._conn = ex._connect()
+                    ex._record_connect()
+                with self._lock:
+                    self._current = job
+                    job.worker = self
+                try:
+                    result = job.fn(self._conn, job.sql, job.params)
+                finally:
+                    with self._lock:
+                        self._current = None
+            except Exception as exc:  # noqa: BLE001 -- forwarded to caller
+                if _is_disconnect(exc):
+                    self._close_conn()
+                _deliver(job, _set_exception, exc)
+            else:
+                _deliver(job, _set_result, result)
+        self._close_conn()
+
+
+class AsyncDBExecutor:
+    """Dedicated reader threads with bounded concurrency and query timeouts.
+
+    Args:
+        connect: Zero-argument callable returning a new DB-API connection.
+            Called once per reader thread (and again after a disconnect).
+        workers: Number of reader threads / connections.
+        max_pending: Maximum queries admitted at once (running + queued).
+            Further callers wait for a slot.
+        query_timeout: Default per-query timeout in seconds; ``None`` or
+            ``0`` disables it.
+        name: Label used in thread names and log messages.
+    """
+
+    def __init__(
+        self,
+        connect: Connector,
+        workers: int = DEFAULT_WORKERS,
+        max_pending: int = DEFAULT_MAX_PENDING,
+        query_timeout: Optional[float] = DEFAULT_QUERY_TIMEOUT,
+        name: str = "db",
+    ) -> None:
+        self.name = name
+        self._connect = connect
+        self._workers_n = max(1, workers)
+        self._max_pending = max(self._workers_n, max_pending)
+        self._query_timeout = query_timeout or None
+        self._queue: "queue.SimpleQueue[Any]" = queue.SimpleQueue()
+        self._closed = False
+
+        # asyncio primitives are bound to one loop; recreate if it changes.
+        self._sem: Optional[asyncio.Semaphore] = None
+        self._sem_loop: Optional[asyncio.AbstractEventLoop] = None
+
+        self._stats_lock = threading.Lock()
+        self._submitted = 0
+        self._completed = 0
+        self._failed = 0
+        self._timeouts = 0
+        self._in_flight = 0
+        self._peak_in_flight = 0
+        self._connects = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+        self._waits = 0
+        self._exec_total = 0.0
+
+        self._workers = [_Worker(self, i) for i in range(self._workers_n)]
+        for w in self._workers:
+            w.start()
+        logger.info(
+            "Async DB executor '%s' started: %d readers, max_pending=%d, timeout=%s",
+            name,
+            self._workers_n,
+            self._max_pending,
+            self._query_timeout,
+        )
+
+    # -- metrics -----------------------------------------------------------
+
+    def _record_wait(self, seconds: float) -> None:
+        with self._stats_lock:
+            self._waits += 1
+            self._wait_total += seconds
+            self._wait_max = max(self._wait_max, seconds)
+
+    def _record_connect(self) -> None:
+        with self._stats_lock:
+            self._connects += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return executor metrics for ``/health``."""
+        with self._stats_lock:
+            done = self._completed + self._failed
+            return {
+                "workers": self._workers_n,
+                "max_pending": self._max_pending,
+                "query_timeout_seconds": self._query_timeout,
+                "in_flight": self._in_flight,
+                "peak_in_flight": self._peak_in_flight,
+                "submitted": self._submitted,
+                "completed": self._completed,
+                "failed": self._failed,
+                "timeouts": self._timeouts,
+                "connects": self._connects,
+                "avg_queue_wait_ms": round(self._wait_total / self._waits * 1000, 2)
+                if self._waits
+                else 0.0,
+                "max_queue_wait_ms": round(self._wait_max * 1000, 2),
+                "avg_query_ms": round(self._exec_total / done * 1000, 2)
+                if done
+                else 0.0,
+            }
+
+    # -- execution ---------------------------------------------------------
+
+    def _semaphore(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        if self._sem is None or self._sem_loop is not loop:
+            self._sem = asyncio.Semaphore(self._max_pending)
+            self._sem_loop = loop
+        return self._sem
+
+    async def run(
+        self,
+        fn: QueryFn,
+        sql: str,
+        params: Any = None,
+        timeout: Optional[float] = None,
+    ) -> Any:
+        """Run ``fn(conn, sql, params)`` on a reader thread and await it.
+
+        Raises:
+            QueryTimeoutError: The query (including time spent waiting for
+                a slot) exceeded *timeout* / the default query timeout.
+            ExecutorClosedError: The executor has been shut down.
+        """
+        if self._closed:
+            raise ExecutorClosedError(f"Async DB executor '{self.name}' is closed")
+        effective = timeout if timeout is not None else self._query_timeout
+        loop = asyncio.get_running_loop()
+        start = time.monotonic()
+        deadline = start + effective if effective else None
+
+        sem = self._semaphore()
+        try:
+            if deadline is None:
+                await sem.acquire()
+            else:
+                await asyncio.wait_for(sem.acquire(), timeout=effective)
+        except asyncio.TimeoutError:
+            with self._stats_lock:
+                self._timeouts += 1
+            raise QueryTimeoutError(
+                f"Timed out after {effective}s waiting for a DB reader slot"
+            ) from None
+
+        job = _Job(fn, sql, params, loop, loop.create_future())
+        with self._stats_lock:
+            self._submitted += 1
+            self._in_flight += 1
+            self._peak_in_flight = max(self._peak_in_flight, self._in_flight)
+        ok = False
+        try:
+            self._queue.put(job)
+            if deadline is None:
+                result = await job.future
+            else:
+                remaining = max(0.0, deadline - time.monotonic())
+                result = await asyncio.wait_for(
+                    asyncio.shield(job.future), timeout=remaining
+                )
+            ok = True
+            return result
+        except asyncio.TimeoutError:
+            job.future.cancel()
+            if job.worker is not None:
+                job.worker.interrupt(job)
+            with self._stats_lock:
+                self._timeouts += 1
+            raise QueryTimeoutError(f"Query exceeded {effective}s timeout") from None
+        finally:
+            sem.release()
+            with self._stats_lock:
+                self._in_flight -= 1
+                self._exec_total += time.monotonic() - start
+                if ok:
+                    self._completed += 1
+                else:
+                    self._failed += 1
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Stop reader threads and close their connections."""
+        if self._closed:
+            return
+        self._closed = True
+        for _ in self._workers:
+            self._queue.put(_SHUTDOWN)
+        for w in self._workers:
+            w.join(timeout=timeout)
+        logger.info("Async DB executor '%s' closed", self.name)
+
+
+# ---------------------------------------------------------------------------
+# Module-level singleton (used by api.db_helper)
+# ---------------------------------------------------------------------------
+
+_executor: Optional[AsyncDBExecutor] = None
+
+
+def init_executor(
+    connect: Connector,
+    workers: int = DEFAULT_WORKERS,
+    max_pending: int = DEFAULT_MAX_PENDING,
+    query_timeout: Optional[float] = DEFAULT_QUERY_TIMEOUT,
+    name: str = "db",
+) -> AsyncDBExecutor:
+    """Create (or replace) the process-wide executor."""
+    global _executor
+    if _executor is not None:
+        _executor.close()
+    _executor = AsyncDBExecutor(
+        connect,
+        workers=workers,
+        max_pending=max_pending,
+        query_timeout=query_timeout,
+        name=name,
+    )
+    return _executor
+
+
+def get_executor() -> Optional[AsyncDBExecutor]:
+    """Return the process-wide executor, or None when not initialized."""
+    return _executor
+
+
+def close_executor() -> None:
+    """Shut down the process-wide executor. Safe to call when not initialized."""
+    global _executor
+    if _executor is not None:
+        _executor.close()
+        _executor = None
+
+
+def get_executor_stats() -> Optional[Dict[str, Any]]:
+    """Return executor metrics, or None when not initialized."""
+    return _executor.get_stats() if _executor is not None else None
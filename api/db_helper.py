@@ -18,7 +18,7 @@ import os
 import re
 import sqlite3
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple, Union
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
 
 logger = logging.getLogger(__name__)
 
@@ -129,8 +129,25 @@ def fetchone(conn: Any, sql: str, params: Params = None) -> Optional[Dict[str, A
     return dict(row) if row else None
 
 
+Statement = Tuple[str, Params]
+
+
+def fetchall_many(
+    conn: Any, statements: Sequence[Statement], _params: Params = None
+) -> List[List[Dict[str, Any]]]:
+    """Run several ``(sql, params)`` queries on *conn*; one row list per query.
+
+    The unused third argument lets this run as an async executor job.
+    """
+    return [fetchall(conn, sql, params) for sql, params in statements]
+
+
 # ---------------------------------------------------------------------------
-# Async wrappers (run sync DB I/O in a thread)
+# Async wrappers
+#
+# When ``api.async_db`` has been initialized (app lifespan), queries run on
+# its dedicated reader threads with bounded concurrency and per-query
+# timeouts.  Otherwise they fall back to ``asyncio.to_thread``.
 # ---------------------------------------------------------------------------
 
 
@@ -164,11 +181,61 @@ def _sync_fetchone(sql: str, params: Params = None) -> Optional[Dict[str, Any]]:
             return fetchone(conn, sql, params)
 
 
-async def afetchall(sql: str, params: Params = None) -> List[Dict[str, Any]]:
-    """Async wrapper: run a fetchall query in a background thread."""
+def _sync_fetchall_many(statements: Sequence[Statement]) -> List[List[Dict[str, Any]]]:
+    """Run fetchall_many on one pooled connection. For asyncio.to_thread."""
+    if is_postgres():
+        conn = get_conn()
+        try:
+            return fetchall_many(conn, statements)
+        finally:
+            conn.close()
+    else:
+        from services.sqlite_pool import get_pool
+
+        with get_pool().connection() as conn:
+            return fetchall_many(conn, statements)
+
+
+async def afetchall(
+    sql: str, params: Params = None, timeout: Optional[float] = None
+) -> List[Dict[str, Any]]:
+    """Async fetchall on the async executor, or in a background thread.
+
+    *timeout* overrides the executor's default per-query timeout.
+    """
+    from api.async_db import get_executor
+
+    executor = get_executor()
+    if executor is not None:
+        return await executor.run(fetchall, sql, params, timeout=timeout)
     return await asyncio.to_thread(_sync_fetchall, sql, params)
 
 
-async def afetchone(sql: str, params: Params = None) -> Optional[Dict[str, Any]]:
-    """Async wrapper: run a fetchone query in a background thread."""
+async def afetchone(
+    sql: str, params: Params = None, timeout: Optional[float] = None
+) -> Optional[Dict[str, Any]]:
+    """Async fetchone on the async executor, or in a background thread.
+
+    *timeout* overrides the executor's default per-query timeout.
+    """
+    from api.async_db import get_executor
+
+    executor = get_executor()
+    if executor is not None:
+        return await executor.run(fetchone, sql, params, timeout=timeout)
     return await asyncio.to_thread(_sync_fetchone, sql, params)
+
+
+async def afetchall_many(
+    statements: Sequence[Statement], timeout: Optional[float] = None
+) -> List[List[Dict[str, Any]]]:
+    """Async :func:`fetchall_many`: one thread hop and one connection for all.
+
+    *timeout* covers the whole batch.
+    """
+    from api.async_db import get_executor
+
+    executor = get_executor()
+    if executor is not None:
+        return await executor.run(fetchall_many, statements, None, timeout=timeout)
+    return await asyncio.to_thread(_sync_fetchall_many, statements)
@@ -16,7 +16,7 @@ from __future__ import annotations
 
 import logging
 from functools import lru_cache
-from typing import Generator
+from typing import Any, Generator
 
 from database.manager import get_database_manager
 from services.news_service import NewsAggregationService
@@ -33,11 +33,13 @@ logger = logging.getLogger(__name__)
 # ---------------------------------------------------------------------------
 
 
-def init_pg_pool(dsn: str, minconn: int = 2, maxconn: int = 10) -> None:
+def init_pg_pool(
+    dsn: str, minconn: int = 2, maxconn: int = 10, **pool_options: Any
+) -> None:
     """Initialize the module-level PostgreSQL connection pool.
 
     Delegates to ``database.pool.init_pool`` which manages the singleton
-    ``ThreadedConnectionPool``.  This wrapper exists so that application
+    ``FairConnectionPool``.  This wrapper exists so that application
     startup code (``app.py`` lifespan) has a single, stable import path in
     ``api.dependencies`` regardless of where the pool implementation lives.
 
@@ -53,6 +55,9 @@ def init_pg_pool(dsn: str, minconn: int = 2, maxconn: int = 10) -> None:
         Minimum number of connections to keep open (default 2).
     maxconn:
         Maximum number of connections allowed (default 10).
+    pool_options:
+        ``acquire_timeout``, ``pre_ping`` and ``recycle_seconds`` for
+        ``FairConnectionPool`` (see ``PoolSettings.options``).
     """
     from database.pool import is_pool_initialized
 
@@ -62,8 +67,6 @@ def init_pg_pool(dsn: str, minconn: int = 2, maxconn: int = 10) -> None:
 
     # database.pool.init_pool accepts a db_settings object; we pass a thin
     # namespace built from the DSN so callers only need the connection string.
-    from psycopg2.pool import ThreadedConnectionPool as _TCP
-
     # Parse DSN into keyword args understood by psycopg2
     try:
         import urllib.parse as _urlparse
@@ -86,7 +89,9 @@ def init_pg_pool(dsn: str, minconn: int = 2, maxconn: int = 10) -> None:
         logger.debug("PostgreSQL connection pool already initialized -- skipping")
         return
 
-    _pool_module._pool = _TCP(minconn, maxconn, **_pool_kwargs)
+    _pool_module._pool = _pool_module.FairConnectionPool(
+        minconn, maxconn, **pool_options, **_pool_kwargs
+    )
     logger.info(
         "PostgreSQL connection pool initialized (min=%d, max=%d)", minconn, maxconn
     )
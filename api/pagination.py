@@ -0,0 +1,106 @@
+"""
+Opaque keyset cursors and cached totals for paginated list endpoints.
+
+LIMIT/OFFSET pagination makes the database walk and discard every skipped
+row, so page *n* costs O(n), and each request also re-runs a ``COUNT(*)``.
+Keyset pagination instead resumes from the sort key of the last row served
+(``WHERE key < :last ORDER BY key DESC LIMIT n``), which an index turns into
+a constant-cost seek regardless of depth.
+
+The key is handed to clients as an opaque cursor (URL-safe base64 of a small
+JSON document) so the sort columns can change without breaking the API
+contract.  Totals are cached per filter signature for a short TTL: they only
+feed "N results" labels, so a few seconds of staleness is cheap compared to
+a full count per scroll step.
+
+Usage::
+
+    from api.pagination import cached_total, decode_cursor, encode_cursor
+
+    state = decode_cursor(cursor, key_size=2) if cursor else None
+    total = await cached_total("news", {"source": source}, count_fn)
+    next_cursor = encode_cursor(last_key, page=page + 1)
+"""
+
+from __future__ import annotations
+
+import base64
+import binascii
+import json
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence
+
+from fastapi import HTTPException
+
+from services.cache_utils import TTLCache
+
+# How long a cached total stays valid, in seconds
+TOTAL_CACHE_TTL = 30
+
+_total_cache = TTLCache(default_ttl=TOTAL_CACHE_TTL, max_entries=512)
+
+
+def encode_cursor(key: Sequence[Any], **extra: Any) -> str:
+    """Encode a row's sort key (plus optional extra state) as an opaque cursor."""
+    payload: Dict[str, Any] = {"k": list(key)}
+    payload.update(extra)
+    raw = json.dumps(payload, separators=(",", ":"), ensure_ascii=False)
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, key_size: int) -> Dict[str, Any]:
+    """Decode a cursor produced by :func:`encode_cursor`.
+
+    Returns the payload dict; ``payload["k"]`` is the sort key as a list of
+    ``key_size`` values.
+
+    Raises:
+        HTTPException: 400 if the cursor is malformed, has the wrong shape,
+            or a key value is not a string or number.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (binascii.Error, UnicodeError, ValueError):
+        raise HTTPException(status_code=400, detail="Invalid pagination cursor")
+    key = payload.get("k") if isinstance(payload, dict) else None
+    if (
+        not isinstance(key, list)
+        or len(key) != key_size
+        or not all(_is_key_value(v) for v in key)
+    ):
+        raise HTTPException(status_code=400, detail="Invalid pagination cursor")
+    return payload
+
+
+def _is_key_value(value: Any) -> bool:
+    """True for the scalar types a sort key is bound as (bool is excluded)."""
+    return isinstance(value, (str, int, float)) and not isinstance(value, bool)
+
+
+def page_key(row: Dict[str, Any], columns: Sequence[str]) -> List[Any]:
+    """Extract the sort key ``columns`` from a result row."""
+    return [row[c] for c in columns]
+
+
+def filter_signature(scope: str, filters: Dict[str, Any]) -> str:
+    """Return a stable cache key for ``filters`` under ``scope``."""
+    return scope + ":" + json.dumps(filters, sort_keys=True, default=str)
+
+
+async def cached_total(
+    scope: str,
+    filters: Dict[str, Any],
+    compute: Callable[[], Awaitable[int]],
+) -> int:
+    """Return the total for ``filters``, computing it at most once per TTL."""
+    key = filter_signature(scope, filters)
+    total: Optional[int] = _total_cache.get(key)
+    if total is None:
+        total = await compute()
+        _total_cache.put(key, total)
+    return total
+
+
+def clear_total_cache() -> None:
+    """Drop every cached total (used by tests and after bulk writes)."""
+    _total_cache.clear()
@@ -3,6 +3,10 @@ Market analytics API routes (dual-backend: SQLite + PostgreSQL).
 
 Provides market movers, summary, sector breakdown, and heatmap data.
 Works with both SQLite (local dev) and PostgreSQL (Railway/Docker) backends.
+
+When the in-memory market snapshot (``services.market_snapshot``) is
+initialized, every endpoint is answered from it with vectorized NumPy
+operations; otherwise the SQL queries below are used.
 """
 
 from __future__ import annotations
@@ -21,6 +25,7 @@ from database.queries import (
     SECTOR_ANALYTICS,
 )
 from models.api_responses import STANDARD_ERRORS
+from services.market_snapshot import aget_market_snapshot
 
 logger = logging.getLogger(__name__)
 
@@ -107,11 +112,15 @@ async def get_movers(
     limit: int = Query(10, ge=1, le=100),
 ) -> MoversResponse:
     """Get top market movers (gainers or losers) by percent change."""
+    snap = await aget_market_snapshot()
     order = "DESC" if type == "gainers" else "ASC"
     sql = _MOVERS_SQL + f" ORDER BY change_pct {order} LIMIT ?"
 
     try:
-        rows = await afetchall(sql, (limit,))
+        if snap is not None:
+            rows = snap.movers(limit, descending=type == "gainers")
+        else:
+            rows = await afetchall(sql, (limit,))
     except HTTPException:
         raise
     except Exception as exc:
@@ -125,11 +134,16 @@ async def get_movers(
 @router.get("/summary", response_model=MarketSummary, responses=STANDARD_ERRORS)
 async def get_market_summary() -> MarketSummary:
     """Get overall market summary with totals and top 5 movers."""
+    snap = await aget_market_snapshot()
     try:
-        agg = await afetchone(MARKET_SUMMARY_AGGREGATES)
-
-        gainers = await afetchall(_MOVERS_SQL + " ORDER BY change_pct DESC LIMIT 5")
-        losers = await afetchall(_MOVERS_SQL + " ORDER BY change_pct ASC LIMIT 5")
+        if snap is not None:
+            agg = snap.summary_aggregates()
+            gainers = snap.movers(5, descending=True)
+            losers = snap.movers(5, descending=False)
+        else:
+            agg = await afetchone(MARKET_SUMMARY_AGGREGATES)
+            gainers = await afetchall(_MOVERS_SQL + " ORDER BY change_pct DESC LIMIT 5")
+            losers = await afetchall(_MOVERS_SQL + " ORDER BY change_pct ASC LIMIT 5")
     except HTTPException:
         raise
     except Exception as exc:
@@ -152,8 +166,12 @@ async def get_market_summary() -> MarketSummary:
 @router.get("/sectors", response_model=List[SectorAnalytics], responses=STANDARD_ERRORS)
 async def get_sector_analytics() -> List[SectorAnalytics]:
     """Get per-sector analytics: avg change, volumes, market cap, gainers/losers."""
+    snap = await aget_market_snapshot()
     try:
-        rows = await afetchall(SECTOR_ANALYTICS)
+        if snap is not None:
+            rows = snap.sector_analytics()
+        else:
+            rows = await afetchall(SECTOR_ANALYTICS)
     except HTTPException:
         raise
     except Exception as exc:
@@ -183,8 +201,9 @@ async def get_sector_analytics() -> List[SectorAnalytics]:
 @router.get("/heatmap", response_model=List[HeatmapItem], responses=STANDARD_ERRORS)
 async def get_heatmap() -> List[HeatmapItem]:
     """Get all stocks with data suitable for treemap/heatmap visualization."""
+    snap = await aget_market_snapshot()
     try:
-        rows = await afetchall(HEATMAP)
+        rows = snap.heatmap() if snap is not None else await afetchall(HEATMAP)
     except HTTPException:
         raise
     except Exception as exc:
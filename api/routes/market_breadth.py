@@ -2,7 +2,8 @@
 Market breadth API route.
 
 Provides advance/decline ratio and 52-week high/low counts for the TASI market.
-Works with both SQLite and PostgreSQL backends.
+Works with both SQLite and PostgreSQL backends, or from the in-memory
+market snapshot when it is initialized.
 """
 
 from __future__ import annotations
@@ -17,6 +18,7 @@ from api.db_helper import afetchone
 from database.queries import MARKET_BREADTH
 from models.api_responses import STANDARD_ERRORS
 from services.cache_utils import cache_response
+from services.market_snapshot import aget_market_snapshot
 
 logger = logging.getLogger(__name__)
 
@@ -36,8 +38,9 @@ class MarketBreadthResponse(BaseModel):
 @cache_response(ttl=30)
 async def get_market_breadth() -> MarketBreadthResponse:
     """Get market breadth indicators: advance/decline counts and 52-week extremes."""
+    snap = await aget_market_snapshot()
     try:
-        row = await afetchone(MARKET_BREADTH)
+        row = snap.breadth() if snap is not None else await afetchone(MARKET_BREADTH)
     except HTTPException:
         raise
     except Exception as exc:
@@ -14,8 +14,9 @@ from typing import List, Optional
 from fastapi import APIRouter, HTTPException, Query
 from pydantic import BaseModel
 
+from api.pagination import cached_total, decode_cursor, encode_cursor, page_key
 from models.api_responses import STANDARD_ERRORS
-from services.news_store import NewsStore
+from services.news_store import FEED_KEY_COLUMNS, NewsStore
 
 logger = logging.getLogger(__name__)
 
@@ -59,6 +60,7 @@ class NewsFeedResponse(BaseModel):
     total: int
     page: int
     limit: int
+    next_cursor: Optional[str] = None
 
 
 class NewsSourceInfo(BaseModel):
@@ -79,34 +81,54 @@ class NewsSourcesResponse(BaseModel):
 async def get_news_feed(
     limit: int = Query(20, ge=1, le=100, description="Articles per page"),
     offset: int = Query(0, ge=0, description="Pagination offset"),
+    cursor: Optional[str] = Query(
+        None, description="Opaque cursor from a previous page (overrides offset)"
+    ),
     source: Optional[str] = Query(None, description="Filter by source name"),
     sentiment: Optional[str] = Query(None, description="Filter by sentiment label"),
     date_from: Optional[str] = Query(None, description="Filter from date (ISO format)"),
     date_to: Optional[str] = Query(None, description="Filter to date (ISO format)"),
 ) -> NewsFeedResponse:
-    """Get latest news articles with optional filtering and pagination."""
+    """Get latest news articles with optional filtering and pagination.
+
+    Pass the returned ``next_cursor`` back as ``cursor`` to fetch the next
+    page in constant time; ``offset`` remains supported for older clients.
+    """
     store = get_store()
-    articles = await store.aget_latest_news(
-        limit=limit,
-        offset=offset,
+    filters = dict(
         source=source,
         sentiment_label=sentiment,
         date_from=date_from,
         date_to=date_to,
     )
-    total = await store.acount_articles(
-        source=source,
-        sentiment_label=sentiment,
-        date_from=date_from,
-        date_to=date_to,
+    if cursor:
+        state = decode_cursor(cursor, len(FEED_KEY_COLUMNS))
+        after = state["k"]
+        page = state.get("p")
+        if not isinstance(page, int) or page < 1:
+            page = 1
+    else:
+        after = None
+        page = (offset // limit) + 1 if limit > 0 else 1
+
+    articles = await store.aget_latest_news(
+        limit=limit, offset=offset, after=after, **filters
     )
-    page = (offset // limit) + 1 if limit > 0 else 1
+    total = await cached_total(
+        f"news:{store.db_path}", filters, lambda: store.acount_articles(**filters)
+    )
+    next_cursor = None
+    if len(articles) == limit:
+        next_cursor = encode_cursor(
+            page_key(articles[-1], FEED_KEY_COLUMNS), p=page + 1
+        )
 
     return NewsFeedResponse(
         items=[NewsArticle(**a) for a in articles],
         total=total,
         page=page,
         limit=limit,
+        next_cursor=next_cursor,
     )
 
 
@@ -148,9 +170,12 @@ async def search_articles(
     date_from: Optional[str] = Query(None, description="Filter from date (ISO format)"),
     date_to: Optional[str] = Query(None, description="Filter to date (ISO format)"),
 ) -> NewsFeedResponse:
-    """Search articles by title or body text with optional filters."""
+    """Search articles by title or body text with optional filters.
+
+    Results are relevance-ranked; the page and the total come from one query.
+    """
     store = get_store()
-    articles = await store.asearch_articles(
+    articles, total = await store.asearch_page(
         query=q,
         limit=limit,
         offset=offset,
@@ -159,13 +184,6 @@ async def search_articles(
         date_from=date_from,
         date_to=date_to,
     )
-    total = await store.acount_search(
-        query=q,
-        source=source,
-        sentiment_label=sentiment,
-        date_from=date_from,
-        date_to=date_to,
-    )
     page = (offset // limit) + 1 if limit > 0 else 1
 
     return NewsFeedResponse(
@@ -16,12 +16,16 @@ from typing import Optional
 from fastapi import APIRouter, Query, Request
 from fastapi.responses import StreamingResponse
 
-from api.routes.news_feed import get_store
+from services.news_hub import article_items, get_news_hub
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api/v1/news", tags=["news-stream"])
 
+# Idle interval after which a keepalive comment is sent (keeps proxies from
+# closing the connection and lets us notice disconnected clients).
+KEEPALIVE_SECONDS = 15.0
+
 
 @router.get("/stream")
 async def news_stream(
@@ -30,58 +34,43 @@ async def news_stream(
 ) -> StreamingResponse:
     """SSE endpoint that emits events when new articles appear.
 
-    Polls the NewsStore every 10 seconds and sends an event containing
-    the new article count whenever the latest article ID changes.
-    Clients should reconnect on error.
+    Subscribes to the news broadcast hub, which ``NewsStore.store_articles``
+    publishes to as soon as new rows are committed, and forwards each batch
+    (filtered by ``source`` in memory). No database queries are made per
+    client. Clients should reconnect on error.
     """
 
     async def event_generator():
-        last_seen_id: Optional[str] = None
-        store = get_store()
-
-        # Send an initial keepalive so the client knows the connection is open
-        yield ": connected\n\n"
-
-        while True:
-            if await request.is_disconnected():
-                logger.debug("SSE client disconnected, closing stream")
-                return
-
-            try:
-                articles = await store.aget_latest_news(
-                    limit=10, offset=0, source=source
-                )
-
-                if articles:
-                    newest_id = articles[0]["id"]
-                    if last_seen_id is None:
-                        # First poll -- just record the current head
-                        last_seen_id = newest_id
-                    elif newest_id != last_seen_id:
-                        # Find how many articles are newer than last_seen_id
-                        new_items = []
-                        for a in articles:
-                            if a["id"] == last_seen_id:
-                                break
-                            new_items.append(
-                                {
-                                    "id": a["id"],
-                                    "title": a.get("title", ""),
-                                    "source_name": a.get("source_name", ""),
-                                }
-                            )
-                        last_seen_id = newest_id
-
-                        if new_items:
-                            payload = json.dumps(
-                                {"items": new_items, "count": len(new_items)},
-                                ensure_ascii=False,
-                            )
-                            yield f"data: {payload}\n\n"
-            except Exception:
-                logger.debug("SSE poll error", exc_info=True)
-
-            await asyncio.sleep(10)
+        with get_news_hub().subscribe() as sub:
+            # Send an initial keepalive so the client knows the connection is open
+            yield ": connected\n\n"
+
+            while True:
+                if await request.is_disconnected():
+                    logger.debug("SSE client disconnected, closing stream")
+                    return
+
+                try:
+                    batch = await sub.get(timeout=KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+
+                new_items = [
+                    {
+                        "id": a["id"],
+                        "title": a.get("title", ""),
+                        "source_name": a.get("source_name", ""),
+                    }
+                    for a in article_items(batch)
+                    if source is None or a.get("source_name") == source
+                ]
+                if new_items:
+                    payload = json.dumps(
+                        {"items": new_items, "count": len(new_items)},
+                        ensure_ascii=False,
+                    )
+                    yield f"data: {payload}\n\n"
 
     return StreamingResponse(
         event_generator(),
@@ -3,6 +3,13 @@ Stock screener API route (dual-backend: SQLite + PostgreSQL).
 
 Provides a POST endpoint for filtering stocks across multiple criteria
 using the SCREENER_BASE query with dynamic parameterized WHERE clauses.
+
+When the materialized ``screener_snapshot`` table is available
+(``services.screener_snapshot``) the same filters run against it instead
+of the 7-table join, and the total count comes back with the page in one
+query (``COUNT(*) OVER ()``).  With ``SCREENER_ENGINE=numpy`` the filters
+are evaluated in process over NumPy arrays loaded from that table
+(``services.screener_engine``).
 """
 
 from __future__ import annotations
@@ -14,37 +21,38 @@ from fastapi import APIRouter
 from pydantic import BaseModel, Field
 
 from api.db_helper import afetchall, afetchone
-from database.queries import SCREENER_BASE
+from database.queries import SCREENER_BASE, SCREENER_SORT_COLUMNS
 from models.api_responses import STANDARD_ERRORS
+from services.screener_engine import aget_screener_engine
+from services.screener_snapshot import SNAPSHOT_TABLE, aget_screener_snapshot
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api/v1/screener", tags=["screener"])
 
 # Allowed sort columns to prevent SQL injection
-_ALLOWED_SORT_COLUMNS = {
-    "ticker",
-    "short_name",
-    "sector",
-    "current_price",
-    "change_pct",
-    "market_cap",
-    "volume",
-    "trailing_pe",
-    "forward_pe",
-    "price_to_book",
-    "price_to_sales",
-    "roe",
-    "profit_margin",
-    "revenue_growth",
-    "earnings_growth",
-    "dividend_yield",
-    "debt_to_equity",
-    "current_ratio",
-    "total_revenue",
-    "target_mean_price",
-    "analyst_count",
-}
+_ALLOWED_SORT_COLUMNS = set(SCREENER_SORT_COLUMNS)
+
+# Filter field -> (SCREENER_BASE table alias, column, comparison).  "ieq" is
+# a case-insensitive equality; string filters are skipped when empty.
+_FILTER_SPECS: tuple[tuple[str, str, str, str], ...] = (
+    ("sector", "c", "sector", "="),
+    ("pe_min", "v", "trailing_pe", ">="),
+    ("pe_max", "v", "trailing_pe", "<="),
+    ("pb_min", "v", "price_to_book", ">="),
+    ("pb_max", "v", "price_to_book", "<="),
+    ("roe_min", "p", "roe", ">="),
+    ("roe_max", "p", "roe", "<="),
+    ("dividend_yield_min", "d", "dividend_yield", ">="),
+    ("dividend_yield_max", "d", "dividend_yield", "<="),
+    ("market_cap_min", "m", "market_cap", ">="),
+    ("market_cap_max", "m", "market_cap", "<="),
+    ("revenue_growth_min", "p", "revenue_growth", ">="),
+    ("revenue_growth_max", "p", "revenue_growth", "<="),
+    ("debt_to_equity_max", "f", "debt_to_equity", "<="),
+    ("current_ratio_min", "f", "current_ratio", ">="),
+    ("recommendation", "a", "recommendation", "ieq"),
+)
 
 
 # ---------------------------------------------------------------------------
@@ -126,72 +134,37 @@ class ScreenerResponse(BaseModel):
 # ---------------------------------------------------------------------------
 
 
-def _build_where_clauses(filters: ScreenerFilters) -> tuple[str, list]:
+def _active_filters(filters: ScreenerFilters) -> list[tuple[str, str, str, Any]]:
+    """(alias, column, op, value) for every filter that is set."""
+    active = []
+    for field, alias, column, op in _FILTER_SPECS:
+        value = getattr(filters, field)
+        if value is None or value == "":
+            continue
+        active.append((alias, column, op, value))
+    return active
+
+
+def _build_where_clauses(
+    filters: ScreenerFilters, qualified: bool = True
+) -> tuple[str, list]:
     """Build parameterized WHERE clauses from filter criteria.
 
     Returns (sql_fragment, params) where sql_fragment starts with ' AND ...'
-    and params is a list of values for '?' placeholders.
+    and params is a list of values for '?' placeholders.  Columns carry the
+    SCREENER_BASE table aliases unless *qualified* is False (for the
+    single-table ``screener_snapshot``).
     """
     clauses: list[str] = []
     params: list[Any] = []
 
-    if filters.sector:
-        clauses.append("c.sector = ?")
-        params.append(filters.sector)
-
-    if filters.pe_min is not None:
-        clauses.append("v.trailing_pe >= ?")
-        params.append(filters.pe_min)
-    if filters.pe_max is not None:
-        clauses.append("v.trailing_pe <= ?")
-        params.append(filters.pe_max)
-
-    if filters.pb_min is not None:
-        clauses.append("v.price_to_book >= ?")
-        params.append(filters.pb_min)
-    if filters.pb_max is not None:
-        clauses.append("v.price_to_book <= ?")
-        params.append(filters.pb_max)
-
-    if filters.roe_min is not None:
-        clauses.append("p.roe >= ?")
-        params.append(filters.roe_min)
-    if filters.roe_max is not None:
-        clauses.append("p.roe <= ?")
-        params.append(filters.roe_max)
-
-    if filters.dividend_yield_min is not None:
-        clauses.append("d.dividend_yield >= ?")
-        params.append(filters.dividend_yield_min)
-    if filters.dividend_yield_max is not None:
-        clauses.append("d.dividend_yield <= ?")
-        params.append(filters.dividend_yield_max)
-
-    if filters.market_cap_min is not None:
-        clauses.append("m.market_cap >= ?")
-        params.append(filters.market_cap_min)
-    if filters.market_cap_max is not None:
-        clauses.append("m.market_cap <= ?")
-        params.append(filters.market_cap_max)
-
-    if filters.revenue_growth_min is not None:
-        clauses.append("p.revenue_growth >= ?")
-        params.append(filters.revenue_growth_min)
-    if filters.revenue_growth_max is not None:
-        clauses.append("p.revenue_growth <= ?")
-        params.append(filters.revenue_growth_max)
-
-    if filters.debt_to_equity_max is not None:
-        clauses.append("f.debt_to_equity <= ?")
-        params.append(filters.debt_to_equity_max)
-
-    if filters.current_ratio_min is not None:
-        clauses.append("f.current_ratio >= ?")
-        params.append(filters.current_ratio_min)
-
-    if filters.recommendation:
-        clauses.append("LOWER(a.recommendation) = LOWER(?)")
-        params.append(filters.recommendation)
+    for alias, column, op, value in _active_filters(filters):
+        ref = f"{alias}.{column}" if qualified else column
+        if op == "ieq":
+            clauses.append(f"LOWER({ref}) = LOWER(?)")
+        else:
+            clauses.append(f"{ref} {op} ?")
+        params.append(value)
 
     sql = ""
     if clauses:
@@ -200,21 +173,52 @@ def _build_where_clauses(filters: ScreenerFilters) -> tuple[str, list]:
     return sql, params
 
 
-# ---------------------------------------------------------------------------
-# Route
-# ---------------------------------------------------------------------------
-
-
-@router.post("/search", response_model=ScreenerResponse, responses=STANDARD_ERRORS)
-async def search_stocks(filters: ScreenerFilters) -> ScreenerResponse:
-    """Search and filter stocks using multiple criteria."""
+def _order_by(sort_by: str, sort_dir: str, qualified: bool) -> str:
+    """ORDER BY clause for a whitelisted column, with ticker as tiebreaker.
 
-    # Validate sort column
-    sort_by = (
-        filters.sort_by if filters.sort_by in _ALLOWED_SORT_COLUMNS else "market_cap"
+    The tiebreaker keeps pages from overlapping or skipping rows.  In the
+    join ``ticker`` is ambiguous, so it is qualified with the companies alias.
+    """
+    ticker = "c.ticker" if qualified else "ticker"
+    if sort_by == "ticker":
+        return f" ORDER BY {ticker} {sort_dir}"
+    return f" ORDER BY {sort_by} {sort_dir} NULLS LAST, {ticker}"
+
+
+def _row_to_item(r: Dict[str, Any]) -> ScreenerItem:
+    return ScreenerItem(
+        ticker=r["ticker"],
+        short_name=r.get("short_name"),
+        sector=r.get("sector"),
+        industry=r.get("industry"),
+        current_price=r.get("current_price"),
+        change_pct=round(r["change_pct"], 2)
+        if r.get("change_pct") is not None
+        else None,
+        market_cap=r.get("market_cap"),
+        volume=r.get("volume"),
+        trailing_pe=r.get("trailing_pe"),
+        forward_pe=r.get("forward_pe"),
+        price_to_book=r.get("price_to_book"),
+        roe=r.get("roe"),
+        profit_margin=r.get("profit_margin"),
+        revenue_growth=r.get("revenue_growth"),
+        dividend_yield=r.get("dividend_yield"),
+        debt_to_equity=r.get("debt_to_equity"),
+        current_ratio=r.get("current_ratio"),
+        total_revenue=r.get("total_revenue"),
+        recommendation=r.get("recommendation"),
+        target_mean_price=r.get("target_mean_price"),
+        analyst_count=int(r["analyst_count"])
+        if r.get("analyst_count") is not None
+        else None,
     )
-    sort_dir = "ASC" if filters.sort_dir.lower() == "asc" else "DESC"
 
+
+async def _search_sql(
+    filters: ScreenerFilters, order_sql: str
+) -> tuple[list[Dict[str, Any]], int]:
+    """Count and page over the SCREENER_BASE join (two queries)."""
     where_sql, where_params = _build_where_clauses(filters)
 
     # Count query
@@ -223,48 +227,80 @@ async def search_stocks(filters: ScreenerFilters) -> ScreenerResponse:
     total_count = count_row["cnt"] if count_row else 0
 
     # Data query with sort and pagination
-    # sort_by is validated against _ALLOWED_SORT_COLUMNS whitelist above.
+    data_sql = f"{SCREENER_BASE}{where_sql}{order_sql} LIMIT ? OFFSET ?"
+    data_params = tuple(where_params) + (filters.limit, filters.offset)
+
+    rows = await afetchall(data_sql, data_params)
+    return rows, total_count
+
+
+async def _search_snapshot(
+    filters: ScreenerFilters, order_sql: str
+) -> tuple[list[Dict[str, Any]], int]:
+    """Count and page over ``screener_snapshot`` in a single query."""
+    where_sql, where_params = _build_where_clauses(filters, qualified=False)
+
     data_sql = (
-        f"{SCREENER_BASE}{where_sql}"
-        f" ORDER BY {sort_by} {sort_dir} NULLS LAST"
-        f" LIMIT ? OFFSET ?"
+        f"SELECT *, COUNT(*) OVER () AS total_count FROM {SNAPSHOT_TABLE}"  # nosec B608
+        f" WHERE 1 = 1{where_sql}{order_sql} LIMIT ? OFFSET ?"
     )
     data_params = tuple(where_params) + (filters.limit, filters.offset)
-
     rows = await afetchall(data_sql, data_params)
+    if rows:
+        return rows, rows[0]["total_count"]
+    if filters.offset == 0:
+        return rows, 0
+
+    # Paged past the end: the window count came back with no rows
+    count_sql = f"SELECT COUNT(*) AS cnt FROM {SNAPSHOT_TABLE} WHERE 1 = 1{where_sql}"  # nosec B608
+    count_row = await afetchone(count_sql, tuple(where_params))
+    return rows, count_row["cnt"] if count_row else 0
+
+
+def _search_engine(
+    engine: Any, filters: ScreenerFilters, sort_by: str, sort_dir: str
+) -> tuple[list[Dict[str, Any]], int]:
+    """Filter, sort and page in process with the NumPy screener engine."""
+    predicates = [
+        (column, op, value) for _, column, op, value in _active_filters(filters)
+    ]
+    return engine.search(
+        predicates,
+        sort_by,
+        descending=sort_dir == "DESC",
+        limit=filters.limit,
+        offset=filters.offset,
+    )
+
+
+# ---------------------------------------------------------------------------
+# Route
+# ---------------------------------------------------------------------------
+
 
-    items = []
-    for r in rows:
-        items.append(
-            ScreenerItem(
-                ticker=r["ticker"],
-                short_name=r.get("short_name"),
-                sector=r.get("sector"),
-                industry=r.get("industry"),
-                current_price=r.get("current_price"),
-                change_pct=round(r["change_pct"], 2)
-                if r.get("change_pct") is not None
-                else None,
-                market_cap=r.get("market_cap"),
-                volume=r.get("volume"),
-                trailing_pe=r.get("trailing_pe"),
-                forward_pe=r.get("forward_pe"),
-                price_to_book=r.get("price_to_book"),
-                roe=r.get("roe"),
-                profit_margin=r.get("profit_margin"),
-                revenue_growth=r.get("revenue_growth"),
-                dividend_yield=r.get("dividend_yield"),
-                debt_to_equity=r.get("debt_to_equity"),
-                current_ratio=r.get("current_ratio"),
-                total_revenue=r.get("total_revenue"),
-                recommendation=r.get("recommendation"),
-                target_mean_price=r.get("target_mean_price"),
-                analyst_count=int(r["analyst_count"])
-                if r.get("analyst_count") is not None
-                else None,
-            )
+@router.post("/search", response_model=ScreenerResponse, responses=STANDARD_ERRORS)
+async def search_stocks(filters: ScreenerFilters) -> ScreenerResponse:
+    """Search and filter stocks using multiple criteria."""
+
+    # Validate sort column
+    sort_by = (
+        filters.sort_by if filters.sort_by in _ALLOWED_SORT_COLUMNS else "market_cap"
+    )
+    sort_dir = "ASC" if filters.sort_dir.lower() == "asc" else "DESC"
+
+    engine = await aget_screener_engine()
+    if engine is not None:
+        rows, total_count = _search_engine(engine, filters, sort_by, sort_dir)
+    elif await aget_screener_snapshot() is not None:
+        order_sql = _order_by(sort_by, sort_dir, qualified=False)
+        rows, total_count = await _search_snapshot(filters, order_sql)
+    else:
+        rows, total_count = await _search_sql(
+            filters, _order_by(sort_by, sort_dir, qualified=True)
         )
 
+    items = [_row_to_item(r) for r in rows]
+
     # Build applied filters summary
     filters_applied: Dict[str, Any] = {}
     filter_dict = filters.model_dump(exclude={"sort_by", "sort_dir", "limit", "offset"})
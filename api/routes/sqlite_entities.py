@@ -15,6 +15,7 @@ from fastapi import APIRouter, HTTPException, Query
 from pydantic import BaseModel
 
 from api.db_helper import afetchall, afetchone
+from api.pagination import cached_total, decode_cursor, encode_cursor
 from database.queries import ENTITY_FULL_DETAIL, SECTOR_LIST
 from models.api_responses import STANDARD_ERRORS
 from models.validators import validate_ticker
@@ -23,6 +24,9 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api/entities", tags=["entities"])
 
+# List sort key: market cap (NULLs last on both backends), then ticker
+_SORT_CAP_SQL = "COALESCE(m.market_cap, -1)"
+
 
 # ---------------------------------------------------------------------------
 # Response models
@@ -43,6 +47,7 @@ class EntityListResponse(BaseModel):
     items: List[CompanySummary]
     count: int
     total: int = 0
+    next_cursor: Optional[str] = None
 
 
 class SectorInfo(BaseModel):
@@ -130,10 +135,17 @@ class CompanyFullDetail(BaseModel):
 async def list_entities(
     limit: int = Query(50, ge=1, le=500),
     offset: int = Query(0, ge=0),
+    cursor: Optional[str] = Query(
+        None, description="Opaque cursor from a previous page (overrides offset)"
+    ),
     sector: Optional[str] = Query(None),
     search: Optional[str] = Query(None, description="Search by ticker or name"),
 ) -> EntityListResponse:
-    """List companies with basic market data."""
+    """List companies with basic market data.
+
+    Pass the returned ``next_cursor`` back as ``cursor`` to page by
+    (market_cap, ticker) keyset; ``offset`` remains supported.
+    """
     # Always filter out stub entities with no meaningful market data
     clauses: list = ["(m.current_price IS NOT NULL OR m.market_cap IS NOT NULL)"]
     params: list = []
@@ -148,16 +160,28 @@ async def list_entities(
         params.append(f"%{search}%")
 
     where = "WHERE " + " AND ".join(clauses)
+    count_params = list(params)
 
-    try:
+    if cursor:
+        last_cap, last_ticker = decode_cursor(cursor, 2)["k"]
+        where += f" AND ({_SORT_CAP_SQL} < ? OR ({_SORT_CAP_SQL} = ? AND c.ticker > ?))"
+        params.extend([last_cap, last_cap, last_ticker])
+        offset = 0
+
+    async def _count() -> int:
         count_row = await afetchone(
             f"""SELECT COUNT(*) AS cnt
                 FROM companies c
                 LEFT JOIN market_data m ON m.ticker = c.ticker
-                {where}""",
-            params,
+                WHERE {" AND ".join(clauses)}""",
+            count_params,
+        )
+        return count_row["cnt"] if count_row else 0
+
+    try:
+        total = await cached_total(
+            "entities", {"sector": sector, "search": search}, _count
         )
-        total = count_row["cnt"] if count_row else 0
 
         sql = f"""
             SELECT
@@ -170,7 +194,7 @@ async def list_entities(
             FROM companies c
             LEFT JOIN market_data m ON m.ticker = c.ticker
             {where}
-            ORDER BY m.market_cap DESC
+            ORDER BY {_SORT_CAP_SQL} DESC, c.ticker ASC
             LIMIT ? OFFSET ?
         """
         rows = await afetchall(sql, params + [limit, offset])
@@ -180,6 +204,12 @@ async def list_entities(
         logger.error("Error listing entities: %s", exc)
         raise HTTPException(status_code=503, detail="Database temporarily unavailable")
 
+    next_cursor = None
+    if len(rows) == limit:
+        last = rows[-1]
+        last_cap = last["market_cap"] if last["market_cap"] is not None else -1
+        next_cursor = encode_cursor([last_cap, last["ticker"]])
+
     items = [
         CompanySummary(
             ticker=r["ticker"],
@@ -194,7 +224,9 @@ async def list_entities(
         )
         for r in rows
     ]
-    return EntityListResponse(items=items, count=len(items), total=total)
+    return EntityListResponse(
+        items=items, count=len(items), total=total, next_cursor=next_cursor
+    )
 
 
 @router.get("/sectors", response_model=List[SectorInfo], responses=STANDARD_ERRORS)
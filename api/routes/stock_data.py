@@ -4,6 +4,10 @@ Stock data API routes (dual-backend: SQLite + PostgreSQL).
 Provides per-stock dividends, financial summary, financial statements,
 stock comparison, and batch quotes.
 Works with both SQLite and PostgreSQL backends via db_helper.
+
+Company existence is checked against the in-memory ticker registry
+(``services.ticker_registry``) when it is available, so most requests
+make a single database call.
 """
 
 from __future__ import annotations
@@ -15,7 +19,7 @@ from typing import Any, Dict, List, Optional
 from fastapi import APIRouter, HTTPException, Query
 from pydantic import BaseModel
 
-from api.db_helper import afetchall, afetchone, get_conn, fetchall
+from api.db_helper import afetchall, afetchall_many, afetchone, get_conn, fetchall
 from database.queries import (
     BATCH_QUOTES_SQL,
     COMPANY_EXISTS,
@@ -25,6 +29,7 @@ from database.queries import (
 )
 from models.api_responses import STANDARD_ERRORS
 from models.validators import validate_ticker, validate_ticker_list
+from services.ticker_registry import aget_ticker_registry
 
 logger = logging.getLogger(__name__)
 
@@ -192,15 +197,28 @@ class QuoteItem(BaseModel):
 # ---------------------------------------------------------------------------
 
 
+async def _require_company(ticker: str) -> None:
+    """Raise 404 unless *ticker* is a listed company.
+
+    A registry hit skips the database; a miss (or no registry) is confirmed
+    with ``COMPANY_EXISTS`` since the company may have been listed since
+    the registry was built.
+    """
+    registry = await aget_ticker_registry()
+    if registry is not None and ticker in registry:
+        return
+    exists = await afetchone(COMPANY_EXISTS, (ticker,))
+    if not exists:
+        raise HTTPException(status_code=404, detail="Company not found")
+
+
 @router.get(
     "/{ticker}/dividends", response_model=DividendData, responses=STANDARD_ERRORS
 )
 async def get_dividends(ticker: str) -> DividendData:
     """Get dividend data for a specific stock."""
     ticker = validate_ticker(ticker)
-    exists = await afetchone(COMPANY_EXISTS, (ticker,))
-    if not exists:
-        raise HTTPException(status_code=404, detail="Company not found")
+    await _require_company(ticker)
 
     row = await afetchone(DIVIDEND_DATA_BY_TICKER, (ticker,))
 
@@ -227,9 +245,7 @@ async def get_dividends(ticker: str) -> DividendData:
 async def get_financial_summary(ticker: str) -> FinancialSummaryData:
     """Get financial summary for a specific stock."""
     ticker = validate_ticker(ticker)
-    exists = await afetchone(COMPANY_EXISTS, (ticker,))
-    if not exists:
-        raise HTTPException(status_code=404, detail="Company not found")
+    await _require_company(ticker)
 
     row = await afetchone(FINANCIAL_SUMMARY_BY_TICKER, (ticker,))
 
@@ -277,9 +293,7 @@ async def get_financials(
             detail="Invalid period_type. Must be one of: annual, quarterly, ttm",
         )
 
-    exists = await afetchone(COMPANY_EXISTS, (ticker,))
-    if not exists:
-        raise HTTPException(status_code=404, detail="Company not found")
+    await _require_company(ticker)
 
     # Table name is validated above against _STATEMENT_TABLES whitelist.
     # SELECT * is intentional here: financial statement tables have dynamic
@@ -460,19 +474,23 @@ _TREND_METRICS = {
 async def get_financial_trend(ticker: str) -> FinancialTrendResponse:
     """Get multi-period financial trend data for charting."""
     ticker = validate_ticker(ticker)
-    exists = await afetchone(COMPANY_EXISTS, (ticker,))
-    if not exists:
-        raise HTTPException(status_code=404, detail="Company not found")
-
-    all_metrics: List[TrendMetric] = []
+    await _require_company(ticker)
 
+    # All three statement tables in one batch on a single connection
+    statements = []
     for table, metric_defs in _TREND_METRICS.items():
         cols = [m[0] for m in metric_defs]
         col_str = ", ".join(["period_date"] + cols)
-        rows = await afetchall(
-            f"SELECT {col_str} FROM {table} WHERE ticker = ? AND period_type = 'annual' ORDER BY period_index ASC",
-            (ticker,),
+        statements.append(
+            (
+                f"SELECT {col_str} FROM {table} WHERE ticker = ? AND period_type = 'annual' ORDER BY period_index ASC",
+                (ticker,),
+            )
         )
+    results = await afetchall_many(statements)
+
+    all_metrics: List[TrendMetric] = []
+    for metric_defs, rows in zip(_TREND_METRICS.values(), results):
         for col_name, display_name in metric_defs:
             periods = []
             for row in rows:
@@ -516,9 +534,7 @@ _OWNERSHIP_QUERY = """
 async def get_ownership(ticker: str) -> OwnershipResponse:
     """Get ownership breakdown for a stock."""
     ticker = validate_ticker(ticker)
-    exists = await afetchone(COMPANY_EXISTS, (ticker,))
-    if not exists:
-        raise HTTPException(status_code=404, detail="Company not found")
+    await _require_company(ticker)
 
     row = await afetchone(_OWNERSHIP_QUERY, (ticker,))
     if not row:
@@ -8,7 +8,6 @@ Works with both SQLite and PostgreSQL backends (no database dependency).
 
 from __future__ import annotations
 
-import asyncio
 import logging
 from typing import List, Literal
 
@@ -19,7 +18,7 @@ from models.api_responses import STANDARD_ERRORS
 from models.validators import validate_ticker
 from services.stock_ohlcv import (
     VALID_PERIODS,
-    fetch_stock_ohlcv,
+    afetch_stock_ohlcv,
     get_cache_status,
     get_circuit_breaker_status,
 )
@@ -82,7 +81,7 @@ async def get_stock_ohlcv(
             detail=f"Invalid period '{period}'. Must be one of: {', '.join(VALID_PERIODS)}",
         )
 
-    result = await asyncio.to_thread(fetch_stock_ohlcv, ticker=ticker, period=period)
+    result = await afetch_stock_ohlcv(ticker, period=period)
 
     return StockOHLCVResponse(
         data=[StockOHLCVPoint(**pt) for pt in result["data"]],
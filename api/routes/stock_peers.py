@@ -2,7 +2,9 @@
 Stock peer comparison API route.
 
 Returns the top N companies in the same sector as the given ticker,
-ranked by market cap proximity, with key comparison metrics.
+ranked by market cap proximity, with key comparison metrics.  The
+ticker's own sector and market cap come from the in-memory ticker registry
+when available, leaving the peer query as the only database call.
 """
 
 from __future__ import annotations
@@ -14,9 +16,9 @@ from fastapi import APIRouter, HTTPException, Query
 from pydantic import BaseModel
 
 from api.db_helper import afetchall, afetchone
-from database.queries import COMPANY_EXISTS
 from models.api_responses import STANDARD_ERRORS
 from services.cache_utils import cache_response
+from services.ticker_registry import aget_ticker_registry
 
 logger = logging.getLogger(__name__)
 
@@ -80,16 +82,23 @@ async def get_stock_peers(
 ) -> PeersResponse:
     """Get peer companies in the same sector, ranked by market cap proximity."""
     try:
-        exists = await afetchone(COMPANY_EXISTS, (ticker,))
-        if not exists:
-            raise HTTPException(status_code=404, detail=f"Company {ticker} not found")
-
-        info = await afetchone(TICKER_SECTOR_MCAP, (ticker,))
-        if not info or not info["sector"]:
+        registry = await aget_ticker_registry()
+        info = registry.get(ticker) if registry is not None else None
+        if info is not None:
+            sector, market_cap = info.sector, info.market_cap
+        else:
+            # Registry miss: one query both confirms the company and reads it
+            row = await afetchone(TICKER_SECTOR_MCAP, (ticker,))
+            if not row:
+                raise HTTPException(
+                    status_code=404, detail=f"Company {ticker} not found"
+                )
+            sector, market_cap = row["sector"], row["market_cap"]
+
+        if not sector:
             return PeersResponse(ticker=ticker, sector=None, peers=[], count=0)
 
-        sector = info["sector"]
-        mcap = float(info["market_cap"]) if info["market_cap"] else 0
+        mcap = float(market_cap) if market_cap else 0
 
         rows = await afetchall(PEER_QUERY, (sector, ticker, mcap, limit))
     except HTTPException:
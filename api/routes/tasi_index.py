@@ -8,7 +8,6 @@ PostgreSQL backends (no database dependency).
 
 from __future__ import annotations
 
-import asyncio
 import logging
 from typing import List, Literal, Optional
 
@@ -18,7 +17,7 @@ from pydantic import BaseModel
 from models.api_responses import STANDARD_ERRORS
 from services.tasi_index import (
     VALID_PERIODS,
-    fetch_tasi_index,
+    afetch_tasi_index,
     get_cache_status,
     get_circuit_breaker_status,
 )
@@ -71,7 +70,7 @@ async def get_tasi_index(
             detail=f"Invalid period '{period}'. Must be one of: {', '.join(VALID_PERIODS)}",
         )
 
-    result = await asyncio.to_thread(fetch_tasi_index, period=period)
+    result = await afetch_tasi_index(period=period)
 
     return TASIIndexResponse(
         data=[TASIOHLCVPoint(**pt) for pt in result["data"]],
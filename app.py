@@ -328,10 +328,24 @@ try:
     # GZip compression (after CORS, before rate limiter)
     app.add_middleware(GZipMiddleware, minimum_size=1000)
 
-    # Rate limiter (skip in debug mode)
+    # Rate limiter (skip in debug mode). Shares counters across workers
+    # through Redis db=1 (RATELIMIT_REDIS_URL, else the cache's server) when
+    # the cache is enabled, else counts in-process.
     if not _debug_mode:
+        from backend.middleware.rate_limit_config import RateLimitConfig
+        from backend.middleware.rate_limiter import RateLimiter
+
+        _cache_cfg = _settings.cache if _settings else None
+        _rl_cfg = RateLimitConfig()
         app.add_middleware(
             RateLimitMiddleware,
+            limiter=RateLimiter(
+                redis_url=_rl_cfg.resolve_redis_url(_cache_cfg.redis_url)
+                if _cache_cfg and _cache_cfg.enabled
+                else None,
+                flush_interval=_rl_cfg.flush_interval,
+                lease_fraction=_rl_cfg.lease_fraction,
+            ),
             requests_per_minute=_rate_limit,
             skip_paths=["/health"],
             path_limits={
@@ -717,14 +731,20 @@ async def lifespan(app):
             _db_settings = _settings.db if _settings else None
             if _db_settings:
                 pg_dsn = _db_settings.pg_connection_string
-                init_pg_pool(pg_dsn, minconn=_pool_min, maxconn=_pool_max)
+                init_pg_pool(
+                    pg_dsn,
+                    minconn=_pool_min,
+                    maxconn=_pool_max,
+                    **(_settings.pool.options if _settings else {}),
+                )
                 logger.info("PostgreSQL connection pool initialized")
         except ImportError:
             logger.warning("database.pool not available -- using direct connections")
         except Exception as exc:
             logger.error("Failed to initialize connection pool: %s", exc)
 
-    # Initialize SQLite connection pool (WAL mode, 5 connections)
+    # Initialize SQLite connection pool (WAL mode, read-optimized; size
+    # autoscales to the default thread-pool width unless DB_SQLITE_POOL_SIZE)
     if DB_BACKEND != "postgres":
         try:
             from services.sqlite_pool import init_pool as _init_sqlite_pool
@@ -734,11 +754,105 @@ async def lifespan(app):
                 if _settings
                 else str(_HERE / "saudi_stocks.db")
             )
-            _init_sqlite_pool(_sqlite_db_path, pool_size=5)
+            _init_sqlite_pool(
+                _sqlite_db_path,
+                pool_size=_settings.db.sqlite_pool_size if _settings else None,
+                **(_settings.db.sqlite_pool_options if _settings else {}),
+            )
             logger.info("SQLite connection pool initialized for: %s", _sqlite_db_path)
         except Exception as exc:
             logger.warning("Failed to initialize SQLite connection pool: %s", exc)
 
+    # Async query executor: dedicated reader threads behind
+    # api.db_helper.afetchall/afetchone (falls back to asyncio.to_thread).
+    _async_db_cfg = _settings.async_db if _settings else None
+    if _async_db_cfg is None or _async_db_cfg.enabled:
+        try:
+            from api.async_db import (
+                init_executor,
+                postgres_connector,
+                sqlite_connector,
+            )
+
+            if DB_BACKEND == "postgres":
+                _connector = postgres_connector(_settings.db.pg_connection_string)
+            else:
+                _connector = sqlite_connector(
+                    str(_settings.db.resolved_sqlite_path)
+                    if _settings
+                    else str(_HERE / "saudi_stocks.db"),
+                    **(_settings.db.sqlite_pool_options if _settings else {}),
+                )
+            init_executor(
+                _connector,
+                workers=_async_db_cfg.workers if _async_db_cfg else 4,
+                max_pending=_async_db_cfg.max_pending if _async_db_cfg else 64,
+                query_timeout=_async_db_cfg.query_timeout if _async_db_cfg else 10.0,
+                name=DB_BACKEND,
+            )
+        except Exception as exc:
+            logger.warning("Failed to start async DB executor: %s", exc)
+
+    # In-memory market snapshot for the market analytics routes (movers,
+    # summary, sectors, heatmap, breadth). Warmed here so the first request
+    # does not pay the rebuild; routes fall back to SQL if this fails.
+    try:
+        from services.market_snapshot import init_snapshot_store
+        from services.screener_snapshot import read_source_version
+
+        # Picks up loads from the ingestion scheduler and offline scripts
+        _snapshot_store = init_snapshot_store(source_version=read_source_version)
+        await asyncio.to_thread(_snapshot_store.refresh)
+        logger.info(
+            "Market snapshot initialized (%d rows)",
+            _snapshot_store.get_stats()["rows"],
+        )
+    except Exception as exc:
+        logger.warning("Failed to initialize market snapshot: %s", exc)
+
+    # In-memory ticker registry: per-stock routes check company existence
+    # (and peers read sector/market cap) without a database round-trip.
+    try:
+        from services.screener_snapshot import read_source_version
+        from services.ticker_registry import init_ticker_registry
+
+        _ticker_registry = init_ticker_registry(source_version=read_source_version)
+        await asyncio.to_thread(_ticker_registry.refresh)
+        logger.info(
+            "Ticker registry initialized (%d tickers)",
+            _ticker_registry.get_stats()["tickers"],
+        )
+    except Exception as exc:
+        logger.warning("Failed to initialize ticker registry: %s", exc)
+
+    # Materialized screener table (SCREENER_BASE denormalized and indexed),
+    # optionally mirrored into the in-process NumPy engine. Built here; the
+    # screener route falls back to the join if this fails.
+    _screener_engine = _settings.screener.engine if _settings else "snapshot"
+    if _screener_engine != "sql":
+        try:
+            from services.screener_engine import init_screener_engine
+            from services.screener_snapshot import (
+                close_screener_snapshot,
+                init_screener_snapshot,
+            )
+
+            _screener_store = init_screener_snapshot()
+            try:
+                await asyncio.to_thread(_screener_store.ensure_fresh)
+                logger.info(
+                    "Screener snapshot initialized (%d rows, engine=%s)",
+                    _screener_store.get_stats()["rows"],
+                    _screener_engine,
+                )
+            except Exception:
+                close_screener_snapshot()
+                raise
+            if _screener_engine == "numpy":
+                init_screener_engine()
+        except Exception as exc:
+            logger.warning("Failed to initialize screener snapshot: %s", exc)
+
     # Initialize Redis (if enabled)
     _cache_enabled = _settings.cache.enabled if _settings else False
     _redis_status = "disabled"
@@ -786,6 +900,40 @@ async def lifespan(app):
     except Exception as exc:
         logger.warning("Failed to start news scheduler: %s", exc)
 
+    # Relay new-article notifications through Redis so SSE clients on every
+    # worker process see articles stored by any of them.
+    _news_relay = False
+    if _redis_status == "connected":
+        try:
+            from cache import get_redis as _get_news_redis
+            from services.news_hub import start_redis_listener
+
+            start_redis_listener(_get_news_redis())
+            _news_relay = True
+        except Exception as exc:
+            logger.warning("Failed to start news hub Redis listener: %s", exc)
+
+    # Warm the per-stock OHLCV cache with batched multi-ticker downloads at
+    # startup and then periodically, so chart requests rarely miss the cache.
+    _ohlcv_warmup = None
+    _warmup_cfg = _settings.ohlcv_warmup if _settings else None
+    if _warmup_cfg is None or _warmup_cfg.enabled:
+        try:
+            from services.ohlcv_warmup import OhlcvWarmupJob
+
+            if _warmup_cfg is not None:
+                _ohlcv_warmup = OhlcvWarmupJob(
+                    period=_warmup_cfg.period,
+                    interval_seconds=_warmup_cfg.interval_seconds,
+                    batch_size=_warmup_cfg.batch_size,
+                )
+            else:
+                _ohlcv_warmup = OhlcvWarmupJob()
+            _ohlcv_warmup.start()
+        except Exception as exc:
+            _ohlcv_warmup = None
+            logger.warning("Failed to start OHLCV warmup job: %s", exc)
+
     # Start quotes hub background task (Redis or in-memory fallback)
     _quotes_hub_task = None
     try:
@@ -844,6 +992,46 @@ async def lifespan(app):
         except Exception as exc:
             logger.warning("Error stopping news scheduler: %s", exc)
 
+    # Shutdown: stop news hub Redis listener
+    if _news_relay:
+        from services.news_hub import stop_redis_listener
+
+        stop_redis_listener()
+
+    # Shutdown: stop OHLCV warmup job
+    if _ohlcv_warmup is not None:
+        _ohlcv_warmup.stop()
+
+    # Shutdown: stop async DB executor reader threads
+    try:
+        from api.async_db import close_executor
+
+        close_executor()
+    except ImportError:
+        pass
+
+    # Shutdown: drop the in-memory market snapshot
+    try:
+        from services.market_snapshot import close_snapshot_store
+
+        close_snapshot_store()
+    except ImportError:
+        pass
+    try:
+        from services.ticker_registry import close_ticker_registry
+
+        close_ticker_registry()
+    except ImportError:
+        pass
+    try:
+        from services.screener_engine import close_screener_engine
+        from services.screener_snapshot import close_screener_snapshot
+
+        close_screener_engine()
+        close_screener_snapshot()
+    except ImportError:
+        pass
+
     # Shutdown: close connection pool and Redis
     if DB_BACKEND == "postgres":
         try:
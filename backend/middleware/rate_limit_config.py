@@ -17,13 +17,17 @@ Health endpoints (/health, /health/live, /health/ready) are always skipped.
 from __future__ import annotations
 
 import logging
-from typing import Dict, List, Set, Tuple
+from typing import Dict, List, Optional, Set, Tuple
+from urllib.parse import urlsplit, urlunsplit
 
 from pydantic import BaseModel, Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 logger = logging.getLogger(__name__)
 
+# Redis logical database reserved for rate-limit state (the cache uses db=0)
+RATELIMIT_REDIS_DB = 1
+
 
 class EndpointRateLimit(BaseModel):
     """Rate limit rule for a path prefix.
@@ -66,6 +70,18 @@ class RateLimitConfig(BaseSettings):
         description="Redis URL for rate limiting (uses db=1)",
     )
 
+    # Redis-mode local pre-check (see backend/middleware/rate_limiter.py)
+    flush_interval: float = Field(
+        default=0.5,
+        description="Seconds between bulk flushes of locally admitted requests",
+    )
+    lease_fraction: float = Field(
+        default=0.1,
+        ge=0.0,
+        le=1.0,
+        description="Fraction of remaining allowance admitted locally between flushes",
+    )
+
     # Whether to enable rate limiting at all
     enabled: bool = Field(default=True, description="Enable rate limiting middleware")
 
@@ -75,6 +91,19 @@ class RateLimitConfig(BaseSettings):
         description="Comma-separated additional paths to skip",
     )
 
+    def resolve_redis_url(self, server_url: Optional[str] = None) -> str:
+        """Return the Redis URL the limiter should use.
+
+        An explicit ``RATELIMIT_REDIS_URL`` wins. Otherwise, when given the
+        URL of a server already in use (e.g. the cache's ``REDIS_URL``),
+        returns the same server with the database switched to
+        ``RATELIMIT_REDIS_DB``.
+        """
+        if "redis_url" in self.model_fields_set or not server_url:
+            return self.redis_url
+        parts = urlsplit(server_url)
+        return urlunsplit(parts._replace(path=f"/{RATELIMIT_REDIS_DB}"))
+
     @property
     def skip_paths_set(self) -> Set[str]:
         """Parse comma-separated skip paths into a set."""
@@ -1,7 +1,9 @@
 """
-FastAPI rate limiting middleware.
+Pure-ASGI rate limiting middleware.
 
-Integrates with RateLimiter to enforce per-request rate limits.
+Integrates with RateLimiter to enforce per-request rate limits. Written
+against the raw ASGI interface (not ``BaseHTTPMiddleware``) so it adds no
+extra task or response buffering per request.
 Extracts client identity from JWT bearer token (user_id) or falls back
 to the client IP address. Sets standard X-RateLimit-* response headers
 and returns 429 JSON when the limit is exceeded.
@@ -14,9 +16,9 @@ from __future__ import annotations
 import logging
 from typing import Dict, List, Optional, Set
 
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.requests import Request
-from starlette.responses import JSONResponse, Response
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from backend.middleware.rate_limiter import RateLimiter
 
@@ -34,8 +36,8 @@ _DEFAULT_SKIP_PATHS: Set[str] = {
 }
 
 
-class RateLimitMiddleware(BaseHTTPMiddleware):
-    """FastAPI middleware that enforces rate limits per client.
+class RateLimitMiddleware:
+    """ASGI middleware that enforces rate limits per client.
 
     Parameters
     ----------
@@ -55,16 +57,19 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
         Longest matching prefix wins.
     """
 
+    # ``error.message`` of the 429 body
+    denied_message = "Too many requests. Please try again later."
+
     def __init__(
         self,
-        app,
+        app: ASGIApp,
         limiter: RateLimiter,
         default_limit: int = 60,
         default_window: int = 60,
         skip_paths: Optional[Set[str]] = None,
         path_limits: Optional[Dict[str, tuple]] = None,
     ) -> None:
-        super().__init__(app)
+        self.app = app
         self.limiter = limiter
         self.default_limit = default_limit
         self.default_window = default_window
@@ -88,13 +93,13 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
                 return prefix, limit, window
         return "_default", self.default_limit, self.default_window
 
-    def _extract_identifier(self, request: Request) -> str:
+    def _extract_identifier(self, scope: Scope) -> str:
         """Extract client identity: JWT user_id if present, else IP address.
 
         Reads the Authorization header for a Bearer token. On decode failure
         (expired, invalid, missing), falls back to the client IP.
         """
-        auth_header = request.headers.get("authorization", "")
+        auth_header = Headers(scope=scope).get("authorization", "")
         if auth_header.startswith("Bearer "):
             token = auth_header[7:]
             try:
@@ -109,22 +114,28 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
                 pass
 
         # Fallback: client IP
-        if request.client:
-            return f"ip:{request.client.host}"
+        client = scope.get("client")
+        if client:
+            return f"ip:{client[0]}"
         return "ip:unknown"
 
-    async def dispatch(self, request: Request, call_next) -> Response:
-        """Process each request through the rate limiter."""
-        path = request.url.path
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Process each HTTP request through the rate limiter."""
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        path = scope["path"]
 
         # Skip health/docs endpoints
         if path in self.skip_paths:
-            return await call_next(request)
+            await self.app(scope, receive, send)
+            return
 
-        identifier = self._extract_identifier(request)
+        identifier = self._extract_identifier(scope)
         bucket, limit, window = self._resolve_limit(path)
 
-        result = self.limiter.check(
+        result = await self.limiter.acheck(
             identifier=identifier,
             limit=limit,
             window=window,
@@ -132,7 +143,7 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
         )
 
         if not result.allowed:
-            request_id = getattr(request.state, "request_id", "unknown")
+            request_id = scope.get("state", {}).get("request_id", "unknown")
             logger.warning(
                 "Rate limit exceeded: identifier=%s path=%s bucket=%s limit=%d [request_id=%s]",
                 identifier,
@@ -141,12 +152,12 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
                 limit,
                 request_id,
             )
-            return JSONResponse(
+            response = JSONResponse(
                 status_code=429,
                 content={
                     "error": {
                         "code": "RATE_LIMITED",
-                        "message": "Too many requests. Please try again later.",
+                        "message": self.denied_message,
                         "request_id": request_id,
                         "retry_after": result.reset_after,
                     }
@@ -158,10 +169,16 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
                     "X-RateLimit-Reset": str(result.reset_after),
                 },
             )
+            await response(scope, receive, send)
+            return
 
         # Request allowed -- add rate limit headers to the response
-        response = await call_next(request)
-        response.headers["X-RateLimit-Limit"] = str(result.limit)
-        response.headers["X-RateLimit-Remaining"] = str(result.remaining)
-        response.headers["X-RateLimit-Reset"] = str(result.reset_after)
-        return response
+        async def send_with_headers(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                headers["X-RateLimit-Limit"] = str(result.limit)
+                headers["X-RateLimit-Remaining"] = str(result.remaining)
+                headers["X-RateLimit-Reset"] = str(result.reset_after)
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
@@ -1,24 +1,43 @@
 """
-Sliding window rate limiter with Redis backend and in-memory fallback.
+Rate limiter with an async Redis GCRA backend and in-memory fallback.
 
-Uses Redis db=1 (separate from cache on db=0) for distributed rate limiting.
-Falls back to an in-memory dict-of-deques implementation when Redis is
-unavailable, making the limiter work identically in development without Redis.
+Redis mode runs one atomic Lua script per check (GCRA, the "generic cell
+rate algorithm" -- a token bucket stored as a single theoretical arrival
+time), on a ``redis.asyncio`` client so checks never block the event loop.
+Falls back to an in-memory dict-of-deques sliding window when Redis is
+unavailable, making the limiter work identically in development without
+Redis.
+
+Hot keys avoid Redis entirely most of the time:
+
+- **Local pre-check** -- a key Redis has denied is rejected locally until
+  its retry time; a key with plenty of headroom gets a small local *lease*
+  (``lease_fraction`` of its remaining allowance) admitted without a
+  round-trip.
+- **Bulk flush** -- locally admitted requests are debited to Redis in one
+  pipelined batch every ``flush_interval`` seconds, which also renews the
+  leases of keys that are still busy.
+
+So each request costs at most one Redis round-trip. Across processes the
+overshoot is bounded by the outstanding leases.
 
 Usage::
 
     limiter = RateLimiter(redis_url="redis://localhost:6379/1")
-    result = limiter.check("user:123", limit=60, window=60)
+    result = await limiter.acheck("user:123", limit=60, window=60)
     if not result.allowed:
         # reject request
 """
 
 from __future__ import annotations
 
+import asyncio
+import contextlib
 import logging
+import math
 import time
 from collections import defaultdict, deque
-from typing import Any, Optional
+from typing import Any, Dict, Optional, Set
 
 from backend.middleware.models import RateLimitResult
 
@@ -27,40 +46,134 @@ logger = logging.getLogger(__name__)
 # Cleanup stale in-memory entries every N checks
 _CLEANUP_INTERVAL = 500
 
+# GCRA: the key stores the bucket's theoretical arrival time (TAT) in ms.
+# ``debt`` requests (already admitted locally) are debited unconditionally,
+# then ``cost`` more are allowed if TAT + cost * interval - window <= now.
+# The flush sends cost=0 with the pending debt.
+# Returns {allowed, remaining, retry_after_ms, reset_after_ms}.
+_GCRA_LUA = """
+local t = redis.call("TIME")
+local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+local interval = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+local debt = tonumber(ARGV[4])
+
+local tat = tonumber(redis.call("GET", KEYS[1]))
+if not tat or tat < now then
+    tat = now
+end
+tat = tat + interval * debt
+local new_tat = tat + interval * cost
+local allow_at = new_tat - window
+local allowed = allow_at <= now
+if not allowed then
+    new_tat = tat
+end
+
+if new_tat > now then
+    redis.call("SET", KEYS[1], new_tat, "PX", math.ceil(new_tat - now) + 1000)
+end
+local remaining = math.floor((window - (new_tat - now)) / interval)
+if remaining < 0 then
+    remaining = 0
+end
+local retry = 0
+if not allowed then
+    retry = math.ceil(allow_at - now)
+end
+return {allowed and 1 or 0, remaining, retry, math.ceil(new_tat - now)}
+"""
+
+
+class _LocalState:
+    """Per-key local view used to skip Redis round-trips for hot keys."""
+
+    __slots__ = (
+        "limit",
+        "window",
+        "blocked_until",
+        "lease",
+        "lease_expires",
+        "pending",
+        "remaining",
+        "reset_at",
+    )
+
+    def __init__(self, limit: int, window: int) -> None:
+        self.limit = limit
+        self.window = window
+        self.blocked_until = 0.0
+        self.lease = 0
+        self.lease_expires = 0.0
+        self.pending = 0
+        self.remaining = 0
+        self.reset_at = 0.0
+
 
 class RateLimiter:
-    """Sliding window rate limiter with Redis + in-memory fallback.
+    """GCRA rate limiter with async Redis + in-memory sliding window fallback.
 
     Parameters
     ----------
     redis_url : str or None
         Redis connection URL. Uses db=1 by default to avoid conflicts with
         the cache layer (db=0). Pass None to skip Redis entirely.
+    flush_interval : float
+        Seconds between bulk flushes of locally admitted requests.
+    lease_fraction : float
+        Fraction of a key's remaining allowance that may be admitted
+        locally between flushes. 0 disables local leases (every allowed
+        request then costs one round-trip).
     """
 
-    def __init__(self, redis_url: Optional[str] = None) -> None:
+    def __init__(
+        self,
+        redis_url: Optional[str] = None,
+        flush_interval: float = 0.5,
+        lease_fraction: float = 0.1,
+    ) -> None:
         self._redis: Any = None
         self._redis_url = redis_url
+        self._redis_healthy = False
+        self._script: Any = None
+        self.flush_interval = flush_interval
+        self.lease_fraction = max(0.0, min(1.0, lease_fraction))
 
         # In-memory fallback structures
         self._requests: dict[str, deque[float]] = defaultdict(deque)
         self._check_count = 0
 
+        # Redis-mode local state (event-loop thread only, so no locks)
+        self._local: Dict[str, _LocalState] = {}
+        self._dirty: Set[str] = set()
+        self._flush_task: Optional[asyncio.Task] = None
+
         if redis_url:
             self._init_redis(redis_url)
 
     def _init_redis(self, url: str) -> None:
-        """Attempt to connect to Redis. Fail silently to in-memory mode."""
+        """Probe Redis once, then keep an async client. Fail silently to in-memory mode."""
         try:
             import redis
+            import redis.asyncio as aioredis
 
-            self._redis = redis.Redis.from_url(
+            probe = redis.Redis.from_url(
+                url, socket_connect_timeout=3, socket_timeout=3
+            )
+            try:
+                probe.ping()
+            finally:
+                probe.close()
+
+            self._redis = aioredis.Redis.from_url(
                 url,
                 decode_responses=True,
                 socket_connect_timeout=3,
                 socket_timeout=3,
             )
-            self._redis.ping()
+            self._script = self._redis.register_script(_GCRA_LUA)
+            self._redis_healthy = True
             logger.info("Rate limiter Redis connected: %s", url)
         except Exception as exc:
             logger.warning(
@@ -72,13 +185,8 @@ class RateLimiter:
 
     @property
     def is_redis_available(self) -> bool:
-        """Return True if the Redis backend is connected."""
-        if self._redis is None:
-            return False
-        try:
-            return self._redis.ping()
-        except Exception:
-            return False
+        """Return True if the Redis backend is connected and its last call succeeded."""
+        return self._redis is not None and self._redis_healthy
 
     def check(
         self,
@@ -87,7 +195,9 @@ class RateLimiter:
         window: int = 60,
         bucket: str = "_default",
     ) -> RateLimitResult:
-        """Check whether a request from *identifier* is within the rate limit.
+        """Synchronous, process-local check (in-memory sliding window).
+
+        Never touches Redis; async callers should use :meth:`acheck`.
 
         Parameters
         ----------
@@ -106,11 +216,27 @@ class RateLimiter:
             Contains ``allowed``, ``remaining``, ``reset_after``, etc.
         """
         key = f"rl:{bucket}:{identifier}"
+        return self._check_memory(key, identifier, limit, window, bucket)
+
+    async def acheck(
+        self,
+        identifier: str,
+        limit: int = 60,
+        window: int = 60,
+        bucket: str = "_default",
+    ) -> RateLimitResult:
+        """Check whether a request from *identifier* is within the rate limit.
+
+        Uses Redis (at most one round-trip) when available, otherwise the
+        in-memory sliding window. Parameters as for :meth:`check`.
+        """
+        key = f"rl:{bucket}:{identifier}"
 
         if self._redis is not None:
             try:
-                return self._check_redis(key, identifier, limit, window, bucket)
+                return await self._check_redis(key, identifier, limit, window, bucket)
             except Exception as exc:
+                self._redis_healthy = False
                 logger.warning(
                     "Redis rate limit check failed for %s: %s -- falling back to in-memory",
                     key,
@@ -119,7 +245,7 @@ class RateLimiter:
 
         return self._check_memory(key, identifier, limit, window, bucket)
 
-    def _check_redis(
+    async def _check_redis(
         self,
         key: str,
         identifier: str,
@@ -127,58 +253,174 @@ class RateLimiter:
         window: int,
         bucket: str,
     ) -> RateLimitResult:
-        """Sliding window counter using Redis sorted set.
+        """GCRA check with local pre-check; one script call on a local miss."""
+        now = time.monotonic()
+        self._ensure_flusher()
 
-        Each request is added as a member with score = current timestamp.
-        Expired members (older than the window) are removed atomically via
-        a pipeline to keep the operation consistent.
-        """
-        now = time.time()
-        window_start = now - window
-        pipe = self._redis.pipeline(transaction=True)
+        self._check_count += 1
+        if self._check_count % _CLEANUP_INTERVAL == 0:
+            self._cleanup_local(now)
 
-        # Remove expired entries
-        pipe.zremrangebyscore(key, "-inf", window_start)
-        # Count current entries
-        pipe.zcard(key)
-        # Add current request (member = timestamp string to ensure uniqueness)
-        pipe.zadd(key, {f"{now}": now})
-        # Set expiry on the key so it auto-cleans
-        pipe.expire(key, window + 1)
-
-        results = pipe.execute()
-        current_count = results[1]  # zcard result (before adding this request)
-
-        if current_count >= limit:
-            # Over limit -- find when the oldest entry expires
-            oldest = self._redis.zrange(key, 0, 0, withscores=True)
-            if oldest:
-                reset_after = max(1, int(oldest[0][1] + window - now) + 1)
-            else:
-                reset_after = window
-
-            # Remove the request we just added since it's rejected
-            self._redis.zrem(key, f"{now}")
+        state = self._local.get(key)
+        if state is None or state.limit != limit or state.window != window:
+            state = self._local[key] = _LocalState(limit, window)
 
+        if state.blocked_until > now:
+            return self._denied(identifier, limit, bucket, state.blocked_until - now)
+
+        if state.lease > 0 and state.lease_expires > now:
+            state.lease -= 1
+            state.pending += 1
+            state.remaining = max(0, state.remaining - 1)
+            state.reset_at = max(state.reset_at, now) + window / limit
+            self._dirty.add(key)
             return RateLimitResult(
-                allowed=False,
+                allowed=True,
                 limit=limit,
-                remaining=0,
-                reset_after=reset_after,
+                remaining=state.remaining,
+                reset_after=max(1, math.ceil(state.reset_at - now)),
                 identifier=identifier,
                 bucket=bucket,
             )
 
-        remaining = max(0, limit - current_count - 1)
+        # Local miss: settle this key's pending debt in the same call
+        debt, state.pending = state.pending, 0
+        self._dirty.discard(key)
+        try:
+            allowed, remaining, retry_ms, reset_ms = await self._script(
+                keys=[key], args=[window * 1000 / limit, window * 1000, 1, debt]
+            )
+        except Exception:
+            state.pending += debt
+            if state.pending:
+                self._dirty.add(key)
+            raise
+        self._redis_healthy = True
+        self._apply(state, allowed, remaining, retry_ms, reset_ms, time.monotonic())
+
+        if not allowed:
+            return self._denied(identifier, limit, bucket, retry_ms / 1000)
         return RateLimitResult(
             allowed=True,
             limit=limit,
             remaining=remaining,
-            reset_after=window,
+            reset_after=max(1, math.ceil(reset_ms / 1000)),
+            identifier=identifier,
+            bucket=bucket,
+        )
+
+    def _apply(
+        self,
+        state: _LocalState,
+        allowed: int,
+        remaining: int,
+        retry_ms: int,
+        reset_ms: int,
+        now: float,
+    ) -> None:
+        """Update a key's local view from a script result."""
+        state.remaining = remaining
+        state.reset_at = now + reset_ms / 1000
+        if not allowed:
+            state.blocked_until = now + retry_ms / 1000
+            state.lease = 0
+            return
+        state.blocked_until = 0.0
+        state.lease = int(remaining * self.lease_fraction)
+        state.lease_expires = now + 2 * self.flush_interval
+
+    @staticmethod
+    def _denied(
+        identifier: str, limit: int, bucket: str, retry_after: float
+    ) -> RateLimitResult:
+        return RateLimitResult(
+            allowed=False,
+            limit=limit,
+            remaining=0,
+            reset_after=max(1, math.ceil(retry_after)),
             identifier=identifier,
             bucket=bucket,
         )
 
+    # -- bulk flush --------------------------------------------------------
+
+    def _ensure_flusher(self) -> None:
+        if self.lease_fraction <= 0:
+            return
+        task = self._flush_task
+        if (
+            task is None
+            or task.done()
+            or task.get_loop() is not asyncio.get_running_loop()
+        ):
+            self._flush_task = asyncio.get_running_loop().create_task(
+                self._flush_loop()
+            )
+
+    async def _flush_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                await self.flush()
+            except Exception as exc:
+                self._redis_healthy = False
+                logger.warning("Rate limiter flush failed: %s", exc)
+
+    async def flush(self) -> int:
+        """Debit all locally admitted requests to Redis in one pipeline.
+
+        Returns the number of keys flushed. Counts stay pending if the
+        pipeline fails, so they are retried on the next flush.
+        """
+        if self._redis is None or not self._dirty:
+            return 0
+        batch = []
+        for key in self._dirty:
+            state = self._local.get(key)
+            if state is not None and state.pending:
+                # Taken off the books now so a concurrent local miss on the
+                # same key doesn't settle these requests a second time
+                batch.append((key, state, state.pending))
+                state.pending = 0
+        self._dirty = set()
+        if not batch:
+            return 0
+
+        pipe = self._redis.pipeline(transaction=False)
+        for key, state, debt in batch:
+            await self._script(
+                keys=[key],
+                args=[state.window * 1000 / state.limit, state.window * 1000, 0, debt],
+                client=pipe,
+            )
+        try:
+            results = await pipe.execute()
+        except Exception:
+            for key, state, debt in batch:
+                state.pending += debt
+                self._dirty.add(key)
+            raise
+
+        now = time.monotonic()
+        for (_, state, _), (allowed, remaining, retry_ms, reset_ms) in zip(
+            batch, results
+        ):
+            self._apply(state, allowed, remaining, retry_ms, reset_ms, now)
+        self._redis_healthy = True
+        return len(batch)
+
+    def _cleanup_local(self, now: float) -> None:
+        """Drop local states with nothing pending, blocked or leased."""
+        stale = [
+            k
+            for k, s in self._local.items()
+            if not s.pending and s.blocked_until <= now and s.lease_expires <= now
+        ]
+        for k in stale:
+            del self._local[k]
+
+    # -- in-memory fallback ------------------------------------------------
+
     def _check_memory(
         self,
         key: str,
@@ -231,13 +473,40 @@ class RateLimiter:
         for k in stale:
             del self._requests[k]
 
+    async def aclose(self) -> None:
+        """Flush pending counts and close the Redis connection if open."""
+        task, self._flush_task = self._flush_task, None
+        if task is not None:
+            task.cancel()
+            if task.get_loop() is asyncio.get_running_loop():
+                with contextlib.suppress(asyncio.CancelledError):
+                    await task
+        if self._redis is None:
+            return
+        try:
+            await self.flush()
+        except Exception as exc:
+            logger.warning("Rate limiter final flush failed: %s", exc)
+        try:
+            await self._redis.aclose()
+            logger.info("Rate limiter Redis connection closed")
+        except Exception as exc:
+            logger.warning("Error closing rate limiter Redis: %s", exc)
+        finally:
+            self._redis = None
+
     def close(self) -> None:
-        """Close the Redis connection if open."""
-        if self._redis is not None:
-            try:
-                self._redis.close()
-                logger.info("Rate limiter Redis connection closed")
-            except Exception as exc:
-                logger.warning("Error closing rate limiter Redis: %s", exc)
-            finally:
-                self._redis = None
+        """Synchronous :meth:`aclose` for shutdown paths without a running loop."""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+        if loop is not None:
+            loop.create_task(self.aclose())
+            return
+        try:
+            asyncio.run(self.aclose())
+        except Exception as exc:
+            logger.warning("Error closing rate limiter Redis: %s", exc)
+        finally:
+            self._redis = None
@@ -19,6 +19,8 @@ Environment variables used (add to .env.example if not present):
     RATELIMIT_DEFAULT_WINDOW=60
     RATELIMIT_REDIS_URL=redis://localhost:6379/1
     RATELIMIT_SKIP_PATHS=
+    RATELIMIT_FLUSH_INTERVAL=0.5
+    RATELIMIT_LEASE_FRACTION=0.1
 """
 
 from __future__ import annotations
@@ -62,7 +64,11 @@ def register_middleware(app: FastAPI) -> None:
         return
 
     # Initialize rate limiter (Redis db=1 with in-memory fallback)
-    _rate_limiter = RateLimiter(redis_url=config.redis_url)
+    _rate_limiter = RateLimiter(
+        redis_url=config.redis_url,
+        flush_interval=config.flush_interval,
+        lease_fraction=config.lease_fraction,
+    )
 
     # Initialize cost controller on same Redis instance
     _cost_controller = CostController(redis_url=config.redis_url)
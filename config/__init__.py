@@ -11,26 +11,32 @@ Usage:
 
 from config.logging_config import get_logger, setup_logging
 from config.settings import (
+    AsyncDBSettings,
     AuthSettings,
     CacheSettings,
     DatabaseSettings,
     LLMSettings,
     MiddlewareSettings,
+    OhlcvWarmupSettings,
     PoolSettings,
     ScraperSettings,
+    ScreenerSettings,
     ServerSettings,
     Settings,
     get_settings,
 )
 
 __all__ = [
+    "AsyncDBSettings",
     "AuthSettings",
     "CacheSettings",
     "DatabaseSettings",
     "LLMSettings",
     "MiddlewareSettings",
+    "OhlcvWarmupSettings",
     "PoolSettings",
     "ScraperSettings",
+    "ScreenerSettings",
     "ServerSettings",
     "Settings",
     "get_logger",
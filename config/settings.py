@@ -28,6 +28,13 @@ class DatabaseSettings(BaseSettings):
     backend: Literal["sqlite", "postgres"] = "sqlite"
     # SQLite settings
     sqlite_path: str = "saudi_stocks.db"
+    # Read-optimized route pool (services.sqlite_pool); pool size 0 = autoscale
+    # to the default thread-pool width.
+    sqlite_pool_size: int = 0
+    sqlite_read_only: bool = True
+    sqlite_mmap_size: int = 256 * 1024 * 1024
+    sqlite_cache_size_kib: int = 16 * 1024
+    sqlite_cached_statements: int = 256
     # PostgreSQL settings — accept both DB_PG_* and POSTGRES_* env vars
     pg_host: str = Field(
         default="localhost",
@@ -57,6 +64,16 @@ class DatabaseSettings(BaseSettings):
             f"@{self.pg_host}:{self.pg_port}/{self.pg_database}"
         )
 
+    @property
+    def sqlite_pool_options(self) -> dict:
+        """Connection options for ``services.sqlite_pool.open_connection``."""
+        return {
+            "read_only": self.sqlite_read_only,
+            "mmap_size": self.sqlite_mmap_size,
+            "cache_size_kib": self.sqlite_cache_size_kib,
+            "cached_statements": self.sqlite_cached_statements,
+        }
+
     @property
     def resolved_sqlite_path(self) -> Path:
         """Return absolute path to SQLite DB, resolved relative to project root."""
@@ -88,6 +105,32 @@ class PoolSettings(BaseSettings):
 
     min: int = 2
     max: int = 10
+    # Seconds a request waits (FIFO) for a free connection before failing
+    acquire_timeout: float = 30.0
+    # Validate idle connections with SELECT 1 before handing them out
+    pre_ping: bool = True
+    # Replace connections older than this many seconds (0 disables)
+    recycle_seconds: float = 1800.0
+
+    @property
+    def options(self) -> dict:
+        """Keyword arguments for ``FairConnectionPool`` beyond min/max."""
+        return {
+            "acquire_timeout": self.acquire_timeout,
+            "pre_ping": self.pre_ping,
+            "recycle_seconds": self.recycle_seconds,
+        }
+
+
+class AsyncDBSettings(BaseSettings):
+    """Async query executor settings (api.async_db). Env vars prefixed with DB_ASYNC_."""
+
+    model_config = SettingsConfigDict(env_prefix="DB_ASYNC_")
+
+    enabled: bool = True
+    workers: int = 4
+    max_pending: int = 64
+    query_timeout: float = 10.0
 
 
 class CacheSettings(BaseSettings):
@@ -188,6 +231,40 @@ class ScraperSettings(BaseSettings):
         "Chrome/125.0.0.0 Safari/537.36"
     )
     dedup_threshold: float = 0.55
+    # MinHash/LSH candidate search for dedup (services/near_dedup.py).
+    # More bands (fewer rows per band) raise recall but compare more pairs.
+    dedup_num_perm: int = 120
+    dedup_bands: int = 40
+    dedup_shingle_size: int = 3
+    # Skip articles that near-duplicate ones stored in earlier cycles
+    dedup_across_cycles: bool = True
+    # Async pipeline (services/news_pipeline.py)
+    per_host_min_interval: float = 1.0
+    max_concurrent_enrichment: int = 8
+    parse_workers: int = 2
+
+
+class ScreenerSettings(BaseSettings):
+    """Stock screener settings. All env vars prefixed with SCREENER_."""
+
+    model_config = SettingsConfigDict(env_prefix="SCREENER_")
+
+    # sql: 7-table join per request; snapshot: materialized screener_snapshot
+    # table; numpy: in-process NumPy engine over that table
+    engine: Literal["sql", "snapshot", "numpy"] = "snapshot"
+
+
+class OhlcvWarmupSettings(BaseSettings):
+    """OHLCV cache warmup settings. All env vars prefixed with OHLCV_WARMUP_."""
+
+    model_config = SettingsConfigDict(env_prefix="OHLCV_WARMUP_")
+
+    enabled: bool = True
+    period: str = "1y"
+    # Each run refetches only entries that would leave the 1h stale-serving
+    # window before the next run
+    interval_seconds: int = 600
+    batch_size: int = 100
 
 
 class ServerSettings(BaseSettings):
@@ -226,10 +303,13 @@ class Settings(BaseSettings):
     llm: LLMSettings = LLMSettings()
     server: ServerSettings = ServerSettings()
     pool: PoolSettings = PoolSettings()
+    async_db: AsyncDBSettings = AsyncDBSettings()
     cache: CacheSettings = CacheSettings()
     auth: AuthSettings = AuthSettings()
     middleware: MiddlewareSettings = MiddlewareSettings()
     scraper: ScraperSettings = ScraperSettings()
+    ohlcv_warmup: OhlcvWarmupSettings = OhlcvWarmupSettings()
+    screener: ScreenerSettings = ScreenerSettings()
 
     def get_llm_api_key(self) -> str:
         """Return the effective LLM API key for the configured provider."""
@@ -1,13 +1,17 @@
 """
 PostgreSQL Connection Pool
 ==========================
-Singleton connection pool using psycopg2's ThreadedConnectionPool.
+Singleton blocking, fair connection pool (``FairConnectionPool``).
 Lazy-initialized via ``init_pool()`` -- never imports or connects at module level.
 
-Important: FastAPI async handlers share a single event-loop thread, so the
-default ThreadedConnectionPool key (thread ID) would cause all concurrent
-requests to share one connection.  We use unique keys per checkout to avoid
-this.
+When every connection is checked out, callers queue in FIFO order for up to
+``acquire_timeout`` seconds instead of failing immediately (psycopg2's
+``ThreadedConnectionPool`` raises as soon as ``maxconn`` is reached).  A
+released connection is handed directly to the longest waiter, so a burst of
+new arrivals cannot barge ahead of it.  Idle connections are validated on
+checkout: ones older than ``recycle_seconds`` are replaced, and with
+``pre_ping`` a ``SELECT 1`` weeds out connections killed by a PostgreSQL
+restart.
 
 Usage::
 
@@ -28,25 +32,308 @@ Usage::
 from __future__ import annotations
 
 import logging
-import uuid
+import threading
+import time
+from collections import deque
 from contextlib import contextmanager
-from typing import Optional
+from typing import Any, Deque, Dict, List, Optional
 
 import psycopg2
-from psycopg2.pool import ThreadedConnectionPool
+import psycopg2.extensions
+from psycopg2.pool import PoolError
 
 logger = logging.getLogger(__name__)
 
+# Upper bounds (ms) of the acquire-wait histogram buckets; the last bucket
+# collects everything slower.  Same buckets as services.sqlite_pool.
+WAIT_BUCKETS_MS = (0.1, 0.5, 1, 5, 10, 50, 100, 500, 1000)
+
+
+class PoolTimeout(PoolError):
+    """Raised when no connection became available within the acquire timeout."""
+
+
+class _Waiter:
+    """A queued ``getconn`` call; released connections are handed over here."""
+
+    __slots__ = ("event", "conn", "granted")
+
+    def __init__(self) -> None:
+        self.event = threading.Event()
+        self.conn: Any = None
+        # True once a slot was handed over (``conn`` is None when the slot
+        # is for a new connection rather than an idle one)
+        self.granted = False
+
+
+class FairConnectionPool:
+    """Thread-safe PostgreSQL pool with FIFO waiting and connection validation.
+
+    Parameters
+    ----------
+    minconn : int
+        Connections opened up front and kept idle.
+    maxconn : int
+        Maximum connections open at once (checked out + idle).
+    acquire_timeout : float
+        Seconds ``getconn`` waits for a connection before raising
+        :class:`PoolTimeout`.
+    pre_ping : bool
+        Run ``SELECT 1`` on an idle connection before handing it out and
+        replace it if that fails.
+    recycle_seconds : float
+        Replace connections older than this on checkout (0 disables).
+    **connect_kwargs
+        Passed to ``psycopg2.connect``.
+    """
+
+    def __init__(
+        self,
+        minconn: int,
+        maxconn: int,
+        acquire_timeout: float = 30.0,
+        pre_ping: bool = True,
+        recycle_seconds: float = 1800.0,
+        **connect_kwargs: Any,
+    ) -> None:
+        if maxconn < 1 or minconn > maxconn:
+            raise ValueError("pool requires 1 <= maxconn and minconn <= maxconn")
+        self.minconn = minconn
+        self.maxconn = maxconn
+        self.acquire_timeout = acquire_timeout
+        self.pre_ping = pre_ping
+        self.recycle_seconds = recycle_seconds
+        self._connect_kwargs = connect_kwargs
+
+        self._lock = threading.Lock()
+        self._idle: Deque[Any] = deque()
+        self._waiters: Deque[_Waiter] = deque()
+        self._born: Dict[int, float] = {}
+        self._open = 0
+        self._in_use = 0
+        self._closed = False
+
+        self._wait_counts = [0] * (len(WAIT_BUCKETS_MS) + 1)
+        self._wait_sum = 0.0
+        self._wait_max = 0.0
+        self._acquires = 0
+        self._timeouts = 0
+        self._peak_in_use = 0
+        self._peak_waiting = 0
+        self._recycled = 0
+        self._ping_failures = 0
+
+        try:
+            for _ in range(minconn):
+                self._idle.append(self._connect())
+                self._open += 1
+        except Exception:
+            self.closeall()
+            raise
+
+    # -- connection lifecycle ---------------------------------------------
+
+    def _connect(self) -> Any:
+        conn = psycopg2.connect(**self._connect_kwargs)
+        self._born[id(conn)] = time.monotonic()
+        return conn
+
+    def _discard(self, conn: Any) -> None:
+        self._born.pop(id(conn), None)
+        try:
+            conn.close()
+        except Exception:  # noqa: BLE001 — connection may already be dead
+            pass
+
+    def _validate(self, conn: Any) -> Any:
+        """Return a usable connection: *conn* itself, or a fresh replacement."""
+        if conn is None:
+            return self._connect()
+        if conn.closed:
+            self._discard(conn)
+            return self._connect()
+        age = time.monotonic() - self._born.get(id(conn), time.monotonic())
+        if self.recycle_seconds and age > self.recycle_seconds:
+            self._discard(conn)
+            with self._lock:
+                self._recycled += 1
+            return self._connect()
+        if self.pre_ping:
+            try:
+                with conn.cursor() as cur:
+                    cur.execute("SELECT 1")
+                conn.rollback()
+            except Exception as exc:  # noqa: BLE001 — any failure means reconnect
+                logger.warning(
+                    "Pooled connection failed pre-ping, reconnecting: %s", exc
+                )
+                self._discard(conn)
+                with self._lock:
+                    self._ping_failures += 1
+                return self._connect()
+        return conn
+
+    # -- checkout / return --------------------------------------------------
+
+    def getconn(self, timeout: Optional[float] = None) -> Any:
+        """Check out a connection, waiting up to *timeout* seconds (FIFO).
+
+        Defaults to ``acquire_timeout``.  Raises :class:`PoolTimeout` when
+        the wait expires and ``PoolError`` if the pool is closed.
+        """
+        timeout = self.acquire_timeout if timeout is None else timeout
+        start = time.perf_counter()
+        waiter: Optional[_Waiter] = None
+        conn: Any = None
+        with self._lock:
+            if self._closed:
+                raise PoolError("connection pool is closed")
+            if not self._waiters and (self._idle or self._open < self.maxconn):
+                if self._idle:
+                    conn = self._idle.popleft()
+                else:
+                    self._open += 1
+                self._in_use += 1
+                self._peak_in_use = max(self._peak_in_use, self._in_use)
+            else:
+                waiter = _Waiter()
+                self._waiters.append(waiter)
+                self._peak_waiting = max(self._peak_waiting, len(self._waiters))
+
+        if waiter is not None:
+            waiter.event.wait(timeout)
+            with self._lock:
+                if not waiter.granted:
+                    if waiter in self._waiters:
+                        self._waiters.remove(waiter)
+                    if self._closed:
+                        raise PoolError("connection pool is closed")
+                    self._timeouts += 1
+                    raise PoolTimeout(
+                        f"no connection available within {timeout:.1f}s "
+                        f"(max={self.maxconn})"
+                    )
+            conn = waiter.conn
+
+        try:
+            conn = self._validate(conn)
+        except Exception:
+            with self._lock:
+                self._return_locked(None)
+            raise
+        self._record_wait((time.perf_counter() - start) * 1000)
+        return conn
+
+    def putconn(self, conn: Any, close: bool = False) -> None:
+        """Return a checked-out connection (closing it if *close* or broken).
+
+        An open transaction is rolled back first.  The connection, or its
+        slot if it was closed, goes straight to the longest waiter.
+        """
+        discard = close or self._closed or bool(conn.closed)
+        if not discard:
+            try:
+                status = conn.get_transaction_status()
+                if status != psycopg2.extensions.TRANSACTION_STATUS_IDLE:
+                    conn.rollback()
+            except Exception:  # noqa: BLE001 — unusable, replace it
+                discard = True
+        if discard:
+            self._discard(conn)
+            conn = None
+        with self._lock:
+            self._return_locked(conn)
+
+    def _return_locked(self, conn: Any) -> None:
+        """Hand *conn* (None: a freed slot) to the next waiter or the idle set."""
+        if self._closed:
+            if conn is not None:
+                self._discard(conn)
+            self._in_use = max(0, self._in_use - 1)
+            self._open = max(0, self._open - 1)
+            return
+        if self._waiters:
+            # The checkout moves to the waiter: in_use and open are unchanged
+            waiter = self._waiters.popleft()
+            waiter.conn = conn
+            waiter.granted = True
+            waiter.event.set()
+            return
+        self._in_use -= 1
+        if conn is None:
+            self._open -= 1
+        else:
+            self._idle.append(conn)
+
+    def closeall(self) -> None:
+        """Close idle connections and wake all waiters with ``PoolError``.
+
+        Connections still checked out are closed when they are returned.
+        """
+        with self._lock:
+            self._closed = True
+            idle, self._idle = list(self._idle), deque()
+            waiters, self._waiters = list(self._waiters), deque()
+            self._open -= len(idle)
+        for conn in idle:
+            self._discard(conn)
+        for waiter in waiters:
+            waiter.event.set()
+
+    # -- metrics -------------------------------------------------------------
+
+    def _record_wait(self, wait_ms: float) -> None:
+        bucket = len(WAIT_BUCKETS_MS)
+        for i, bound in enumerate(WAIT_BUCKETS_MS):
+            if wait_ms <= bound:
+                bucket = i
+                break
+        with self._lock:
+            self._wait_counts[bucket] += 1
+            self._wait_sum += wait_ms
+            self._wait_max = max(self._wait_max, wait_ms)
+            self._acquires += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return pool usage, saturation counters and the acquire-wait histogram."""
+        with self._lock:
+            labels = [f"le_{b}ms" for b in WAIT_BUCKETS_MS] + ["gt_1000ms"]
+            return {
+                "min": self.minconn,
+                "max": self.maxconn,
+                "open": self._open,
+                "idle": len(self._idle),
+                "in_use": self._in_use,
+                "peak_in_use": self._peak_in_use,
+                "waiting": len(self._waiters),
+                "peak_waiting": self._peak_waiting,
+                "acquires": self._acquires,
+                "timeouts": self._timeouts,
+                "recycled": self._recycled,
+                "ping_failures": self._ping_failures,
+                "avg_wait_ms": round(self._wait_sum / self._acquires, 3)
+                if self._acquires
+                else 0.0,
+                "max_wait_ms": round(self._wait_max, 3),
+                # Unrounded, for the Prometheus histogram's _sum
+                "total_wait_ms": self._wait_sum,
+                "wait_histogram_ms": dict(zip(labels, self._wait_counts)),
+            }
+
+
 # ---------------------------------------------------------------------------
 # Module-level singleton (lazy -- None until init_pool is called)
 # ---------------------------------------------------------------------------
-_pool: Optional[ThreadedConnectionPool] = None
+_pool: Optional[FairConnectionPool] = None
 
 
 def init_pool(
     db_settings,
     min_connections: int = 2,
     max_connections: int = 10,
+    acquire_timeout: float = 30.0,
+    pre_ping: bool = True,
+    recycle_seconds: float = 1800.0,
 ) -> None:
     """Initialize the global connection pool.
 
@@ -59,6 +346,8 @@ def init_pool(
         Minimum connections kept open (default 2).
     max_connections : int
         Maximum connections allowed (default 10).
+    acquire_timeout, pre_ping, recycle_seconds
+        See :class:`FairConnectionPool`.
     """
     global _pool
 
@@ -67,9 +356,12 @@ def init_pool(
         return
 
     try:
-        _pool = ThreadedConnectionPool(
+        _pool = FairConnectionPool(
             minconn=min_connections,
             maxconn=max_connections,
+            acquire_timeout=acquire_timeout,
+            pre_ping=pre_ping,
+            recycle_seconds=recycle_seconds,
             host=db_settings.pg_host,
             port=db_settings.pg_port,
             dbname=db_settings.pg_database,
@@ -87,16 +379,6 @@ def init_pool(
         raise
 
 
-def _unique_key() -> str:
-    """Generate a unique key for each pool checkout.
-
-    ThreadedConnectionPool uses thread ID as the default key, which causes
-    all async handlers (sharing one event-loop thread) to receive the same
-    connection.  A UUID key ensures every checkout gets its own connection.
-    """
-    return uuid.uuid4().hex
-
-
 @contextmanager
 def get_connection():
     """Context manager that checks out a connection and returns it on exit.
@@ -104,15 +386,15 @@ def get_connection():
     Commits on clean exit, rolls back on exception, and always returns the
     connection to the pool.
 
-    Raises ``RuntimeError`` if the pool has not been initialized.
+    Raises ``RuntimeError`` if the pool has not been initialized and
+    :class:`PoolTimeout` if no connection frees up within the acquire timeout.
     """
     if _pool is None:
         raise RuntimeError(
             "Connection pool is not initialized. Call init_pool() first."
         )
 
-    key = _unique_key()
-    conn = _pool.getconn(key=key)
+    conn = _pool.getconn()
     try:
         yield conn
         conn.commit()
@@ -120,7 +402,7 @@ def get_connection():
         conn.rollback()
         raise
     finally:
-        _pool.putconn(conn, key=key)
+        _pool.putconn(conn)
 
 
 class _PooledConnection:
@@ -132,23 +414,21 @@ class _PooledConnection:
     attribute access to the underlying connection while overriding ``close``.
     """
 
-    __slots__ = ("_conn", "_pool", "_key")
+    __slots__ = ("_conn", "_pool")
 
-    def __init__(self, conn, pool, key: str):
+    def __init__(self, conn, pool):
         object.__setattr__(self, "_conn", conn)
         object.__setattr__(self, "_pool", pool)
-        object.__setattr__(self, "_key", key)
 
     def close(self):
         conn = object.__getattribute__(self, "_conn")
         pool = object.__getattribute__(self, "_pool")
-        key = object.__getattribute__(self, "_key")
         try:
             conn.rollback()
         except Exception:  # noqa: BLE001 — connection teardown, errors are non-fatal
             pass
         try:
-            pool.putconn(conn, key=key)
+            pool.putconn(conn)
         except Exception:  # noqa: BLE001 — pool return failed, fall back to hard close
             try:
                 conn.close()
@@ -189,9 +469,7 @@ def get_pool_connection():
         raise RuntimeError(
             "Connection pool is not initialized. Call init_pool() first."
         )
-    key = _unique_key()
-    conn = _pool.getconn(key=key)
-    return _PooledConnection(conn, _pool, key)
+    return _PooledConnection(_pool.getconn(), _pool)
 
 
 def close_pool() -> None:
@@ -210,3 +488,57 @@ def close_pool() -> None:
 def is_pool_initialized() -> bool:
     """Return True if the connection pool has been initialized."""
     return _pool is not None
+
+
+def get_pool_stats() -> Optional[Dict[str, Any]]:
+    """Return the pool's usage and wait statistics, or None if not initialized."""
+    pool = _pool
+    if pool is None or not hasattr(pool, "get_stats"):
+        return None
+    return pool.get_stats()
+
+
+try:
+    from prometheus_client.core import (
+        REGISTRY,
+        CounterMetricFamily,
+        GaugeMetricFamily,
+        HistogramMetricFamily,
+    )
+
+    class _PoolCollector:
+        """Exposes pool saturation metrics, read at scrape time."""
+
+        def collect(self):
+            stats = get_pool_stats()
+            if stats is None:
+                return
+            for name, key, doc in (
+                ("pg_pool_connections_in_use", "in_use", "Checked-out connections"),
+                ("pg_pool_connections_idle", "idle", "Idle pooled connections"),
+                ("pg_pool_waiting", "waiting", "Callers queued for a connection"),
+            ):
+                yield GaugeMetricFamily(name, doc, value=stats[key])
+            yield CounterMetricFamily(
+                "pg_pool_acquire_timeouts",
+                "Checkouts that gave up after the acquire timeout",
+                value=stats["timeouts"],
+            )
+            cumulative = 0
+            buckets: List[tuple] = []
+            for bound, count in zip(
+                WAIT_BUCKETS_MS, stats["wait_histogram_ms"].values()
+            ):
+                cumulative += count
+                buckets.append((str(bound / 1000), cumulative))
+            buckets.append(("+Inf", stats["acquires"]))
+            yield HistogramMetricFamily(
+                "pg_pool_acquire_wait_seconds",
+                "Time spent waiting for a pooled connection",
+                buckets=buckets,
+                sum_value=stats["total_wait_ms"] / 1000,
+            )
+
+    REGISTRY.register(_PoolCollector())
+except ImportError:
+    pass
@@ -12,6 +12,14 @@ audit, test, and maintain.
 
 COMPANY_EXISTS = "SELECT 1 FROM companies WHERE ticker = ?"
 
+# Every listed ticker with the fields routes need before their main query
+# (services/ticker_registry.py keeps this in memory).
+TICKER_REGISTRY = """
+    SELECT c.ticker, c.sector, m.market_cap
+    FROM companies c
+    LEFT JOIN market_data m ON m.ticker = c.ticker
+"""
+
 DIVIDEND_DATA_BY_TICKER = (
     "SELECT ticker, dividend_rate, dividend_yield, payout_ratio,"
     " trailing_annual_dividend_rate, trailing_annual_dividend_yield,"
@@ -208,6 +216,32 @@ MARKET_BREADTH = """
 # screener queries
 # ---------------------------------------------------------------------------
 
+# Columns the screener may sort by (validated before interpolation into
+# ORDER BY, and indexed on the materialized screener_snapshot table).
+SCREENER_SORT_COLUMNS = (
+    "ticker",
+    "short_name",
+    "sector",
+    "current_price",
+    "change_pct",
+    "market_cap",
+    "volume",
+    "trailing_pe",
+    "forward_pe",
+    "price_to_book",
+    "price_to_sales",
+    "roe",
+    "profit_margin",
+    "revenue_growth",
+    "earnings_growth",
+    "dividend_yield",
+    "debt_to_equity",
+    "current_ratio",
+    "total_revenue",
+    "target_mean_price",
+    "analyst_count",
+)
+
 SCREENER_BASE = """
     SELECT
         c.ticker, c.short_name, c.sector, c.industry,
@@ -230,3 +264,40 @@ SCREENER_BASE = """
     LEFT JOIN analyst_data a ON a.ticker = c.ticker
     WHERE m.current_price IS NOT NULL
 """
+
+# ---------------------------------------------------------------------------
+# market_snapshot queries
+# ---------------------------------------------------------------------------
+
+# One row per market_data ticker, LEFT JOINed to companies so the in-memory
+# snapshot can answer both the company-joined analytics queries and the
+# market_data-only aggregates (summary, breadth) with identical semantics.
+MARKET_SNAPSHOT = """
+    SELECT
+        m.ticker,
+        c.ticker AS company_ticker,
+        c.short_name,
+        c.sector,
+        m.current_price,
+        m.previous_close,
+        m.volume,
+        m.market_cap,
+        m.week_52_high,
+        m.week_52_low
+    FROM market_data m
+    LEFT JOIN companies c ON c.ticker = m.ticker
+    ORDER BY m.ticker
+"""
+
+
+# ---------------------------------------------------------------------------
+# ohlcv_warmup queries
+# ---------------------------------------------------------------------------
+
+# Largest companies first so the most-viewed charts are warmed earliest.
+WARMUP_TICKERS = """
+    SELECT c.ticker
+    FROM companies c
+    LEFT JOIN market_data m ON m.ticker = c.ticker
+    ORDER BY COALESCE(m.market_cap, 0) DESC, c.ticker
+"""
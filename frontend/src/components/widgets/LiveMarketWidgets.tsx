@@ -25,6 +25,27 @@ type QuoteItem = {
 
 type ConnectionStatus = 'live' | 'reconnecting' | 'offline';
 
+/** Changed fields per symbol (all fields for new symbols), plus removed symbols. */
+type QuoteDelta = {
+  changed: (Partial<QuoteItem> & { symbol: string })[];
+  removed: string[];
+};
+
+function applyDelta(prev: QuoteItem[], delta: QuoteDelta): QuoteItem[] {
+  const removed = new Set(delta.removed);
+  const changes = new Map(delta.changed.map((c) => [c.symbol, c]));
+  const next = prev
+    .filter((q) => !removed.has(q.symbol))
+    .map((q) => {
+      const change = changes.get(q.symbol);
+      if (!change) return q;
+      changes.delete(q.symbol);
+      return { ...q, ...change };
+    });
+  changes.forEach((c) => next.push(c as QuoteItem));
+  return next;
+}
+
 // ---------------------------------------------------------------------------
 // Asset-class icons (inline SVG, small)
 // ---------------------------------------------------------------------------
@@ -116,6 +137,7 @@ export function LiveMarketWidgets({ lang = 'ar', className }: LiveMarketWidgetsP
   const [status, setStatus] = useState<ConnectionStatus>('offline');
   const retryRef = useRef(0);
   const esRef = useRef<EventSource | null>(null);
+  const seqRef = useRef<number | null>(null);
   const timerRef = useRef<ReturnType<typeof setTimeout> | null>(null);
 
   // Number formatters, memoized per lang
@@ -157,16 +179,35 @@ export function LiveMarketWidgets({ lang = 'ar', className }: LiveMarketWidgetsP
       setStatus('live');
     };
 
-    // Handle 'snapshot' event (full list of quotes)
+    // Handle 'snapshot' event (full list of quotes; also sent as a periodic keyframe)
     es.addEventListener('snapshot', (e) => {
       try {
         const data = JSON.parse(e.data) as QuoteItem[];
+        seqRef.current = Number(e.lastEventId) || null;
         setQuotes(data);
       } catch {
         // ignore malformed data
       }
     });
 
+    // Handle 'delta' event (only the fields that changed since the previous frame)
+    es.addEventListener('delta', (e) => {
+      const seq = Number(e.lastEventId);
+      if (seqRef.current === null || seq !== seqRef.current + 1) {
+        // Missed a frame: reconnect to resync from a fresh snapshot
+        seqRef.current = null;
+        connect();
+        return;
+      }
+      seqRef.current = seq;
+      try {
+        const delta = JSON.parse(e.data) as QuoteDelta;
+        setQuotes((prev) => applyDelta(prev, delta));
+      } catch {
+        // ignore malformed data
+      }
+    });
+
     // Handle 'update' event (single quote update)
     es.addEventListener('update', (e) => {
       try {
@@ -17,6 +17,9 @@ class IngestionConfig:
         rate_limit_seconds: float = None,
         max_retries: int = None,
         backoff_factor: float = None,
+        max_workers: int = None,
+        requests_per_second: float = None,
+        xbrl_workers: int = None,
     ):
         self.batch_size = batch_size or int(
             os.environ.get("INGESTION_BATCH_SIZE", "10")
@@ -34,11 +37,26 @@ class IngestionConfig:
             if backoff_factor is not None
             else float(os.environ.get("INGESTION_BACKOFF_FACTOR", "2.0"))
         )
+        # Concurrent fetching (PriceLoader): >1 workers share a token bucket
+        # of requests_per_second instead of sleeping between batches
+        self.max_workers = max_workers or int(
+            os.environ.get("INGESTION_MAX_WORKERS", "1")
+        )
+        self.requests_per_second = requests_per_second or float(
+            os.environ.get("INGESTION_REQUESTS_PER_SECOND", "5")
+        )
+        # Parser processes for multi-file XBRL ingestion (1 = in-process)
+        self.xbrl_workers = xbrl_workers or int(
+            os.environ.get("INGESTION_XBRL_WORKERS", "1")
+        )
 
     def __repr__(self) -> str:
         return (
             f"IngestionConfig(batch_size={self.batch_size}, "
             f"rate_limit_seconds={self.rate_limit_seconds}, "
             f"max_retries={self.max_retries}, "
-            f"backoff_factor={self.backoff_factor})"
+            f"backoff_factor={self.backoff_factor}, "
+            f"max_workers={self.max_workers}, "
+            f"requests_per_second={self.requests_per_second}, "
+            f"xbrl_workers={self.xbrl_workers})"
         )
@@ -15,6 +15,13 @@ Features:
   - Computes change_amount and change_pct from previous close
   - Handles partial failures (continues processing remaining tickers)
   - Progress tracking with logging
+  - Incremental mode: reads MAX(trade_date) per ticker in one query, fetches
+    only the missing tail, and bulk-loads each batch with COPY into a staging
+    table merged into price_history
+  - Concurrent mode (max_workers > 1): a thread pool fetches tickers in
+    parallel, paced by a shared requests-per-second token bucket, and hands
+    frames through a bounded queue to a single DB writer
+  - Per-phase timings (fetch, transform, insert/copy/merge) in ``stats``
 
 Usage:
     # Fetch prices from Yahoo Finance for specific tickers
@@ -23,6 +30,12 @@ Usage:
     # Fetch prices for ALL tickers in the companies table
     python ingestion/price_loader.py --all --from-date 2024-01-01
 
+    # Daily top-up: only dates after each ticker's latest stored trade_date
+    python ingestion/price_loader.py --all --incremental
+
+    # Full-universe backfill with 8 concurrent fetchers at 5 requests/second
+    python ingestion/price_loader.py --all --from-date 2015-01-01 --workers 8 --rps 5
+
     # Load from a single CSV
     python ingestion/price_loader.py --file data/prices/2222.SR.csv --ticker 2222.SR
 
@@ -34,10 +47,16 @@ Usage:
 """
 
 import argparse
+import csv
+import io
 import logging
 import os
+import queue
 import sys
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from datetime import date, timedelta
 from pathlib import Path
 from typing import Optional
@@ -116,6 +135,86 @@ INSERT_SQL = (
     f"ON CONFLICT (ticker, trade_date) DO NOTHING"
 )
 
+# Incremental mode: COPY into a per-session staging table, then merge
+STAGING_TABLE = "price_history_staging"
+
+STAGING_DDL = (
+    f"CREATE TEMP TABLE IF NOT EXISTS {STAGING_TABLE} ("
+    "ticker TEXT, trade_date DATE, open_price NUMERIC(12,4), "
+    "high_price NUMERIC(12,4), low_price NUMERIC(12,4), "
+    "close_price NUMERIC(12,4), volume BIGINT, change_amount NUMERIC(12,4), "
+    "change_pct NUMERIC(8,4)) ON COMMIT DELETE ROWS"
+)
+
+COPY_SQL = (
+    f"COPY {STAGING_TABLE} ({', '.join(INSERT_COLUMNS)}) FROM STDIN WITH (FORMAT csv)"
+)
+
+MERGE_SQL = (
+    f"INSERT INTO price_history ({', '.join(INSERT_COLUMNS)}) "
+    f"SELECT {', '.join(INSERT_COLUMNS)} FROM {STAGING_TABLE} "
+    f"ON CONFLICT (ticker, trade_date) DO NOTHING"
+)
+
+HIGH_WATER_SQL = (
+    "SELECT ticker, MAX(trade_date) FROM price_history "
+    "WHERE ticker = ANY(%s) GROUP BY ticker"
+)
+
+
+# Concurrent workers add to the same timings dict
+_TIMINGS_LOCK = threading.Lock()
+
+
+@contextmanager
+def _timed(timings: dict, phase: str):
+    """Add the elapsed wall-clock milliseconds of the block to timings[phase]."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = (time.perf_counter() - start) * 1000
+        with _TIMINGS_LOCK:
+            timings[phase] = timings.get(phase, 0.0) + elapsed
+
+
+class TokenBucket:
+    """Thread-safe token bucket shared by concurrent fetch workers.
+
+    Tokens refill continuously at ``rate`` per second up to ``capacity``;
+    :meth:`acquire` takes one, sleeping until it is available.
+
+    Args:
+        rate: Sustained requests per second.
+        capacity: Burst size (default: one second's worth, at least 1).
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """Take one token, blocking as needed. Returns seconds waited."""
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(
+                    self.capacity, self._tokens + (now - self._updated) * self.rate
+                )
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return waited
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+            waited += wait
+
 
 # ---------------------------------------------------------------------------
 # PriceLoader class (yfinance-based)
@@ -130,6 +229,7 @@ class PriceLoader:
         pg_conn=None,
         config: Optional[IngestionConfig] = None,
         dry_run: bool = False,
+        incremental: bool = False,
     ):
         """Initialize PriceLoader.
 
@@ -137,11 +237,22 @@ class PriceLoader:
             pg_conn: PostgreSQL connection (or None for dry run).
             config: Ingestion configuration for batch size / rate limits.
             dry_run: If True, don't write to database.
+            incremental: If True, fetch only dates after each ticker's latest
+                stored trade_date and bulk-load each batch with COPY.
         """
         self.pg_conn = pg_conn
         self.config = config or IngestionConfig()
         self.dry_run = dry_run
-        self.stats = {"tickers_processed": 0, "tickers_failed": 0, "rows_inserted": 0}
+        self.incremental = incremental
+        # Set for the duration of a concurrent load_prices() run
+        self._bucket: Optional[TokenBucket] = None
+        self.stats = {
+            "tickers_processed": 0,
+            "tickers_failed": 0,
+            "tickers_up_to_date": 0,
+            "rows_inserted": 0,
+            "timings_ms": {},
+        }
 
     def load_prices(
         self,
@@ -151,7 +262,11 @@ class PriceLoader:
     ) -> int:
         """Fetch and load price data for a list of tickers.
 
-        Processes tickers in batches with rate limiting between batches.
+        Processes tickers in batches with rate limiting between batches, or
+        with ``config.max_workers`` concurrent fetchers when that is > 1
+        (see :meth:`_load_concurrent`). In incremental mode, tickers whose
+        latest stored trade_date is on or after ``to_date`` are skipped, and
+        the rest are fetched from that date instead of ``from_date``.
 
         Args:
             tickers: List of ticker symbols (e.g., ["2222.SR", "1010.SR"]).
@@ -179,21 +294,35 @@ class PriceLoader:
             total_batches,
         )
 
+        high_water = self._high_water_marks(tickers) if self.incremental else {}
+
+        if self.config.max_workers > 1:
+            return self._finish(
+                self._load_concurrent(tickers, high_water, from_date, to_date)
+            )
+
         for batch_idx in range(0, len(tickers), batch_size):
             batch = tickers[batch_idx : batch_idx + batch_size]
             batch_num = (batch_idx // batch_size) + 1
 
             logger.info("Batch %d/%d: %s", batch_num, total_batches, ", ".join(batch))
 
-            for ticker in batch:
-                try:
-                    count = self._fetch_and_insert_ticker(ticker, from_date, to_date)
-                    total_inserted += count
-                    self.stats["tickers_processed"] += 1
-                    logger.info("  %s: %d rows inserted", ticker, count)
-                except Exception as e:
-                    self.stats["tickers_failed"] += 1
-                    logger.error("  %s: FAILED - %s", ticker, e)
+            if self.incremental:
+                total_inserted += self._load_batch_incremental(
+                    batch, high_water, from_date, to_date
+                )
+            else:
+                for ticker in batch:
+                    try:
+                        count = self._fetch_and_insert_ticker(
+                            ticker, from_date, to_date
+                        )
+                        total_inserted += count
+                        self.stats["tickers_processed"] += 1
+                        logger.info("  %s: %d rows inserted", ticker, count)
+                    except Exception as e:
+                        self.stats["tickers_failed"] += 1
+                        logger.error("  %s: FAILED - %s", ticker, e)
 
             # Rate limit between batches (skip after last batch)
             if batch_idx + batch_size < len(tickers):
@@ -201,6 +330,10 @@ class PriceLoader:
                 logger.info("  Sleeping %.1fs before next batch...", sleep_time)
                 time.sleep(sleep_time)
 
+        return self._finish(total_inserted)
+
+    def _finish(self, total_inserted: int) -> int:
+        """Record and log the totals of a load_prices() run."""
         self.stats["rows_inserted"] = total_inserted
         logger.info(
             "Done: %d tickers processed, %d failed, %d total rows inserted",
@@ -208,6 +341,12 @@ class PriceLoader:
             self.stats["tickers_failed"],
             total_inserted,
         )
+        logger.info(
+            "Timings: %s",
+            ", ".join(
+                f"{phase}={ms:.0f}ms" for phase, ms in self.stats["timings_ms"].items()
+            ),
+        )
         return total_inserted
 
     def load_all_prices(
@@ -252,22 +391,235 @@ class PriceLoader:
 
         Uses exponential backoff on rate limiting.
         """
-        df = self._fetch_with_retry(ticker, from_date, to_date)
+        timings = self.stats["timings_ms"]
+        with _timed(timings, "fetch"):
+            df = self._fetch_with_retry(ticker, from_date, to_date)
         if df is None or df.empty:
             return 0
 
-        # Normalize yfinance output to our schema
-        df = self._normalize_yfinance_df(df, ticker)
+        with _timed(timings, "transform"):
+            # Normalize yfinance output to our schema
+            df = self._normalize_yfinance_df(df, ticker)
+
+            # Compute changes
+            df = compute_changes(df)
+
+            # Clean for insertion
+            numeric = df.select_dtypes(include=[np.number]).columns
+            df[numeric] = df[numeric].replace([np.inf, -np.inf], np.nan)
+
+            rows = df_to_insert_tuples(df)
+
+        with _timed(timings, "insert"):
+            return insert_prices(self.pg_conn, rows, self.dry_run)
+
+    # -- incremental mode ------------------------------------------------------
+
+    def _high_water_marks(self, tickers: list[str]) -> dict:
+        """Return {ticker: latest stored trade_date} in a single query.
+
+        Tickers with no stored prices are absent from the result.
+        """
+        if self.pg_conn is None or not tickers:
+            return {}
+
+        with _timed(self.stats["timings_ms"], "high_water"):
+            cur = self.pg_conn.cursor()
+            cur.execute(HIGH_WATER_SQL, (list(tickers),))
+            marks = dict(cur.fetchall())
+            cur.close()
+
+        logger.info(
+            "High-water marks: %d of %d tickers have stored prices",
+            len(marks),
+            len(tickers),
+        )
+        return marks
+
+    def _fetch_tail(
+        self,
+        ticker: str,
+        last_date: Optional[date],
+        from_date: date,
+        to_date: date,
+    ) -> Optional[pd.DataFrame]:
+        """Fetch and normalize the rows of ``ticker`` after ``last_date``.
+
+        The fetch starts at ``last_date`` itself so compute_changes() has the
+        previous close for the first new row; that overlap row is dropped.
+        """
+        start = from_date if last_date is None else max(from_date, last_date)
+        timings = self.stats["timings_ms"]
+
+        with _timed(timings, "fetch"):
+            df = self._fetch_with_retry(ticker, start, to_date)
+        if df is None or df.empty:
+            return None
+
+        with _timed(timings, "transform"):
+            df = self._normalize_yfinance_df(df, ticker)
+            df = compute_changes(df)
+            if last_date is not None:
+                df = df[df["trade_date"] > last_date]
+        return df
+
+    def _load_batch_incremental(
+        self,
+        batch: list[str],
+        high_water: dict,
+        from_date: date,
+        to_date: date,
+    ) -> int:
+        """Fetch the missing tail of each ticker and COPY the batch at once."""
+        frames = []
+        fetched = []
+        for ticker in batch:
+            last_date = high_water.get(ticker)
+            if last_date is not None and last_date >= to_date:
+                self.stats["tickers_up_to_date"] += 1
+                logger.info("  %s: up to date (%s)", ticker, last_date)
+                continue
+            try:
+                df = self._fetch_tail(ticker, last_date, from_date, to_date)
+            except Exception as e:
+                self.stats["tickers_failed"] += 1
+                logger.error("  %s: FAILED - %s", ticker, e)
+                continue
+            fetched.append(ticker)
+            if df is not None and not df.empty:
+                frames.append(df)
+                logger.info("  %s: %d new rows", ticker, len(df))
+
+        if not frames:
+            self.stats["tickers_processed"] += len(fetched)
+            return 0
+
+        timings = self.stats["timings_ms"]
+        try:
+            with _timed(timings, "transform"):
+                rows = df_to_insert_tuples(pd.concat(frames, ignore_index=True))
+            count = copy_prices(self.pg_conn, rows, self.dry_run, timings)
+        except Exception as e:
+            self.stats["tickers_failed"] += len(fetched)
+            logger.error("  Batch COPY FAILED (%d tickers) - %s", len(fetched), e)
+            return 0
+
+        self.stats["tickers_processed"] += len(fetched)
+        logger.info("  Batch: %d rows inserted", count)
+        return count
+
+    # -- concurrent mode -------------------------------------------------------
+
+    def _load_concurrent(
+        self,
+        tickers: list[str],
+        high_water: dict,
+        from_date: date,
+        to_date: date,
+    ) -> int:
+        """Fetch tickers on a worker pool and write them from this thread.
+
+        Workers share one :class:`TokenBucket`, so the request rate is
+        ``config.requests_per_second`` however many are running, and each
+        keeps the per-ticker exponential backoff of :meth:`_fetch_with_retry`.
+        Fetched frames go through a bounded queue to the calling thread, the
+        only one that touches ``pg_conn``; it writes every ``batch_size``
+        tickers (COPY in incremental mode, execute_batch otherwise).
+        """
+        workers = self.config.max_workers
+        pending = []
+        for ticker in tickers:
+            last_date = high_water.get(ticker)
+            if last_date is not None and last_date >= to_date:
+                self.stats["tickers_up_to_date"] += 1
+                logger.info("  %s: up to date (%s)", ticker, last_date)
+            else:
+                pending.append((ticker, last_date))
 
-        # Compute changes
-        df = compute_changes(df)
+        logger.info(
+            "Fetching %d tickers with %d workers at %.1f requests/s",
+            len(pending),
+            workers,
+            self.config.requests_per_second,
+        )
+
+        # Bounded so fetchers block instead of piling frames up in memory
+        # when the writer falls behind
+        results: queue.Queue = queue.Queue(maxsize=workers * 2)
+
+        def fetch(ticker: str, last_date: Optional[date]) -> None:
+            try:
+                df = self._fetch_tail(ticker, last_date, from_date, to_date)
+                results.put((ticker, df, None))
+            except Exception as e:
+                results.put((ticker, None, e))
+
+        total_inserted = 0
+        self._bucket = TokenBucket(self.config.requests_per_second)
+        pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="price-fetch")
+        futures = []
+        try:
+            futures = [pool.submit(fetch, t, last_date) for t, last_date in pending]
+
+            frames = []
+            fetched = []
+            for done in range(1, len(pending) + 1):
+                ticker, df, error = results.get()
+                if error is not None:
+                    self.stats["tickers_failed"] += 1
+                    logger.error("  %s: FAILED - %s", ticker, error)
+                else:
+                    fetched.append(ticker)
+                    if df is not None and not df.empty:
+                        frames.append(df)
+                if len(fetched) >= self.config.batch_size or done == len(pending):
+                    total_inserted += self._write_frames(frames, fetched)
+                    frames, fetched = [], []
+        except BaseException:
+            # Workers blocked on the full queue would hang the shutdown below:
+            # drop the fetches not yet started and drain until the rest finish.
+            for future in futures:
+                future.cancel()
+            while not all(future.done() for future in futures):
+                try:
+                    results.get(timeout=0.1)
+                except queue.Empty:
+                    pass
+            raise
+        finally:
+            pool.shutdown(wait=True)
+            self._bucket = None
+        return total_inserted
+
+    def _write_frames(self, frames: list, fetched: list[str]) -> int:
+        """Insert the frames of ``fetched`` tickers in one write."""
+        if not frames:
+            self.stats["tickers_processed"] += len(fetched)
+            return 0
 
-        # Clean for insertion
-        numeric = df.select_dtypes(include=[np.number]).columns
-        df[numeric] = df[numeric].replace([np.inf, -np.inf], np.nan)
+        timings = self.stats["timings_ms"]
+        try:
+            with _timed(timings, "transform"):
+                rows = df_to_insert_tuples(pd.concat(frames, ignore_index=True))
+            if self.incremental:
+                # copy_prices() rolls back its own failed transaction
+                count = copy_prices(self.pg_conn, rows, self.dry_run, timings)
+            else:
+                with _timed(timings, "insert"):
+                    try:
+                        count = insert_prices(self.pg_conn, rows, self.dry_run)
+                    except Exception:
+                        if self.pg_conn is not None:
+                            self.pg_conn.rollback()
+                        raise
+        except Exception as e:
+            self.stats["tickers_failed"] += len(fetched)
+            logger.error("  Write FAILED (%d tickers) - %s", len(fetched), e)
+            return 0
 
-        rows = df_to_insert_tuples(df)
-        return insert_prices(self.pg_conn, rows, self.dry_run)
+        self.stats["tickers_processed"] += len(fetched)
+        logger.info("  %d tickers written: %d rows inserted", len(fetched), count)
+        return count
 
     def _fetch_with_retry(
         self,
@@ -280,6 +632,10 @@ class PriceLoader:
         backoff = self.config.backoff_factor
 
         for attempt in range(max_retries):
+            if self._bucket is not None:
+                # Every attempt, retries included, spends a shared token
+                with _timed(self.stats["timings_ms"], "rate_wait"):
+                    self._bucket.acquire()
             try:
                 stock = yf.Ticker(ticker)
                 df = stock.history(
@@ -435,23 +791,37 @@ def _clean_val(val):
     return val
 
 
+def _numeric_values(series: pd.Series) -> list:
+    """Convert a numeric column to Python ints/floats with NaN/inf -> None."""
+    values = pd.to_numeric(series, errors="coerce")
+    if pd.api.types.is_integer_dtype(values.dtype):
+        missing = values.isna().to_numpy()
+        out = values.to_numpy(dtype=np.int64, na_value=0).tolist()
+    else:
+        arr = values.to_numpy(dtype=np.float64, na_value=np.nan)
+        missing = ~np.isfinite(arr)
+        out = arr.tolist()
+    for i in np.flatnonzero(missing):
+        out[i] = None
+    return out
+
+
 def df_to_insert_tuples(df: pd.DataFrame) -> list:
-    """Convert DataFrame to list of tuples for INSERT."""
-    tuples = []
-    for _, row in df.iterrows():
-        t = (
-            row["ticker"],
-            row["trade_date"],
-            _clean_val(row.get("open_price")),
-            _clean_val(row.get("high_price")),
-            _clean_val(row.get("low_price")),
-            _clean_val(row.get("close_price")),
-            _clean_val(row.get("volume")),
-            _clean_val(row.get("change_amount")),
-            _clean_val(row.get("change_pct")),
-        )
-        tuples.append(t)
-    return tuples
+    """Convert DataFrame to list of tuples for INSERT (INSERT_COLUMNS order).
+
+    Columns are converted whole with NumPy rather than row by row; missing
+    optional columns become None.
+    """
+    columns = [
+        df["ticker"].astype(object).where(df["ticker"].notna(), None).tolist(),
+        df["trade_date"].astype(object).where(df["trade_date"].notna(), None).tolist(),
+    ]
+    for col in INSERT_COLUMNS[2:]:
+        if col in df.columns:
+            columns.append(_numeric_values(df[col]))
+        else:
+            columns.append([None] * len(df))
+    return list(zip(*columns))
 
 
 # ---------------------------------------------------------------------------
@@ -477,6 +847,43 @@ def insert_prices(pg_conn, rows: list, dry_run: bool = False) -> int:
     return inserted
 
 
+def copy_prices(pg_conn, rows: list, dry_run: bool = False, timings=None) -> int:
+    """Bulk-load price rows via COPY into a staging table, then merge.
+
+    Rows are streamed as CSV into a temporary staging table and merged into
+    price_history with ON CONFLICT DO NOTHING in one statement.  Returns the
+    count of rows actually inserted (existing (ticker, trade_date) pairs are
+    skipped).  ``timings`` receives "copy" and "merge" milliseconds.
+    """
+    if not rows:
+        return 0
+
+    if dry_run:
+        return len(rows)
+
+    timings = {} if timings is None else timings
+    cur = pg_conn.cursor()
+    try:
+        with _timed(timings, "copy"):
+            buf = io.StringIO()
+            # None -> empty unquoted field, which COPY reads as NULL
+            csv.writer(buf).writerows(rows)
+            buf.seek(0)
+            cur.execute(STAGING_DDL)
+            cur.copy_expert(COPY_SQL, buf)
+        with _timed(timings, "merge"):
+            cur.execute(MERGE_SQL)
+            inserted = cur.rowcount
+            # ON COMMIT DELETE ROWS empties the staging table
+            pg_conn.commit()
+    except Exception:
+        pg_conn.rollback()
+        raise
+    finally:
+        cur.close()
+    return inserted
+
+
 # ---------------------------------------------------------------------------
 # Main
 # ---------------------------------------------------------------------------
@@ -520,6 +927,23 @@ def parse_args():
         default=None,
         help="Seconds between batches (default: 2)",
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Concurrent fetch workers; >1 replaces batch sleeps (default: 1)",
+    )
+    parser.add_argument(
+        "--rps",
+        type=float,
+        default=None,
+        help="Shared Yahoo Finance requests/second for --workers (default: 5)",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Fetch only dates after each ticker's latest stored trade_date",
+    )
     parser.add_argument(
         "--dry-run", action="store_true", help="Print plan without writing"
     )
@@ -584,6 +1008,8 @@ def main():
     config = IngestionConfig(
         batch_size=args.batch_size,
         rate_limit_seconds=args.rate_limit,
+        max_workers=args.workers,
+        requests_per_second=args.rps,
     )
 
     # Connect to PostgreSQL
@@ -618,7 +1044,12 @@ def main():
             from_date = date.fromisoformat(from_date_str)
             to_date = date.fromisoformat(args.to_date) if args.to_date else date.today()
 
-            loader = PriceLoader(pg_conn=pg_conn, config=config, dry_run=args.dry_run)
+            loader = PriceLoader(
+                pg_conn=pg_conn,
+                config=config,
+                dry_run=args.dry_run,
+                incremental=args.incremental,
+            )
 
             if args.all:
                 total_rows = loader.load_all_prices(from_date, to_date)
@@ -627,6 +1058,8 @@ def main():
 
             print(f"\nProcessed: {loader.stats['tickers_processed']} tickers")
             print(f"Failed: {loader.stats['tickers_failed']} tickers")
+            if args.incremental:
+                print(f"Up to date: {loader.stats['tickers_up_to_date']} tickers")
 
         elif args.file:
             file_path = Path(args.file)
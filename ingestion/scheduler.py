@@ -15,7 +15,7 @@ Usage:
 
 Environment variables:
     PG_HOST, PG_PORT, PG_DBNAME, PG_USER, PG_PASSWORD
-    INGESTION_BATCH_SIZE, INGESTION_RATE_LIMIT_SECONDS
+    INGESTION_BATCH_SIZE, INGESTION_RATE_LIMIT_SECONDS, INGESTION_XBRL_WORKERS
 """
 
 import logging
@@ -69,7 +69,9 @@ def job_load_prices():
         pg_conn.autocommit = False
 
         config = IngestionConfig()
-        loader = PriceLoader(pg_conn=pg_conn, config=config)
+        # Incremental: tickers already loaded through today are skipped and
+        # the rest are fetched from their latest stored trade_date
+        loader = PriceLoader(pg_conn=pg_conn, config=config, incremental=True)
 
         # Fetch last 3 days to handle weekends/holidays
         from_date = date.today() - timedelta(days=3)
@@ -90,14 +92,23 @@ def job_load_prices():
 
 
 def job_process_xbrl():
-    """Scheduled job: process any new XBRL filings in the ingestion directory."""
+    """Scheduled job: process any new XBRL filings in the ingestion directory.
+
+    With ``INGESTION_XBRL_WORKERS`` > 1 the filings are parsed on a process
+    pool; either way completed filings are skipped and only facts not
+    already in xbrl_facts are inserted.
+    """
     logger.info("=== Scheduled XBRL processing starting ===")
 
     from ingestion.xbrl_processor import (
+        SUPPORTED_EXTENSIONS,
         XBRLProcessor,
+        check_filing_exists,
         insert_facts,
         create_filing,
         mark_filing_complete,
+        process_files_parallel,
+        ticker_from_filename,
     )
 
     filings_dir = PROJECT_DIR / "data" / "filings"
@@ -110,28 +121,45 @@ def job_process_xbrl():
         pg_conn = _get_pg_conn()
         pg_conn.autocommit = False
 
-        supported = {".xml", ".xbrl", ".xlsx", ".xls"}
         files = [
-            f for f in sorted(filings_dir.iterdir()) if f.suffix.lower() in supported
+            f
+            for f in sorted(filings_dir.iterdir())
+            if f.suffix.lower() in SUPPORTED_EXTENSIONS
         ]
 
         if not files:
             logger.info("No filing files found in %s", filings_dir)
             return
 
-        total_facts = 0
+        jobs = []
         for file_path in files:
             # Extract ticker from filename (e.g., '2222.SR_annual.xml')
-            stem = file_path.stem
-            parts = stem.split("_")
-            if parts and ".SR" in parts[0]:
-                ticker = parts[0]
-            else:
+            ticker = ticker_from_filename(file_path)
+            if not ticker:
                 logger.warning(
                     "Skipping %s: cannot determine ticker from filename", file_path.name
                 )
                 continue
+            jobs.append((file_path, ticker))
+
+        workers = IngestionConfig().xbrl_workers
+        if workers > 1 and len(jobs) > 1:
+            total_facts, errors, _ = process_files_parallel(
+                jobs, "annual", "Tadawul", pg_conn, False, workers
+            )
+            for err in errors[:3]:
+                logger.warning("  %s", err)
+            logger.info(
+                "XBRL processing complete: %d total facts inserted", total_facts
+            )
+            return
 
+        total_facts = 0
+        for file_path, ticker in jobs:
+            # Same skip as process_files_parallel
+            if check_filing_exists(pg_conn, ticker, str(file_path)):
+                logger.info("  Skipped %s: already processed", file_path.name)
+                continue
             filing_id = create_filing(
                 pg_conn,
                 ticker,
@@ -149,7 +177,7 @@ def job_process_xbrl():
             facts = processor.process_filing(file_path)
 
             if facts:
-                count = insert_facts(pg_conn, facts)
+                count = insert_facts(pg_conn, facts, skip_existing=True)
                 total_facts += count
                 mark_filing_complete(pg_conn, filing_id)
                 logger.info("  %s: %d facts inserted", file_path.name, count)
@@ -7,9 +7,15 @@ inserting structured facts into the PostgreSQL xbrl_facts table.
 Features:
   - XBRLFact dataclass for structured fact representation
   - Parses XBRL/XML filings using lxml (IFRS taxonomy)
+  - Streaming mode: iterparse-based chunked fact extraction with bounded
+    memory, reporting facts/second and peak RSS
   - Parses Excel workbooks with XBRL-like data using openpyxl
   - SHA-256 content hash for deduplication
   - Batch insert with ON CONFLICT DO NOTHING on content_hash
+  - Hash pre-filter: facts whose content_hash is already stored are dropped
+    before the INSERT instead of being sent to PostgreSQL
+  - Multi-file mode: filings are parsed in a process pool, with per-worker
+    throughput reporting
   - Skip already-processed filings
   - process_filing(file_path), process_directory(dir_path), process_url(url)
 
@@ -23,20 +29,28 @@ Usage:
     # Process a directory of filings
     python ingestion/xbrl_processor.py --dir data/filings/ --ticker-pattern "*.xml"
 
+    # Parse a directory of filings with 4 worker processes
+    python ingestion/xbrl_processor.py --dir data/filings/ --workers 4
+
+    # Stream a large XML filing into the database chunk by chunk
+    python ingestion/xbrl_processor.py --file data/filing.xml --ticker 2222.SR --stream
+
     # Dry run
     python ingestion/xbrl_processor.py --file data/filing.xml --ticker 2222.SR --dry-run
 """
 
 import argparse
+import copy
 import hashlib
 import logging
 import os
 import sys
 import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from dataclasses import dataclass, field
 from datetime import date, datetime
 from pathlib import Path
-from typing import Optional
+from typing import Iterator, Optional
 from urllib.parse import urlparse
 
 try:
@@ -60,6 +74,13 @@ try:
 except ImportError:
     requests = None
 
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+from ingestion.config import IngestionConfig
+
 logger = logging.getLogger(__name__)
 
 # ---------------------------------------------------------------------------
@@ -68,6 +89,11 @@ logger = logging.getLogger(__name__)
 SCRIPT_DIR = Path(__file__).resolve().parent
 PROJECT_DIR = SCRIPT_DIR.parent
 BATCH_SIZE = 250
+# Facts per chunk yielded by XBRLProcessor.iter_xml_facts()
+STREAM_CHUNK_SIZE = 2000
+# Content hashes per existing-hash lookup in filter_new_facts()
+HASH_LOOKUP_SIZE = 5000
+SUPPORTED_EXTENSIONS = {".xml", ".xbrl", ".xlsx", ".xls"}
 
 # XBRL namespace prefixes used in Saudi IFRS filings
 XBRL_NAMESPACES = {
@@ -79,6 +105,20 @@ XBRL_NAMESPACES = {
     "xbrldi": "http://xbrl.org/2006/xbrldi",
 }
 
+XBRLI_NS = XBRL_NAMESPACES["xbrli"]
+
+# Local names of the elements iter_xml_facts() collects into lookups
+_LOOKUP_TAG_SUFFIXES = ("}context", "}unit")
+
+# XBRL infrastructure namespaces; elements in these are never facts
+SKIP_NAMESPACES = frozenset(
+    {
+        XBRLI_NS,
+        XBRL_NAMESPACES["link"],
+        XBRL_NAMESPACES["xlink"],
+    }
+)
+
 
 # ---------------------------------------------------------------------------
 # Data structures
@@ -179,6 +219,9 @@ XBRL_INSERT_SQL = (
     f"ON CONFLICT (content_hash) DO NOTHING"
 )
 
+# Index lookup on the unique content_hash; only the hashes cross the wire
+EXISTING_HASHES_SQL = "SELECT content_hash FROM xbrl_facts WHERE content_hash = ANY(%s)"
+
 
 # ---------------------------------------------------------------------------
 # XBRLProcessor
@@ -252,6 +295,9 @@ class XBRLProcessor:
         self.default_unit = default_unit
         self.facts: list[XBRLFact] = []
         self.errors: list[str] = []
+        # Filled by iter_xml_facts(): facts, deferred, elapsed_s,
+        # facts_per_second, peak_rss_mb
+        self.stream_stats: dict = {}
 
     # ------------------------------------------------------------------
     # Public API: process_filing, process_directory, process_url
@@ -282,12 +328,16 @@ class XBRLProcessor:
             self.errors.append(f"Unsupported file type: {suffix}")
             return []
 
-    def process_directory(self, dir_path: Path, pattern: str = "*") -> list[XBRLFact]:
+    def process_directory(
+        self, dir_path: Path, pattern: str = "*", workers: int = 1
+    ) -> list[XBRLFact]:
         """Process all filing files in a directory.
 
         Args:
             dir_path: Directory containing filing files.
             pattern: Glob pattern for matching files (default: all files).
+            workers: Parser processes; with more than one, files are parsed
+                in parallel by :func:`parse_filing`.
 
         Returns:
             Combined list of XBRLFact objects from all files.
@@ -297,13 +347,16 @@ class XBRLProcessor:
             self.errors.append(f"Directory not found: {dir_path}")
             return []
 
-        all_facts = []
-        supported_extensions = {".xml", ".xbrl", ".xlsx", ".xls"}
-        files = sorted(dir_path.glob(pattern))
+        files = [
+            f
+            for f in sorted(dir_path.glob(pattern))
+            if f.suffix.lower() in SUPPORTED_EXTENSIONS
+        ]
+        if workers > 1 and len(files) > 1:
+            return self._process_files_pooled(files, workers)
 
+        all_facts = []
         for file_path in files:
-            if file_path.suffix.lower() not in supported_extensions:
-                continue
             try:
                 facts = self.process_filing(file_path)
                 all_facts.extend(facts)
@@ -316,6 +369,41 @@ class XBRLProcessor:
 
         return all_facts
 
+    def _process_files_pooled(self, files: list[Path], workers: int) -> list[XBRLFact]:
+        """Parse ``files`` on a process pool, keeping the input file order."""
+        results = {}
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {
+                pool.submit(
+                    parse_filing,
+                    file_path,
+                    self.ticker,
+                    self.filing_id,
+                    self.source_url,
+                    self.default_unit,
+                ): file_path
+                for file_path in files
+            }
+            for future in as_completed(futures):
+                file_path = futures[future]
+                try:
+                    results[file_path] = future.result()
+                except Exception as e:
+                    self.errors.append(f"Error processing {file_path.name}: {e}")
+                    logger.error("Error processing %s: %s", file_path.name, e)
+
+        all_facts = []
+        for file_path in files:
+            if file_path not in results:
+                continue
+            result = results[file_path]
+            all_facts.extend(result.facts)
+            self.errors.extend(result.errors)
+            logger.info(
+                "Processed %s: %d facts extracted", file_path.name, len(result.facts)
+            )
+        return all_facts
+
     def process_url(
         self, url: str, download_dir: Optional[Path] = None
     ) -> list[XBRLFact]:
@@ -401,88 +489,228 @@ class XBRLProcessor:
 
         # Extract facts from all non-structural elements
         for elem in root.iter():
-            tag = elem.tag
-            if not isinstance(tag, str):
-                continue
+            fact = self._element_to_fact(elem, contexts, units, nsmap)
+            if fact is not None:
+                self.facts.append(fact)
 
-            # Skip structural elements (contexts, units, footnotes, etc.)
-            local_name = etree.QName(tag).localname if "}" in tag else tag
-            namespace = etree.QName(tag).namespace if "}" in tag else ""
+        logger.info(
+            "XML parsing complete: %d facts from %s", len(self.facts), file_path.name
+        )
+        return self.facts
 
-            # Skip XBRL infrastructure elements
-            skip_namespaces = {
-                "http://www.xbrl.org/2003/instance",
-                "http://www.xbrl.org/2003/linkbase",
-                "http://www.w3.org/1999/xlink",
-            }
-            if namespace in skip_namespaces:
-                continue
+    def iter_xml_facts(
+        self, file_path: Path, chunk_size: int = STREAM_CHUNK_SIZE
+    ) -> Iterator[list[XBRLFact]]:
+        """Stream an XBRL XML filing as lists of at most ``chunk_size`` facts.
 
-            # This is a fact element
-            text = (elem.text or "").strip()
-            if not text:
-                continue
+        Memory-bounded alternative to :meth:`process_xml` for large filings:
+        a single iterparse pass turns each top-level element into facts and
+        then clears it, so the tree never holds more than one top-level
+        subtree. Facts are not kept on ``self.facts``.
 
-            # Build concept name
-            concept = self._build_concept_name(namespace, local_name, nsmap)
+        Contexts and units are resolved lazily. Instance documents declare
+        them before the facts that use them, so facts are normally built as
+        they are read; a fact referencing one not seen yet is set aside and
+        yielded after the rest of the document.
 
-            # Get context reference for period info
-            context_ref = elem.get("contextRef")
-            period_info = contexts.get(context_ref, {}) if context_ref else {}
+        Parse errors are recorded in ``self.errors`` and end the stream;
+        chunks already yielded stay valid. Throughput and peak RSS of the
+        run are stored in ``self.stream_stats``.
 
-            # Get unit reference
-            unit_ref = elem.get("unitRef")
-            unit = units.get(unit_ref, self.default_unit) if unit_ref else None
+        Args:
+            file_path: Path to the XML/XBRL file.
+            chunk_size: Maximum facts per yielded list.
 
-            # Get decimals
-            decimals_str = elem.get("decimals")
-            decimals = None
-            if decimals_str and decimals_str not in ("INF", "inf"):
-                try:
-                    decimals = int(decimals_str)
-                except ValueError:
-                    pass
+        Yields:
+            Lists of XBRLFact objects.
+        """
+        if etree is None:
+            raise ImportError("lxml is required for XML parsing: pip install lxml")
+
+        file_path = Path(file_path)
+        t_start = time.perf_counter()
+        total = 0
+        # xbrli contexts/units, plus same-named elements in other namespaces
+        # used only when the document has no xbrli ones (as in _parse_contexts)
+        contexts, units = {}, {}
+        fallback_contexts, fallback_units = {}, {}
+        deferred = []
+        try:
+            chunk: list[XBRLFact] = []
+            nsmap = None
+            for _, elem in etree.iterparse(str(file_path), events=("end",)):
+                root = elem.getparent()
+                if root is None or root.getparent() is not None:
+                    # Nested elements are handled with their top-level ancestor
+                    continue
+                if nsmap is None:
+                    nsmap = root.nsmap.copy()
+                    if None in nsmap:
+                        nsmap["default"] = nsmap.pop(None)
+
+                if str(elem.tag).endswith(_LOOKUP_TAG_SUFFIXES):
+                    self._collect_lookup(
+                        elem, contexts, units, fallback_contexts, fallback_units
+                    )
+                for sub in elem.iter():
+                    context_ref = sub.get("contextRef")
+                    unit_ref = sub.get("unitRef")
+                    if (context_ref and context_ref not in contexts) or (
+                        unit_ref and unit_ref not in units
+                    ):
+                        # Detached copy: elem is cleared below
+                        deferred.append(copy.deepcopy(sub))
+                        continue
+                    fact = self._element_to_fact(sub, contexts, units, nsmap)
+                    if fact is not None:
+                        chunk.append(fact)
+                _release(elem)
 
-            # Determine value type
-            value_numeric = None
-            value_text = None
-            value_boolean = None
+                if len(chunk) >= chunk_size:
+                    total += len(chunk)
+                    yield chunk
+                    chunk = []
 
-            if text.lower() in ("true", "false"):
-                value_boolean = text.lower() == "true"
-            else:
-                try:
-                    value_numeric = float(text.replace(",", ""))
-                except ValueError:
-                    value_text = text
-
-            # Extract dimension info from context
-            dimension_member = period_info.get("dimension_member")
-            dimension_value = period_info.get("dimension_value")
-
-            fact = XBRLFact(
-                ticker=self.ticker,
-                concept=concept,
-                label_en=local_name,
-                value_numeric=value_numeric,
-                value_text=value_text,
-                value_boolean=value_boolean,
-                unit=unit,
-                decimals=decimals,
-                period_start=period_info.get("period_start"),
-                period_end=period_info.get("period_end"),
-                period_instant=period_info.get("period_instant"),
-                dimension_member=dimension_member,
-                dimension_value=dimension_value,
-                source_url=self.source_url,
-                filing_id=self.filing_id,
+            if deferred:
+                logger.info(
+                    "%s: resolving %d facts declared before their context/unit",
+                    file_path.name,
+                    len(deferred),
+                )
+                contexts = contexts or fallback_contexts
+                units = units or fallback_units
+                for sub in deferred:
+                    fact = self._element_to_fact(sub, contexts, units, nsmap)
+                    if fact is not None:
+                        chunk.append(fact)
+                    if len(chunk) >= chunk_size:
+                        total += len(chunk)
+                        yield chunk
+                        chunk = []
+
+            if chunk:
+                total += len(chunk)
+                yield chunk
+        except etree.XMLSyntaxError as e:
+            self.errors.append(f"XML syntax error in {file_path}: {e}")
+        except OSError as e:
+            self.errors.append(f"Cannot parse XML {file_path}: {e}")
+        finally:
+            elapsed = time.perf_counter() - t_start
+            self.stream_stats = {
+                "facts": total,
+                "deferred": len(deferred),
+                "elapsed_s": round(elapsed, 3),
+                "facts_per_second": round(total / elapsed, 1) if elapsed else 0.0,
+                "peak_rss_mb": _peak_rss_mb(),
+            }
+            logger.info(
+                "XML streaming complete: %d facts from %s in %.2fs "
+                "(%.0f facts/s, peak RSS %s MB)",
+                total,
+                file_path.name,
+                elapsed,
+                self.stream_stats["facts_per_second"],
+                self.stream_stats["peak_rss_mb"],
             )
-            self.facts.append(fact)
 
-        logger.info(
-            "XML parsing complete: %d facts from %s", len(self.facts), file_path.name
+    def _collect_lookup(
+        self,
+        elem,
+        contexts: dict,
+        units: dict,
+        fallback_contexts: dict,
+        fallback_units: dict,
+    ) -> None:
+        """Record ``elem`` in the context/unit lookups if it is one."""
+        tag = elem.tag
+        if not isinstance(tag, str) or "}" not in tag:
+            return
+        namespace, _, local = tag[1:].partition("}")
+        elem_id = elem.get("id")
+        if not elem_id:
+            return
+        is_xbrli = namespace == XBRLI_NS
+        if local == "context":
+            target = contexts if is_xbrli else fallback_contexts
+            target[elem_id] = self._context_info(elem)
+        elif local == "unit":
+            measure = self._unit_measure(elem)
+            if measure is not None:
+                target = units if is_xbrli else fallback_units
+                target[elem_id] = measure
+
+    def _element_to_fact(
+        self, elem, contexts: dict, units: dict, nsmap: dict
+    ) -> Optional[XBRLFact]:
+        """Map one instance element to an XBRLFact, or None if it is not a fact."""
+        tag = elem.tag
+        if not isinstance(tag, str):
+            return None
+
+        if tag[0] == "{":
+            namespace, _, local_name = tag[1:].partition("}")
+        else:
+            namespace, local_name = "", tag
+
+        # Skip XBRL infrastructure elements (contexts, units, links, etc.)
+        if namespace in SKIP_NAMESPACES:
+            return None
+
+        text = (elem.text or "").strip()
+        if not text:
+            return None
+
+        # Build concept name
+        concept = self._build_concept_name(namespace, local_name, nsmap)
+
+        # Get context reference for period info
+        context_ref = elem.get("contextRef")
+        period_info = contexts.get(context_ref, {}) if context_ref else {}
+
+        # Get unit reference
+        unit_ref = elem.get("unitRef")
+        unit = units.get(unit_ref, self.default_unit) if unit_ref else None
+
+        # Get decimals
+        decimals_str = elem.get("decimals")
+        decimals = None
+        if decimals_str and decimals_str not in ("INF", "inf"):
+            try:
+                decimals = int(decimals_str)
+            except ValueError:
+                pass
+
+        # Determine value type
+        value_numeric = None
+        value_text = None
+        value_boolean = None
+
+        if text.lower() in ("true", "false"):
+            value_boolean = text.lower() == "true"
+        else:
+            try:
+                value_numeric = float(text.replace(",", ""))
+            except ValueError:
+                value_text = text
+
+        return XBRLFact(
+            ticker=self.ticker,
+            concept=concept,
+            label_en=local_name,
+            value_numeric=value_numeric,
+            value_text=value_text,
+            value_boolean=value_boolean,
+            unit=unit,
+            decimals=decimals,
+            period_start=period_info.get("period_start"),
+            period_end=period_info.get("period_end"),
+            period_instant=period_info.get("period_instant"),
+            dimension_member=period_info.get("dimension_member"),
+            dimension_value=period_info.get("dimension_value"),
+            source_url=self.source_url,
+            filing_id=self.filing_id,
         )
-        return self.facts
 
     def _parse_contexts(self, root, nsmap: dict) -> dict:
         """Parse xbrli:context elements to build period lookup.
@@ -507,43 +735,47 @@ class XBRLProcessor:
             if not ctx_id:
                 continue
 
-            info = {
-                "period_start": None,
-                "period_end": None,
-                "period_instant": None,
-                "dimension_member": None,
-                "dimension_value": None,
-            }
-
-            # Parse period
-            for period_elem in ctx.iter():
-                tag = period_elem.tag if isinstance(period_elem.tag, str) else ""
-                local = tag.split("}")[-1] if "}" in tag else tag
-                text = (period_elem.text or "").strip()
-
-                if local == "startDate" and text:
-                    info["period_start"] = self._safe_parse_date(text)
-                elif local == "endDate" and text:
-                    info["period_end"] = self._safe_parse_date(text)
-                elif local == "instant" and text:
-                    info["period_instant"] = self._safe_parse_date(text)
-
-            # Parse dimension (scenario/segment explicit members)
-            for member_elem in ctx.iter():
-                tag = member_elem.tag if isinstance(member_elem.tag, str) else ""
-                local = tag.split("}")[-1] if "}" in tag else tag
-
-                if local == "explicitMember":
-                    dimension = member_elem.get("dimension", "")
-                    value = (member_elem.text or "").strip()
-                    if dimension:
-                        info["dimension_member"] = dimension
-                        info["dimension_value"] = value
-
-            contexts[ctx_id] = info
+            contexts[ctx_id] = self._context_info(ctx)
 
         return contexts
 
+    def _context_info(self, ctx) -> dict:
+        """Extract period and dimension info from one xbrli:context element."""
+        info = {
+            "period_start": None,
+            "period_end": None,
+            "period_instant": None,
+            "dimension_member": None,
+            "dimension_value": None,
+        }
+
+        # Parse period
+        for period_elem in ctx.iter():
+            tag = period_elem.tag if isinstance(period_elem.tag, str) else ""
+            local = tag.split("}")[-1] if "}" in tag else tag
+            text = (period_elem.text or "").strip()
+
+            if local == "startDate" and text:
+                info["period_start"] = self._safe_parse_date(text)
+            elif local == "endDate" and text:
+                info["period_end"] = self._safe_parse_date(text)
+            elif local == "instant" and text:
+                info["period_instant"] = self._safe_parse_date(text)
+
+        # Parse dimension (scenario/segment explicit members)
+        for member_elem in ctx.iter():
+            tag = member_elem.tag if isinstance(member_elem.tag, str) else ""
+            local = tag.split("}")[-1] if "}" in tag else tag
+
+            if local == "explicitMember":
+                dimension = member_elem.get("dimension", "")
+                value = (member_elem.text or "").strip()
+                if dimension:
+                    info["dimension_member"] = dimension
+                    info["dimension_value"] = value
+
+        return info
+
     def _parse_units(self, root, nsmap: dict) -> dict:
         """Parse xbrli:unit elements to build unit lookup.
 
@@ -564,21 +796,27 @@ class XBRLProcessor:
             if not unit_id:
                 continue
 
-            # Look for measure element
-            for measure in unit_elem.iter():
-                tag = measure.tag if isinstance(measure.tag, str) else ""
-                local = tag.split("}")[-1] if "}" in tag else tag
-                if local == "measure":
-                    text = (measure.text or "").strip()
-                    # Extract currency code from namespace-prefixed value
-                    # e.g., "iso4217:SAR" -> "SAR"
-                    if ":" in text:
-                        text = text.split(":")[-1]
-                    units[unit_id] = text
-                    break
+            measure = self._unit_measure(unit_elem)
+            if measure is not None:
+                units[unit_id] = measure
 
         return units
 
+    @staticmethod
+    def _unit_measure(unit_elem) -> Optional[str]:
+        """Return the first measure of a unit element, without its prefix."""
+        for measure in unit_elem.iter():
+            tag = measure.tag if isinstance(measure.tag, str) else ""
+            local = tag.split("}")[-1] if "}" in tag else tag
+            if local == "measure":
+                text = (measure.text or "").strip()
+                # Extract currency code from namespace-prefixed value
+                # e.g., "iso4217:SAR" -> "SAR"
+                if ":" in text:
+                    text = text.split(":")[-1]
+                return text
+        return None
+
     def _build_concept_name(self, namespace: str, local_name: str, nsmap: dict) -> str:
         """Build a prefixed concept name from namespace and local name.
 
@@ -857,6 +1095,67 @@ class XBRLProcessor:
         return False
 
 
+@dataclass
+class ParseResult:
+    """Outcome of :func:`parse_filing` in a worker process."""
+
+    facts: list[XBRLFact]
+    errors: list[str]
+    elapsed_s: float
+    worker_pid: int
+
+
+def parse_filing(
+    file_path: Path,
+    ticker: str,
+    filing_id: Optional[str] = None,
+    source_url: Optional[str] = None,
+    default_unit: str = "SAR",
+) -> ParseResult:
+    """Parse one filing; the process-pool entry point for multi-file modes."""
+    t_start = time.perf_counter()
+    processor = XBRLProcessor(
+        ticker=ticker,
+        filing_id=filing_id,
+        source_url=source_url,
+        default_unit=default_unit,
+    )
+    facts = processor.process_filing(file_path)
+    return ParseResult(
+        facts=facts,
+        errors=processor.errors,
+        elapsed_s=time.perf_counter() - t_start,
+        worker_pid=os.getpid(),
+    )
+
+
+def ticker_from_filename(file_path: Path) -> Optional[str]:
+    """Return the ticker a filing is named after (e.g. '2222.SR_annual.xml')."""
+    parts = Path(file_path).stem.split("_")
+    if parts and ".SR" in parts[0]:
+        return parts[0]
+    return None
+
+
+def _release(elem) -> None:
+    """Free a processed top-level iterparse element and its earlier siblings."""
+    elem.clear(keep_tail=True)
+    parent = elem.getparent()
+    if parent is not None:
+        while elem.getprevious() is not None:
+            del parent[0]
+
+
+def _peak_rss_mb() -> Optional[float]:
+    """Peak resident set size of this process in MB (None if unavailable)."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and KiB elsewhere
+    divisor = 1024 * 1024 if sys.platform == "darwin" else 1024
+    return round(peak / divisor, 1)
+
+
 # ---------------------------------------------------------------------------
 # Database operations
 # ---------------------------------------------------------------------------
@@ -867,8 +1166,46 @@ def _get_connection(pg_conn_or_pool):
     return pg_conn_or_pool
 
 
-def insert_facts(pg_conn, facts: list[XBRLFact], dry_run: bool = False) -> int:
-    """Insert XBRL facts into PostgreSQL. Returns count of rows inserted."""
+def filter_new_facts(pg_conn, facts: list[XBRLFact]) -> list[XBRLFact]:
+    """Drop facts whose content_hash is already stored or repeated in ``facts``.
+
+    Looks the hashes up in batches of HASH_LOOKUP_SIZE, so facts that
+    ``ON CONFLICT DO NOTHING`` would discard are never sent to PostgreSQL.
+    """
+    seen = set()
+    unique = []
+    for fact in facts:
+        if fact.content_hash not in seen:
+            seen.add(fact.content_hash)
+            unique.append(fact)
+
+    if pg_conn is None or not unique:
+        return unique
+
+    existing = set()
+    cur = pg_conn.cursor()
+    for i in range(0, len(unique), HASH_LOOKUP_SIZE):
+        hashes = [f.content_hash for f in unique[i : i + HASH_LOOKUP_SIZE]]
+        cur.execute(EXISTING_HASHES_SQL, (hashes,))
+        existing.update(row[0] for row in cur.fetchall())
+    cur.close()
+
+    if not existing:
+        return unique
+    return [f for f in unique if f.content_hash not in existing]
+
+
+def insert_facts(
+    pg_conn,
+    facts: list[XBRLFact],
+    dry_run: bool = False,
+    skip_existing: bool = False,
+) -> int:
+    """Insert XBRL facts into PostgreSQL. Returns count of rows inserted.
+
+    With ``skip_existing``, facts already in xbrl_facts are filtered out
+    first (see :func:`filter_new_facts`) and only new rows are sent.
+    """
     if not facts:
         return 0
 
@@ -876,6 +1213,16 @@ def insert_facts(pg_conn, facts: list[XBRLFact], dry_run: bool = False) -> int:
         logger.info("Would insert %d facts (dry run)", len(facts))
         return len(facts)
 
+    if skip_existing:
+        total = len(facts)
+        facts = filter_new_facts(pg_conn, facts)
+        if len(facts) < total:
+            logger.info(
+                "Skipping %d of %d facts already stored", total - len(facts), total
+            )
+        if not facts:
+            return 0
+
     rows = [f.to_insert_tuple() for f in facts]
     cur = pg_conn.cursor()
     inserted = 0
@@ -990,6 +1337,17 @@ def parse_args():
     parser.add_argument(
         "--dry-run", action="store_true", help="Print plan without writing"
     )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Stream XML filings in chunks (bounded memory for large filings)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Parser processes for --dir mode (default: INGESTION_XBRL_WORKERS or 1)",
+    )
     parser.add_argument("--pg-host", default=os.environ.get("PG_HOST", "localhost"))
     parser.add_argument(
         "--pg-port", type=int, default=int(os.environ.get("PG_PORT", "5432"))
@@ -1007,14 +1365,20 @@ def process_single_file(
     source: str,
     pg_conn,
     dry_run: bool,
+    stream: bool = False,
 ) -> tuple[int, list[str]]:
-    """Process a single filing file. Returns (facts_count, errors)."""
-    print(f"\nProcessing: {file_path.name} (ticker: {ticker})")
+    """Process a single filing file. Returns (facts_count, errors).
+
+    With ``stream=True``, XML filings are parsed by
+    :meth:`XBRLProcessor.iter_xml_facts` and each chunk is inserted as soon
+    as it is produced instead of after the whole document is parsed.
+    """
+    logger.info("Processing: %s (ticker: %s)", file_path.name, ticker)
 
     # Skip already-processed filings
     if pg_conn and not dry_run:
         if check_filing_exists(pg_conn, ticker, str(file_path)):
-            print("  Skipped: already processed")
+            logger.info("  Skipped: already processed")
             return 0, []
 
     # Create filing record
@@ -1035,21 +1399,35 @@ def process_single_file(
         filing_id=filing_id,
         source_url=str(file_path),
     )
-    facts = processor.process_filing(file_path)
+    if stream and file_path.suffix.lower() in (".xml", ".xbrl"):
+        extracted = count = 0
+        for chunk in processor.iter_xml_facts(file_path):
+            extracted += len(chunk)
+            count += insert_facts(pg_conn, chunk, dry_run)
+        stats = processor.stream_stats
+        logger.info(
+            "  Streamed in %.2fs: %.0f facts/s, peak RSS %s MB",
+            stats["elapsed_s"],
+            stats["facts_per_second"],
+            stats["peak_rss_mb"],
+        )
+    else:
+        facts = processor.process_filing(file_path)
+        extracted = len(facts)
+        # Insert facts
+        count = insert_facts(pg_conn, facts, dry_run)
 
     if processor.errors:
-        print(f"  Warnings: {len(processor.errors)}")
+        logger.warning("  Warnings: %d", len(processor.errors))
         for err in processor.errors[:5]:
-            print(f"    - {err}")
+            logger.warning("    - %s", err)
         if len(processor.errors) > 5:
-            print(f"    ... and {len(processor.errors) - 5} more")
+            logger.warning("    ... and %d more", len(processor.errors) - 5)
 
-    # Insert facts
-    count = insert_facts(pg_conn, facts, dry_run)
-    print(f"  Facts extracted: {len(facts)}, Inserted: {count}")
+    logger.info("  Facts extracted: %d, Inserted: %d", extracted, count)
 
     # Update filing status
-    if facts:
+    if extracted:
         mark_filing_complete(pg_conn, filing_id, dry_run)
     else:
         mark_filing_failed(pg_conn, filing_id, dry_run)
@@ -1057,9 +1435,102 @@ def process_single_file(
     return count, processor.errors
 
 
+def process_files_parallel(
+    files: list[tuple[Path, str]],
+    filing_type: str,
+    source: str,
+    pg_conn,
+    dry_run: bool,
+    workers: int,
+) -> tuple[int, list[str], dict]:
+    """Parse (file, ticker) pairs on a process pool and insert from here.
+
+    Filing rows are created and facts inserted in the calling process, the
+    only one holding ``pg_conn``; workers just parse. Inserts skip facts
+    whose content_hash is already stored.
+
+    Returns:
+        (facts inserted, errors, per-worker stats). The stats map each
+        worker pid to files, facts, parse_s and facts_per_second.
+    """
+    total = 0
+    all_errors: list[str] = []
+    worker_stats: dict = {}
+
+    pending = {}
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for file_path, ticker in files:
+            if pg_conn and not dry_run:
+                if check_filing_exists(pg_conn, ticker, str(file_path)):
+                    logger.info("  Skipped %s: already processed", file_path.name)
+                    continue
+            filing_id = create_filing(
+                pg_conn,
+                ticker,
+                filing_type,
+                date.today(),
+                source,
+                str(file_path),
+                dry_run,
+            )
+            future = pool.submit(
+                parse_filing, file_path, ticker, filing_id, str(file_path)
+            )
+            pending[future] = (file_path, filing_id)
+
+        for future in as_completed(pending):
+            file_path, filing_id = pending[future]
+            try:
+                result = future.result()
+            except Exception as e:
+                all_errors.append(f"Error processing {file_path.name}: {e}")
+                logger.error("Error processing %s: %s", file_path.name, e)
+                mark_filing_failed(pg_conn, filing_id, dry_run)
+                continue
+
+            all_errors.extend(result.errors)
+            count = insert_facts(pg_conn, result.facts, dry_run, skip_existing=True)
+            total += count
+            logger.info(
+                "  %s: %d facts extracted, %d inserted (%.2fs)",
+                file_path.name,
+                len(result.facts),
+                count,
+                result.elapsed_s,
+            )
+            if result.facts:
+                mark_filing_complete(pg_conn, filing_id, dry_run)
+            else:
+                mark_filing_failed(pg_conn, filing_id, dry_run)
+
+            stats = worker_stats.setdefault(
+                result.worker_pid, {"files": 0, "facts": 0, "parse_s": 0.0}
+            )
+            stats["files"] += 1
+            stats["facts"] += len(result.facts)
+            stats["parse_s"] += result.elapsed_s
+
+    for pid, stats in sorted(worker_stats.items()):
+        stats["parse_s"] = round(stats["parse_s"], 3)
+        stats["facts_per_second"] = (
+            round(stats["facts"] / stats["parse_s"], 1) if stats["parse_s"] else 0.0
+        )
+        logger.info(
+            "Worker %d: %d files, %d facts in %.2fs (%.0f facts/s)",
+            pid,
+            stats["files"],
+            stats["facts"],
+            stats["parse_s"],
+            stats["facts_per_second"],
+        )
+    return total, all_errors, worker_stats
+
+
 def main():
     args = parse_args()
     t_start = time.time()
+    # Per-file progress is logged by the helpers shared with the scheduler
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
 
     print("=" * 60)
     print("XBRL Processor")
@@ -1105,6 +1576,7 @@ def main():
                 args.source,
                 pg_conn,
                 args.dry_run,
+                args.stream,
             )
             total_facts += count
             total_errors.extend(errors)
@@ -1147,22 +1619,40 @@ def main():
                 sys.exit(1)
 
             files = sorted(dir_path.glob(args.ticker_pattern))
-            supported = {".xml", ".xbrl", ".xlsx", ".xls"}
-            files = [f for f in files if f.suffix.lower() in supported]
+            files = [f for f in files if f.suffix.lower() in SUPPORTED_EXTENSIONS]
             print(f"Found {len(files)} supported files")
 
+            jobs = []
             for file_path in files:
                 # Try to extract ticker from filename (e.g., '2222.SR_annual.xlsx')
-                ticker = args.ticker
+                ticker = args.ticker or ticker_from_filename(file_path)
                 if not ticker:
-                    stem = file_path.stem
-                    parts = stem.split("_")
-                    if parts and ".SR" in parts[0]:
-                        ticker = parts[0]
-                    else:
-                        print(f"  Skipping {file_path.name}: cannot determine ticker")
-                        continue
+                    print(f"  Skipping {file_path.name}: cannot determine ticker")
+                    continue
+                jobs.append((file_path, ticker))
+
+            workers = args.workers or IngestionConfig().xbrl_workers
+            if workers > 1 and len(jobs) > 1:
+                print(f"Parsing with {workers} worker processes")
+                count, errors, worker_stats = process_files_parallel(
+                    jobs,
+                    args.filing_type,
+                    args.source,
+                    pg_conn,
+                    args.dry_run,
+                    workers,
+                )
+                total_facts += count
+                total_errors.extend(errors)
+                for pid, stats in sorted(worker_stats.items()):
+                    print(
+                        f"  Worker {pid}: {stats['files']} files, "
+                        f"{stats['facts']} facts, "
+                        f"{stats['facts_per_second']:.0f} facts/s"
+                    )
+                jobs = []
 
+            for file_path, ticker in jobs:
                 count, errors = process_single_file(
                     file_path,
                     ticker,
@@ -1170,6 +1660,7 @@ def main():
                     args.source,
                     pg_conn,
                     args.dry_run,
+                    args.stream,
                 )
                 total_facts += count
                 total_errors.extend(errors)
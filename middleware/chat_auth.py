@@ -3,27 +3,32 @@ Chat authentication middleware.
 Validates JWT bearer tokens for Vanna chat endpoints.
 Anonymous access is allowed — a missing token passes through,
 but a present-and-invalid token returns 401.
+Pure ASGI, so the chat SSE stream is passed through untouched.
 """
 
 import logging
-from fastapi import Request
+
 from fastapi.responses import JSONResponse
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Receive, Scope, Send
 
 logger = logging.getLogger(__name__)
 
 _PROTECTED_PATHS = {"/api/vanna/v2/chat_sse", "/api/vanna/v2/chat_poll"}
 
 
-class ChatAuthMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next):
-        if request.url.path in _PROTECTED_PATHS:
-            auth_header = request.headers.get("authorization", "")
+class ChatAuthMiddleware:
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http" and scope["path"] in _PROTECTED_PATHS:
+            auth_header = Headers(scope=scope).get("authorization", "")
             if auth_header.lower().startswith("bearer "):
                 token = auth_header[7:]
                 logger.debug(
                     "ChatAuthMiddleware: validating bearer token for %s",
-                    request.url.path,
+                    scope["path"],
                 )
                 try:
                     from auth.jwt_handler import decode_token
@@ -31,8 +36,10 @@ class ChatAuthMiddleware(BaseHTTPMiddleware):
                     decode_token(token, expected_type="access")
                 except Exception as exc:
                     logger.debug("ChatAuthMiddleware: token validation failed: %s", exc)
-                    return JSONResponse(
+                    response = JSONResponse(
                         status_code=401,
                         content={"detail": "Invalid or expired authentication token"},
                     )
-        return await call_next(request)
+                    await response(scope, receive, send)
+                    return
+        await self.app(scope, receive, send)
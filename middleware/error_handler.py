@@ -1,9 +1,10 @@
 """
 Global error handler middleware and exception handlers.
 
-Catches unhandled exceptions and returns a safe JSON response with a
-consistent ``{"error": {"code": ..., "message": ..., "request_id": ...}}``
-structure.
+Pure-ASGI middleware (no ``BaseHTTPMiddleware`` task group or response
+wrapping, so streamed responses pass straight through). Catches unhandled
+exceptions and returns a safe JSON response with a consistent
+``{"error": {"code": ..., "message": ..., "request_id": ...}}`` structure.
 
 Specific built-in exceptions are mapped to appropriate HTTP status codes:
 - ``ValueError`` -> 400 (BAD_REQUEST)
@@ -27,9 +28,9 @@ import os
 import uuid
 from typing import TYPE_CHECKING
 
-from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.requests import Request
 from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 if TYPE_CHECKING:
     from fastapi import FastAPI
@@ -97,48 +98,78 @@ def _error_response(
     )
 
 
-class ErrorHandlerMiddleware(BaseHTTPMiddleware):
+class ErrorHandlerMiddleware:
     """Catches unhandled exceptions and returns a JSON error response.
 
     Known exception types are mapped to specific HTTP status codes.
     Unknown exceptions always return 500.  Stack traces are logged
     server-side but never included in the HTTP response (unless
     ``SERVER_DEBUG`` is enabled, in which case the error message is
-    included for developer convenience).
+    included for developer convenience).  An exception raised after the
+    response has started is logged and re-raised, since no error body can
+    be sent at that point.
     """
 
-    async def dispatch(self, request: Request, call_next):
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
         # Ensure request_id is available for the entire request lifecycle
+        request = Request(scope)
         request_id = _get_request_id(request)
         request.state.request_id = request_id
         if _set_request_id_ctx is not None:
             _set_request_id_ctx(request_id)
 
+        response_started = False
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
         try:
-            return await call_next(request)
+            await self.app(scope, receive, send_wrapper)
         except Exception as exc:
+            method, path = scope["method"], scope["path"]
+            if response_started:
+                logger.exception(
+                    "Exception after response started on %s %s [request_id=%s]",
+                    method,
+                    path,
+                    request_id,
+                )
+                raise
+
             # Check for a mapped exception type
             for exc_type, (status_code, code) in _EXCEPTION_MAP.items():
                 if isinstance(exc, exc_type):
                     logger.warning(
                         "%s on %s %s: %s [request_id=%s]",
                         exc_type.__name__,
-                        request.method,
-                        request.url.path,
+                        method,
+                        path,
                         exc,
                         request_id,
                     )
-                    return _error_response(status_code, code, str(exc), request_id)
-
-            # Unmapped / unexpected exception -> 500
-            logger.exception(
-                "Unhandled exception on %s %s [request_id=%s]",
-                request.method,
-                request.url.path,
-                request_id,
-            )
-            message = str(exc) if _DEBUG else "Internal server error"
-            return _error_response(500, "INTERNAL_ERROR", message, request_id)
+                    response = _error_response(status_code, code, str(exc), request_id)
+                    break
+            else:
+                # Unmapped / unexpected exception -> 500
+                logger.exception(
+                    "Unhandled exception on %s %s [request_id=%s]",
+                    method,
+                    path,
+                    request_id,
+                )
+                message = str(exc) if _DEBUG else "Internal server error"
+                response = _error_response(500, "INTERNAL_ERROR", message, request_id)
+            await response(scope, receive, send)
 
 
 def install_exception_handlers(app: "FastAPI") -> None:
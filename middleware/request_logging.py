@@ -4,6 +4,9 @@ Request logging middleware.
 Logs method, path, status code, duration, client IP (anonymized), and
 request_id for each request as structured JSON-compatible log records.
 Uses Python logging with extra fields compatible with config/logging_config.py.
+
+Pure-ASGI: the record is written when the response starts, so duration is
+time-to-headers and streamed bodies (SSE) are never held back.
 """
 
 from __future__ import annotations
@@ -13,8 +16,8 @@ import logging
 import time
 from typing import List
 
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.requests import Request
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 logger = logging.getLogger("tasi.access")
 
@@ -37,7 +40,7 @@ def _anonymize_ip(ip: str) -> str:
     return ip
 
 
-class RequestLoggingMiddleware(BaseHTTPMiddleware):
+class RequestLoggingMiddleware:
     """Logs HTTP requests with timing, request_id, and anonymized client IP.
 
     Parameters
@@ -49,43 +52,62 @@ class RequestLoggingMiddleware(BaseHTTPMiddleware):
         Merged with a default set that includes /docs, /redoc, /openapi.json.
     """
 
-    def __init__(self, app, skip_paths: List[str] | None = None) -> None:
-        super().__init__(app)
+    def __init__(self, app: ASGIApp, skip_paths: List[str] | None = None) -> None:
+        self.app = app
         self.skip_paths: set[str] = _DEFAULT_SKIP_PATHS | set(skip_paths or [])
 
-    async def dispatch(self, request: Request, call_next):
-        path = request.url.path
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        path = scope["path"]
         if path in self.skip_paths:
-            return await call_next(request)
+            await self.app(scope, receive, send)
+            return
 
-        raw_ip = request.client.host if request.client else "unknown"
-        client_ip = _anonymize_ip(raw_ip)
-        request_id = getattr(request.state, "request_id", "unknown")
+        client = scope.get("client")
+        client_ip = _anonymize_ip(client[0] if client else "unknown")
+        request_id = scope.get("state", {}).get("request_id", "unknown")
+        method = scope["method"]
         start = time.perf_counter()
 
-        response = await call_next(request)
-        response.headers["X-Request-ID"] = request_id
-
-        duration_ms = (time.perf_counter() - start) * 1000
-        status_code = response.status_code
-
-        # Structured log data (JSON-compatible)
-        log_data = {
-            "method": request.method,
-            "path": path,
-            "status_code": status_code,
-            "response_time_ms": round(duration_ms, 1),
-            "client_ip": client_ip,
-            "request_id": request_id,
-        }
-
-        msg = json.dumps(log_data, ensure_ascii=False)
-
-        if status_code < 400:
-            logger.info(msg)
-        elif status_code < 500:
-            logger.warning(msg)
-        else:
-            logger.error(msg)
-
-        return response
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message)["X-Request-ID"] = request_id
+                _log_request(
+                    method, path, message["status"], start, client_ip, request_id
+                )
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
+
+
+def _log_request(
+    method: str,
+    path: str,
+    status_code: int,
+    start: float,
+    client_ip: str,
+    request_id: str,
+) -> None:
+    duration_ms = (time.perf_counter() - start) * 1000
+
+    # Structured log data (JSON-compatible)
+    log_data = {
+        "method": method,
+        "path": path,
+        "status_code": status_code,
+        "response_time_ms": round(duration_ms, 1),
+        "client_ip": client_ip,
+        "request_id": request_id,
+    }
+
+    msg = json.dumps(log_data, ensure_ascii=False)
+
+    if status_code < 400:
+        logger.info(msg)
+    elif status_code < 500:
+        logger.warning(msg)
+    else:
+        logger.error(msg)
@@ -0,0 +1,238 @@
+"""
+In-process broadcast hub for SSE fan-out.
+
+One publisher, many asyncio subscribers: each subscriber owns a bounded
+``asyncio.Queue`` and a slow client only ever loses its own oldest
+messages (drop-oldest), never blocks the publisher or other clients.
+``publish`` is thread-safe, so background threads (schedulers, Redis
+listeners) can publish straight into the event loop.
+
+``RedisRelay`` is the one Redis pub/sub subscriber a process needs to
+feed a hub from other processes: a single daemon thread, however many
+SSE clients are connected.
+
+Usage:
+    from services.broadcast import BroadcastHub
+
+    hub = BroadcastHub("news")
+
+    # SSE endpoint (event loop)
+    with hub.subscribe() as sub:
+        message = await sub.get(timeout=15)
+
+    # any thread
+    hub.publish({"id": "..."})
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+from typing import Any, Callable, Dict, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_QUEUE_SIZE = 64
+
+
+class Subscription:
+    """A subscriber's bounded queue; the oldest message is dropped when full."""
+
+    def __init__(
+        self, hub: "BroadcastHub", loop: asyncio.AbstractEventLoop, maxsize: int
+    ):
+        self._hub = hub
+        self.loop = loop
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+        self.dropped = 0
+
+    def offer(self, message: Any) -> None:
+        """Enqueue ``message`` (event-loop thread only), evicting the oldest if full."""
+        if self._queue.full():
+            try:
+                self._queue.get_nowait()
+            except asyncio.QueueEmpty:
+                pass
+            self.dropped += 1
+            self._hub._count_dropped()
+        self._queue.put_nowait(message)
+
+    async def get(self, timeout: Optional[float] = None) -> Any:
+        """Return the next message; raises ``asyncio.TimeoutError`` on timeout."""
+        if timeout is None:
+            return await self._queue.get()
+        return await asyncio.wait_for(self._queue.get(), timeout)
+
+    def get_nowait(self) -> Any:
+        """Return a queued message or raise ``asyncio.QueueEmpty``."""
+        return self._queue.get_nowait()
+
+    def qsize(self) -> int:
+        return self._queue.qsize()
+
+    def close(self) -> None:
+        self._hub._unsubscribe(self)
+
+    def __enter__(self) -> "Subscription":
+        return self
+
+    def __exit__(self, *_: Any) -> None:
+        self.close()
+
+
+class BroadcastHub:
+    """Fan-out of published messages to every current subscriber.
+
+    Args:
+        name: Human-readable name for log messages.
+        queue_size: Default per-subscriber queue bound.
+    """
+
+    def __init__(self, name: str, queue_size: int = DEFAULT_QUEUE_SIZE):
+        self.name = name
+        self._queue_size = queue_size
+        # Subscribers grouped by event loop so a cross-thread publish costs
+        # one call_soon_threadsafe per loop, not per subscriber.
+        self._subs: Dict[asyncio.AbstractEventLoop, Set[Subscription]] = {}
+        self._lock = threading.Lock()
+        self._published = 0
+        self._dropped = 0
+
+    def subscribe(self, queue_size: Optional[int] = None) -> Subscription:
+        """Register a subscriber on the running event loop."""
+        loop = asyncio.get_running_loop()
+        sub = Subscription(self, loop, queue_size or self._queue_size)
+        with self._lock:
+            self._subs.setdefault(loop, set()).add(sub)
+        return sub
+
+    def _unsubscribe(self, sub: Subscription) -> None:
+        with self._lock:
+            subs = self._subs.get(sub.loop)
+            if subs is not None:
+                subs.discard(sub)
+                if not subs:
+                    del self._subs[sub.loop]
+
+    def _count_dropped(self) -> None:
+        with self._lock:
+            self._dropped += 1
+
+    @staticmethod
+    def _fanout(subs: Set[Subscription], message: Any) -> None:
+        for sub in subs:
+            sub.offer(message)
+
+    def publish(self, message: Any) -> int:
+        """Deliver ``message`` to all subscribers; safe to call from any thread.
+
+        Returns the number of subscribers the message was dispatched to.
+        """
+        with self._lock:
+            self._published += 1
+            targets = [(loop, set(subs)) for loop, subs in self._subs.items()]
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        count = 0
+        for loop, subs in targets:
+            if loop is running:
+                self._fanout(subs, message)
+            else:
+                try:
+                    loop.call_soon_threadsafe(self._fanout, subs, message)
+                except RuntimeError:
+                    # Loop closed without its subscribers unsubscribing
+                    with self._lock:
+                        self._subs.pop(loop, None)
+                    continue
+            count += len(subs)
+        return count
+
+    def subscriber_count(self) -> int:
+        with self._lock:
+            return sum(len(subs) for subs in self._subs.values())
+
+    def get_stats(self) -> Dict[str, int]:
+        """Return subscriber and delivery counters for health endpoints."""
+        with self._lock:
+            return {
+                "subscribers": sum(len(subs) for subs in self._subs.values()),
+                "published": self._published,
+                "dropped": self._dropped,
+            }
+
+
+class RedisRelay:
+    """Single per-process Redis pub/sub listener thread.
+
+    Every message received on ``channel`` is decoded to ``str`` and passed
+    to ``on_message`` (typically a function that publishes to a hub).
+
+    Args:
+        redis_client: A synchronous ``redis.Redis`` instance.
+        channel: Pub/sub channel to subscribe to.
+        on_message: Callback invoked on the listener thread.
+        name: Thread name.
+    """
+
+    def __init__(
+        self,
+        redis_client: Any,
+        channel: str,
+        on_message: Callable[[str], None],
+        name: str = "redis-relay",
+    ):
+        self._redis = redis_client
+        self.channel = channel
+        self._on_message = on_message
+        self._name = name
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        if self.is_running():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name=self._name, daemon=True)
+        self._thread.start()
+        logger.info("%s listening on channel %s", self._name, self.channel)
+
+    def stop(self, timeout: float = 2.0) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=timeout)
+            self._thread = None
+
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def _run(self) -> None:
+        pubsub = self._redis.pubsub(ignore_subscribe_messages=True)
+        try:
+            pubsub.subscribe(self.channel)
+            while not self._stop.is_set():
+                try:
+                    message = pubsub.get_message(timeout=1.0)
+                except Exception as exc:
+                    logger.warning("%s: pub/sub error: %s", self._name, exc)
+                    self._stop.wait(1.0)
+                    continue
+                if not message or message.get("type") != "message":
+                    continue
+                data = message["data"]
+                if isinstance(data, bytes):
+                    data = data.decode("utf-8")
+                try:
+                    self._on_message(data)
+                except Exception:
+                    logger.debug(
+                        "%s: message handler failed", self._name, exc_info=True
+                    )
+        finally:
+            try:
+                pubsub.close()
+            except Exception:
+                pass
@@ -76,6 +76,10 @@ class TTLCache:
             while len(self._store) > self._max_entries:
                 self._store.popitem(last=False)
 
+    def clear(self) -> None:
+        with self._lock:
+            self._store.clear()
+
 
 # Module-level singleton -- shared across all decorated functions.
 _fallback_cache = TTLCache()
@@ -430,6 +430,9 @@ def check_tasi_index() -> ComponentHealth:
         parts.append(f"circuit_breaker={circuit_state}")
         if consecutive_failures > 0:
             parts.append(f"failures={consecutive_failures}")
+        coalesced = cache_info.get("singleflight", {}).get("coalesced", 0)
+        if coalesced > 0:
+            parts.append(f"coalesced={coalesced}")
         message = ", ".join(parts)
 
         # Determine status
@@ -627,10 +630,27 @@ def _get_build_info() -> Dict[str, Any]:
 def get_pool_stats() -> Dict[str, Any]:
     """Return connection pool statistics for the active backend.
 
-    For SQLite: returns pool_size from the SQLitePool instance.
-    For PostgreSQL: returns minconn/maxconn from ThreadedConnectionPool.
+    For SQLite: returns pool_size and acquire-wait stats from the SQLitePool.
+    For PostgreSQL: returns min/max plus in-use, waiting, timeout and
+    acquire-wait stats from the FairConnectionPool.
+    When the async query executor is running its metrics are included
+    under ``async_executor``.
     Always returns a dict and never raises.
     """
+    stats = _backend_pool_stats()
+    try:
+        from api.async_db import get_executor_stats
+
+        executor_stats = get_executor_stats()
+        if executor_stats is not None:
+            stats["async_executor"] = executor_stats
+    except Exception:
+        pass  # executor metrics are optional
+    return stats
+
+
+def _backend_pool_stats() -> Dict[str, Any]:
+    """Return pool sizing for the configured backend (never raises)."""
     try:
         settings = get_settings()
         backend = settings.db.backend
@@ -639,14 +659,17 @@ def get_pool_stats() -> Dict[str, Any]:
 
     if backend == "postgres":
         try:
-            from database.pool import _pool as _pg_pool
+            from database.pool import FairConnectionPool, _pool as _pg_pool
 
             if _pg_pool is not None:
-                return {
+                stats = {
                     "backend": "postgres",
                     "min": _pg_pool.minconn,
                     "max": _pg_pool.maxconn,
                 }
+                if isinstance(_pg_pool, FairConnectionPool):
+                    stats.update(_pg_pool.get_stats())
+                return stats
             return {"backend": "postgres", "pool_size": "unknown"}
         except Exception:
             return {"backend": "postgres", "pool_size": "unknown"}
@@ -655,8 +678,10 @@ def get_pool_stats() -> Dict[str, Any]:
             from services.sqlite_pool import _pool as _sq_pool
 
             if _sq_pool is not None:
-                pool_size = _sq_pool.pool_size
-                return {"backend": "sqlite", "pool_size": pool_size}
+                stats = {"backend": "sqlite", "pool_size": _sq_pool.pool_size}
+                if hasattr(_sq_pool, "get_stats"):
+                    stats.update(_sq_pool.get_stats())
+                return stats
             return {"backend": "sqlite", "pool_size": "unknown"}
         except Exception:
             return {"backend": "sqlite", "pool_size": "unknown"}
@@ -0,0 +1,237 @@
+"""
+Multi-pattern keyword matcher (Aho-Corasick)
+=============================================
+Finds every occurrence of a fixed set of keywords in a text in one linear
+pass, instead of one ``kw in text`` scan per keyword.  Used by the news
+scraper to extract tickers and score sentiment / market impact, where the
+keyword set is several hundred company names plus the sentiment and impact
+vocabularies.
+
+Matching is substring-based (same semantics as ``kw in text``).  Each
+keyword is either case-sensitive or case-insensitive; the automaton runs
+over ``text.lower()`` and case-sensitive hits are verified against the
+original text.
+
+The automaton is built with ``pyahocorasick`` (C extension) when it is
+installed.  Otherwise a pure-Python automaton is used: trie edges and failure
+links are built by :meth:`KeywordMatcher.compile`, and a transition that has
+to follow failure links is memoized on first use, so steady-state scanning
+costs one dict lookup per character.
+
+Usage:
+    from services.keyword_matcher import KeywordMatcher
+    matcher = KeywordMatcher()
+    matcher.add("أرباح", "positive")
+    matcher.add("IPO", "high", ignore_case=True)
+    matcher.find("أرباح قياسية بعد ipo")   # ["positive", "high"]
+    matcher.spans("أرباح قياسية")          # [(0, 5, "positive")]
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+try:
+    import ahocorasick
+except ImportError:  # pragma: no cover - depends on installed extras
+    ahocorasick = None
+
+
+class KeywordMatcher:
+    """Aho-Corasick automaton over a fixed set of keywords.
+
+    Keywords are added with :meth:`add`, each carrying an arbitrary value;
+    :meth:`find` returns the values of every keyword present in a text, in
+    the order they were added.  Adding the same keyword twice yields two
+    entries (and two values) just like two list entries would.
+
+    Args:
+        native: Use the ``pyahocorasick`` backend. Defaults to True when the
+            package is installed; False forces the pure-Python automaton.
+    """
+
+    def __init__(self, native: Optional[bool] = None) -> None:
+        if native is None:
+            native = ahocorasick is not None
+        elif native and ahocorasick is None:
+            raise ImportError("pyahocorasick is not installed")
+        self.native = native
+        # (pattern, value, ignore_case) per entry, in insertion order
+        self._entries: List[Tuple[str, Any, bool]] = []
+        self._automaton: Any = None
+        self._delta: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[Tuple[int, ...]] = [()]
+        self._compiled = False
+        # True when every keyword is case-sensitive and already lowercase, so
+        # the text can be scanned as-is (no lowering, no verification)
+        self._exact = False
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def add(self, pattern: str, value: Any, ignore_case: bool = False) -> None:
+        """Register ``pattern``; :meth:`find` reports ``value`` when it occurs."""
+        if not pattern:
+            return
+        self._entries.append((pattern, value, ignore_case))
+        self._compiled = False
+
+    def compile(self) -> "KeywordMatcher":
+        """Build the automaton. Called lazily by :meth:`find`."""
+        if self.native:
+            self._compile_native()
+        else:
+            self._compile_python()
+        self._exact = not any(
+            ignore_case or pattern != pattern.lower()
+            for pattern, _value, ignore_case in self._entries
+        )
+        self._compiled = True
+        return self
+
+    def _compile_native(self) -> None:
+        keys: Dict[str, List[int]] = {}
+        for entry_id, (pattern, _value, _ignore_case) in enumerate(self._entries):
+            keys.setdefault(pattern.lower(), []).append(entry_id)
+        automaton = ahocorasick.Automaton()
+        for key, ids in keys.items():
+            automaton.add_word(key, tuple(ids))
+        if keys:
+            automaton.make_automaton()
+        self._automaton = automaton if keys else None
+
+    def _compile_python(self) -> None:
+        delta: List[Dict[str, int]] = [{}]
+        out: List[List[int]] = [[]]
+        for entry_id, (pattern, _value, _ignore_case) in enumerate(self._entries):
+            state = 0
+            for ch in pattern.lower():
+                nxt = delta[state].get(ch)
+                if nxt is None:
+                    nxt = len(delta)
+                    delta[state][ch] = nxt
+                    delta.append({})
+                    out.append([])
+                state = nxt
+            out[state].append(entry_id)
+
+        # Breadth-first failure links; each state also reports the outputs
+        # of its failure state (keywords that are suffixes of this prefix).
+        fail = [0] * len(delta)
+        queue = deque(delta[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in delta[state].items():
+                queue.append(nxt)
+                f = fail[state]
+                while f and ch not in delta[f]:
+                    f = fail[f]
+                fail[nxt] = delta[f].get(ch, 0)
+                out[nxt].extend(out[fail[nxt]])
+
+        self._delta = delta
+        self._fail = fail
+        self._out = [tuple(ids) for ids in out]
+
+    def _resolve(self, state: int, ch: str) -> int:
+        """Follow failure links for ``ch`` and memoize the resulting edge."""
+        delta = self._delta
+        f = state
+        while True:
+            f = self._fail[f]
+            nxt = delta[f].get(ch)
+            if nxt is not None or f == 0:
+                break
+        result = nxt if nxt is not None else 0
+        delta[state][ch] = result
+        return result
+
+    def _iter_python(self, lowered: str) -> Iterator[Tuple[int, Tuple[int, ...]]]:
+        delta = self._delta
+        out = self._out
+        resolve = self._resolve
+        state = 0
+        for i, ch in enumerate(lowered):
+            nxt = delta[state].get(ch)
+            state = nxt if nxt is not None else resolve(state, ch)
+            if out[state]:
+                yield i, out[state]
+
+    def _hits(self, lowered: str) -> Iterator[Tuple[int, Tuple[int, ...]]]:
+        """Yield ``(end_index, entry_ids)`` for every keyword end in ``lowered``."""
+        if not self.native:
+            return self._iter_python(lowered)
+        if self._automaton is None:
+            return iter(())
+        return self._automaton.iter(lowered)
+
+    def find_ids(self, text: str) -> Set[int]:
+        """Return the ids (insertion indexes) of every keyword found in ``text``."""
+        if not self._compiled:
+            self.compile()
+        lowered = text if self._exact else text.lower()
+        hits = self._hits(lowered)
+        entries = self._entries
+        same_length = len(lowered) == len(text)
+        found: Set[int] = set()
+        for end, ids in hits:
+            for entry_id in ids:
+                if entry_id in found:
+                    continue
+                pattern, _value, ignore_case = entries[entry_id]
+                if ignore_case:
+                    found.add(entry_id)
+                elif same_length:
+                    if text[end + 1 - len(pattern) : end + 1] == pattern:
+                        found.add(entry_id)
+                elif pattern in text:
+                    # Lowering changed the text length; offsets don't line up
+                    found.add(entry_id)
+        return found
+
+    def find(self, text: str) -> List[Any]:
+        """Return the values of every keyword found in ``text``, in add order."""
+        entries = self._entries
+        return [entries[i][1] for i in sorted(self.find_ids(text))]
+
+    def spans(self, text: str) -> List[Tuple[int, int, Any]]:
+        """Return ``(start, end, value)`` of non-overlapping matches in ``text``.
+
+        Matches are chosen leftmost-longest, like an alternation regex with
+        longer keywords first, and returned in text order.  When several
+        entries share a keyword, the first one added is reported.
+        """
+        if not self._compiled:
+            self.compile()
+        entries = self._entries
+        if self._exact and self.native:
+            if self._automaton is None:
+                return []
+            # Every hit is an exact match; pyahocorasick picks leftmost-longest
+            return [
+                (end + 1 - len(entries[ids[0]][0]), end + 1, entries[ids[0]][1])
+                for end, ids in self._automaton.iter_long(text)
+            ]
+        lowered = text if self._exact else text.lower()
+        if len(lowered) != len(text):
+            # Keep offsets aligned with ``text``
+            lowered = "".join(
+                low if len(low) == 1 else ch
+                for ch, low in ((ch, ch.lower()) for ch in text)
+            )
+        found: List[Tuple[int, int, int]] = []
+        for end, ids in self._hits(lowered):
+            for entry_id in ids:
+                pattern, _value, ignore_case = entries[entry_id]
+                start = end + 1 - len(pattern)
+                if ignore_case or text[start : end + 1] == pattern:
+                    found.append((start, -(end + 1), entry_id))
+        result: List[Tuple[int, int, Any]] = []
+        last_end = 0
+        for start, neg_end, entry_id in sorted(found):
+            if start >= last_end:
+                last_end = -neg_end
+                result.append((start, last_end, entries[entry_id][1]))
+        return result
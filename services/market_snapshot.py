@@ -0,0 +1,297 @@
+"""
+In-memory columnar snapshot of ``companies`` + ``market_data``.
+
+The TASI universe is only ~500 rows, so the market analytics routes
+(movers, summary, sectors, heatmap, breadth) can be answered from NumPy
+arrays held in process memory instead of re-running aggregate SQL through
+``asyncio.to_thread`` on every request.
+
+The snapshot is held by a ``services.versioned_store.VersionedStore``: it
+is rebuilt when the app's ``source_version`` reader
+(``screener_snapshot.read_source_version``, which the screener triggers on
+``companies`` and ``market_data`` bump) reports a price load, and at least
+every 60 seconds otherwise, since the movers and summary routes show live
+prices.
+
+Each query method returns rows shaped exactly like the corresponding SQL
+constant in ``database/queries.py`` so routes can share their row-to-model
+conversion code between the snapshot and SQL paths.
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from services.versioned_store import (
+    DEFAULT_CHECK_INTERVAL_SECONDS,
+    RowLoader,
+    VersionedStore,
+    VersionReader,
+)
+
+logger = logging.getLogger(__name__)
+
+# Rebuild the snapshot at least this often even without a version bump.
+DEFAULT_MAX_AGE_SECONDS = 60
+
+
+def _float_column(rows: List[Dict[str, Any]], key: str) -> np.ndarray:
+    """Build a float64 column, mapping SQL NULL to NaN."""
+    return np.array(
+        [np.nan if r.get(key) is None else float(r[key]) for r in rows],
+        dtype=np.float64,
+    )
+
+
+def _opt_float(value: float) -> Optional[float]:
+    return None if np.isnan(value) else float(value)
+
+
+def _opt_int(value: float) -> Optional[int]:
+    return None if np.isnan(value) else int(value)
+
+
+class MarketSnapshot:
+    """Immutable columnar view of the market at one point in time.
+
+    Args:
+        rows: Rows shaped like ``database.queries.MARKET_SNAPSHOT``.
+        version: Store version the snapshot was built for.
+    """
+
+    def __init__(self, rows: List[Dict[str, Any]], version: int = 0) -> None:
+        self.version = version
+        self.built_at = time.monotonic()
+        self.size = len(rows)
+
+        self.ticker = np.array([r["ticker"] for r in rows], dtype=object)
+        self.short_name = np.array([r.get("short_name") for r in rows], dtype=object)
+        self.sector = np.array([r.get("sector") for r in rows], dtype=object)
+        self.has_company = np.array(
+            [r.get("company_ticker") is not None for r in rows], dtype=bool
+        )
+
+        self.current_price = _float_column(rows, "current_price")
+        self.previous_close = _float_column(rows, "previous_close")
+        self.volume = _float_column(rows, "volume")
+        self.market_cap = _float_column(rows, "market_cap")
+        self.week_52_high = _float_column(rows, "week_52_high")
+        self.week_52_low = _float_column(rows, "week_52_low")
+
+        # NaN comparisons are False, matching SQL NULL semantics in CASE WHEN.
+        has_price = ~np.isnan(self.current_price)
+        prev_positive = self.previous_close > 0
+        self._has_price = has_price
+        self._prev_positive = prev_positive
+        with np.errstate(divide="ignore", invalid="ignore"):
+            self.change_pct = np.where(
+                prev_positive,
+                (self.current_price - self.previous_close) / self.previous_close * 100,
+                np.nan,
+            )
+        self._gainer = prev_positive & (self.current_price > self.previous_close)
+        self._loser = prev_positive & (self.current_price < self.previous_close)
+        self._unchanged = prev_positive & (self.current_price == self.previous_close)
+
+        # Dense sector codes for bincount-based group-bys (-1 = NULL sector).
+        names = sorted({s for s in self.sector if s is not None})
+        index = {name: i for i, name in enumerate(names)}
+        self.sector_names: List[str] = names
+        self.sector_code = np.array(
+            [-1 if s is None else index[s] for s in self.sector], dtype=np.int64
+        )
+
+    # -- row builders ------------------------------------------------------
+
+    def _mover_row(self, i: int) -> Dict[str, Any]:
+        return {
+            "ticker": self.ticker[i],
+            "short_name": self.short_name[i],
+            "current_price": _opt_float(self.current_price[i]),
+            "previous_close": _opt_float(self.previous_close[i]),
+            "change_pct": _opt_float(self.change_pct[i]),
+            "volume": _opt_int(self.volume[i]),
+            "sector": self.sector[i],
+        }
+
+    # -- queries -----------------------------------------------------------
+
+    def movers(self, limit: int, descending: bool = True) -> List[Dict[str, Any]]:
+        """Equivalent of ``MOVERS_BASE ORDER BY change_pct {DESC|ASC} LIMIT ?``."""
+        mask = self.has_company & self._has_price & self._prev_positive
+        idx = np.flatnonzero(mask)
+        keys = -self.change_pct[idx] if descending else self.change_pct[idx]
+        top = idx[np.argsort(keys, kind="stable")[:limit]]
+        return [self._mover_row(int(i)) for i in top]
+
+    def summary_aggregates(self) -> Dict[str, Any]:
+        """Equivalent of ``MARKET_SUMMARY_AGGREGATES``."""
+        mask = self._has_price
+        return {
+            "total_market_cap": float(np.nansum(self.market_cap[mask])),
+            "total_volume": int(np.nansum(self.volume[mask])),
+            "gainers_count": int(np.count_nonzero(self._gainer & mask)),
+            "losers_count": int(np.count_nonzero(self._loser & mask)),
+            "unchanged_count": int(np.count_nonzero(self._unchanged & mask)),
+        }
+
+    def sector_analytics(self) -> List[Dict[str, Any]]:
+        """Equivalent of ``SECTOR_ANALYTICS`` (grouped, market cap DESC)."""
+        mask = self.has_company & self._has_price & (self.sector_code >= 0)
+        codes = self.sector_code[mask]
+        n = len(self.sector_names)
+        if n == 0 or codes.size == 0:
+            return []
+
+        change = self.change_pct[mask]
+        has_change = ~np.isnan(change)
+        counts = np.bincount(codes, minlength=n)
+        change_n = np.bincount(codes[has_change], minlength=n)
+        change_sum = np.bincount(
+            codes[has_change], weights=change[has_change], minlength=n
+        )
+        volume = np.bincount(
+            codes, weights=np.nan_to_num(self.volume[mask]), minlength=n
+        )
+        mcap = np.bincount(
+            codes, weights=np.nan_to_num(self.market_cap[mask]), minlength=n
+        )
+        gainers = np.bincount(codes, weights=self._gainer[mask], minlength=n)
+        losers = np.bincount(codes, weights=self._loser[mask], minlength=n)
+
+        present = np.flatnonzero(counts)
+        order = present[np.argsort(-mcap[present], kind="stable")]
+        return [
+            {
+                "sector": self.sector_names[g],
+                "avg_change_pct": float(change_sum[g] / change_n[g])
+                if change_n[g]
+                else None,
+                "total_volume": int(volume[g]),
+                "total_market_cap": float(mcap[g]),
+                "company_count": int(counts[g]),
+                "gainers": int(gainers[g]),
+                "losers": int(losers[g]),
+            }
+            for g in order
+        ]
+
+    def heatmap(self) -> List[Dict[str, Any]]:
+        """Equivalent of ``HEATMAP`` (ordered by market cap DESC)."""
+        mask = self.has_company & self._has_price & ~np.isnan(self.market_cap)
+        idx = np.flatnonzero(mask)
+        idx = idx[np.argsort(-self.market_cap[idx], kind="stable")]
+        return [
+            {
+                "ticker": self.ticker[i],
+                "name": self.short_name[i],
+                "sector": self.sector[i],
+                "market_cap": float(self.market_cap[i]),
+                "change_pct": _opt_float(self.change_pct[i]),
+            }
+            for i in idx
+        ]
+
+    def breadth(self) -> Dict[str, Any]:
+        """Equivalent of ``MARKET_BREADTH``."""
+        mask = self._has_price & self._prev_positive
+        price = self.current_price[mask]
+        return {
+            "advancing": int(np.count_nonzero(self._gainer[mask])),
+            "declining": int(np.count_nonzero(self._loser[mask])),
+            "unchanged": int(np.count_nonzero(self._unchanged[mask])),
+            "new_52w_highs": int(np.count_nonzero(price >= self.week_52_high[mask])),
+            "new_52w_lows": int(np.count_nonzero(price <= self.week_52_low[mask])),
+        }
+
+
+def _default_loader() -> List[Dict[str, Any]]:
+    from api.db_helper import _sync_fetchall
+    from database.queries import MARKET_SNAPSHOT
+
+    return _sync_fetchall(MARKET_SNAPSHOT)
+
+
+class MarketSnapshotStore(VersionedStore[MarketSnapshot]):
+    """Holds the current ``MarketSnapshot`` and rebuilds it on demand.
+
+    Args:
+        loader: Callable returning ``MARKET_SNAPSHOT``-shaped rows.
+        max_age: Seconds after which the snapshot is rebuilt even without
+            a version bump.  ``0`` disables age-based rebuilds.
+        source_version: Returns the database's data version (or None when
+            unknown); a change bumps the store version.
+        check_interval: Seconds between ``source_version`` polls.
+    """
+
+    name = "Market snapshot"
+
+    def __init__(
+        self,
+        loader: Optional[RowLoader] = None,
+        max_age: float = DEFAULT_MAX_AGE_SECONDS,
+        source_version: Optional[VersionReader] = None,
+        check_interval: float = DEFAULT_CHECK_INTERVAL_SECONDS,
+    ) -> None:
+        super().__init__(
+            loader or _default_loader, max_age, source_version, check_interval
+        )
+
+    def build(self, rows: List[Dict[str, Any]], version: int) -> MarketSnapshot:
+        return MarketSnapshot(rows, version=version)
+
+    def get_stats(self) -> Dict[str, Any]:
+        snap = self._value
+        return {**super().get_stats(), "rows": snap.size if snap else 0}
+
+
+_store: Optional[MarketSnapshotStore] = None
+
+
+def init_snapshot_store(
+    loader: Optional[RowLoader] = None,
+    max_age: float = DEFAULT_MAX_AGE_SECONDS,
+    source_version: Optional[VersionReader] = None,
+) -> MarketSnapshotStore:
+    """Create the process-wide snapshot store (called from app lifespan)."""
+    global _store
+    _store = MarketSnapshotStore(
+        loader=loader, max_age=max_age, source_version=source_version
+    )
+    return _store
+
+
+def close_snapshot_store() -> None:
+    """Drop the process-wide store so routes fall back to SQL."""
+    global _store
+    _store = None
+
+
+def get_snapshot_store() -> Optional[MarketSnapshotStore]:
+    """Return the process-wide store, or None when it was never initialized."""
+    return _store
+
+
+def bump_version() -> None:
+    """Invalidate the process-wide snapshot after an in-process data write."""
+    if _store is not None:
+        _store.bump_version()
+
+
+async def aget_market_snapshot() -> Optional[MarketSnapshot]:
+    """Return the current snapshot, or None so callers fall back to SQL.
+
+    Never raises: a failed rebuild is logged and reported as None.
+    """
+    store = _store
+    if store is None:
+        return None
+    try:
+        return await store.aget()
+    except Exception as exc:
+        logger.warning("Market snapshot unavailable, falling back to SQL: %s", exc)
+        return None
@@ -0,0 +1,177 @@
+"""
+Near-duplicate title detection (MinHash + LSH)
+===============================================
+Finds candidate near-duplicate news titles without comparing every pair.
+Each title is reduced to its set of character shingles, summarized by a
+MinHash signature, and the signature is cut into LSH bands.  Two titles
+become candidates when any band hashes to the same bucket, which happens
+with probability ``1 - (1 - s**rows)**bands`` for shingle similarity ``s``.
+
+Candidates are then confirmed with the exact title checks in
+:func:`titles_similar`, so LSH only decides which pairs are compared:
+more bands (fewer rows per band) raise recall at the cost of more exact
+comparisons; fewer bands do the opposite.  Precision is unaffected.
+
+Bucket keys are stable 64-bit integers (they fold in the band index and the
+index parameters), so ``NewsStore`` persists them and later scrape cycles
+look up stored titles by bucket instead of re-reading old articles.
+
+Usage:
+    from services.near_dedup import NearDuplicateIndex
+    index = NearDuplicateIndex.from_settings()
+    buckets = index.buckets("مؤشر تاسي يرتفع بنسبة 2%")
+    index.add("article-1", buckets)
+    index.candidates(index.buckets("مؤشر تاسي يرتفع 2%"))   # {"article-1"}
+"""
+
+from __future__ import annotations
+
+import hashlib
+import random
+import zlib
+from difflib import SequenceMatcher
+from typing import Dict, Hashable, List, Set
+
+import numpy as np
+
+# Mersenne prime for the universal hash family (shingle hashes are 32-bit,
+# so a * h + b stays well inside int64)
+_PRIME = (1 << 31) - 1
+
+# Word-overlap ratio above which two titles are duplicates
+WORD_OVERLAP_THRESHOLD = 0.50
+
+
+def title_word_overlap(title_a: str, title_b: str) -> float:
+    """Return the fraction of shared words between two titles (Jaccard-like).
+
+    Computes ``|intersection| / |union|`` over whitespace-split word sets.
+    Returns 0.0 when both titles are empty.
+    """
+    words_a = set(title_a.split())
+    words_b = set(title_b.split())
+    if not words_a and not words_b:
+        return 0.0
+    intersection = words_a & words_b
+    union = words_a | words_b
+    return len(intersection) / len(union)
+
+
+def titles_similar(title_a: str, title_b: str, threshold: float) -> bool:
+    """Exact duplicate check: SequenceMatcher ratio or word overlap.
+
+    The titles are duplicates when ``SequenceMatcher.ratio() >= threshold``
+    or more than half of their words are shared.
+    """
+    if title_word_overlap(title_a, title_b) > WORD_OVERLAP_THRESHOLD:
+        return True
+    matcher = SequenceMatcher(None, title_a, title_b)
+    # real_quick_ratio/quick_ratio are cheap upper bounds on ratio()
+    return (
+        matcher.real_quick_ratio() >= threshold
+        and matcher.quick_ratio() >= threshold
+        and matcher.ratio() >= threshold
+    )
+
+
+class NearDuplicateIndex:
+    """In-memory MinHash/LSH index over titles.
+
+    Args:
+        num_perm: MinHash signature length.
+        bands: Number of LSH bands; must divide ``num_perm``. More bands
+            means higher recall and more candidate pairs.
+        shingle_size: Character shingle length.
+        threshold: SequenceMatcher ratio used by :meth:`similar` to
+            confirm candidates.
+        seed: Seed for the hash permutations. Indexes only share buckets
+            when ``num_perm``, ``bands``, ``shingle_size`` and ``seed`` match.
+    """
+
+    def __init__(
+        self,
+        num_perm: int = 120,
+        bands: int = 40,
+        shingle_size: int = 3,
+        threshold: float = 0.55,
+        seed: int = 1,
+    ) -> None:
+        if num_perm < 1 or bands < 1 or num_perm % bands:
+            raise ValueError(
+                f"bands ({bands}) must be a positive divisor of num_perm ({num_perm})"
+            )
+        if shingle_size < 1:
+            raise ValueError("shingle_size must be >= 1")
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_size = shingle_size
+        self.threshold = threshold
+        self.seed = seed
+        rng = random.Random(seed)
+        self._a = np.array(
+            [rng.randrange(1, _PRIME) for _ in range(num_perm)], dtype=np.int64
+        )
+        self._b = np.array(
+            [rng.randrange(0, _PRIME) for _ in range(num_perm)], dtype=np.int64
+        )
+        self._salt = f"{num_perm}:{bands}:{shingle_size}:{seed}:".encode()
+        self._buckets: Dict[int, List[Hashable]] = {}
+
+    @classmethod
+    def from_settings(cls) -> "NearDuplicateIndex":
+        """Build an index with the ``SCRAPER_DEDUP_*`` settings."""
+        from config import get_settings
+
+        cfg = get_settings().scraper
+        return cls(
+            num_perm=cfg.dedup_num_perm,
+            bands=cfg.dedup_bands,
+            shingle_size=cfg.dedup_shingle_size,
+            threshold=cfg.dedup_threshold,
+        )
+
+    def similar(self, title_a: str, title_b: str) -> bool:
+        """Confirm a candidate pair with :func:`titles_similar`."""
+        return titles_similar(title_a, title_b, self.threshold)
+
+    def shingles(self, title: str) -> Set[str]:
+        """Return the character shingles of a whitespace-normalized title."""
+        text = " ".join(title.lower().split())
+        k = self.shingle_size
+        if len(text) <= k:
+            return {text}
+        return {text[i : i + k] for i in range(len(text) - k + 1)}
+
+    def signature(self, title: str) -> np.ndarray:
+        """Return the MinHash signature of ``title``."""
+        hashes = np.fromiter(
+            (zlib.crc32(s.encode("utf-8")) for s in self.shingles(title)),
+            dtype=np.int64,
+        )
+        hashed = (np.outer(self._a, hashes) + self._b[:, None]) % _PRIME
+        return hashed.min(axis=1).astype(np.uint32)
+
+    def buckets(self, title: str) -> List[int]:
+        """Return one signed 64-bit bucket key per LSH band."""
+        sig = self.signature(title)
+        keys = []
+        for band in range(self.bands):
+            chunk = sig[band * self.rows : (band + 1) * self.rows].tobytes()
+            digest = hashlib.blake2b(
+                self._salt + band.to_bytes(2, "little") + chunk, digest_size=8
+            ).digest()
+            keys.append(int.from_bytes(digest, "little", signed=True))
+        return keys
+
+    def add(self, key: Hashable, buckets: List[int]) -> None:
+        """Register ``key`` under its bucket keys."""
+        for bucket in buckets:
+            self._buckets.setdefault(bucket, []).append(key)
+
+    def candidates(self, buckets: List[int]) -> Set[Hashable]:
+        """Return every key sharing at least one bucket."""
+        found: Set[Hashable] = set()
+        for bucket in buckets:
+            found.update(self._buckets.get(bucket, ()))
+        return found
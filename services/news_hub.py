@@ -0,0 +1,113 @@
+"""
+News broadcast hub.
+
+Fans newly stored articles out to SSE clients (``/api/v1/news/stream``)
+without per-client polling. ``NewsStore.store_articles`` publishes the
+rows it actually inserted; when Redis is configured, messages travel over
+the ``news:articles:new`` pub/sub channel so every worker process sees
+articles stored by any other, and a single listener thread per process
+forwards them into the local hub.
+
+Usage:
+    from services.news_hub import get_news_hub, publish_new_articles
+
+    publish_new_articles([{"id": "...", "title": "...", "source_name": "..."}])
+
+    with get_news_hub().subscribe() as sub:
+        items = await sub.get(timeout=15)
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+from typing import Any, Dict, List, Optional
+
+from services.broadcast import BroadcastHub, RedisRelay
+
+logger = logging.getLogger(__name__)
+
+NEWS_CHANNEL = "news:articles:new"
+
+_hub = BroadcastHub("news", queue_size=32)
+
+_redis_client: Any = None
+_relay: Optional[RedisRelay] = None
+
+
+def get_news_hub() -> BroadcastHub:
+    """Return the process-wide news hub."""
+    return _hub
+
+
+def publish_new_articles(items: List[Dict[str, Any]]) -> None:
+    """Broadcast a batch of newly inserted articles.
+
+    Each item carries ``id``, ``title`` and ``source_name``. Goes through
+    Redis when the listener is running (so other processes receive it
+    too); falls back to the local hub if Redis is unavailable.
+    """
+    if not items:
+        return
+    if _redis_client is not None:
+        try:
+            _redis_client.publish(NEWS_CHANNEL, json.dumps(items, ensure_ascii=False))
+            return
+        except Exception as exc:
+            logger.warning("News hub Redis publish failed, delivering locally: %s", exc)
+    _hub.publish(items)
+
+
+def article_items(message: Any) -> List[Dict[str, Any]]:
+    """Return the well-formed articles of a hub message.
+
+    A message is a list of dicts that each carry an ``id``. Anything else
+    (a foreign publisher on the Redis channel, a hand-written test message)
+    is logged and dropped rather than ending the subscriber's stream.
+    """
+    if not isinstance(message, list):
+        logger.warning(
+            "News hub: ignoring %s message, expected a list of articles",
+            type(message).__name__,
+        )
+        return []
+    items = [m for m in message if isinstance(m, dict) and m.get("id") is not None]
+    if len(items) != len(message):
+        logger.warning(
+            "News hub: dropped %d of %d malformed articles",
+            len(message) - len(items),
+            len(message),
+        )
+    return items
+
+
+def _on_redis_message(data: str) -> None:
+    try:
+        message = json.loads(data)
+    except ValueError:
+        logger.warning("News hub: ignoring non-JSON message on %s", NEWS_CHANNEL)
+        return
+    items = article_items(message)
+    if items:
+        _hub.publish(items)
+
+
+def start_redis_listener(redis_client: Any) -> None:
+    """Route publishes through Redis and start this process's listener."""
+    global _redis_client, _relay
+    if _relay is not None and _relay.is_running():
+        return
+    _relay = RedisRelay(
+        redis_client, NEWS_CHANNEL, _on_redis_message, name="news-hub-redis"
+    )
+    _relay.start()
+    _redis_client = redis_client
+
+
+def stop_redis_listener() -> None:
+    """Stop the listener and revert to in-process delivery."""
+    global _redis_client, _relay
+    _redis_client = None
+    if _relay is not None:
+        _relay.stop()
+        _relay = None
@@ -6,16 +6,24 @@ Simple Arabic text paraphraser that applies minor modifications to news articles
 - Adds slight variations to sentence openings
 - Keeps meaning identical -- this is NOT creative rewriting
 
+Both passes are compiled once at import: synonyms are found in a single scan
+by an Aho-Corasick automaton over every synonym key, and sentence openings by
+one precompiled regex.  Pass a seeded ``random.Random`` as ``rng`` for
+reproducible output.
+
 Usage:
     from services.news_paraphraser import paraphrase_article
     modified = paraphrase_article(article_dict)
+    modified = paraphrase_article(article_dict, rng=random.Random(42))
 """
 
 from __future__ import annotations
 
 import random
 import re
-from typing import Dict, List, Tuple
+from typing import Callable, Dict, List, Optional, Tuple
+
+from services.keyword_matcher import KeywordMatcher
 
 # ---------------------------------------------------------------------------
 # Synonym pairs: (original, replacement)
@@ -70,43 +78,93 @@ OPENING_VARIATIONS: List[Tuple[str, str]] = [
     ("كشف", "أظهر"),
     ("أفاد", "نقل"),
 ]
+_OPENING_MAP: Dict[str, str] = dict(OPENING_VARIATIONS)
+
+# One scan finds every synonym key (longest key wins at a position)
+_SYNONYM_MATCHER = KeywordMatcher()
+for _key in _SYNONYM_MAP:
+    _SYNONYM_MATCHER.add(_key, _key)
+_SYNONYM_MATCHER.compile()
+
+# An opening is at the start of the text or after a period/newline (and
+# optional whitespace). Sentence breaks are located with str.find, which is
+# much faster than letting a regex try every position of the text.
+_OPENING_ALT = "|".join(re.escape(o) for o, _ in OPENING_VARIATIONS)
+_OPENING_START_RE = re.compile(rf"(?:{_OPENING_ALT})")
+_OPENING_AFTER_BREAK_RE = re.compile(rf"\s*({_OPENING_ALT})")
+
+
+def _chance(rng: Optional[random.Random]) -> Callable[[], float]:
+    """Return the random source: ``rng`` if given, else the module RNG."""
+    return rng.random if rng is not None else random.random
+
+
+def _replace_first(
+    text: str,
+    spans: List[Tuple[int, int, str]],
+    replacements: Dict[str, str],
+    probability: float,
+    rng: Optional[random.Random],
+) -> str:
+    """Replace the first occurrence of each matched key with ``probability``.
+
+    ``spans`` are non-overlapping ``(start, end, key)`` matches in text order.
+    Replaced text is not rescanned.
+    """
+    chance = _chance(rng)
+    decided = set()
+    parts: List[str] = []
+    pos = 0
+    for start, end, key in spans:
+        if key in decided:
+            continue
+        decided.add(key)
+        if chance() < probability:
+            parts.append(text[pos:start])
+            parts.append(replacements[key])
+            pos = end
+    if not parts:
+        return text
+    parts.append(text[pos:])
+    return "".join(parts)
 
 
-def _apply_synonyms(text: str) -> str:
+def _apply_synonyms(text: str, rng: Optional[random.Random] = None) -> str:
     """Replace financial terms with their synonyms.
 
-    Applies replacements with ~50% probability per occurrence to avoid
-    making the text feel mechanically transformed.
+    Applies replacements with ~50% probability per term to avoid making the
+    text feel mechanically transformed. Only the first occurrence of a term
+    is replaced to keep changes minimal.
     """
     if not text:
         return text
+    spans = _SYNONYM_MATCHER.spans(text)
+    return _replace_first(text, spans, _SYNONYM_MAP, 0.5, rng)
 
-    result = text
-    for original, replacement in _SYNONYM_MAP.items():
-        if original in result and random.random() < 0.5:
-            # Replace only the first occurrence to keep changes minimal
-            result = result.replace(original, replacement, 1)
-
-    return result
 
-
-def _vary_openings(text: str) -> str:
+def _vary_openings(text: str, rng: Optional[random.Random] = None) -> str:
     """Apply slight variations to sentence openings."""
     if not text:
         return text
 
-    result = text
-    for original, replacement in OPENING_VARIATIONS:
-        # Only modify if it appears at the start of a sentence
-        # (beginning of text or after a period/newline)
-        pattern = rf"(^|[.\n]\s*){re.escape(original)}"
-        if re.search(pattern, result) and random.random() < 0.4:
-            result = re.sub(pattern, rf"\1{replacement}", result, count=1)
-
-    return result
-
-
-def paraphrase_text(text: str) -> str:
+    # Opening word spans by start offset (a break may be reached from both
+    # a period and a following newline)
+    found: Dict[int, Tuple[int, int, str]] = {}
+    head = _OPENING_START_RE.match(text)
+    if head:
+        found[0] = (0, head.end(), head.group())
+    for brk in ".\n":
+        pos = text.find(brk)
+        while pos != -1:
+            m = _OPENING_AFTER_BREAK_RE.match(text, pos + 1)
+            if m:
+                found[m.start(1)] = (m.start(1), m.end(1), m.group(1))
+            pos = text.find(brk, pos + 1)
+    spans = [found[start] for start in sorted(found)]
+    return _replace_first(text, spans, _OPENING_MAP, 0.4, rng)
+
+
+def paraphrase_text(text: str, rng: Optional[random.Random] = None) -> str:
     """Apply minor paraphrasing to Arabic text.
 
     Returns the modified text with synonym replacements and
@@ -115,21 +173,22 @@ def paraphrase_text(text: str) -> str:
     if not text:
         return text
 
-    result = _apply_synonyms(text)
-    result = _vary_openings(result)
+    result = _apply_synonyms(text, rng)
+    result = _vary_openings(result, rng)
     return result
 
 
-def paraphrase_article(article: dict) -> dict:
+def paraphrase_article(article: dict, rng: Optional[random.Random] = None) -> dict:
     """Paraphrase the title and body of an article dict.
 
     Returns a new dict (does not modify the original).
     Handles None/empty body gracefully -- always returns a string for body.
+    ``rng`` makes the output reproducible (e.g. ``random.Random(seed)``).
     """
     modified = dict(article)
     title = article.get("title") or ""
     body = article.get("body") or ""
 
-    modified["title"] = paraphrase_text(title) if title else ""
-    modified["body"] = paraphrase_text(body) if body else ""
+    modified["title"] = paraphrase_text(title, rng) if title else ""
+    modified["body"] = paraphrase_text(body, rng) if body else ""
     return modified
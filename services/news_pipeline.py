@@ -0,0 +1,247 @@
+"""
+News Scraping Pipeline
+======================
+Async pipeline that runs every news scraper concurrently. Requests go
+through one shared ``httpx.AsyncClient``; politeness is enforced per host
+(``HostRateLimiter``) instead of global sleeps, full-article enrichment is
+bounded by a semaphore, and BeautifulSoup parsing runs in a process pool
+so it never blocks the event loop.
+
+Scrapers that implement ``afetch_articles(ctx)`` (``BaseNewsScraper`` and
+subclasses) run natively on the loop; any other scraper's synchronous
+``fetch_articles()`` runs in a worker thread alongside them.
+
+Usage:
+    from services.news_pipeline import ScrapePipeline
+    from services.news_scraper import ALL_SCRAPERS
+
+    pipeline = ScrapePipeline.from_settings()
+    result = pipeline.run(ALL_SCRAPERS)   # blocking; use arun() inside a loop
+    result.articles, result.errors, result.timings
+    pipeline.close()
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import multiprocessing
+import threading
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence
+from urllib.parse import urlsplit
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+
+class StageTimings:
+    """Accumulates wall-clock milliseconds per named stage (thread-safe).
+
+    Stages that run concurrently (e.g. ``fetch`` across sources) accumulate
+    their individual durations, so their sum can exceed the cycle total.
+    """
+
+    def __init__(self) -> None:
+        self._ms: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def add(self, stage: str, seconds: float) -> None:
+        with self._lock:
+            self._ms[stage] = self._ms.get(stage, 0.0) + seconds * 1000
+
+    @contextmanager
+    def measure(self, stage: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(stage, time.perf_counter() - start)
+
+    def as_dict(self) -> Dict[str, float]:
+        with self._lock:
+            return {stage: round(ms, 1) for stage, ms in self._ms.items()}
+
+
+class HostRateLimiter:
+    """Spaces requests to the same host at least ``min_interval`` seconds apart.
+
+    Slots are reserved up front, so concurrent callers for one host queue
+    behind each other while requests to other hosts proceed immediately.
+    Must be used from a single event loop.
+    """
+
+    def __init__(self, min_interval: float):
+        self.min_interval = max(0.0, float(min_interval))
+        self._next_slot: Dict[str, float] = {}
+
+    async def wait(self, url: str) -> None:
+        host = urlsplit(url).netloc.lower()
+        now = time.monotonic()
+        slot = max(now, self._next_slot.get(host, 0.0))
+        self._next_slot[host] = slot + self.min_interval
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+
+class ScrapeContext:
+    """Shared resources handed to ``afetch_articles`` for one pipeline run."""
+
+    def __init__(
+        self,
+        client: httpx.AsyncClient,
+        limiter: HostRateLimiter,
+        enrich_slots: asyncio.Semaphore,
+        parse_executor: Optional[Executor],
+        timings: StageTimings,
+    ):
+        self.client = client
+        self.limiter = limiter
+        self.enrich_slots = enrich_slots
+        self.timings = timings
+        self._parse_executor = parse_executor
+
+    async def get_text(self, url: str, timeout: float) -> str:
+        """GET ``url`` (after its host's rate-limit slot) and return the body.
+
+        Raises ``httpx.HTTPError`` subclasses on transport or status errors.
+        """
+        await self.limiter.wait(url)
+        with self.timings.measure("fetch"):
+            resp = await self.client.get(url, timeout=timeout)
+            resp.raise_for_status()
+            return resp.text
+
+    async def parse(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """Run a (picklable, module-level) parse function off the event loop."""
+        with self.timings.measure("parse"):
+            if self._parse_executor is None:
+                return await asyncio.to_thread(fn, *args)
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._parse_executor, fn, *args)
+
+
+@dataclass
+class ScrapeResult:
+    """Outcome of one pipeline run."""
+
+    articles: List[dict] = field(default_factory=list)
+    counts: Dict[str, int] = field(default_factory=dict)
+    errors: Dict[str, int] = field(default_factory=dict)
+    timings: Dict[str, float] = field(default_factory=dict)
+
+
+class ScrapePipeline:
+    """Runs scrapers concurrently with per-host rate limits.
+
+    Args:
+        per_host_min_interval: Minimum seconds between requests to one host.
+        max_concurrent_enrichment: Full-article fetches allowed in flight.
+        parse_workers: Size of the HTML parsing process pool; 0 parses in
+            worker threads instead.
+        headers: Default request headers.
+    """
+
+    def __init__(
+        self,
+        per_host_min_interval: float = 1.0,
+        max_concurrent_enrichment: int = 8,
+        parse_workers: int = 2,
+        headers: Optional[Dict[str, str]] = None,
+    ):
+        if max_concurrent_enrichment < 1:
+            raise ValueError("max_concurrent_enrichment must be >= 1")
+        self.per_host_min_interval = per_host_min_interval
+        self.max_concurrent_enrichment = max_concurrent_enrichment
+        self.parse_workers = max(0, int(parse_workers))
+        self.headers = dict(headers or {})
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+
+    @classmethod
+    def from_settings(cls) -> "ScrapePipeline":
+        """Build a pipeline from ``ScraperSettings``."""
+        from config import get_settings
+        from services.news_scraper import DEFAULT_HEADERS
+
+        cfg = get_settings().scraper
+        return cls(
+            per_host_min_interval=cfg.per_host_min_interval,
+            max_concurrent_enrichment=cfg.max_concurrent_enrichment,
+            parse_workers=cfg.parse_workers,
+            headers=DEFAULT_HEADERS,
+        )
+
+    def _parse_executor(self) -> Optional[ProcessPoolExecutor]:
+        if self.parse_workers == 0:
+            return None
+        with self._executor_lock:
+            if self._executor is None:
+                # spawn: the scheduler process is multi-threaded, so fork is unsafe
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.parse_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            return self._executor
+
+    def close(self) -> None:
+        """Shut down the parse process pool (if one was started)."""
+        with self._executor_lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+    def run(self, scraper_classes: Sequence[type]) -> ScrapeResult:
+        """Blocking wrapper around :meth:`arun` (not for use inside a loop)."""
+        return asyncio.run(self.arun(scraper_classes))
+
+    async def arun(self, scraper_classes: Sequence[type]) -> ScrapeResult:
+        """Fetch every source concurrently and collect their articles.
+
+        Articles keep the order of ``scraper_classes``. A scraper that raises
+        is counted in ``errors`` and contributes no articles.
+        """
+        timings = StageTimings()
+        result = ScrapeResult()
+        start = time.perf_counter()
+
+        async with httpx.AsyncClient(
+            headers=self.headers, follow_redirects=True
+        ) as client:
+            ctx = ScrapeContext(
+                client=client,
+                limiter=HostRateLimiter(self.per_host_min_interval),
+                enrich_slots=asyncio.Semaphore(self.max_concurrent_enrichment),
+                parse_executor=self._parse_executor(),
+                timings=timings,
+            )
+            outcomes = await asyncio.gather(
+                *(self._run_one(cls, ctx) for cls in scraper_classes),
+                return_exceptions=True,
+            )
+
+        for scraper_cls, outcome in zip(scraper_classes, outcomes):
+            source = getattr(scraper_cls, "source_name", scraper_cls.__name__)
+            if isinstance(outcome, BaseException):
+                result.errors[source] = result.errors.get(source, 0) + 1
+                logger.warning("Source %s: fetch failed", source, exc_info=outcome)
+                continue
+            result.articles.extend(outcome)
+            result.counts[source] = len(outcome)
+            logger.info("Source %s: fetched %d articles", source, len(outcome))
+
+        timings.add("scrape", time.perf_counter() - start)
+        result.timings = timings.as_dict()
+        return result
+
+    @staticmethod
+    async def _run_one(scraper_cls: type, ctx: ScrapeContext) -> List[dict]:
+        scraper = scraper_cls()
+        afetch = getattr(scraper, "afetch_articles", None)
+        if afetch is not None:
+            return await afetch(ctx)
+        return await asyncio.to_thread(scraper.fetch_articles)
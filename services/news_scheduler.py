@@ -2,7 +2,8 @@
 News Scheduler
 ===============
 Background scheduler that periodically runs the news scrapers and stores
-results into the NewsStore (SQLite).
+results into the NewsStore (SQLite). Each cycle fetches all sources
+concurrently through ``ScrapePipeline`` and records per-stage timings.
 
 Usage:
     from services.news_store import NewsStore
@@ -23,6 +24,7 @@ import time
 from datetime import datetime
 
 from config import get_settings
+from services.news_pipeline import ScrapePipeline, StageTimings
 from services.news_store import NewsStore
 
 logger = logging.getLogger(__name__)
@@ -43,6 +45,8 @@ class NewsScheduler:
         self._last_run_at: datetime | None = None
         self._total_articles_stored: int = 0
         self._run_count: int = 0
+        self._last_timings: dict[str, float] = {}
+        self._pipeline = ScrapePipeline.from_settings()
 
     def start(self) -> None:
         """Start background thread that fetches news periodically."""
@@ -64,24 +68,28 @@ class NewsScheduler:
 
     def _run_loop(self) -> None:
         """Main loop: fetch immediately, then sleep between cycles."""
-        # Fetch immediately on start
-        inserted = self._fetch_cycle()
-        self._last_run_at = datetime.utcnow()
-        self._total_articles_stored += inserted
-        self._run_count += 1
-
-        while self._running:
-            # Sleep in small increments so stop() is responsive
-            for _ in range(FETCH_INTERVAL_SECONDS):
-                if not self._running:
-                    return
-                time.sleep(1)
-
-            if self._running:
-                inserted = self._fetch_cycle()
-                self._last_run_at = datetime.utcnow()
-                self._total_articles_stored += inserted
-                self._run_count += 1
+        try:
+            # Fetch immediately on start
+            inserted = self._fetch_cycle()
+            self._last_run_at = datetime.utcnow()
+            self._total_articles_stored += inserted
+            self._run_count += 1
+
+            while self._running:
+                # Sleep in small increments so stop() is responsive
+                for _ in range(FETCH_INTERVAL_SECONDS):
+                    if not self._running:
+                        return
+                    time.sleep(1)
+
+                if self._running:
+                    inserted = self._fetch_cycle()
+                    self._last_run_at = datetime.utcnow()
+                    self._total_articles_stored += inserted
+                    self._run_count += 1
+        finally:
+            # Closed here rather than in stop() so an in-flight cycle keeps its pool
+            self._pipeline.close()
 
     def get_source_error_counts(self) -> dict[str, int]:
         """Return per-source error counts for health check output."""
@@ -89,7 +97,13 @@ class NewsScheduler:
             return dict(self._source_errors)
 
     def get_stats(self) -> dict:
-        """Return scheduler statistics (run count, last run time, articles stored)."""
+        """Return scheduler statistics (run count, last run time, articles stored).
+
+        ``stage_timings_ms`` holds the last cycle's per-stage wall-clock
+        times: ``fetch``/``parse``/``enrich`` summed across concurrent
+        sources, ``scrape`` for the whole concurrent fetch, then ``store``,
+        ``cleanup`` and ``total``.
+        """
         with self._source_errors_lock:
             source_errors = dict(self._source_errors)
         return {
@@ -97,6 +111,7 @@ class NewsScheduler:
             "last_run_at": self._last_run_at.isoformat() if self._last_run_at else None,
             "total_articles_stored": self._total_articles_stored,
             "source_errors": source_errors,
+            "stage_timings_ms": dict(self._last_timings),
             "is_running": self._running,
         }
 
@@ -107,49 +122,48 @@ class NewsScheduler:
             Number of new articles inserted during this cycle.
         """
         inserted = 0
+        timings = StageTimings()
         try:
-            from services.news_scraper import ALL_SCRAPERS, INTER_REQUEST_DELAY
-            import time as _time
+            from services.news_scraper import ALL_SCRAPERS
 
             logger.info("News fetch cycle starting")
-            all_articles: list[dict] = []
-            cycle_errors: dict[str, int] = {}
-
-            for scraper_cls in ALL_SCRAPERS:
-                scraper = scraper_cls()
-                source = scraper.source_name
-                try:
-                    articles = scraper.fetch_articles()
-                    all_articles.extend(articles)
-                    logger.info("Source %s: fetched %d articles", source, len(articles))
-                    if articles:
-                        _time.sleep(INTER_REQUEST_DELAY)
-                except Exception:
-                    cycle_errors[source] = cycle_errors.get(source, 0) + 1
-                    logger.warning("Source %s: fetch failed", source, exc_info=True)
-
-            # Update cumulative error counts
-            with self._source_errors_lock:
-                for src, count in cycle_errors.items():
-                    self._source_errors[src] = self._source_errors.get(src, 0) + count
-
-            if all_articles:
-                inserted = self.store.store_articles(all_articles)
-                logger.info(
-                    "News fetch cycle complete: %d fetched, %d new, %d source_errors",
-                    len(all_articles),
-                    inserted,
-                    sum(cycle_errors.values()),
-                )
-            else:
-                logger.info(
-                    "News fetch cycle complete: no articles returned, %d source_errors",
-                    sum(cycle_errors.values()),
-                )
-
-            self.store.cleanup_old(days=_scraper_cfg.cleanup_age_days)
+            with timings.measure("total"):
+                result = self._pipeline.run(ALL_SCRAPERS)
+                for stage, ms in result.timings.items():
+                    timings.add(stage, ms / 1000)
+                all_articles = result.articles
+                cycle_errors = result.errors
+
+                # Update cumulative error counts
+                with self._source_errors_lock:
+                    for src, count in cycle_errors.items():
+                        self._source_errors[src] = (
+                            self._source_errors.get(src, 0) + count
+                        )
+
+                if all_articles:
+                    with timings.measure("store"):
+                        inserted = self.store.store_articles(
+                            all_articles,
+                            skip_near_duplicates=_scraper_cfg.dedup_across_cycles,
+                        )
+                    logger.info(
+                        "News fetch cycle complete: %d fetched, %d new, %d source_errors",
+                        len(all_articles),
+                        inserted,
+                        sum(cycle_errors.values()),
+                    )
+                else:
+                    logger.info(
+                        "News fetch cycle complete: no articles returned, %d source_errors",
+                        sum(cycle_errors.values()),
+                    )
+
+                with timings.measure("cleanup"):
+                    self.store.cleanup_old(days=_scraper_cfg.cleanup_age_days)
 
         except Exception:
             logger.warning("News fetch cycle failed", exc_info=True)
 
+        self._last_timings = timings.as_dict()
         return inserted
@@ -17,22 +17,28 @@ Usage:
 
 from __future__ import annotations
 
+import asyncio
 import logging
 import sqlite3
 import time
 from abc import ABC, abstractmethod
 from datetime import datetime
-from difflib import SequenceMatcher
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import TYPE_CHECKING, Dict, List, Optional
 from urllib.parse import quote_plus
 
+import httpx
 import requests
 from bs4 import BeautifulSoup
 
 from config import get_settings
+from services.keyword_matcher import KeywordMatcher
+from services.near_dedup import NearDuplicateIndex, titles_similar
 from services.news_paraphraser import paraphrase_article
 
+if TYPE_CHECKING:
+    from services.news_pipeline import ScrapeContext
+
 logger = logging.getLogger(__name__)
 
 _scraper_cfg = get_settings().scraper
@@ -141,11 +147,12 @@ def analyze_sentiment(title: str, body: str) -> tuple[float, str]:
     - score: float in [-1, 1]
     - label: "إيجابي" / "سلبي" / "محايد"
     """
-    text = f"{title} {body}"
-    pos = sum(1 for kw in POSITIVE_KEYWORDS if kw in text)
-    pos += sum(2 for kw in STRONG_POSITIVE_KEYWORDS if kw in text)
-    neg = sum(1 for kw in NEGATIVE_KEYWORDS if kw in text)
-    neg += sum(2 for kw in STRONG_NEGATIVE_KEYWORDS if kw in text)
+    return _sentiment_from_hits(_scan_text(title, body))
+
+
+def _sentiment_from_hits(hits: List[tuple]) -> tuple[float, str]:
+    pos = sum(weight for kind, weight in hits if kind == "sentiment" and weight > 0)
+    neg = -sum(weight for kind, weight in hits if kind == "sentiment" and weight < 0)
     score = (pos - neg) / (pos + neg + 1)
     if score > 0.1:
         label = "إيجابي"
@@ -215,13 +222,15 @@ def score_market_impact(title: str, body: str) -> str:
 
     Returns "high", "medium", or "low".
     """
-    text = f"{title} {body}".lower()
-    for kw in _HIGH_IMPACT_KEYWORDS:
-        if kw.lower() in text:
-            return "high"
-    for kw in _MEDIUM_IMPACT_KEYWORDS:
-        if kw.lower() in text:
-            return "medium"
+    return _impact_from_hits(_scan_text(title, body))
+
+
+def _impact_from_hits(hits: List[tuple]) -> str:
+    levels = {level for kind, level in hits if kind == "impact"}
+    if "high" in levels:
+        return "high"
+    if "medium" in levels:
+        return "medium"
     return "low"
 
 
@@ -321,13 +330,96 @@ def extract_ticker(title: str, body: str) -> str | None:
 
     Returns the first matched ticker code or None.
     """
-    text = f"{title} {body}"
-    for name, ticker in COMPANY_TICKER_MAP.items():
-        if name in text:
+    return _ticker_from_hits(_scan_text(title, body))
+
+
+def _ticker_from_hits(hits: List[tuple]) -> str | None:
+    # Hits come back in map order, so this is the first matching name
+    for kind, ticker in hits:
+        if kind == "ticker":
             return ticker
     return None
 
 
+def reload_ticker_map() -> Dict[str, str]:
+    """Reload company names from the DB and rebuild the keyword matcher.
+
+    Updates :data:`COMPANY_TICKER_MAP` in place so existing references see
+    the new names.
+    """
+    global _text_matcher
+    fresh = _init_ticker_map()
+    COMPANY_TICKER_MAP.clear()
+    COMPANY_TICKER_MAP.update(fresh)
+    _text_matcher = None
+    return COMPANY_TICKER_MAP
+
+
+# ---------------------------------------------------------------------------
+# Compiled keyword matcher
+# ---------------------------------------------------------------------------
+# One automaton over company names and the sentiment / impact vocabularies, so
+# an article is scanned once instead of once per keyword. Built on first use;
+# rebuilt by reload_ticker_map() or when COMPANY_TICKER_MAP is replaced or
+# resized.
+
+_text_matcher: Optional[KeywordMatcher] = None
+# The map object and size the matcher was built from
+_text_matcher_source: tuple = (None, 0)
+
+
+def _build_text_matcher(ticker_map: Dict[str, str]) -> KeywordMatcher:
+    matcher = KeywordMatcher()
+    # Ticker entries first and in map order: extract_ticker takes the first
+    for name, ticker in ticker_map.items():
+        matcher.add(name, ("ticker", ticker))
+    for keywords, weight in (
+        (POSITIVE_KEYWORDS, 1),
+        (STRONG_POSITIVE_KEYWORDS, 2),
+        (NEGATIVE_KEYWORDS, -1),
+        (STRONG_NEGATIVE_KEYWORDS, -2),
+    ):
+        for kw in keywords:
+            matcher.add(kw, ("sentiment", weight))
+    for keywords, level in (
+        (_HIGH_IMPACT_KEYWORDS, "high"),
+        (_MEDIUM_IMPACT_KEYWORDS, "medium"),
+    ):
+        for kw in keywords:
+            matcher.add(kw, ("impact", level), ignore_case=True)
+    return matcher.compile()
+
+
+def _get_text_matcher() -> KeywordMatcher:
+    global _text_matcher, _text_matcher_source
+    source_map, source_len = _text_matcher_source
+    if (
+        _text_matcher is None
+        or source_map is not COMPANY_TICKER_MAP
+        or source_len != len(COMPANY_TICKER_MAP)
+    ):
+        _text_matcher = _build_text_matcher(COMPANY_TICKER_MAP)
+        _text_matcher_source = (COMPANY_TICKER_MAP, len(COMPANY_TICKER_MAP))
+    return _text_matcher
+
+
+def _scan_text(title: str, body: str) -> List[tuple]:
+    """Return the (kind, value) hits of every keyword in the article text."""
+    return _get_text_matcher().find(f"{title} {body}")
+
+
+def score_article(title: str, body: str) -> tuple[str | None, float, str, str]:
+    """Score an article in a single pass over its text.
+
+    Returns ``(ticker, sentiment_score, sentiment_label, impact)``, the same
+    values as :func:`extract_ticker`, :func:`analyze_sentiment` and
+    :func:`score_market_impact`.
+    """
+    hits = _scan_text(title, body)
+    score, label = _sentiment_from_hits(hits)
+    return _ticker_from_hits(hits), score, label, _impact_from_hits(hits)
+
+
 # ---------------------------------------------------------------------------
 # Constants (loaded from config/settings.py ScraperSettings)
 # ---------------------------------------------------------------------------
@@ -479,36 +571,7 @@ class BaseNewsScraper(ABC):
             resp = self._session.get(url, timeout=ARTICLE_FETCH_TIMEOUT)
             resp.raise_for_status()
             resp.encoding = resp.apparent_encoding or "utf-8"
-            soup = BeautifulSoup(resp.text, "lxml")
-
-            # Try common article content selectors (most specific first)
-            for selector in [
-                "article .article-body",
-                "article .entry-content",
-                ".article-content",
-                ".post-content",
-                ".story-body",
-                ".article__body",
-                ".article-text",
-                ".content-article",
-                "article p",
-                "main article",
-                ".content-area",
-            ]:
-                content = soup.select(selector)
-                if content:
-                    text = " ".join(el.get_text(strip=True) for el in content)
-                    if len(text) > 50:
-                        return text
-
-            # Fallback: get all paragraphs from article/main/content areas
-            paragraphs = soup.select("article p, main p, .content p")
-            if paragraphs:
-                text = " ".join(p.get_text(strip=True) for p in paragraphs)
-                if len(text) > 50:
-                    return text
-
-            return ""
+            return extract_article_body(resp.text)
         except Exception:
             logger.debug("Failed to fetch full article from %s", url)
             return ""
@@ -533,6 +596,96 @@ class BaseNewsScraper(ABC):
                 fetched_count += 1
         return articles
 
+    # -- async pipeline (services.news_pipeline) ----------------------------
+
+    def _listing_urls(self) -> List[str]:
+        """Listing pages to try in order until one yields articles."""
+        return [self.source_url]
+
+    async def afetch_articles(self, ctx: "ScrapeContext") -> List[dict]:
+        """Async variant of :meth:`fetch_articles` for the scraping pipeline.
+
+        Requests go through ``ctx`` (shared client, per-host rate limit),
+        parsing runs in the pipeline's parse pool, and bodies are enriched
+        concurrently. Never raises.
+        """
+        for url in self._listing_urls():
+            articles = await self._afetch_listing(ctx, url)
+            if articles:
+                return articles
+        return []
+
+    async def _afetch_listing(self, ctx: "ScrapeContext", url: str) -> List[dict]:
+        try:
+            logger.info("Fetching articles from %s (%s)", self.source_name, url)
+            html = await ctx.get_text(url, REQUEST_TIMEOUT)
+            raw_articles = await ctx.parse(_parse_listing, type(self), url, html)
+
+            relevant = [a for a in raw_articles if self._is_relevant(a)]
+            limited = relevant[:MAX_ARTICLES_PER_SOURCE]
+            with ctx.timings.measure("enrich"):
+                limited = await self._aenrich_bodies(ctx, limited)
+
+            logger.info(
+                "%s: parsed %d articles, %d relevant, returning %d",
+                self.source_name,
+                len(raw_articles),
+                len(relevant),
+                len(limited),
+            )
+            return limited
+
+        except httpx.TimeoutException:
+            logger.warning(
+                "%s: request timed out after %ds", self.source_name, REQUEST_TIMEOUT
+            )
+            return []
+        except httpx.TransportError:
+            logger.warning("%s: connection error", self.source_name)
+            return []
+        except httpx.HTTPStatusError as exc:
+            logger.warning(
+                "%s: HTTP error %s", self.source_name, exc.response.status_code
+            )
+            return []
+        except Exception:
+            logger.warning(
+                "%s: unexpected error during fetch", self.source_name, exc_info=True
+            )
+            return []
+
+    async def _afetch_full_article(self, ctx: "ScrapeContext", url: str) -> str:
+        try:
+            html = await ctx.get_text(url, ARTICLE_FETCH_TIMEOUT)
+            return await ctx.parse(extract_article_body, html)
+        except Exception:
+            logger.debug("Failed to fetch full article from %s", url)
+            return ""
+
+    async def _aenrich_bodies(
+        self, ctx: "ScrapeContext", articles: List[dict]
+    ) -> List[dict]:
+        """Fetch missing bodies concurrently, bounded by ``ctx.enrich_slots``.
+
+        Same selection as :meth:`_enrich_bodies` (first
+        MAX_FULL_ARTICLE_FETCHES articles with an empty/short body); spacing
+        between requests comes from the per-host rate limiter.
+        """
+        targets = [
+            a
+            for a in articles
+            if (not a.get("body") or len(a["body"]) < 50) and a.get("source_url")
+        ][:MAX_FULL_ARTICLE_FETCHES]
+
+        async def _enrich(article: dict) -> None:
+            async with ctx.enrich_slots:
+                full_body = await self._afetch_full_article(ctx, article["source_url"])
+            if full_body:
+                article["body"] = full_body
+
+        await asyncio.gather(*(_enrich(a) for a in targets))
+        return articles
+
     def _make_article(
         self,
         title: str,
@@ -615,6 +768,76 @@ class GoogleNewsRssScraper(BaseNewsScraper):
     _source_filter: str = ""  # domain substring to filter, e.g. "alarabiya"
     _google_rss_base = "https://news.google.com/rss/search"
 
+    def _rss_url(self, query: str) -> str:
+        return f"{self._google_rss_base}?q={quote_plus(query)}&hl=ar&gl=SA&ceid=SA:ar"
+
+    def _parse_rss(self, xml: str) -> List[dict]:
+        """Parse a Google News RSS feed into article dicts.
+
+        Skips items with short titles and, when ``_source_filter`` is set,
+        items from other publishers.
+        """
+        soup = BeautifulSoup(xml, "xml")
+        articles: List[dict] = []
+        for item in soup.select("item"):
+            title_el = item.select_one("title")
+            link_el = item.select_one("link")
+            pub_date_el = item.select_one("pubDate")
+            source_el = item.select_one("source")
+            description_el = item.select_one("description")
+
+            title = title_el.get_text(strip=True) if title_el else ""
+            link = link_el.get_text(strip=True) if link_el else ""
+            pub_date = pub_date_el.get_text(strip=True) if pub_date_el else None
+            source_text = source_el.get_text(strip=True) if source_el else ""
+            source_href = self._get_attr(source_el, "url") if source_el else ""
+            body = ""
+            if description_el:
+                # Google wraps description in HTML; extract text
+                desc_soup = BeautifulSoup(description_el.get_text(), "html.parser")
+                body = desc_soup.get_text(strip=True)
+
+            if not title or len(title) < 10:
+                continue
+
+            # Filter by source domain if specified
+            if self._source_filter:
+                matches_source = (
+                    self._source_filter in source_href.lower()
+                    or self._source_filter in source_text.lower()
+                    or self._source_filter in link.lower()
+                )
+                if not matches_source:
+                    continue
+
+            # Parse RFC 2822 date from Google RSS
+            published_at = None
+            if pub_date:
+                try:
+                    from email.utils import parsedate_to_datetime
+
+                    dt = parsedate_to_datetime(pub_date)
+                    published_at = dt.isoformat()
+                except Exception:
+                    published_at = pub_date
+
+            articles.append(self._make_article(title, body, link, published_at))
+        return articles
+
+    def _select_relevant(self, all_articles: List[dict]) -> List[dict]:
+        # Filter for Saudi market relevance
+        relevant = [a for a in all_articles if self._is_relevant(a)]
+        limited = relevant[:MAX_ARTICLES_PER_SOURCE]
+
+        logger.info(
+            "%s: Google RSS total %d, relevant %d, returning %d",
+            self.source_name,
+            len(all_articles),
+            len(relevant),
+            len(limited),
+        )
+        return limited
+
     def fetch_articles(self) -> List[dict]:
         """Fetch articles from Google News RSS, trying each query in order."""
         all_articles: List[dict] = []
@@ -622,79 +845,27 @@ class GoogleNewsRssScraper(BaseNewsScraper):
 
         for query in self._rss_queries:
             try:
-                encoded_query = quote_plus(query)
-                rss_url = (
-                    f"{self._google_rss_base}?q={encoded_query}&hl=ar&gl=SA&ceid=SA:ar"
-                )
                 logger.info(
                     "Fetching %s articles via Google News RSS: %s",
                     self.source_name,
                     query,
                 )
-                resp = self._session.get(rss_url, timeout=REQUEST_TIMEOUT)
+                resp = self._session.get(self._rss_url(query), timeout=REQUEST_TIMEOUT)
                 resp.raise_for_status()
                 resp.encoding = "utf-8"
 
-                soup = BeautifulSoup(resp.text, "xml")
-                items = soup.select("item")
+                items = self._parse_rss(resp.text)
                 logger.info(
                     "%s: Google RSS returned %d items for query '%s'",
                     self.source_name,
                     len(items),
                     query,
                 )
-
-                for item in items:
-                    title_el = item.select_one("title")
-                    link_el = item.select_one("link")
-                    pub_date_el = item.select_one("pubDate")
-                    source_el = item.select_one("source")
-                    description_el = item.select_one("description")
-
-                    title = title_el.get_text(strip=True) if title_el else ""
-                    link = link_el.get_text(strip=True) if link_el else ""
-                    pub_date = pub_date_el.get_text(strip=True) if pub_date_el else None
-                    source_text = source_el.get_text(strip=True) if source_el else ""
-                    source_href = self._get_attr(source_el, "url") if source_el else ""
-                    body = ""
-                    if description_el:
-                        # Google wraps description in HTML; extract text
-                        desc_soup = BeautifulSoup(
-                            description_el.get_text(), "html.parser"
-                        )
-                        body = desc_soup.get_text(strip=True)
-
-                    if not title or len(title) < 10:
-                        continue
-
-                    # Filter by source domain if specified
-                    if self._source_filter:
-                        matches_source = (
-                            self._source_filter in source_href.lower()
-                            or self._source_filter in source_text.lower()
-                            or self._source_filter in link.lower()
-                        )
-                        if not matches_source:
-                            continue
-
-                    if link in seen_urls:
+                for article in items:
+                    if article["source_url"] in seen_urls:
                         continue
-                    seen_urls.add(link)
-
-                    # Parse RFC 2822 date from Google RSS
-                    published_at = None
-                    if pub_date:
-                        try:
-                            from email.utils import parsedate_to_datetime
-
-                            dt = parsedate_to_datetime(pub_date)
-                            published_at = dt.isoformat()
-                        except Exception:
-                            published_at = pub_date
-
-                    all_articles.append(
-                        self._make_article(title, body, link, published_at)
-                    )
+                    seen_urls.add(article["source_url"])
+                    all_articles.append(article)
 
                 if all_articles:
                     break  # Got results from this query, skip remaining
@@ -726,18 +897,47 @@ class GoogleNewsRssScraper(BaseNewsScraper):
                     exc_info=True,
                 )
 
-        # Filter for Saudi market relevance
-        relevant = [a for a in all_articles if self._is_relevant(a)]
-        limited = relevant[:MAX_ARTICLES_PER_SOURCE]
+        return self._select_relevant(all_articles)
 
-        logger.info(
-            "%s: Google RSS total %d, relevant %d, returning %d",
-            self.source_name,
-            len(all_articles),
-            len(relevant),
-            len(limited),
-        )
-        return limited
+    async def afetch_articles(self, ctx: "ScrapeContext") -> List[dict]:
+        """Async variant of :meth:`fetch_articles` for the scraping pipeline."""
+        all_articles: List[dict] = []
+        seen_urls: set = set()
+
+        for query in self._rss_queries:
+            try:
+                logger.info(
+                    "Fetching %s articles via Google News RSS: %s",
+                    self.source_name,
+                    query,
+                )
+                xml = await ctx.get_text(self._rss_url(query), REQUEST_TIMEOUT)
+                items = await ctx.parse(_parse_rss_feed, type(self), xml)
+                for article in items:
+                    if article["source_url"] in seen_urls:
+                        continue
+                    seen_urls.add(article["source_url"])
+                    all_articles.append(article)
+
+                if all_articles:
+                    break  # Got results from this query, skip remaining
+
+            except httpx.HTTPError as exc:
+                logger.warning(
+                    "%s: Google RSS %s for query '%s'",
+                    self.source_name,
+                    type(exc).__name__,
+                    query,
+                )
+            except Exception:
+                logger.warning(
+                    "%s: unexpected error fetching Google RSS for query '%s'",
+                    self.source_name,
+                    query,
+                    exc_info=True,
+                )
+
+        return self._select_relevant(all_articles)
 
     def _parse_page(self, html: str) -> List[dict]:
         """Not used for RSS scrapers -- fetch_articles is overridden."""
@@ -855,6 +1055,9 @@ class MaaalScraper(BaseNewsScraper):
         "https://www.maaal.com/",
     ]
 
+    def _listing_urls(self) -> List[str]:
+        return list(self._alt_urls)
+
     def fetch_articles(self) -> List[dict]:
         """Override to try multiple URLs for Maaal."""
         for url in self._alt_urls:
@@ -1015,6 +1218,64 @@ class MubasherScraper(BaseNewsScraper):
         return articles
 
 
+# ---------------------------------------------------------------------------
+# Parse functions for the pipeline's process pool (module-level so they
+# pickle; scrapers are rebuilt without __init__ to skip the HTTP session)
+# ---------------------------------------------------------------------------
+def extract_article_body(html: str) -> str:
+    """Extract the main article text from a full article page.
+
+    Tries common article content selectors, falling back to paragraph
+    extraction. Returns empty string when nothing substantial is found.
+    """
+    soup = BeautifulSoup(html, "lxml")
+
+    # Try common article content selectors (most specific first)
+    for selector in [
+        "article .article-body",
+        "article .entry-content",
+        ".article-content",
+        ".post-content",
+        ".story-body",
+        ".article__body",
+        ".article-text",
+        ".content-article",
+        "article p",
+        "main article",
+        ".content-area",
+    ]:
+        content = soup.select(selector)
+        if content:
+            text = " ".join(el.get_text(strip=True) for el in content)
+            if len(text) > 50:
+                return text
+
+    # Fallback: get all paragraphs from article/main/content areas
+    paragraphs = soup.select("article p, main p, .content p")
+    if paragraphs:
+        text = " ".join(p.get_text(strip=True) for p in paragraphs)
+        if len(text) > 50:
+            return text
+
+    return ""
+
+
+def _bare_scraper(scraper_cls: type) -> BaseNewsScraper:
+    return scraper_cls.__new__(scraper_cls)
+
+
+def _parse_listing(scraper_cls: type, source_url: str, html: str) -> List[dict]:
+    """Run ``scraper_cls._parse_page`` on a listing page fetched from ``source_url``."""
+    scraper = _bare_scraper(scraper_cls)
+    scraper.source_url = source_url
+    return scraper._parse_page(html)
+
+
+def _parse_rss_feed(scraper_cls: type, xml: str) -> List[dict]:
+    """Run ``scraper_cls._parse_rss`` on a Google News RSS feed."""
+    return _bare_scraper(scraper_cls)._parse_rss(xml)
+
+
 # ---------------------------------------------------------------------------
 # Registry of all scrapers
 # ---------------------------------------------------------------------------
@@ -1030,76 +1291,67 @@ ALL_SCRAPERS: List[type] = [
 # ---------------------------------------------------------------------------
 # Deduplication
 # ---------------------------------------------------------------------------
-def _title_word_overlap(title_a: str, title_b: str) -> float:
-    """Return the fraction of shared words between two titles (Jaccard-like).
-
-    Computes ``|intersection| / |union|`` over whitespace-split word sets.
-    Returns 0.0 when both titles are empty.
-    """
-    words_a = set(title_a.split())
-    words_b = set(title_b.split())
-    if not words_a and not words_b:
-        return 0.0
-    intersection = words_a & words_b
-    union = words_a | words_b
-    return len(intersection) / len(union)
-
-
 def _deduplicate(
-    articles: List[dict], threshold: float = _scraper_cfg.dedup_threshold
+    articles: List[dict],
+    threshold: float = _scraper_cfg.dedup_threshold,
+    index: Optional[NearDuplicateIndex] = None,
 ) -> List[dict]:
     """Remove near-duplicate articles based on title similarity.
 
-    Two-pass deduplication:
+    Candidate pairs come from a MinHash/LSH index over title shingles
+    (``services.near_dedup``), so each title is compared only with kept
+    titles that share an LSH bucket instead of with every kept title. A
+    candidate is a duplicate when either check passes:
     1. SequenceMatcher on full titles with a 0.55 threshold (lowered from 0.7
        to catch paraphrased duplicates that share most of the same phrasing).
     2. Word-overlap check on titles: if >50% of the words are shared between
        two article titles, they are considered duplicates.
 
     Keeps the article from the higher-priority source (lower priority number).
+    ``index`` must be empty; it defaults to one built from the
+    ``SCRAPER_DEDUP_*`` settings.
     """
-    unique: List[dict] = []
-    for article in articles:
-        is_dup = False
-        for existing in unique:
-            # Check 1: SequenceMatcher ratio
-            seq_similarity = SequenceMatcher(
-                None,
-                article["title"],
-                existing["title"],
-            ).ratio()
-            # Check 2: word overlap in titles
-            word_overlap = _title_word_overlap(article["title"], existing["title"])
-
-            if seq_similarity >= threshold or word_overlap > 0.50:
-                is_dup = True
+    if index is None:
+        index = NearDuplicateIndex.from_settings()
+    # Kept articles by input position; dict order matches the old list order
+    # (a replacement is appended at the end), so candidates are checked in
+    # the same order as before.
+    kept: Dict[int, dict] = {}
+    for slot, article in enumerate(articles):
+        buckets = index.buckets(article["title"])
+        for other in sorted(index.candidates(buckets)):
+            existing = kept.get(other)
+            if existing is None:
+                continue  # replaced by a higher-priority duplicate
+            if titles_similar(article["title"], existing["title"], threshold):
                 # Keep the one with higher priority (lower number)
                 if article["priority"] < existing["priority"]:
-                    unique.remove(existing)
-                    unique.append(article)
+                    del kept[other]
+                    kept[slot] = article
+                    index.add(slot, buckets)
                 break
-        if not is_dup:
-            unique.append(article)
-    return unique
+        else:
+            kept[slot] = article
+            index.add(slot, buckets)
+    return list(kept.values())
 
 
 # ---------------------------------------------------------------------------
 # Top-level aggregator
 # ---------------------------------------------------------------------------
 def fetch_all_news() -> List[dict]:
-    """Run all scrapers, paraphrase, deduplicate, and sort results.
+    """Run all scrapers concurrently, paraphrase, deduplicate, and sort results.
 
     Returns articles sorted by priority (ascending) then published_at
     (descending, most recent first).
     """
-    all_articles: List[dict] = []
+    from services.news_pipeline import ScrapePipeline
 
-    for scraper_cls in ALL_SCRAPERS:
-        scraper = scraper_cls()
-        articles = scraper.fetch_articles()
-        all_articles.extend(articles)
-        if articles:
-            time.sleep(INTER_REQUEST_DELAY)
+    pipeline = ScrapePipeline.from_settings()
+    try:
+        all_articles = pipeline.run(ALL_SCRAPERS).articles
+    finally:
+        pipeline.close()
 
     logger.info("Total raw articles fetched: %d", len(all_articles))
 
@@ -1115,20 +1367,15 @@ def fetch_all_news() -> List[dict]:
                 exc_info=True,
             )
 
-        # Sentiment analysis
+        # Sentiment, ticker and market impact from one scan of the text
         title = article.get("title", "")
         body = article.get("body", "")
-        score, label = analyze_sentiment(title, body)
+        ticker, score, label, impact = score_article(title, body)
         article["sentiment_score"] = score
         article["sentiment_label"] = label
-
-        # Ticker extraction
-        ticker = extract_ticker(title, body)
         if ticker:
             article["ticker"] = ticker
-
-        # Market-impact scoring
-        article["impact_score"] = score_market_impact(title, body)
+        article["impact_score"] = impact
 
         paraphrased.append(article)
 
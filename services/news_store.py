@@ -7,6 +7,11 @@ model works in both development (SQLite) and production (PostgreSQL).
 
 Thread-safe: reuses one SQLite connection per thread via threading.local().
 
+Full-text search uses an FTS5 ``news_articles_fts`` index (trigram
+tokenizer, bm25 ranking) kept in sync by triggers; it is created and
+backfilled on first use and searches fall back to ``LIKE`` where FTS5 or the
+trigram tokenizer is unavailable.
+
 Usage:
     from services.news_store import NewsStore
     store = NewsStore("saudi_stocks.db")
@@ -22,7 +27,9 @@ import sqlite3
 import threading
 import uuid
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from services.near_dedup import NearDuplicateIndex
 
 logger = logging.getLogger(__name__)
 
@@ -49,15 +56,78 @@ _CREATE_INDEXES_SQL = [
     "CREATE INDEX IF NOT EXISTS idx_news_articles_source ON news_articles (source_name)",
     "CREATE INDEX IF NOT EXISTS idx_news_articles_ticker ON news_articles (ticker)",
     "CREATE INDEX IF NOT EXISTS idx_news_articles_published ON news_articles (published_at DESC)",
+    # Serves the feed order, so keyset pages are an index seek
+    "CREATE INDEX IF NOT EXISTS idx_news_articles_feed ON news_articles (created_at DESC, priority ASC, id ASC)",
 ]
 
+# Feed sort key, in ORDER BY order. Articles stored in one batch share a
+# created_at second, so priority and id break ties deterministically.
+FEED_KEY_COLUMNS = ("created_at", "priority", "id")
+
+
+# External-content FTS5 index over title/body. The trigram tokenizer matches
+# substrings (like the LIKE search it replaces), so Arabic words with attached
+# clitics (ال، و، ب) and English word stems still match; case-insensitive.
+# Its rowids mirror news_articles rowids: after a VACUUM of the database, call
+# NewsStore.rebuild_search_index().
+_CREATE_FTS_SQL = """\
+CREATE VIRTUAL TABLE IF NOT EXISTS news_articles_fts USING fts5(
+    title, body, content='news_articles', tokenize='trigram'
+)
+"""
+
+_CREATE_FTS_TRIGGERS_SQL = [
+    """CREATE TRIGGER IF NOT EXISTS news_articles_fts_ai
+       AFTER INSERT ON news_articles BEGIN
+           INSERT INTO news_articles_fts (rowid, title, body)
+           VALUES (new.rowid, new.title, new.body);
+       END""",
+    """CREATE TRIGGER IF NOT EXISTS news_articles_fts_ad
+       AFTER DELETE ON news_articles BEGIN
+           INSERT INTO news_articles_fts (news_articles_fts, rowid, title, body)
+           VALUES ('delete', old.rowid, old.title, old.body);
+       END""",
+    """CREATE TRIGGER IF NOT EXISTS news_articles_fts_au
+       AFTER UPDATE OF title, body ON news_articles BEGIN
+           INSERT INTO news_articles_fts (news_articles_fts, rowid, title, body)
+           VALUES ('delete', old.rowid, old.title, old.body);
+           INSERT INTO news_articles_fts (rowid, title, body)
+           VALUES (new.rowid, new.title, new.body);
+       END""",
+]
+
+# LSH bucket keys of each article title (services/near_dedup.py), used to
+# find near-duplicates of new articles among stored ones. Keyed on the
+# article rowid to keep rows small; removed with the article by trigger.
+_CREATE_TITLE_BUCKETS_SQL = [
+    """CREATE TABLE IF NOT EXISTS news_title_buckets (
+           bucket INTEGER NOT NULL,
+           article_rowid INTEGER NOT NULL,
+           PRIMARY KEY (bucket, article_rowid)
+       ) WITHOUT ROWID""",
+    "CREATE INDEX IF NOT EXISTS idx_news_title_buckets_article ON news_title_buckets (article_rowid)",
+    """CREATE TRIGGER IF NOT EXISTS news_title_buckets_ad
+       AFTER DELETE ON news_articles BEGIN
+           DELETE FROM news_title_buckets WHERE article_rowid = old.rowid;
+       END""",
+]
+
+# Trigram queries need at least 3 characters per term
+_FTS_MIN_TERM = 3
+# bm25 column weights: a title hit counts 10x a body hit
+_FTS_RANK = "bm25(news_articles_fts, 10.0, 1.0)"
+
 
 class NewsStore:
     """SQLite-backed news article storage."""
 
-    def __init__(self, db_path: str):
+    def __init__(self, db_path: str, dedup_index: Optional[NearDuplicateIndex] = None):
         self.db_path = db_path
         self._local = threading.local()
+        # Set by _ensure_table(): whether the FTS5 search index is available
+        self.fts_enabled = False
+        # Bucket scheme for stored title signatures (SCRAPER_DEDUP_* settings)
+        self.dedup_index = dedup_index or NearDuplicateIndex.from_settings()
         self._ensure_table()
 
     def _connect(self) -> sqlite3.Connection:
@@ -109,22 +179,148 @@ class NewsStore:
                 exc_info=True,
             )
             raise
+        self._ensure_search_index(conn)
+        self._ensure_title_buckets(conn)
+
+    def _ensure_search_index(self, conn: sqlite3.Connection) -> None:
+        """Create the FTS5 index and its sync triggers, backfilling once.
+
+        The backfill runs only when the index table is first created, so
+        existing databases are migrated on their first start. If this SQLite
+        build lacks FTS5 or the trigram tokenizer, search stays on LIKE.
+        """
+        try:
+            existed = conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' "
+                "AND name = 'news_articles_fts'"
+            ).fetchone()
+            conn.execute(_CREATE_FTS_SQL)
+            for trigger_sql in _CREATE_FTS_TRIGGERS_SQL:
+                conn.execute(trigger_sql)
+            if not existed:
+                conn.execute(
+                    "INSERT INTO news_articles_fts (news_articles_fts) "
+                    "VALUES ('rebuild')"
+                )
+            conn.commit()
+        except sqlite3.OperationalError:
+            conn.rollback()
+            logger.warning(
+                "FTS5 trigram search unavailable in %s; using LIKE search",
+                self.db_path,
+                exc_info=True,
+            )
+            return
+        self.fts_enabled = True
+        if not existed:
+            logger.info("news_articles_fts index built in %s", self.db_path)
+
+    def _ensure_title_buckets(self, conn: sqlite3.Connection) -> None:
+        """Create the title bucket table, backfilling once like the FTS index."""
+        try:
+            existed = conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' "
+                "AND name = 'news_title_buckets'"
+            ).fetchone()
+            for sql in _CREATE_TITLE_BUCKETS_SQL:
+                conn.execute(sql)
+            if not existed:
+                self._index_titles(
+                    conn,
+                    conn.execute("SELECT rowid, title FROM news_articles").fetchall(),
+                )
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            logger.error(
+                "Failed to ensure news_title_buckets in %s",
+                self.db_path,
+                exc_info=True,
+            )
+            raise
+
+    def _index_titles(self, conn: sqlite3.Connection, rows) -> None:
+        """Insert the LSH bucket keys of ``(rowid, title)`` rows."""
+        buckets = self.dedup_index.buckets
+        conn.executemany(
+            "INSERT OR IGNORE INTO news_title_buckets (bucket, article_rowid)"
+            " VALUES (?, ?)",
+            (
+                (bucket, rowid)
+                for rowid, title in rows
+                for bucket in buckets(title or "")
+            ),
+        )
+
+    def rebuild_title_buckets(self) -> None:
+        """Recompute stored title buckets (after changing SCRAPER_DEDUP_*)."""
+        conn = self._connect()
+        try:
+            conn.execute("DELETE FROM news_title_buckets")
+            self._index_titles(
+                conn, conn.execute("SELECT rowid, title FROM news_articles").fetchall()
+            )
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            logger.error("Failed to rebuild news_title_buckets", exc_info=True)
+            raise
+
+    def _has_stored_near_duplicate(
+        self, conn: sqlite3.Connection, title: str, buckets: List[int]
+    ) -> bool:
+        """Whether a stored article sharing an LSH bucket has a similar title."""
+        placeholders = ",".join("?" for _ in buckets)
+        rows = conn.execute(
+            f"""SELECT DISTINCT a.title FROM news_title_buckets b
+                JOIN news_articles a ON a.rowid = b.article_rowid
+                WHERE b.bucket IN ({placeholders})""",  # nosec B608
+            buckets,
+        ).fetchall()
+        return any(self.dedup_index.similar(title, row[0]) for row in rows)
+
+    def rebuild_search_index(self) -> None:
+        """Rebuild the FTS5 index from news_articles (e.g. after VACUUM)."""
+        if not self.fts_enabled:
+            return
+        conn = self._connect()
+        try:
+            conn.execute(
+                "INSERT INTO news_articles_fts (news_articles_fts) VALUES ('rebuild')"
+            )
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            logger.error("Failed to rebuild news_articles_fts", exc_info=True)
+            raise
 
-    def store_articles(self, articles: List[Dict]) -> int:
+    def store_articles(
+        self, articles: List[Dict], skip_near_duplicates: bool = False
+    ) -> int:
         """Insert articles, skipping duplicates. Returns count of newly inserted.
 
-        Uses a single ``executemany`` call (all-or-nothing batch). Duplicate
-        rows are silently skipped by ``INSERT OR IGNORE`` at the SQLite engine
+        All rows go in one transaction (all-or-nothing batch). Duplicate rows
+        are silently skipped by ``INSERT OR IGNORE`` at the SQLite engine
         level — no ``IntegrityError`` is raised for duplicates.  Any other
         unexpected error rolls back the entire batch.
+
+        Each inserted title's LSH bucket keys are stored alongside it. With
+        ``skip_near_duplicates``, an article whose title near-duplicates a
+        stored one (including one stored earlier in the same batch) is
+        skipped; only titles sharing a bucket are read and compared.
+
+        After commit, the newly inserted rows are published to the news hub
+        (``services.news_hub``) so SSE clients are notified immediately.
         """
         if not articles:
             return 0
 
         conn = self._connect()
+        new_items: List[Dict] = []
+        near_duplicates = 0
         try:
-            rows = [
-                (
+            for article in articles:
+                row = (
                     article.get("id") or str(uuid.uuid4()),
                     article.get("ticker"),
                     article.get("title", ""),
@@ -137,26 +333,49 @@ class NewsStore:
                     article.get("language", "ar"),
                     article.get("priority", 3),
                 )
-                for article in articles
-            ]
-            before = conn.total_changes
-            conn.executemany(
-                """INSERT OR IGNORE INTO news_articles
-                   (id, ticker, title, body, source_name, source_url,
-                    published_at, sentiment_score, sentiment_label,
-                    language, priority)
-                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
-                rows,
-            )
-            inserted = conn.total_changes - before
+                buckets = self.dedup_index.buckets(row[2] or "")
+                if skip_near_duplicates and self._has_stored_near_duplicate(
+                    conn, row[2], buckets
+                ):
+                    near_duplicates += 1
+                    continue
+                cur = conn.execute(
+                    """INSERT OR IGNORE INTO news_articles
+                       (id, ticker, title, body, source_name, source_url,
+                        published_at, sentiment_score, sentiment_label,
+                        language, priority)
+                       VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+                    row,
+                )
+                if cur.rowcount > 0:
+                    conn.executemany(
+                        "INSERT OR IGNORE INTO news_title_buckets"
+                        " (bucket, article_rowid) VALUES (?, ?)",
+                        [(bucket, cur.lastrowid) for bucket in buckets],
+                    )
+                    new_items.append(
+                        {"id": row[0], "title": row[2], "source_name": row[4]}
+                    )
             conn.commit()
+            inserted = len(new_items)
             logger.info(
-                "Stored %d new articles (of %d provided)", inserted, len(articles)
+                "Stored %d new articles (of %d provided, %d near-duplicates skipped)",
+                inserted,
+                len(articles),
+                near_duplicates,
             )
         except Exception:
             conn.rollback()
             logger.error("Failed to store articles", exc_info=True)
             raise
+
+        if new_items:
+            try:
+                from services.news_hub import publish_new_articles
+
+                publish_new_articles(new_items)
+            except Exception:
+                logger.warning("Failed to publish new articles", exc_info=True)
         return inserted
 
     def _build_filters(
@@ -195,20 +414,34 @@ class NewsStore:
         sentiment_label: Optional[str] = None,
         date_from: Optional[str] = None,
         date_to: Optional[str] = None,
+        after: Optional[Sequence] = None,
     ) -> List[Dict]:
         """Get latest news, optionally filtered by source, sentiment, and date range.
 
+        ``after`` is the :data:`FEED_KEY_COLUMNS` key of the last article of
+        the previous page; when given, the page starts right after it (keyset
+        pagination) and ``offset`` is ignored.
+
         .. deprecated:: Use :meth:`aget_latest_news` in async contexts.
         """
         conn = self._connect()
         clauses, params = self._build_filters(
             source, sentiment_label, date_from, date_to
         )
+        if after is not None:
+            created_at, priority, article_id = after
+            # The leading created_at bound lets the feed index seek directly
+            clauses.append(
+                "created_at <= ? AND (created_at < ?"
+                " OR (created_at = ? AND (priority, id) > (?, ?)))"
+            )
+            params.extend([created_at, created_at, created_at, priority, article_id])
+            offset = 0
         where = (" WHERE " + " AND ".join(clauses)) if clauses else ""
         params.extend([limit, offset])
         rows = conn.execute(
             f"""SELECT * FROM news_articles{where}
-                ORDER BY created_at DESC, priority ASC
+                ORDER BY created_at DESC, priority ASC, id ASC
                 LIMIT ? OFFSET ?""",  # nosec B608
             params,
         ).fetchall()
@@ -263,7 +496,7 @@ class NewsStore:
         ).fetchone()
         return row[0] if row else 0
 
-    def search_articles(
+    def search_page(
         self,
         query: str,
         limit: int = 20,
@@ -272,31 +505,101 @@ class NewsStore:
         sentiment_label: Optional[str] = None,
         date_from: Optional[str] = None,
         date_to: Optional[str] = None,
-    ) -> List[Dict]:
-        """Search articles by title or body text, with optional filters.
-
-        .. deprecated:: Use :meth:`asearch_articles` in async contexts.
+    ) -> Tuple[List[Dict], int]:
+        """Search articles and count all matches in a single query.
+
+        Every whitespace-separated term must appear in the title or body
+        (case-insensitive substring match). With the FTS5 index, results are
+        ranked by bm25 (title hits weighted above body hits), then recency;
+        terms shorter than 3 characters, which the trigram index cannot
+        match, are checked with LIKE on the matched rows. Without any indexable
+        term, or without FTS5, the whole search uses LIKE in recency order.
+
+        Returns:
+            (page of article dicts, total matching articles).
         """
         conn = self._connect()
-        escaped = query.replace("%", "\\%").replace("_", "\\_")
-        pattern = f"%{escaped}%"
+        terms = query.split() or [query]
+        indexed = [t for t in terms if len(t) >= _FTS_MIN_TERM]
+        if not self.fts_enabled:
+            indexed = []
+        unindexed = [t for t in terms if t not in indexed]
+
+        clauses: List[str] = []
+        params: list = []
+        if indexed:
+            # bm25() is only usable in a plain query over the FTS table, so
+            # rank there and join the articles onto the hits
+            match = " AND ".join('"' + t.replace('"', '""') + '"' for t in indexed)
+            prefix = f"""WITH hits AS (
+                    SELECT rowid, {_FTS_RANK} AS score
+                    FROM news_articles_fts WHERE news_articles_fts MATCH ?
+                )
+                """
+            params.append(match)
+            source_sql = "hits JOIN news_articles a ON a.rowid = hits.rowid"
+            order = "hits.score, a.created_at DESC"
+        else:
+            prefix = ""
+            source_sql = "news_articles a"
+            order = "a.created_at DESC, a.priority ASC"
+
+        for term in unindexed:
+            escaped = term.replace("%", "\\%").replace("_", "\\_")
+            pattern = f"%{escaped}%"
+            clauses.append("(a.title LIKE ? ESCAPE '\\' OR a.body LIKE ? ESCAPE '\\')")
+            params.extend([pattern, pattern])
         extra_clauses, extra_params = self._build_filters(
             source, sentiment_label, date_from, date_to
         )
-        where = "(title LIKE ? ESCAPE '\\' OR body LIKE ? ESCAPE '\\')"
-        params: list = [pattern, pattern]
-        if extra_clauses:
-            where += " AND " + " AND ".join(extra_clauses)
-            params.extend(extra_params)
-        params.extend([limit, offset])
+        clauses.extend(f"a.{c}" for c in extra_clauses)
+        params.extend(extra_params)
+        where = (" WHERE " + " AND ".join(clauses)) if clauses else ""
+
+        # COUNT(*) OVER () is evaluated before LIMIT, giving the total
         rows = conn.execute(
-            f"""SELECT * FROM news_articles
-                WHERE {where}
-                ORDER BY created_at DESC, priority ASC
+            f"""{prefix}SELECT a.*, COUNT(*) OVER () AS _total
+                FROM {source_sql}{where}
+                ORDER BY {order}
                 LIMIT ? OFFSET ?""",  # nosec B608
-            params,
+            params + [limit, offset],
         ).fetchall()
-        return [dict(row) for row in rows]
+
+        if not rows:
+            if offset > 0:
+                # Past the last page: count without an offset
+                return [], self.search_page(
+                    query, 1, 0, source, sentiment_label, date_from, date_to
+                )[1]
+            return [], 0
+
+        total = rows[0]["_total"]
+        items = []
+        for row in rows:
+            item = dict(row)
+            del item["_total"]
+            items.append(item)
+        return items, total
+
+    def search_articles(
+        self,
+        query: str,
+        limit: int = 20,
+        offset: int = 0,
+        source: Optional[str] = None,
+        sentiment_label: Optional[str] = None,
+        date_from: Optional[str] = None,
+        date_to: Optional[str] = None,
+    ) -> List[Dict]:
+        """Search articles by title or body text, with optional filters.
+
+        See :meth:`search_page` for matching and ranking.
+
+        .. deprecated:: Use :meth:`asearch_page` in async contexts.
+        """
+        return self.search_page(
+            query, limit, offset, source, sentiment_label, date_from, date_to
+        )[0]
 
     def count_search(
         self,
@@ -308,24 +611,11 @@ class NewsStore:
     ) -> int:
         """Count total articles matching a search query with optional filters.
 
-        .. deprecated:: Use :meth:`acount_search` in async contexts.
+        .. deprecated:: Use :meth:`asearch_page` in async contexts.
         """
-        conn = self._connect()
-        escaped = query.replace("%", "\\%").replace("_", "\\_")
-        pattern = f"%{escaped}%"
-        extra_clauses, extra_params = self._build_filters(
-            source, sentiment_label, date_from, date_to
-        )
-        where = "(title LIKE ? ESCAPE '\\' OR body LIKE ? ESCAPE '\\')"
-        params: list = [pattern, pattern]
-        if extra_clauses:
-            where += " AND " + " AND ".join(extra_clauses)
-            params.extend(extra_params)
-        row = conn.execute(
-            f"SELECT COUNT(*) FROM news_articles WHERE {where}",  # nosec B608
-            params,
-        ).fetchone()
-        return row[0] if row else 0
+        return self.search_page(
+            query, 1, 0, source, sentiment_label, date_from, date_to
+        )[1]
 
     def get_sources(self) -> List[Dict]:
         """Get list of sources with article counts.
@@ -376,6 +666,9 @@ class NewsStore:
     async def acount_search(self, **kwargs) -> int:
         return await asyncio.to_thread(self.count_search, **kwargs)
 
+    async def asearch_page(self, **kwargs) -> Tuple[List[Dict], int]:
+        return await asyncio.to_thread(self.search_page, **kwargs)
+
     async def aget_sources(self) -> List[Dict]:
         return await asyncio.to_thread(self.get_sources)
 
@@ -0,0 +1,146 @@
+"""
+OHLCV Cache Warmup
+==================
+Background job that keeps the per-stock OHLCV cache (services.stock_ohlcv)
+warm for every listed company, using multi-ticker yfinance downloads instead
+of one HTTP round-trip per ticker.
+
+Usage:
+    from services.ohlcv_warmup import OhlcvWarmupJob
+
+    job = OhlcvWarmupJob(period="1y", interval_seconds=600)
+    job.start()   # non-blocking: warms immediately, then on every interval
+    ...
+    job.stop()
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from datetime import datetime
+from typing import Callable, List, Optional
+
+from services.stock_ohlcv import (
+    DEFAULT_BATCH_SIZE,
+    VALID_PERIODS,
+    Downloader,
+    fetch_stock_ohlcv_batch,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def load_listed_tickers() -> List[str]:
+    """Return all company tickers, largest market cap first."""
+    from api.db_helper import _sync_fetchall
+    from database.queries import WARMUP_TICKERS
+
+    return [row["ticker"] for row in _sync_fetchall(WARMUP_TICKERS)]
+
+
+class OhlcvWarmupJob:
+    """Periodically refills the OHLCV cache in multi-ticker batches.
+
+    A run only downloads tickers that are missing from the cache or would
+    stop being servable before the next run. Entries past the soft TTL are
+    still served while a request revalidates them, so requested tickers
+    stay current on their own; the job keeps the rest of the listing from
+    falling out of the hard TTL.
+    """
+
+    def __init__(
+        self,
+        ticker_loader: Optional[Callable[[], List[str]]] = None,
+        period: str = "1y",
+        interval_seconds: int = 600,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        downloader: Optional[Downloader] = None,
+    ):
+        if period not in VALID_PERIODS:
+            raise ValueError(f"Invalid warmup period '{period}'")
+        self._ticker_loader = ticker_loader or load_listed_tickers
+        self.period = period
+        self.interval_seconds = int(interval_seconds)
+        self.batch_size = int(batch_size)
+        self._downloader = downloader
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._run_count = 0
+        self._last_run_at: datetime | None = None
+        self._last_duration_ms: float | None = None
+        self._last_requested = 0
+        self._last_filled = 0
+        self._failures = 0
+
+    def start(self) -> None:
+        """Start the background thread (first run happens immediately)."""
+        if self._thread is not None and self._thread.is_alive():
+            logger.warning("OhlcvWarmupJob already running")
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run_loop, name="ohlcv-warmup", daemon=True
+        )
+        self._thread.start()
+        logger.info(
+            "OhlcvWarmupJob started (period=%s, interval=%ds, batch_size=%d)",
+            self.period,
+            self.interval_seconds,
+            self.batch_size,
+        )
+
+    def stop(self) -> None:
+        """Stop the job; an in-progress run stops before its next batch."""
+        self._stop.set()
+
+    def _run_loop(self) -> None:
+        while not self._stop.is_set():
+            self.run_once()
+            if self._stop.wait(self.interval_seconds):
+                return
+
+    def run_once(self) -> int:
+        """Warm the cache once; return the number of tickers filled."""
+        t_start = time.monotonic()
+        try:
+            tickers = self._ticker_loader()
+            filled = fetch_stock_ohlcv_batch(
+                tickers,
+                period=self.period,
+                batch_size=self.batch_size,
+                downloader=self._downloader,
+                stop_event=self._stop,
+                servable_for=self.interval_seconds,
+            )
+        except Exception:
+            self._failures += 1
+            logger.warning("OHLCV warmup run failed", exc_info=True)
+            return 0
+        self._run_count += 1
+        self._last_run_at = datetime.utcnow()
+        self._last_duration_ms = round((time.monotonic() - t_start) * 1000, 1)
+        self._last_requested = len(tickers)
+        self._last_filled = len(filled)
+        logger.info(
+            "OHLCV warmup complete: %d/%d tickers filled in %.1f ms",
+            self._last_filled,
+            self._last_requested,
+            self._last_duration_ms,
+        )
+        return self._last_filled
+
+    def get_stats(self) -> dict:
+        """Return warmup statistics (runs, last run time and coverage)."""
+        return {
+            "run_count": self._run_count,
+            "last_run_at": self._last_run_at.isoformat() if self._last_run_at else None,
+            "last_duration_ms": self._last_duration_ms,
+            "last_requested": self._last_requested,
+            "last_filled": self._last_filled,
+            "failures": self._failures,
+            "is_running": self._thread is not None
+            and self._thread.is_alive()
+            and not self._stop.is_set(),
+        }
@@ -0,0 +1,226 @@
+"""
+Vectorized in-process screener engine.
+
+The screener universe is ~500 rows, so the whole ``screener_snapshot``
+table fits in a handful of NumPy arrays.  ``ScreenerEngine`` evaluates the
+route's filter predicates as boolean masks over those arrays instead of
+sending SQL per request:
+
+- numeric range filters (``>=`` / ``<=``) are array comparisons; NaN
+  stands in for SQL NULL and compares False, exactly like ``NULL >= x``;
+- ``sector`` and ``LOWER(recommendation)`` equality use bitmaps (one
+  boolean mask per distinct value) precomputed at build time;
+- the requested page is the top ``offset + limit`` rows, selected with
+  ``np.argpartition`` and only then sorted.
+
+Ordering matches ``_order_by`` in the route: the sort column with NULLs
+last, then ticker.  Text columns are ordered by code point, which is
+SQLite's default (BINARY) collation.
+
+The engine is rebuilt from the snapshot table whenever the
+``ScreenerSnapshotStore`` rebuilds or adopts a new version, so it is never
+staler than the table it mirrors.
+
+Usage:
+    from services.screener_engine import aget_screener_engine
+
+    engine = await aget_screener_engine()   # None -> use SQL
+    if engine is not None:
+        rows, total = engine.search(
+            [("trailing_pe", "<=", 15.0)], "market_cap", True, limit=50, offset=0
+        )
+"""
+
+from __future__ import annotations
+
+import logging
+from typing import Any, Dict, Hashable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from database.queries import SCREENER_SORT_COLUMNS
+from services.market_snapshot import _float_column
+
+logger = logging.getLogger(__name__)
+
+# Text columns of SCREENER_BASE; every other column is numeric.
+TEXT_COLUMNS = ("ticker", "short_name", "sector", "industry", "recommendation")
+
+# Columns with precomputed equality bitmaps: "=" matches the value exactly,
+# "ieq" matches it case-insensitively (``LOWER(col) = LOWER(?)``).
+BITMAP_COLUMNS = ("sector", "recommendation")
+
+Predicate = Tuple[str, str, Any]
+
+
+def _rank_column(values: List[Optional[str]]) -> np.ndarray:
+    """Code-point rank of each text value as float64 (NULL -> NaN)."""
+    ranks = {v: i for i, v in enumerate(sorted({v for v in values if v is not None}))}
+    return np.array(
+        [np.nan if v is None else ranks[v] for v in values], dtype=np.float64
+    )
+
+
+def _bitmaps(values: List[Optional[str]], fold: bool) -> Dict[str, np.ndarray]:
+    groups: Dict[str, List[int]] = {}
+    for i, v in enumerate(values):
+        if v is not None:
+            groups.setdefault(v.lower() if fold else v, []).append(i)
+    masks = {}
+    for key, positions in groups.items():
+        mask = np.zeros(len(values), dtype=bool)
+        mask[positions] = True
+        masks[key] = mask
+    return masks
+
+
+class ScreenerEngine:
+    """Immutable columnar copy of ``screener_snapshot``.
+
+    Args:
+        rows: Rows shaped like ``SCREENER_BASE``; returned as-is by
+            :meth:`search`, so results are the same dicts SQL produced.
+        key: Build identity of the source table (see
+            ``ScreenerSnapshotStore.build_key``).
+    """
+
+    def __init__(self, rows: List[Dict[str, Any]], key: Hashable = None) -> None:
+        self.key = key
+        self.size = len(rows)
+        self._rows = rows
+        self._empty = np.zeros(self.size, dtype=bool)
+
+        columns = list(rows[0]) if rows else list(SCREENER_SORT_COLUMNS)
+        self._numeric: Dict[str, np.ndarray] = {
+            c: _float_column(rows, c) for c in columns if c not in TEXT_COLUMNS
+        }
+        text = {c: [r.get(c) for r in rows] for c in TEXT_COLUMNS}
+
+        self._eq = {c: _bitmaps(text[c], fold=False) for c in BITMAP_COLUMNS}
+        self._ieq = {c: _bitmaps(text[c], fold=True) for c in BITMAP_COLUMNS}
+
+        # Every sort column as a float64 key; text sorts by code-point rank
+        self._sort_keys: Dict[str, np.ndarray] = {}
+        for column in SCREENER_SORT_COLUMNS:
+            if column in TEXT_COLUMNS:
+                self._sort_keys[column] = _rank_column(text[column])
+            elif column in self._numeric:
+                self._sort_keys[column] = self._numeric[column]
+        self._ticker_rank = self._sort_keys["ticker"]
+
+    # -- filtering -----------------------------------------------------------
+
+    def _mask(self, column: str, op: str, value: Any) -> np.ndarray:
+        if op == "=" and column in self._eq:
+            return self._eq[column].get(value, self._empty)
+        if op == "ieq" and column in self._ieq:
+            return self._ieq[column].get(str(value).lower(), self._empty)
+        if op == ">=":
+            return self._numeric[column] >= value
+        if op == "<=":
+            return self._numeric[column] <= value
+        raise ValueError(f"Unsupported screener predicate: {column} {op}")
+
+    def filter(self, predicates: Sequence[Predicate]) -> np.ndarray:
+        """Row indices matching every ``(column, op, value)`` predicate."""
+        mask = np.ones(self.size, dtype=bool)
+        for column, op, value in predicates:
+            mask &= self._mask(column, op, value)
+        return np.flatnonzero(mask)
+
+    # -- ordering ------------------------------------------------------------
+
+    def _top(
+        self, idx: np.ndarray, sort_by: str, descending: bool, k: int
+    ) -> np.ndarray:
+        """First ``k`` of ``idx`` in ``ORDER BY sort_by NULLS LAST, ticker`` order."""
+        key = self._sort_keys[sort_by][idx]
+        if descending:
+            key = -key
+        # NULLS LAST in either direction; kept apart from the keys because
+        # real data has +/-inf ratios, which sort before NULL
+        null = np.isnan(key)
+        idx, key, nulls = idx[~null], key[~null], idx[null]
+
+        if k < idx.size:
+            # Keep everything tied with the k-th key so the ticker
+            # tiebreaker below sees the full tie group
+            kth = key[np.argpartition(key, k - 1)[k - 1]]
+            keep = key <= kth
+            idx, key = idx[keep], key[keep]
+
+        top = idx[np.lexsort((self._ticker_rank[idx], key))][:k]
+        if top.size < k:
+            nulls = nulls[np.argsort(self._ticker_rank[nulls], kind="stable")]
+            top = np.concatenate([top, nulls[: k - top.size]])
+        return top
+
+    def search(
+        self,
+        predicates: Sequence[Predicate],
+        sort_by: str,
+        descending: bool,
+        limit: int,
+        offset: int = 0,
+    ) -> Tuple[List[Dict[str, Any]], int]:
+        """Filter, sort and page; returns ``(rows, total_count)``."""
+        if sort_by not in self._sort_keys:
+            raise ValueError(f"Unsupported screener sort column: {sort_by}")
+        idx = self.filter(predicates)
+        total = int(idx.size)
+        if offset >= total or limit <= 0:
+            return [], total
+        top = self._top(idx, sort_by, descending, min(offset + limit, total))
+        return [self._rows[i] for i in top[offset:]], total
+
+
+_enabled = False
+_engine: Optional[ScreenerEngine] = None
+
+
+def init_screener_engine() -> None:
+    """Enable the engine (called from app lifespan when configured)."""
+    global _enabled, _engine
+    _enabled = True
+    _engine = None
+
+
+def close_screener_engine() -> None:
+    """Disable the engine so the route falls back to SQL."""
+    global _enabled, _engine
+    _enabled = False
+    _engine = None
+
+
+async def aget_screener_engine() -> Optional[ScreenerEngine]:
+    """Return an engine matching the current snapshot table, or None.
+
+    None when the engine is disabled or the snapshot table is unavailable.
+    Never raises: a failed load is logged and reported as None.
+    """
+    global _engine
+    if not _enabled:
+        return None
+
+    from services.screener_snapshot import SNAPSHOT_TABLE, aget_screener_snapshot
+
+    store = await aget_screener_snapshot()
+    if store is None:
+        return None
+    engine = _engine
+    key = store.build_key
+    if engine is not None and engine.key == key:
+        return engine
+    try:
+        from api.db_helper import afetchall
+
+        # Concurrent first requests may each load; the table is small and
+        # the last engine built wins.
+        rows = await afetchall(f"SELECT * FROM {SNAPSHOT_TABLE} ORDER BY ticker")  # nosec B608
+        engine = ScreenerEngine(rows, key=key)
+    except Exception as exc:
+        logger.warning("Screener engine unavailable, falling back to SQL: %s", exc)
+        return None
+    _engine = engine
+    logger.debug("Screener engine loaded: %d rows, key=%s", engine.size, key)
+    return engine
@@ -0,0 +1,374 @@
+"""
+Materialized screener table (``screener_snapshot``).
+
+``SCREENER_BASE`` joins seven tables on every screener request.  This module
+keeps its result denormalized in a ``screener_snapshot`` table, indexed on
+every sortable column, so ``/api/v1/screener/search`` filters, counts and
+pages a single ~500-row table in one query.
+
+Staleness is tracked in the database itself: triggers on the seven source
+tables bump ``screener_snapshot_meta.source_version`` on any write (from
+this process, another worker, or an offline loader), and the table is
+rebuilt when it no longer matches ``built_version``.  The version is
+checked at most every ``check_interval`` seconds, and the table is also
+rebuilt after ``max_age`` seconds in case a loader dropped and recreated a
+source table (which drops its trigger too).
+
+Usage:
+    from services.screener_snapshot import aget_screener_snapshot
+
+    store = await aget_screener_snapshot()   # None -> use SCREENER_BASE
+    if store is not None:
+        rows = await afetchall(f"SELECT ... FROM {SNAPSHOT_TABLE} ...")
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+from database.queries import SCREENER_BASE, SCREENER_SORT_COLUMNS
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_TABLE = "screener_snapshot"
+META_TABLE = "screener_snapshot_meta"
+
+# Tables joined by SCREENER_BASE; a write to any of them marks the snapshot stale.
+SOURCE_TABLES = (
+    "companies",
+    "market_data",
+    "valuation_metrics",
+    "profitability_metrics",
+    "dividend_data",
+    "financial_summary",
+    "analyst_data",
+)
+
+DEFAULT_CHECK_INTERVAL_SECONDS = 5.0
+DEFAULT_MAX_AGE_SECONDS = 300.0
+
+
+def _sqlite_schema() -> list:
+    stmts = [
+        f"CREATE TABLE IF NOT EXISTS {SNAPSHOT_TABLE} AS "
+        f"SELECT * FROM ({SCREENER_BASE}) s LIMIT 0",
+        f"CREATE TABLE IF NOT EXISTS {META_TABLE} ("
+        " id INTEGER PRIMARY KEY,"
+        " source_version INTEGER NOT NULL DEFAULT 0,"
+        " built_version INTEGER NOT NULL DEFAULT -1)",
+        f"INSERT OR IGNORE INTO {META_TABLE} (id) VALUES (1)",
+    ]
+    for table in SOURCE_TABLES:
+        for op in ("INSERT", "UPDATE", "DELETE"):
+            stmts.append(
+                f"CREATE TRIGGER IF NOT EXISTS trg_screener_{table}_{op.lower()} "
+                f"AFTER {op} ON {table} BEGIN "
+                f"UPDATE {META_TABLE} SET source_version = source_version + 1 "
+                "WHERE id = 1; END"
+            )
+    return stmts
+
+
+def _postgres_schema() -> list:
+    stmts = [
+        f"CREATE TABLE IF NOT EXISTS {SNAPSHOT_TABLE} AS "
+        f"SELECT * FROM ({SCREENER_BASE}) s LIMIT 0",
+        f"CREATE TABLE IF NOT EXISTS {META_TABLE} ("
+        " id INTEGER PRIMARY KEY,"
+        " source_version BIGINT NOT NULL DEFAULT 0,"
+        " built_version BIGINT NOT NULL DEFAULT -1)",
+        f"INSERT INTO {META_TABLE} (id) VALUES (1) ON CONFLICT (id) DO NOTHING",
+        "CREATE OR REPLACE FUNCTION screener_snapshot_touch() RETURNS trigger AS $$ "
+        f"BEGIN UPDATE {META_TABLE} SET source_version = source_version + 1 "
+        "WHERE id = 1; RETURN NULL; END $$ LANGUAGE plpgsql",
+    ]
+    return stmts
+
+
+# Source tables (visible on the search path) that already have their trigger
+_POSTGRES_TRIGGERED_TABLES = (
+    "SELECT c.relname FROM pg_trigger t JOIN pg_class c ON c.oid = t.tgrelid "
+    "WHERE NOT t.tgisinternal AND t.tgname = 'trg_screener_' || c.relname "
+    "AND pg_table_is_visible(c.oid)"
+)
+
+
+def _postgres_trigger(table: str) -> str:
+    # Statement-level, so a bulk load bumps the version once (and TRUNCATE
+    # is covered too)
+    return (
+        f"CREATE TRIGGER trg_screener_{table} "
+        f"AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON {table} "
+        "FOR EACH STATEMENT EXECUTE FUNCTION screener_snapshot_touch()"
+    )
+
+
+def _index_statements() -> list:
+    stmts = [
+        f"CREATE UNIQUE INDEX IF NOT EXISTS idx_{SNAPSHOT_TABLE}_ticker "
+        f"ON {SNAPSHOT_TABLE} (ticker)",
+        f"CREATE INDEX IF NOT EXISTS idx_{SNAPSHOT_TABLE}_recommendation "
+        f"ON {SNAPSHOT_TABLE} (LOWER(recommendation))",
+    ]
+    for column in SCREENER_SORT_COLUMNS:
+        if column != "ticker":
+            stmts.append(
+                f"CREATE INDEX IF NOT EXISTS idx_{SNAPSHOT_TABLE}_{column} "
+                f"ON {SNAPSHOT_TABLE} ({column})"
+            )
+    return stmts
+
+
+def _default_connect() -> Any:
+    # A read/write connection: the route pool may be opened read-only
+    from api.db_helper import get_conn
+
+    return get_conn()
+
+
+def _default_is_postgres() -> bool:
+    from api.db_helper import is_postgres
+
+    return is_postgres()
+
+
+class ScreenerSnapshotStore:
+    """Keeps the ``screener_snapshot`` table in step with its source tables.
+
+    Args:
+        connect: Returns a read/write DB-API connection (closed after use).
+        postgres: Backend flag; detected from ``api.db_helper`` when None.
+        check_interval: Seconds between source-version checks.
+        max_age: Seconds after which the table is rebuilt even if the
+            version is unchanged.  ``0`` disables age-based rebuilds.
+    """
+
+    def __init__(
+        self,
+        connect: Optional[Callable[[], Any]] = None,
+        postgres: Optional[bool] = None,
+        check_interval: float = DEFAULT_CHECK_INTERVAL_SECONDS,
+        max_age: float = DEFAULT_MAX_AGE_SECONDS,
+    ) -> None:
+        self._connect = connect or _default_connect
+        self._postgres = _default_is_postgres() if postgres is None else postgres
+        self._check_interval = check_interval
+        self._max_age = max_age
+        self._lock = threading.Lock()
+        self._schema_ready = False
+        self._checked_at: Optional[float] = None
+        self._built_at: Optional[float] = None
+        self._version: Optional[int] = None
+        self._rows = 0
+        self._rebuilds = 0
+        self._last_build_ms: Optional[float] = None
+        self._failed_at: Optional[float] = None
+
+    # -- freshness -----------------------------------------------------------
+
+    def _recently_checked(self) -> bool:
+        if self._checked_at is None:
+            return False
+        now = time.monotonic()
+        if now - self._checked_at >= self._check_interval:
+            return False
+        if self._max_age and now - (self._built_at or 0.0) >= self._max_age:
+            return False
+        return True
+
+    def ensure_fresh(self) -> None:
+        """Rebuild the table if its source tables changed (blocking).
+
+        Raises on database errors; callers treat that as "use SQL".
+        """
+        with self._lock:
+            if self._recently_checked():
+                return
+            try:
+                self._check_and_rebuild()
+            except Exception:
+                # Schema may have been dropped by a reload: recreate next time
+                self._schema_ready = False
+                self._failed_at = time.monotonic()
+                raise
+            self._checked_at = time.monotonic()
+            self._failed_at = None
+
+    def _check_and_rebuild(self) -> None:
+        conn = self._connect()
+        try:
+            if not self._schema_ready:
+                self._create_schema(conn)
+            source, built = self._read_versions(conn)
+            aged = self._max_age and (
+                self._built_at is None
+                or time.monotonic() - self._built_at >= self._max_age
+            )
+            if source != built or aged:
+                self._rebuild(conn)
+            elif self._built_at is None or built != self._version:
+                # Built by another worker: adopt it
+                self._built_at = time.monotonic()
+                self._version = built
+        except Exception:
+            try:
+                conn.rollback()
+            except Exception:
+                pass
+            raise
+        finally:
+            conn.close()
+
+    def recently_failed(self) -> bool:
+        """True if the last check failed less than ``check_interval`` ago."""
+        failed_at = self._failed_at
+        return (
+            failed_at is not None
+            and time.monotonic() - failed_at < self._check_interval
+        )
+
+    async def aensure_fresh(self) -> None:
+        """Like :meth:`ensure_fresh`; only a version check leaves the event loop."""
+        if self._recently_checked():
+            return
+        await asyncio.to_thread(self.ensure_fresh)
+
+    def mark_stale(self) -> None:
+        """Force a version check on the next request."""
+        self._checked_at = None
+
+    # -- build ---------------------------------------------------------------
+
+    def _execute(self, conn: Any, sql: str) -> Any:
+        cur = conn.cursor()
+        cur.execute(sql)
+        return cur
+
+    def _create_schema(self, conn: Any) -> None:
+        if self._postgres:
+            # CREATE TRIGGER takes a lock on its table: only create the
+            # missing ones (first start, or a loader recreated the table)
+            stmts = _postgres_schema() + [
+                _postgres_trigger(table) for table in self._missing_triggers(conn)
+            ]
+        else:
+            stmts = _sqlite_schema()
+        for sql in stmts + _index_statements():
+            self._execute(conn, sql)
+        conn.commit()
+        self._schema_ready = True
+
+    def _missing_triggers(self, conn: Any) -> list:
+        rows = self._execute(conn, _POSTGRES_TRIGGERED_TABLES).fetchall()
+        triggered = {row[0] for row in rows}
+        return [table for table in SOURCE_TABLES if table not in triggered]
+
+    def _read_versions(self, conn: Any) -> tuple:
+        row = self._execute(
+            conn, f"SELECT source_version, built_version FROM {META_TABLE} WHERE id = 1"
+        ).fetchone()
+        conn.commit()
+        return row[0], row[1]
+
+    def _rebuild(self, conn: Any) -> None:
+        start = time.perf_counter()
+        # Serialize rebuilds across workers; readers keep seeing the old rows
+        if self._postgres:
+            self._execute(conn, f"LOCK TABLE {SNAPSHOT_TABLE} IN EXCLUSIVE MODE")
+        else:
+            self._execute(conn, "BEGIN IMMEDIATE")
+        source, built = self._execute(
+            conn, f"SELECT source_version, built_version FROM {META_TABLE} WHERE id = 1"
+        ).fetchone()
+        self._execute(conn, f"DELETE FROM {SNAPSHOT_TABLE}")
+        cur = self._execute(
+            conn, f"INSERT INTO {SNAPSHOT_TABLE} SELECT * FROM ({SCREENER_BASE}) s"
+        )
+        rows = cur.rowcount
+        self._execute(
+            conn, f"UPDATE {META_TABLE} SET built_version = {int(source)} WHERE id = 1"
+        )
+        conn.commit()
+
+        self._version = source
+        self._rows = rows
+        self._built_at = time.monotonic()
+        self._rebuilds += 1
+        self._last_build_ms = round((time.perf_counter() - start) * 1000, 1)
+        logger.debug(
+            "Screener snapshot rebuilt: %d rows, version=%d, %.1f ms",
+            rows,
+            source,
+            self._last_build_ms,
+        )
+
+    @property
+    def build_key(self) -> tuple:
+        """Changes whenever the table is rebuilt or a new build is adopted."""
+        return (self._version, self._built_at)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "version": self._version,
+            "rows": self._rows,
+            "rebuilds": self._rebuilds,
+            "last_build_ms": self._last_build_ms,
+            "age_seconds": round(time.monotonic() - self._built_at, 1)
+            if self._built_at is not None
+            else None,
+        }
+
+
+def read_source_version() -> Optional[int]:
+    """Return ``source_version``, or None before the meta table exists.
+
+    Other in-memory caches over the source tables poll this to notice
+    writes made by offline loaders.
+    """
+    from api.db_helper import _sync_fetchone
+
+    try:
+        row = _sync_fetchone(f"SELECT source_version FROM {META_TABLE} WHERE id = 1")
+    except Exception:
+        return None
+    return None if row is None else int(row["source_version"])
+
+
+_store: Optional[ScreenerSnapshotStore] = None
+
+
+def init_screener_snapshot(**kwargs: Any) -> ScreenerSnapshotStore:
+    """Create the process-wide store (called from app lifespan)."""
+    global _store
+    _store = ScreenerSnapshotStore(**kwargs)
+    return _store
+
+
+def close_screener_snapshot() -> None:
+    """Drop the process-wide store so the route falls back to SQL."""
+    global _store
+    _store = None
+
+
+def get_screener_snapshot() -> Optional[ScreenerSnapshotStore]:
+    return _store
+
+
+async def aget_screener_snapshot() -> Optional[ScreenerSnapshotStore]:
+    """Return the store once its table is fresh, or None to use ``SCREENER_BASE``.
+
+    Never raises: a failed check or rebuild is logged and reported as None.
+    """
+    store = _store
+    if store is None or store.recently_failed():
+        return None
+    try:
+        await store.aensure_fresh()
+        return store
+    except Exception as exc:
+        logger.warning("Screener snapshot unavailable, falling back to SQL: %s", exc)
+        return None
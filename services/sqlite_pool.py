@@ -1,41 +1,180 @@
-"""Thread-safe SQLite connection pool with WAL mode."""
-
+"""Thread-safe SQLite connection pool with WAL mode.
+
+Besides the default read/write pool, a read-optimized mode is available
+for route traffic:
+
+* connections opened with ``mode=ro`` (falling back to read/write when
+  the file cannot be opened read-only) and ``PRAGMA query_only=ON``;
+* tunable ``mmap_size`` so readers share the OS page cache instead of
+  copying pages into per-connection caches, plus a tunable ``cache_size``;
+* a per-connection prepared-statement cache (``cached_statements``);
+* a pool size that defaults to the width of the default thread pool that
+  ``asyncio.to_thread`` uses, so threads never queue on connections;
+* an acquire-wait histogram (``get_stats()``) to make contention visible.
+"""
+
+import os
 import queue
 import sqlite3
 import threading
-from typing import Optional
+import time
+from typing import Any, Dict, Optional
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Upper bounds (ms) of the acquire-wait histogram buckets; the last bucket
+# collects everything slower.
+WAIT_BUCKETS_MS = (0.1, 0.5, 1, 5, 10, 50, 100, 500, 1000)
+
+# Default prepared-statement cache per connection (sqlite3 default is 128).
+DEFAULT_CACHED_STATEMENTS = 256
+
+
+def default_pool_size() -> int:
+    """Return the default ``ThreadPoolExecutor`` width (``asyncio.to_thread``)."""
+    return min(32, (os.cpu_count() or 1) + 4)
+
+
+def open_connection(
+    db_path: str,
+    read_only: bool = False,
+    mmap_size: int = 0,
+    cache_size_kib: Optional[int] = None,
+    cached_statements: int = DEFAULT_CACHED_STATEMENTS,
+) -> sqlite3.Connection:
+    """Open a tuned SQLite connection usable from any thread.
+
+    Args:
+        db_path: Path to the database file.
+        read_only: Open with ``mode=ro`` and ``PRAGMA query_only=ON``.
+        mmap_size: Bytes of the file to memory-map (0 disables mmap).
+        cache_size_kib: Page cache size in KiB (None keeps SQLite's default).
+        cached_statements: Size of the per-connection prepared-statement LRU.
+    """
+    conn = None
+    if read_only:
+        try:
+            conn = sqlite3.connect(
+                f"file:{db_path}?mode=ro",
+                uri=True,
+                check_same_thread=False,
+                cached_statements=cached_statements,
+            )
+        except sqlite3.OperationalError as exc:
+            logger.warning(
+                "SQLite read-only open failed for %s (%s); using query_only",
+                db_path,
+                exc,
+            )
+    if conn is None:
+        conn = sqlite3.connect(
+            db_path, check_same_thread=False, cached_statements=cached_statements
+        )
+        conn.execute("PRAGMA journal_mode=WAL")
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA busy_timeout=5000")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    if read_only:
+        conn.execute("PRAGMA query_only=ON")
+    if mmap_size:
+        conn.execute(f"PRAGMA mmap_size={int(mmap_size)}")
+    if cache_size_kib:
+        # Negative cache_size is interpreted by SQLite as KiB, not pages.
+        conn.execute(f"PRAGMA cache_size={-abs(int(cache_size_kib))}")
+    return conn
+
 
 class SQLitePool:
-    def __init__(self, db_path: str, pool_size: int = 5):
+    def __init__(
+        self,
+        db_path: str,
+        pool_size: Optional[int] = 5,
+        read_only: bool = False,
+        mmap_size: int = 0,
+        cache_size_kib: Optional[int] = None,
+        cached_statements: int = DEFAULT_CACHED_STATEMENTS,
+    ):
+        if not pool_size:
+            pool_size = default_pool_size()
         self._db_path = db_path
         self._pool: queue.Queue = queue.Queue(maxsize=pool_size)
         self.pool_size: int = pool_size
+        self.read_only = read_only
+        self._conn_kwargs: Dict[str, Any] = {
+            "read_only": read_only,
+            "mmap_size": mmap_size,
+            "cache_size_kib": cache_size_kib,
+            "cached_statements": cached_statements,
+        }
         self._lock = threading.Lock()
+        self._wait_counts = [0] * (len(WAIT_BUCKETS_MS) + 1)
+        self._wait_sum = 0.0
+        self._wait_max = 0.0
+        self._acquires = 0
+        self._timeouts = 0
+        self._in_use = 0
+        self._peak_in_use = 0
         for _ in range(pool_size):
             self._pool.put(self._make_conn())
-        logger.info("SQLite pool initialized: %d connections to %s", pool_size, db_path)
+        logger.info(
+            "SQLite pool initialized: %d connections to %s (read_only=%s)",
+            pool_size,
+            db_path,
+            read_only,
+        )
 
     def _make_conn(self) -> sqlite3.Connection:
-        conn = sqlite3.connect(self._db_path, check_same_thread=False)
-        conn.row_factory = sqlite3.Row
-        conn.execute("PRAGMA journal_mode=WAL")
-        conn.execute("PRAGMA busy_timeout=5000")
-        conn.execute("PRAGMA synchronous=NORMAL")
-        return conn
+        return open_connection(self._db_path, **self._conn_kwargs)
+
+    def _record_wait(self, wait_ms: float) -> None:
+        bucket = len(WAIT_BUCKETS_MS)
+        for i, bound in enumerate(WAIT_BUCKETS_MS):
+            if wait_ms <= bound:
+                bucket = i
+                break
+        with self._lock:
+            self._wait_counts[bucket] += 1
+            self._wait_sum += wait_ms
+            self._wait_max = max(self._wait_max, wait_ms)
+            self._acquires += 1
+            self._in_use += 1
+            self._peak_in_use = max(self._peak_in_use, self._in_use)
 
     def acquire(self, timeout: float = 10.0) -> sqlite3.Connection:
+        start = time.perf_counter()
         try:
-            return self._pool.get(timeout=timeout)
+            conn = self._pool.get(timeout=timeout)
         except queue.Empty:
+            with self._lock:
+                self._timeouts += 1
             raise RuntimeError("SQLite pool exhausted — all connections in use")
+        self._record_wait((time.perf_counter() - start) * 1000)
+        return conn
 
     def release(self, conn: sqlite3.Connection) -> None:
+        with self._lock:
+            self._in_use = max(0, self._in_use - 1)
         self._pool.put(conn)
 
+    def get_stats(self) -> Dict[str, Any]:
+        """Return pool usage and the acquire-wait histogram."""
+        with self._lock:
+            labels = [f"le_{b}ms" for b in WAIT_BUCKETS_MS] + ["gt_1000ms"]
+            return {
+                "pool_size": self.pool_size,
+                "read_only": self.read_only,
+                "in_use": self._in_use,
+                "peak_in_use": self._peak_in_use,
+                "acquires": self._acquires,
+                "timeouts": self._timeouts,
+                "avg_wait_ms": round(self._wait_sum / self._acquires, 3)
+                if self._acquires
+                else 0.0,
+                "max_wait_ms": round(self._wait_max, 3),
+                "wait_histogram_ms": dict(zip(labels, self._wait_counts)),
+            }
+
     class _Ctx:
         def __init__(self, pool: "SQLitePool"):
             self._pool = pool
@@ -56,9 +195,14 @@ class SQLitePool:
 _pool: Optional[SQLitePool] = None
 
 
-def init_pool(db_path: str, pool_size: int = 5) -> None:
+def init_pool(db_path: str, pool_size: Optional[int] = 5, **kwargs: Any) -> None:
+    """Create the process-wide pool.
+
+    ``pool_size=None`` (or 0) sizes the pool to ``default_pool_size()``.
+    Extra keyword arguments are passed to ``SQLitePool``.
+    """
     global _pool
-    _pool = SQLitePool(db_path, pool_size)
+    _pool = SQLitePool(db_path, pool_size, **kwargs)
 
 
 def get_pool() -> SQLitePool:
@@ -11,34 +11,29 @@ import random
 import threading
 import time
 from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, Iterable, List, Optional
 
-from services.yfinance_base import CircuitBreaker, YFinanceCache
+from services.yfinance_base import (
+    CircuitBreaker,
+    RefreshPool,
+    SingleFlight,
+    YFinanceCache,
+)
 
 logger = logging.getLogger(__name__)
 
 # ---------------------------------------------------------------------------
 # Shared cache & circuit breaker instances
 # ---------------------------------------------------------------------------
-_cache = YFinanceCache(ttl=300, max_entries=500, name="stock_ohlcv")
-
-# Per-ticker locks: allow concurrent fetches for different tickers
-_ticker_locks: Dict[str, threading.Lock] = {}
-_locks_guard = threading.Lock()  # Protects _ticker_locks dict itself
-_MAX_LOCKS = 1000  # Prevent unbounded growth
+# Entries past the 5-minute soft TTL are served for up to an hour while a
+# background refresh revalidates them.
+_cache = YFinanceCache(ttl=300, max_entries=500, name="stock_ohlcv", hard_ttl=3600)
 
+# Concurrent misses for the same (symbol, period) share one yfinance fetch
+_flight = SingleFlight(name="stock_ohlcv")
 
-def _get_ticker_lock(symbol: str, period: str) -> threading.Lock:
-    """Return a per-(symbol, period) lock, creating one if needed."""
-    key = f"{symbol}:{period}"
-    with _locks_guard:
-        if key not in _ticker_locks:
-            # Evict oldest if at capacity
-            if len(_ticker_locks) >= _MAX_LOCKS:
-                # Remove first entry (oldest by insertion order in Python 3.7+)
-                _ticker_locks.pop(next(iter(_ticker_locks)))
-            _ticker_locks[key] = threading.Lock()
-        return _ticker_locks[key]
+# Background revalidation of stale entries, hottest tickers first
+_refresher = RefreshPool(max_workers=4, max_pending=128, name="stock_ohlcv")
 
 
 VALID_PERIODS = ("1mo", "3mo", "6mo", "1y", "2y", "5y")
@@ -182,11 +177,94 @@ def _generate_mock_data(ticker: str, period: str) -> List[Dict[str, Any]]:
 # ---------------------------------------------------------------------------
 
 
+def _rows_from_frame(df: Any) -> List[Dict[str, Any]]:
+    """Convert a yfinance OHLCV frame (Date index) into chart points."""
+    df = df.reset_index()
+    data: List[Dict[str, Any]] = []
+    for _, row in df.iterrows():
+        date_val = row.get("Date")
+        if hasattr(date_val, "strftime"):
+            time_str = date_val.strftime("%Y-%m-%d")
+        else:
+            time_str = str(date_val)[:10]
+
+        data.append(
+            {
+                "time": time_str,
+                "open": round(float(row["Open"]), 2),
+                "high": round(float(row["High"]), 2),
+                "low": round(float(row["Low"]), 2),
+                "close": round(float(row["Close"]), 2),
+                "volume": int(row["Volume"]) if row.get("Volume") else 0,
+            }
+        )
+    return data
+
+
+def _real_payload(
+    symbol: str, period: str, data: List[Dict[str, Any]]
+) -> Dict[str, Any]:
+    return {
+        "data": data,
+        "source": "real",
+        "last_updated": datetime.utcnow().isoformat() + "Z",
+        "symbol": symbol,
+        "period": period,
+        "count": len(data),
+    }
+
+
+def _cache_hit(symbol: str, period: str, t_start: float) -> Optional[Dict[str, Any]]:
+    """Return the fresh cache entry (logging the hit), or None."""
+    cached = _get_cached(symbol, period)
+    if cached is not None:
+        duration_ms = round((time.monotonic() - t_start) * 1000, 1)
+        logger.info(
+            "stock_ohlcv fetch: source=cache, cache_hit=True, "
+            "fetch_duration_ms=%.1f, symbol=%s, period=%s",
+            duration_ms,
+            symbol,
+            period,
+        )
+    return cached
+
+
+def _serve_stale(symbol: str, period: str) -> Optional[Dict[str, Any]]:
+    """Return a stale-but-servable entry and queue its background refresh.
+
+    Only entries between the soft and hard TTL qualify; the refresh joins
+    the same single-flight as foreground fetches and is prioritised by the
+    entry's hit count.
+    """
+    key = (symbol, period)
+    hits = _cache.stale_priority(key)
+    if hits is None:
+        return None
+    stale = _get_stale_cached(symbol, period)
+    if stale is None:
+        return None
+    _refresher.submit(
+        key,
+        lambda: _flight.do(key, lambda: _load(symbol, period, time.monotonic())),
+        priority=hits,
+    )
+    logger.info(
+        "stock_ohlcv fetch: source=cached, cache_hit=stale, revalidating=True, "
+        "symbol=%s, period=%s",
+        symbol,
+        period,
+    )
+    return stale
+
+
 def fetch_stock_ohlcv(ticker: str, period: str = "1y") -> Dict[str, Any]:
     """Fetch OHLCV data for a single Saudi stock.
 
     Tries yfinance first with .SR suffix normalization.
     Falls back to stale cache or deterministic mock data.
+    Entries past the soft TTL (but within the hard TTL) are returned
+    immediately while a background worker refreshes them. Concurrent
+    misses for the same (symbol, period) share one fetch.
 
     Args:
         ticker: Saudi stock ticker (e.g. "2222", "2222.SR").
@@ -198,122 +276,101 @@ def fetch_stock_ohlcv(ticker: str, period: str = "1y") -> Dict[str, Any]:
     symbol = _normalize_ticker(ticker)
     t_start = time.monotonic()
 
-    # Check fresh cache first
-    cached = _get_cached(symbol, period)
+    cached = _cache_hit(symbol, period, t_start)
+    if cached is None:
+        cached = _serve_stale(symbol, period)
     if cached is not None:
-        duration_ms = round((time.monotonic() - t_start) * 1000, 1)
+        return cached
+    return _flight.do((symbol, period), lambda: _load(symbol, period, t_start))
+
+
+async def afetch_stock_ohlcv(ticker: str, period: str = "1y") -> Dict[str, Any]:
+    """Async variant of :func:`fetch_stock_ohlcv`.
+
+    Cache hits are served on the event loop; misses join the same
+    single-flight as sync callers and await it without holding a thread.
+    """
+    symbol = _normalize_ticker(ticker)
+    t_start = time.monotonic()
+
+    cached = _cache_hit(symbol, period, t_start)
+    if cached is None:
+        cached = _serve_stale(symbol, period)
+    if cached is not None:
+        return cached
+    return await _flight.ado((symbol, period), lambda: _load(symbol, period, t_start))
+
+
+def _load(symbol: str, period: str, t_start: float) -> Dict[str, Any]:
+    """Fetch from yfinance, falling back to stale cache or mock data.
+
+    Runs once per in-flight (symbol, period) under ``_flight``.
+    """
+    # Double-check: a flight that just finished may have filled the cache
+    cached = _cache_hit(symbol, period, t_start)
+    if cached is not None:
+        return cached
+
+    # Check circuit breaker
+    if _is_circuit_open():
         logger.info(
-            "stock_ohlcv fetch: source=cache, cache_hit=True, "
-            "fetch_duration_ms=%.1f, symbol=%s, period=%s",
-            duration_ms,
+            "stock_ohlcv fetch: circuit_breaker=open, skipping yfinance, "
+            "symbol=%s, period=%s",
             symbol,
             period,
         )
-        return cached
-
-    # Serialize yfinance fetches per ticker (different tickers fetch concurrently)
-    with _get_ticker_lock(symbol, period):
-        # Double-check cache inside the lock
-        cached = _get_cached(symbol, period)
-        if cached is not None:
-            duration_ms = round((time.monotonic() - t_start) * 1000, 1)
-            logger.info(
-                "stock_ohlcv fetch: source=cache, cache_hit=True, "
-                "fetch_duration_ms=%.1f, symbol=%s, period=%s",
-                duration_ms,
-                symbol,
-                period,
-            )
-            return cached
-
-        # Check circuit breaker
-        if _is_circuit_open():
-            logger.info(
-                "stock_ohlcv fetch: circuit_breaker=open, skipping yfinance, "
-                "symbol=%s, period=%s",
-                symbol,
-                period,
-            )
-        else:
-            # Try yfinance
-            try:
-                import yfinance as yf
-
-                yf_ticker = yf.Ticker(symbol)
-                df = yf_ticker.history(period=period, auto_adjust=True)
-
-                if df is not None and not df.empty:
-                    df = df.reset_index()
-                    data: List[Dict[str, Any]] = []
-                    for _, row in df.iterrows():
-                        date_val = row.get("Date")
-                        if hasattr(date_val, "strftime"):
-                            time_str = date_val.strftime("%Y-%m-%d")
-                        else:
-                            time_str = str(date_val)[:10]
-
-                        data.append(
-                            {
-                                "time": time_str,
-                                "open": round(float(row["Open"]), 2),
-                                "high": round(float(row["High"]), 2),
-                                "low": round(float(row["Low"]), 2),
-                                "close": round(float(row["Close"]), 2),
-                                "volume": int(row["Volume"])
-                                if row.get("Volume")
-                                else 0,
-                            }
-                        )
-
-                    payload = {
-                        "data": data,
-                        "source": "real",
-                        "last_updated": datetime.utcnow().isoformat() + "Z",
-                        "symbol": symbol,
-                        "period": period,
-                        "count": len(data),
-                    }
-                    _set_cache(symbol, period, payload)
-                    _record_success()
-                    duration_ms = round((time.monotonic() - t_start) * 1000, 1)
-                    logger.info(
-                        "stock_ohlcv fetch: source=real, cache_hit=False, "
-                        "fetch_duration_ms=%.1f, symbol=%s, period=%s, points=%d",
-                        duration_ms,
-                        symbol,
-                        period,
-                        len(data),
-                    )
-                    return payload
-
-            except ImportError:
-                logger.warning("yfinance not installed, skipping real data fetch")
-            except Exception as exc:
-                _record_failure()
-                exc_type = type(exc).__name__
-                exc_msg = str(exc)
-                error_category = "unknown"
-                if "429" in exc_msg or "rate" in exc_msg.lower():
-                    error_category = "rate_limit"
-                elif any(
-                    k in exc_msg.lower()
-                    for k in ("timeout", "connect", "network", "dns", "socket")
-                ):
-                    error_category = "network"
-                else:
-                    error_category = "data_error"
-
-                logger.warning(
-                    "yfinance fetch failed: symbol=%s, period=%s, "
-                    "error_type=%s, error_category=%s, message=%s, "
-                    "consecutive_failures=%d",
+    else:
+        # Try yfinance
+        try:
+            import yfinance as yf
+
+            yf_ticker = yf.Ticker(symbol)
+            df = yf_ticker.history(period=period, auto_adjust=True)
+
+            if df is not None and not df.empty:
+                data = _rows_from_frame(df)
+                payload = _real_payload(symbol, period, data)
+                _set_cache(symbol, period, payload)
+                _record_success()
+                duration_ms = round((time.monotonic() - t_start) * 1000, 1)
+                logger.info(
+                    "stock_ohlcv fetch: source=real, cache_hit=False, "
+                    "fetch_duration_ms=%.1f, symbol=%s, period=%s, points=%d",
+                    duration_ms,
                     symbol,
                     period,
-                    exc_type,
-                    error_category,
-                    exc_msg,
-                    _breaker.get_status()["consecutive_failures"],
+                    len(data),
                 )
+                return payload
+
+        except ImportError:
+            logger.warning("yfinance not installed, skipping real data fetch")
+        except Exception as exc:
+            _record_failure()
+            exc_type = type(exc).__name__
+            exc_msg = str(exc)
+            error_category = "unknown"
+            if "429" in exc_msg or "rate" in exc_msg.lower():
+                error_category = "rate_limit"
+            elif any(
+                k in exc_msg.lower()
+                for k in ("timeout", "connect", "network", "dns", "socket")
+            ):
+                error_category = "network"
+            else:
+                error_category = "data_error"
+
+            logger.warning(
+                "yfinance fetch failed: symbol=%s, period=%s, "
+                "error_type=%s, error_category=%s, message=%s, "
+                "consecutive_failures=%d",
+                symbol,
+                period,
+                exc_type,
+                error_category,
+                exc_msg,
+                _breaker.get_status()["consecutive_failures"],
+            )
 
     # Fallback: stale cache
     stale = _get_stale_cached(symbol, period)
@@ -351,6 +408,159 @@ def fetch_stock_ohlcv(ticker: str, period: str = "1y") -> Dict[str, Any]:
     return payload
 
 
+# ---------------------------------------------------------------------------
+# Batched multi-ticker fetch (cache warmup)
+# ---------------------------------------------------------------------------
+
+DEFAULT_BATCH_SIZE = 100
+
+Downloader = Callable[[List[str], str], Any]
+
+
+def _yf_download(symbols: List[str], period: str) -> Any:
+    """Download OHLCV for several symbols in one yfinance request."""
+    import yfinance as yf
+
+    return yf.download(
+        tickers=symbols,
+        period=period,
+        group_by="ticker",
+        auto_adjust=True,
+        threads=True,
+        progress=False,
+    )
+
+
+def _split_download(df: Any, symbols: List[str]) -> Dict[str, Any]:
+    """Split a multi-symbol download into one OHLCV frame per symbol.
+
+    ``yf.download`` returns (symbol, field) MultiIndex columns for several
+    symbols (field-first on some versions) and aligns all symbols on one
+    date index, so rows a symbol did not trade on are dropped here.
+    """
+    frames: Dict[str, Any] = {}
+    if df is None or df.empty:
+        return frames
+    columns = df.columns
+    multi = hasattr(columns, "levels")
+    for symbol in symbols:
+        if multi:
+            if symbol in columns.get_level_values(0):
+                frame = df[symbol]
+            elif symbol in columns.get_level_values(1):
+                frame = df.xs(symbol, axis=1, level=1)
+            else:
+                continue
+        elif len(symbols) == 1:
+            frame = df
+        else:
+            continue
+        if not {"Open", "High", "Low", "Close"}.issubset(frame.columns):
+            continue
+        frame = frame.dropna(subset=["Open", "High", "Low", "Close"])
+        if "Volume" in frame.columns:
+            frame = frame.assign(Volume=frame["Volume"].fillna(0))
+        if not frame.empty:
+            frames[symbol] = frame
+    return frames
+
+
+def fetch_stock_ohlcv_batch(
+    tickers: Iterable[str],
+    period: str = "1y",
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    downloader: Optional[Downloader] = None,
+    force: bool = False,
+    stop_event: Optional[threading.Event] = None,
+    servable_for: Optional[float] = None,
+) -> Dict[str, Dict[str, Any]]:
+    """Fetch OHLCV for many tickers with one multi-symbol request per batch.
+
+    Each batch is split into per-ticker payloads that go straight into the
+    cache, so later :func:`fetch_stock_ohlcv` calls are cache hits. Tickers
+    missing from a download keep their current cache state.
+
+    Args:
+        tickers: Saudi stock tickers (``.SR`` suffix optional).
+        period: One of :data:`VALID_PERIODS`.
+        batch_size: Symbols per download request.
+        downloader: ``(symbols, period) -> DataFrame``; defaults to
+            ``yf.download``. Tests pass a local stub.
+        force: Refetch tickers whose cache entry is still fresh.
+        stop_event: Abort between batches (and before filling the cache)
+            once set.
+        servable_for: Instead of skipping fresh entries, skip entries that
+            can still be served (fresh, or stale within the hard TTL while
+            a request revalidates them) for at least this many seconds.
+
+    Returns:
+        Dict of symbol -> payload for every ticker filled by this call.
+    """
+    if period not in VALID_PERIODS:
+        raise ValueError(f"Invalid period '{period}'")
+    t_start = time.monotonic()
+    symbols = list(dict.fromkeys(_normalize_ticker(t) for t in tickers))
+    if not force and servable_for is not None:
+        symbols = [
+            s for s in symbols if _cache.servable_for((s, period)) < servable_for
+        ]
+    elif not force:
+        symbols = [s for s in symbols if not _cache.is_fresh((s, period))]
+    if not symbols:
+        return {}
+    if _is_circuit_open():
+        logger.info(
+            "stock_ohlcv batch: circuit_breaker=open, skipping %d symbols",
+            len(symbols),
+        )
+        return {}
+
+    download = downloader or _yf_download
+    filled: Dict[str, Dict[str, Any]] = {}
+    batches = 0
+    for i in range(0, len(symbols), max(1, batch_size)):
+        if stop_event is not None and stop_event.is_set():
+            break
+        chunk = symbols[i : i + batch_size]
+        batches += 1
+        try:
+            df = download(chunk, period)
+        except ImportError:
+            logger.warning("yfinance not installed, skipping batch fetch")
+            break
+        except Exception as exc:
+            _record_failure()
+            logger.warning(
+                "yfinance batch download failed: symbols=%d, period=%s, "
+                "error_type=%s, message=%s",
+                len(chunk),
+                period,
+                type(exc).__name__,
+                exc,
+            )
+            continue
+        if stop_event is not None and stop_event.is_set():
+            break
+        frames = _split_download(df, chunk)
+        for symbol, frame in frames.items():
+            payload = _real_payload(symbol, period, _rows_from_frame(frame))
+            _set_cache(symbol, period, payload)
+            filled[symbol] = payload
+        if frames:
+            _record_success()
+
+    logger.info(
+        "stock_ohlcv batch: requested=%d, filled=%d, batches=%d, "
+        "fetch_duration_ms=%.1f, period=%s",
+        len(symbols),
+        len(filled),
+        batches,
+        round((time.monotonic() - t_start) * 1000, 1),
+        period,
+    )
+    return filled
+
+
 # Convenience alias used by the verification command
 get_stock_ohlcv = fetch_stock_ohlcv
 
@@ -363,6 +573,8 @@ def get_cache_status() -> Dict[str, Any]:
             "cached_tickers": 0,
             "cache_age_seconds": None,
             "last_updated": None,
+            "singleflight": _flight.get_stats(),
+            "refresh": _refresher.get_stats(),
         }
     entry = _cache.newest_entry()
     if entry is None:
@@ -371,6 +583,8 @@ def get_cache_status() -> Dict[str, Any]:
             "cached_tickers": 0,
             "cache_age_seconds": None,
             "last_updated": None,
+            "singleflight": _flight.get_stats(),
+            "refresh": _refresher.get_stats(),
         }
     age = time.monotonic() - entry["fetched_at"]
     fresh = age < _cache.ttl
@@ -379,4 +593,6 @@ def get_cache_status() -> Dict[str, Any]:
         "cached_tickers": len(_cache),
         "cache_age_seconds": round(age),
         "last_updated": entry["payload"].get("last_updated"),
+        "singleflight": _flight.get_stats(),
+        "refresh": _refresher.get_stats(),
     }
@@ -12,30 +12,28 @@ import time
 from datetime import datetime, timedelta
 from typing import Any, Dict, List, Optional
 
-from services.yfinance_base import CircuitBreaker, YFinanceCache
+from services.yfinance_base import (
+    CircuitBreaker,
+    RefreshPool,
+    SingleFlight,
+    YFinanceCache,
+)
 
 logger = logging.getLogger(__name__)
 
 # ---------------------------------------------------------------------------
 # Shared cache & circuit breaker instances
 # ---------------------------------------------------------------------------
-_cache = YFinanceCache(ttl=300, max_entries=500, name="tasi_index")
+# Entries past the 5-minute soft TTL are served for up to an hour while a
+# background refresh revalidates them.
+_cache = YFinanceCache(ttl=300, max_entries=500, name="tasi_index", hard_ttl=3600)
 _CACHE_TTL = _cache.ttl  # backward-compatible alias for tests
 
-# Per-period locks: allow concurrent fetches for different periods
-_period_locks: Dict[str, threading.Lock] = {}
-_locks_guard = threading.Lock()  # Protects _period_locks dict itself
-_MAX_LOCKS = 100  # Prevent unbounded growth
-
+# Concurrent misses for the same period share one yfinance fetch
+_flight = SingleFlight(name="tasi_index")
 
-def _get_period_lock(period: str) -> threading.Lock:
-    """Return a per-period lock, creating one if needed."""
-    with _locks_guard:
-        if period not in _period_locks:
-            if len(_period_locks) >= _MAX_LOCKS:
-                _period_locks.pop(next(iter(_period_locks)))
-            _period_locks[period] = threading.Lock()
-        return _period_locks[period]
+# Background revalidation of stale periods, most requested first
+_refresher = RefreshPool(max_workers=1, max_pending=16, name="tasi_index")
 
 
 VALID_PERIODS = ("1mo", "3mo", "6mo", "1y", "2y", "5y")
@@ -215,11 +213,54 @@ def _generate_mock_data(period: str) -> List[Dict[str, Any]]:
 # ---------------------------------------------------------------------------
 
 
+def _cache_hit(period: str, t_start: float) -> Optional[Dict[str, Any]]:
+    """Return the fresh cache entry (logging the hit), or None."""
+    cached = _get_cached(period)
+    if cached is not None:
+        duration_ms = round((time.monotonic() - t_start) * 1000, 1)
+        logger.info(
+            "TASI fetch: source=cache, cache_hit=True, "
+            "fetch_duration_ms=%.1f, symbol=%s, period=%s",
+            duration_ms,
+            cached.get("symbol", "^TASI"),
+            period,
+        )
+    return cached
+
+
+def _serve_stale(period: str) -> Optional[Dict[str, Any]]:
+    """Return a stale-but-servable entry and queue its background refresh.
+
+    Only entries between the soft and hard TTL qualify; the refresh joins
+    the same single-flight as foreground fetches and is prioritised by the
+    entry's hit count.
+    """
+    hits = _cache.stale_priority(period)
+    if hits is None:
+        return None
+    stale = _get_stale_cached(period)
+    if stale is None:
+        return None
+    _refresher.submit(
+        period,
+        lambda: _flight.do(period, lambda: _load(period, time.monotonic())),
+        priority=hits,
+    )
+    logger.info(
+        "TASI fetch: source=cached, cache_hit=stale, revalidating=True, period=%s",
+        period,
+    )
+    return stale
+
+
 def fetch_tasi_index(period: str = "1y") -> Dict[str, Any]:
     """Fetch TASI index OHLCV data.
 
     Tries yfinance first (^TASI, then TASI.SR fallback).
     Falls back to stale cache or deterministic mock data.
+    Entries past the soft TTL (but within the hard TTL) are returned
+    immediately while a background worker refreshes them. Concurrent
+    misses for the same period share one fetch.
 
     Args:
         period: One of '1mo', '3mo', '6mo', '1y', '2y', '5y'.
@@ -229,128 +270,134 @@ def fetch_tasi_index(period: str = "1y") -> Dict[str, Any]:
     """
     t_start = time.monotonic()
 
-    # Check fresh cache first
-    cached = _get_cached(period)
+    cached = _cache_hit(period, t_start)
+    if cached is None:
+        cached = _serve_stale(period)
     if cached is not None:
-        duration_ms = round((time.monotonic() - t_start) * 1000, 1)
+        return cached
+    return _flight.do(period, lambda: _load(period, t_start))
+
+
+async def afetch_tasi_index(period: str = "1y") -> Dict[str, Any]:
+    """Async variant of :func:`fetch_tasi_index`.
+
+    Cache hits are served on the event loop; misses join the same
+    single-flight as sync callers and await it without holding a thread.
+    """
+    t_start = time.monotonic()
+
+    cached = _cache_hit(period, t_start)
+    if cached is None:
+        cached = _serve_stale(period)
+    if cached is not None:
+        return cached
+    return await _flight.ado(period, lambda: _load(period, t_start))
+
+
+def _load(period: str, t_start: float) -> Dict[str, Any]:
+    """Fetch from yfinance, falling back to stale cache or mock data.
+
+    Runs once per in-flight period under ``_flight``.
+    """
+    # Double-check: a flight that just finished may have filled the cache
+    cached = _cache_hit(period, t_start)
+    if cached is not None:
+        return cached
+
+    # Check circuit breaker -- skip yfinance entirely if open
+    if _is_circuit_open():
         logger.info(
-            "TASI fetch: source=cache, cache_hit=True, "
-            "fetch_duration_ms=%.1f, symbol=%s, period=%s",
-            duration_ms,
-            cached.get("symbol", "^TASI"),
+            "TASI fetch: circuit_breaker=open, skipping yfinance, period=%s",
             period,
         )
-        return cached
-
-    # Serialize yfinance fetches per period (different periods fetch concurrently)
-    with _get_period_lock(period):
-        # Double-check cache inside the lock (another thread may have filled it)
-        cached = _get_cached(period)
-        if cached is not None:
-            duration_ms = round((time.monotonic() - t_start) * 1000, 1)
-            logger.info(
-                "TASI fetch: source=cache, cache_hit=True, "
-                "fetch_duration_ms=%.1f, symbol=%s, period=%s",
-                duration_ms,
-                cached.get("symbol", "^TASI"),
-                period,
-            )
-            return cached
-
-        # Check circuit breaker -- skip yfinance entirely if open
-        if _is_circuit_open():
-            logger.info(
-                "TASI fetch: circuit_breaker=open, skipping yfinance, period=%s",
-                period,
-            )
-        else:
-            # Try yfinance
-            symbols = ["^TASI", "TASI.SR"]
-            for idx, symbol in enumerate(symbols):
-                try:
-                    import yfinance as yf
-
-                    ticker = yf.Ticker(symbol)
-                    df = ticker.history(period=period, auto_adjust=True)
-
-                    if df is not None and not df.empty:
-                        df = df.reset_index()
-                        data = []
-                        for _, row in df.iterrows():
-                            date_val = row.get("Date")
-                            if hasattr(date_val, "strftime"):
-                                time_str = date_val.strftime("%Y-%m-%d")
-                            else:
-                                time_str = str(date_val)[:10]
-
-                            data.append(
-                                {
-                                    "time": time_str,
-                                    "open": round(float(row["Open"]), 2),
-                                    "high": round(float(row["High"]), 2),
-                                    "low": round(float(row["Low"]), 2),
-                                    "close": round(float(row["Close"]), 2),
-                                    "volume": int(row["Volume"])
-                                    if row.get("Volume")
-                                    else 0,
-                                }
-                            )
-
-                        payload = {
-                            "data": data,
-                            "source": "real",
-                            "data_freshness": "real-time",
-                            "cache_age_seconds": 0,
-                            "last_updated": datetime.utcnow().isoformat() + "Z",
-                            "symbol": symbol,
-                        }
-                        _set_cache(period, payload)
-                        _record_success()
-                        duration_ms = round((time.monotonic() - t_start) * 1000, 1)
-                        logger.info(
-                            "TASI fetch: source=real, cache_hit=False, "
-                            "fetch_duration_ms=%.1f, symbol=%s, period=%s, points=%d",
-                            duration_ms,
-                            symbol,
-                            period,
-                            len(data),
+    else:
+        # Try yfinance
+        symbols = ["^TASI", "TASI.SR"]
+        for idx, symbol in enumerate(symbols):
+            try:
+                import yfinance as yf
+
+                ticker = yf.Ticker(symbol)
+                df = ticker.history(period=period, auto_adjust=True)
+
+                if df is not None and not df.empty:
+                    df = df.reset_index()
+                    data = []
+                    for _, row in df.iterrows():
+                        date_val = row.get("Date")
+                        if hasattr(date_val, "strftime"):
+                            time_str = date_val.strftime("%Y-%m-%d")
+                        else:
+                            time_str = str(date_val)[:10]
+
+                        data.append(
+                            {
+                                "time": time_str,
+                                "open": round(float(row["Open"]), 2),
+                                "high": round(float(row["High"]), 2),
+                                "low": round(float(row["Low"]), 2),
+                                "close": round(float(row["Close"]), 2),
+                                "volume": int(row["Volume"])
+                                if row.get("Volume")
+                                else 0,
+                            }
                         )
-                        return payload
-
-                except ImportError:
-                    logger.warning("yfinance not installed, skipping real data fetch")
-                    break
-                except Exception as exc:
-                    _record_failure()
-                    exc_type = type(exc).__name__
-                    exc_msg = str(exc)
-                    # Classify the error
-                    error_category = "unknown"
-                    if "429" in exc_msg or "rate" in exc_msg.lower():
-                        error_category = "rate_limit"
-                    elif any(
-                        k in exc_msg.lower()
-                        for k in ("timeout", "connect", "network", "dns", "socket")
-                    ):
-                        error_category = "network"
-                    else:
-                        error_category = "data_error"
-
-                    logger.warning(
-                        "yfinance fetch failed: symbol=%s, period=%s, "
-                        "error_type=%s, error_category=%s, message=%s, "
-                        "consecutive_failures=%d",
+
+                    payload = {
+                        "data": data,
+                        "source": "real",
+                        "data_freshness": "real-time",
+                        "cache_age_seconds": 0,
+                        "last_updated": datetime.utcnow().isoformat() + "Z",
+                        "symbol": symbol,
+                    }
+                    _set_cache(period, payload)
+                    _record_success()
+                    duration_ms = round((time.monotonic() - t_start) * 1000, 1)
+                    logger.info(
+                        "TASI fetch: source=real, cache_hit=False, "
+                        "fetch_duration_ms=%.1f, symbol=%s, period=%s, points=%d",
+                        duration_ms,
                         symbol,
                         period,
-                        exc_type,
-                        error_category,
-                        exc_msg,
-                        _breaker.get_status()["consecutive_failures"],
+                        len(data),
                     )
-                    # Add delay between symbol retries (but not after the last symbol)
-                    if idx < len(symbols) - 1:
-                        time.sleep(SYMBOL_RETRY_DELAY)
-                    continue
+                    return payload
+
+            except ImportError:
+                logger.warning("yfinance not installed, skipping real data fetch")
+                break
+            except Exception as exc:
+                _record_failure()
+                exc_type = type(exc).__name__
+                exc_msg = str(exc)
+                # Classify the error
+                error_category = "unknown"
+                if "429" in exc_msg or "rate" in exc_msg.lower():
+                    error_category = "rate_limit"
+                elif any(
+                    k in exc_msg.lower()
+                    for k in ("timeout", "connect", "network", "dns", "socket")
+                ):
+                    error_category = "network"
+                else:
+                    error_category = "data_error"
+
+                logger.warning(
+                    "yfinance fetch failed: symbol=%s, period=%s, "
+                    "error_type=%s, error_category=%s, message=%s, "
+                    "consecutive_failures=%d",
+                    symbol,
+                    period,
+                    exc_type,
+                    error_category,
+                    exc_msg,
+                    _breaker.get_status()["consecutive_failures"],
+                )
+                # Add delay between symbol retries (but not after the last symbol)
+                if idx < len(symbols) - 1:
+                    time.sleep(SYMBOL_RETRY_DELAY)
+                continue
 
     # Fallback: stale cache
     stale = _get_stale_cached(period)
@@ -398,6 +445,8 @@ def get_cache_status() -> Dict[str, Any]:
             "cache_status": "empty",
             "cache_age_seconds": None,
             "last_updated": None,
+            "singleflight": _flight.get_stats(),
+            "refresh": _refresher.get_stats(),
         }
     entry = _cache.newest_entry()
     if entry is None:
@@ -405,6 +454,8 @@ def get_cache_status() -> Dict[str, Any]:
             "cache_status": "empty",
             "cache_age_seconds": None,
             "last_updated": None,
+            "singleflight": _flight.get_stats(),
+            "refresh": _refresher.get_stats(),
         }
     age = time.monotonic() - entry["fetched_at"]
     fresh = age < _cache.ttl
@@ -412,4 +463,6 @@ def get_cache_status() -> Dict[str, Any]:
         "cache_status": "fresh" if fresh else "stale",
         "cache_age_seconds": round(age),
         "last_updated": entry["payload"].get("last_updated"),
+        "singleflight": _flight.get_stats(),
+        "refresh": _refresher.get_stats(),
     }
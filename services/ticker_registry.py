@@ -0,0 +1,161 @@
+"""
+In-memory registry of listed tickers.
+
+Per-stock routes used to start every request with a ``COMPANY_EXISTS``
+round-trip (one thread hop and one pool checkout) before their real query.
+The ~500 listed tickers, with the sector and market cap the peers route
+needs, fit in a dict, so the existence check becomes a set lookup.
+
+The app hands the store ``screener_snapshot.read_source_version`` (see
+``services.versioned_store``), so each price load also refreshes the market
+caps the peers route ranks by; the five-minute ``max_age`` covers databases
+without that counter.  A ticker missing from the registry is not proof that
+it does not exist (it may have been listed since the last build), so
+callers fall back to SQL on a miss; only hits skip the database.
+
+Usage:
+    from services.ticker_registry import aget_ticker_registry
+
+    registry = await aget_ticker_registry()   # None -> use SQL
+    info = registry.get("2222.SR") if registry is not None else None
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from typing import Any, Dict, List, NamedTuple, Optional
+
+from services.versioned_store import (
+    DEFAULT_CHECK_INTERVAL_SECONDS,
+    RowLoader,
+    VersionedStore,
+    VersionReader,
+)
+
+logger = logging.getLogger(__name__)
+
+# Rebuild the registry at least this often even without a version bump.
+DEFAULT_MAX_AGE_SECONDS = 300
+
+
+class TickerInfo(NamedTuple):
+    sector: Optional[str]
+    market_cap: Optional[float]
+
+
+class TickerRegistry:
+    """Immutable ticker -> ``TickerInfo`` map at one point in time.
+
+    Args:
+        rows: Rows shaped like ``database.queries.TICKER_REGISTRY``.
+        version: Store version the registry was built for.
+    """
+
+    def __init__(self, rows: List[Dict[str, Any]], version: int = 0) -> None:
+        self.version = version
+        self.built_at = time.monotonic()
+        self._entries: Dict[str, TickerInfo] = {
+            r["ticker"]: TickerInfo(
+                sector=r.get("sector"),
+                market_cap=float(r["market_cap"])
+                if r.get("market_cap") is not None
+                else None,
+            )
+            for r in rows
+        }
+        self.size = len(self._entries)
+
+    def __contains__(self, ticker: object) -> bool:
+        return ticker in self._entries
+
+    def get(self, ticker: str) -> Optional[TickerInfo]:
+        return self._entries.get(ticker)
+
+
+def _default_loader() -> List[Dict[str, Any]]:
+    from api.db_helper import _sync_fetchall
+    from database.queries import TICKER_REGISTRY
+
+    return _sync_fetchall(TICKER_REGISTRY)
+
+
+class TickerRegistryStore(VersionedStore[TickerRegistry]):
+    """Holds the current ``TickerRegistry`` and rebuilds it on demand.
+
+    Args:
+        loader: Callable returning ``TICKER_REGISTRY``-shaped rows.
+        max_age: Seconds after which the registry is rebuilt even without
+            a version bump.  ``0`` disables age-based rebuilds.
+        source_version: Returns the database's data version (or None when
+            unknown); a change bumps the store version.
+        check_interval: Seconds between ``source_version`` polls.
+    """
+
+    name = "Ticker registry"
+
+    def __init__(
+        self,
+        loader: Optional[RowLoader] = None,
+        max_age: float = DEFAULT_MAX_AGE_SECONDS,
+        source_version: Optional[VersionReader] = None,
+        check_interval: float = DEFAULT_CHECK_INTERVAL_SECONDS,
+    ) -> None:
+        super().__init__(
+            loader or _default_loader, max_age, source_version, check_interval
+        )
+
+    def build(self, rows: List[Dict[str, Any]], version: int) -> TickerRegistry:
+        return TickerRegistry(rows, version=version)
+
+    def get_stats(self) -> Dict[str, Any]:
+        registry = self._value
+        return {**super().get_stats(), "tickers": registry.size if registry else 0}
+
+
+_store: Optional[TickerRegistryStore] = None
+
+
+def init_ticker_registry(
+    loader: Optional[RowLoader] = None,
+    max_age: float = DEFAULT_MAX_AGE_SECONDS,
+    source_version: Optional[VersionReader] = None,
+) -> TickerRegistryStore:
+    """Create the process-wide registry store (called from app lifespan)."""
+    global _store
+    _store = TickerRegistryStore(
+        loader=loader, max_age=max_age, source_version=source_version
+    )
+    return _store
+
+
+def close_ticker_registry() -> None:
+    """Drop the process-wide store so routes fall back to SQL."""
+    global _store
+    _store = None
+
+
+def get_ticker_registry_store() -> Optional[TickerRegistryStore]:
+    """Return the process-wide store, or None when it was never initialized."""
+    return _store
+
+
+def bump_version() -> None:
+    """Invalidate the process-wide registry after an in-process data write."""
+    if _store is not None:
+        _store.bump_version()
+
+
+async def aget_ticker_registry() -> Optional[TickerRegistry]:
+    """Return the current registry, or None so callers fall back to SQL.
+
+    Never raises: a failed rebuild is logged and reported as None.
+    """
+    store = _store
+    if store is None:
+        return None
+    try:
+        return await store.aget()
+    except Exception as exc:
+        logger.warning("Ticker registry unavailable, falling back to SQL: %s", exc)
+        return None
@@ -0,0 +1,194 @@
+"""
+Versioned in-memory stores over small, rarely written tables.
+
+``VersionedStore`` holds one immutable value built from a single query
+(the market snapshot, the ticker registry) and rebuilds it lazily on the
+next read once it is stale.  A value is stale when:
+
+* the store's version was bumped (``bump_version()``, for writes made by
+  this process);
+* the database's data version moved.  Loads run in other processes (the
+  ingestion scheduler, ``csv_to_sqlite.py``, the migration scripts), so
+  the store polls a ``source_version`` callable at most every
+  ``check_interval`` seconds;
+* it is older than ``max_age`` seconds, which bounds staleness when no
+  data version is available.
+
+Reads of a fresh value never leave the event loop; version polls and
+rebuilds run in a worker thread.
+
+Usage:
+    class RegistryStore(VersionedStore[Registry]):
+        name = "Registry"
+
+        def build(self, rows, version):
+            return Registry(rows, version=version)
+
+    store = RegistryStore(loader, max_age=300, source_version=read_version)
+    registry = await store.aget()
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Any, Callable, Dict, Generic, List, Optional, Protocol, TypeVar
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHECK_INTERVAL_SECONDS = 5.0
+
+RowLoader = Callable[[], List[Dict[str, Any]]]
+VersionReader = Callable[[], Optional[int]]
+
+
+class Built(Protocol):
+    """What a stored value exposes: its store version and build time."""
+
+    version: int
+    built_at: float  # time.monotonic()
+
+
+T = TypeVar("T", bound=Built)
+
+
+class VersionedStore(ABC, Generic[T]):
+    """Holds the current value built by :meth:`build` and rebuilds it on demand.
+
+    Args:
+        loader: Callable returning the rows :meth:`build` consumes.
+        max_age: Seconds after which the value is rebuilt even without a
+            version change.  ``0`` disables age-based rebuilds.
+        source_version: Returns the database's data version (or None when
+            unknown); a change bumps the store version.
+        check_interval: Seconds between ``source_version`` polls.
+    """
+
+    # Used in log messages
+    name = "Versioned store"
+
+    def __init__(
+        self,
+        loader: RowLoader,
+        max_age: float,
+        source_version: Optional[VersionReader] = None,
+        check_interval: float = DEFAULT_CHECK_INTERVAL_SECONDS,
+    ) -> None:
+        self._loader = loader
+        self._max_age = max_age
+        self._source_version = source_version
+        self._check_interval = check_interval
+        self._version = 0
+        self._value: Optional[T] = None
+        self._lock = threading.Lock()
+        self._rebuilds = 0
+        self._source_seen: Optional[int] = None
+        self._checked_at: Optional[float] = None
+
+    @abstractmethod
+    def build(self, rows: List[Dict[str, Any]], version: int) -> T:
+        """Build the value from loader rows."""
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    def bump_version(self) -> int:
+        """Mark the current value stale; the next read rebuilds it."""
+        with self._lock:
+            self._version += 1
+            return self._version
+
+    # -- data version ------------------------------------------------------
+
+    def _read_source(self) -> Optional[int]:
+        self._checked_at = time.monotonic()
+        try:
+            return self._source_version()  # type: ignore[misc]
+        except Exception as exc:
+            logger.debug("%s: data version unavailable: %s", self.name, exc)
+            return None
+
+    def _source_due(self) -> bool:
+        if self._source_version is None:
+            return False
+        checked_at = self._checked_at
+        return (
+            checked_at is None or time.monotonic() - checked_at >= self._check_interval
+        )
+
+    def check_source(self) -> None:
+        """Bump the version if the database's data version moved (blocking)."""
+        seen = self._read_source()
+        if seen is None:
+            return
+        if self._source_seen is not None and seen != self._source_seen:
+            self.bump_version()
+        self._source_seen = seen
+
+    # -- reads -------------------------------------------------------------
+
+    def _is_fresh(self, value: Optional[T]) -> bool:
+        if value is None or value.version != self._version:
+            return False
+        if self._max_age and time.monotonic() - value.built_at >= self._max_age:
+            return False
+        return True
+
+    def peek(self) -> Optional[T]:
+        """Return the value if it is fresh, without rebuilding."""
+        value = self._value
+        return value if self._is_fresh(value) else None
+
+    def refresh(self) -> T:
+        """Rebuild the value synchronously (one DB round-trip)."""
+        with self._lock:
+            # Another thread may have rebuilt while we waited for the lock.
+            if self._is_fresh(self._value):
+                return self._value  # type: ignore[return-value]
+            version = self._version
+            start = time.monotonic()
+            # Read before loading: a write in between triggers another rebuild
+            if self._source_version is not None:
+                self._source_seen = self._read_source()
+            rows = self._loader()
+            value = self.build(rows, version)
+            self._value = value
+            self._rebuilds += 1
+            logger.debug(
+                "%s rebuilt: %d rows, version=%d, %.1f ms",
+                self.name,
+                len(rows),
+                version,
+                (time.monotonic() - start) * 1000,
+            )
+            return value
+
+    def get(self) -> T:
+        """Return a fresh value, rebuilding synchronously if needed."""
+        if self._source_due():
+            self.check_source()
+        return self.peek() or self.refresh()
+
+    async def aget(self) -> T:
+        """Return a fresh value; only checks and rebuilds leave the event loop."""
+        if self._source_due():
+            await asyncio.to_thread(self.check_source)
+        value = self.peek()
+        if value is not None:
+            return value
+        return await asyncio.to_thread(self.refresh)
+
+    def get_stats(self) -> Dict[str, Any]:
+        value = self._value
+        return {
+            "version": self._version,
+            "source_version": self._source_seen,
+            "rebuilds": self._rebuilds,
+            "age_seconds": round(time.monotonic() - value.built_at, 1)
+            if value is not None
+            else None,
+        }
@@ -1,8 +1,13 @@
 """Quotes Hub -- background task that fetches market quotes.
 
 Fetches from all providers on a schedule. When Redis is available, stores
-snapshots and publishes changes via Pub/Sub. Without Redis, keeps an
-in-memory snapshot that the SSE endpoint reads directly.
+snapshots and publishes changes via Pub/Sub; one shared subscriber per
+process (``RedisRelay``) receives them. Each new snapshot is diffed
+against the previous one and encoded once as an SSE ``delta`` frame
+carrying only changed fields (with a full ``snapshot`` keyframe every
+``_KEYFRAME_EVERY`` frames). Frames carry a sequence number as the SSE
+``id`` and are fanned out through a ``BroadcastHub`` to per-client bounded
+queues (drop-oldest), so a slow viewer never holds up the others.
 """
 
 from __future__ import annotations
@@ -10,9 +15,11 @@ from __future__ import annotations
 import asyncio
 import json
 import logging
-from typing import List, Optional
+import threading
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
 
 from api.models.widgets import QuoteItem
+from services.broadcast import BroadcastHub, RedisRelay
 
 logger = logging.getLogger(__name__)
 
@@ -21,9 +28,60 @@ _REDIS_CHANNEL = "widgets:quotes:pubsub"
 _REDIS_TTL = 120  # seconds
 _FETCH_INTERVAL = 30  # seconds
 
-# In-memory snapshot for Redis-free operation
+# Frames queued per client before the oldest is dropped. A client that
+# falls behind is resynced with a keyframe, so only a few are needed.
+_CLIENT_QUEUE_SIZE = 8
+
+# Every Nth frame is a full ``snapshot`` keyframe instead of a ``delta``
+_KEYFRAME_EVERY = 20
+
+
+class QuoteFrame(NamedTuple):
+    """A pre-encoded SSE frame as published to the hub."""
+
+    seq: int
+    data: str
+    keyframe: bool
+
+
+# Latest snapshot JSON, its per-symbol quotes and the matching keyframe
+# (for first paint and resync). Guarded by ``_state_lock`` because frames
+# are produced both on the event loop and on the Redis relay thread.
 _latest_snapshot: Optional[str] = None
-_snapshot_event: asyncio.Event = asyncio.Event()
+_latest_quotes: Dict[str, Dict[str, Any]] = {}
+_latest_frame: Optional[str] = None
+_seq = 0
+_state_lock = threading.Lock()
+
+_hub = BroadcastHub("widgets_quotes", queue_size=_CLIENT_QUEUE_SIZE)
+
+try:
+    from prometheus_client.core import REGISTRY, GaugeMetricFamily
+
+    class _QuotesStreamCollector:
+        """Exposes the quotes hub's fan-out stats on /metrics, read at scrape time."""
+
+        def collect(self):
+            stats = _hub.get_stats()
+            yield GaugeMetricFamily(
+                "widgets_quotes_stream_clients",
+                "Connected widgets quotes SSE clients",
+                value=stats["subscribers"],
+            )
+            yield GaugeMetricFamily(
+                "widgets_quotes_stream_dropped_frames",
+                "Quote frames dropped for slow widgets SSE clients",
+                value=stats["dropped"],
+            )
+
+    try:
+        REGISTRY.register(_QuotesStreamCollector())
+    except ValueError:
+        # Re-import (e.g. importlib.reload in tests): the first collector
+        # already owns these names.
+        logger.debug("Quotes stream metrics already registered")
+except ImportError:
+    pass
 
 
 def get_latest_snapshot() -> Optional[str]:
@@ -31,9 +89,101 @@ def get_latest_snapshot() -> Optional[str]:
     return _latest_snapshot
 
 
-def get_snapshot_event() -> asyncio.Event:
-    """Return the asyncio.Event that is set on each new snapshot."""
-    return _snapshot_event
+def get_keyframe() -> Tuple[int, Optional[str]]:
+    """Return ``(seq, frame)`` for the latest full snapshot.
+
+    ``frame`` is None before the first fetch (``seq`` is then 0).
+    """
+    with _state_lock:
+        return _seq, _latest_frame
+
+
+def get_quotes_hub() -> BroadcastHub:
+    """Return the hub that SSE clients subscribe to for new frames."""
+    return _hub
+
+
+def get_stream_stats() -> Dict[str, Any]:
+    """Return connected-client and dropped-frame counters."""
+    stats = _hub.get_stats()
+    return {
+        "connected_clients": stats["subscribers"],
+        "frames_published": stats["published"],
+        "dropped_frames": stats["dropped"],
+        "seq": _seq,
+    }
+
+
+def encode_snapshot_frame(snapshot: str, seq: int) -> str:
+    """Encode a snapshot JSON string as an SSE ``snapshot`` event."""
+    return f"id: {seq}\nevent: snapshot\ndata: {snapshot}\n\n"
+
+
+def encode_delta_frame(delta: Dict[str, Any], seq: int) -> str:
+    """Encode a delta (see :func:`compute_delta`) as an SSE ``delta`` event."""
+    data = json.dumps(delta, ensure_ascii=False, separators=(",", ":"))
+    return f"id: {seq}\nevent: delta\ndata: {data}\n\n"
+
+
+def compute_delta(
+    previous: Dict[str, Dict[str, Any]], current: Dict[str, Dict[str, Any]]
+) -> Dict[str, Any]:
+    """Diff two per-symbol quote maps.
+
+    Returns ``{"changed": [...], "removed": [...]}`` where each changed
+    entry holds ``symbol`` plus only the fields that differ (all fields for
+    a new symbol), and ``removed`` lists symbols no longer present.
+    """
+    changed: List[Dict[str, Any]] = []
+    for symbol, quote in current.items():
+        old = previous.get(symbol)
+        if old is None:
+            changed.append(dict(quote))
+            continue
+        diff = {k: v for k, v in quote.items() if old.get(k) != v}
+        if diff:
+            diff["symbol"] = symbol
+            changed.append(diff)
+    removed = [symbol for symbol in previous if symbol not in current]
+    return {"changed": changed, "removed": removed}
+
+
+def _index_by_symbol(snapshot: str) -> Optional[Dict[str, Dict[str, Any]]]:
+    """Parse a snapshot into ``{symbol: quote}``; None if it is not a quote list."""
+    try:
+        quotes = json.loads(snapshot)
+        return {q["symbol"]: q for q in quotes}
+    except (ValueError, TypeError, KeyError):
+        return None
+
+
+def _deliver(snapshot: str) -> bool:
+    """Record ``snapshot`` and publish a frame if it differs from the last one.
+
+    The frame is a ``delta`` against the previous snapshot, except every
+    ``_KEYFRAME_EVERY`` frames (and whenever the previous state is unknown)
+    when a full ``snapshot`` keyframe is sent. Safe to call from any
+    thread. Returns True if a frame was published.
+    """
+    global _latest_snapshot, _latest_quotes, _latest_frame, _seq
+    with _state_lock:
+        if snapshot == _latest_snapshot:
+            return False
+        quotes = _index_by_symbol(snapshot)
+        seq = _seq + 1
+        keyframe_data = encode_snapshot_frame(snapshot, seq)
+        keyframe = quotes is None or not _latest_quotes or seq % _KEYFRAME_EVERY == 0
+        if keyframe:
+            frame = QuoteFrame(seq, keyframe_data, True)
+        else:
+            delta = compute_delta(_latest_quotes, quotes)
+            frame = QuoteFrame(seq, encode_delta_frame(delta, seq), False)
+        _seq = seq
+        _latest_snapshot = snapshot
+        _latest_quotes = quotes or {}
+        _latest_frame = keyframe_data
+        _hub.publish(frame)
+    return True
 
 
 async def _fetch_all_providers() -> List[QuoteItem]:
@@ -78,50 +228,67 @@ async def run_quotes_hub(redis_client=None) -> None:
         A ``redis.Redis`` instance (synchronous, with ``decode_responses=True``).
         If None, operates in memory-only mode.
     """
-    global _latest_snapshot
-
     mode = "Redis" if redis_client else "in-memory"
     logger.info("Quotes hub started (mode: %s)", mode)
     last_snapshot = ""
 
-    while True:
+    relay: Optional[RedisRelay] = None
+    if redis_client:
+        # Fast first paint for clients of this process before our first fetch
         try:
-            quotes = await _fetch_all_providers()
+            cached = await asyncio.to_thread(redis_client.get, _REDIS_KEY)
+            if isinstance(cached, bytes):
+                cached = cached.decode("utf-8")
+            if isinstance(cached, str) and cached:
+                _deliver(cached)
+        except Exception as exc:
+            logger.warning("Failed to read cached quotes snapshot: %s", exc)
+        relay = RedisRelay(
+            redis_client, _REDIS_CHANNEL, _deliver, name="quotes-hub-redis"
+        )
+        relay.start()
 
-            if not quotes:
-                logger.debug("No quotes fetched this cycle")
-                await asyncio.sleep(_FETCH_INTERVAL)
-                continue
+    try:
+        while True:
+            try:
+                quotes = await _fetch_all_providers()
 
-            snapshot = _serialize(quotes)
+                if not quotes:
+                    logger.debug("No quotes fetched this cycle")
+                    await asyncio.sleep(_FETCH_INTERVAL)
+                    continue
 
-            # Always update in-memory snapshot
-            _latest_snapshot = snapshot
-            _snapshot_event.set()
-            _snapshot_event.clear()
+                snapshot = _serialize(quotes)
 
-            if redis_client:
-                # Store latest snapshot with TTL
-                await asyncio.to_thread(
-                    redis_client.setex, _REDIS_KEY, _REDIS_TTL, snapshot
-                )
+                # Always update the local snapshot; other processes get it
+                # through Redis (our own relay skips it as a duplicate).
+                _deliver(snapshot)
 
-                # Only publish if data changed
-                if snapshot != last_snapshot:
+                if redis_client:
+                    # Store latest snapshot with TTL
                     await asyncio.to_thread(
-                        redis_client.publish, _REDIS_CHANNEL, snapshot
+                        redis_client.setex, _REDIS_KEY, _REDIS_TTL, snapshot
                     )
 
-            if snapshot != last_snapshot:
-                last_snapshot = snapshot
-                logger.debug("Quotes updated (%d items)", len(quotes))
-            else:
-                logger.debug("Quotes unchanged, skipping")
+                    # Only publish if data changed
+                    if snapshot != last_snapshot:
+                        await asyncio.to_thread(
+                            redis_client.publish, _REDIS_CHANNEL, snapshot
+                        )
 
-        except asyncio.CancelledError:
-            logger.info("Quotes hub cancelled")
-            raise
-        except Exception as exc:
-            logger.warning("Quotes hub error: %s", exc)
+                if snapshot != last_snapshot:
+                    last_snapshot = snapshot
+                    logger.debug("Quotes updated (%d items)", len(quotes))
+                else:
+                    logger.debug("Quotes unchanged, skipping")
+
+            except asyncio.CancelledError:
+                logger.info("Quotes hub cancelled")
+                raise
+            except Exception as exc:
+                logger.warning("Quotes hub error: %s", exc)
 
-        await asyncio.sleep(_FETCH_INTERVAL)
+            await asyncio.sleep(_FETCH_INTERVAL)
+    finally:
+        if relay is not None:
+            relay.stop()
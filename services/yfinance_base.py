@@ -1,21 +1,38 @@
 """
-Shared yfinance utilities: LRU cache with TTL and circuit breaker.
+Shared yfinance utilities: LRU cache with soft/hard TTL, circuit breaker,
+single-flight request coalescing, and a background refresh pool for
+stale-while-revalidate.
 
 Extracted from stock_ohlcv.py and tasi_index.py to eliminate ~200 lines
 of duplicated cache + circuit breaker logic.
 """
 
+import asyncio
 import logging
 import threading
 import time
 from collections import OrderedDict
-from typing import Any, Dict, Optional, Tuple, Union
+from concurrent.futures import Future
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Hashable,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    TypeVar,
+    Union,
+)
 
 logger = logging.getLogger(__name__)
 
 # Default LRU cache capacity
 DEFAULT_MAX_ENTRIES = 500
 
+T = TypeVar("T")
+
 
 class YFinanceCache:
     """Thread-safe LRU cache with TTL expiration.
@@ -23,10 +40,17 @@ class YFinanceCache:
     Uses OrderedDict to maintain insertion/access order and evicts
     the oldest entries when the cache exceeds ``max_entries``.
 
+    ``ttl`` is the soft TTL: past it :meth:`get` misses. With a
+    ``hard_ttl``, entries between the two are still servable through
+    :meth:`stale_priority` while a background refresh revalidates them.
+    Each entry counts its hits so hot keys can be refreshed first.
+
     Args:
-        ttl: Time-to-live in seconds for cache entries.
+        ttl: Time-to-live in seconds for cache entries (soft TTL).
         max_entries: Maximum number of entries before LRU eviction.
         name: Human-readable name for log messages.
+        hard_ttl: Age in seconds after which stale entries are no longer
+            served while revalidating (None disables stale-while-revalidate).
     """
 
     def __init__(
@@ -34,8 +58,10 @@ class YFinanceCache:
         ttl: int = 300,
         max_entries: int = DEFAULT_MAX_ENTRIES,
         name: str = "yfinance",
+        hard_ttl: Optional[int] = None,
     ) -> None:
         self._ttl = ttl
+        self._hard_ttl = hard_ttl
         self._max_entries = max_entries
         self._name = name
         self._store: OrderedDict[Union[str, Tuple], Dict[str, Any]] = OrderedDict()
@@ -45,6 +71,10 @@ class YFinanceCache:
     def ttl(self) -> int:
         return self._ttl
 
+    @property
+    def hard_ttl(self) -> Optional[int]:
+        return self._hard_ttl
+
     def get(self, key: Union[str, Tuple]) -> Optional[Dict[str, Any]]:
         """Return cached payload if still fresh, else None."""
         with self._lock:
@@ -55,9 +85,50 @@ class YFinanceCache:
             if age < self._ttl:
                 # Move to end (most-recently-used)
                 self._store.move_to_end(key)
+                entry["hits"] = entry.get("hits", 0) + 1
                 return entry["payload"]
             return None
 
+    def is_fresh(self, key: Union[str, Tuple]) -> bool:
+        """Return True if ``key`` holds a fresh entry (does not count as a hit)."""
+        with self._lock:
+            entry = self._store.get(key)
+            return (
+                entry is not None and time.monotonic() - entry["fetched_at"] < self._ttl
+            )
+
+    def servable_for(self, key: Union[str, Tuple]) -> float:
+        """Return seconds until ``key`` can no longer be served (0 if absent).
+
+        Includes the stale-while-revalidate window when a ``hard_ttl`` is
+        set. Does not count as a hit.
+        """
+        limit = self._ttl if self._hard_ttl is None else self._hard_ttl
+        with self._lock:
+            entry = self._store.get(key)
+            if entry is None:
+                return 0.0
+            return max(0.0, limit - (time.monotonic() - entry["fetched_at"]))
+
+    def stale_priority(self, key: Union[str, Tuple]) -> Optional[int]:
+        """Return the hit count of an entry that may be served while revalidating.
+
+        Returns None unless the entry is past the soft TTL but younger than
+        the hard TTL. Counts as a hit.
+        """
+        if self._hard_ttl is None:
+            return None
+        with self._lock:
+            entry = self._store.get(key)
+            if entry is None:
+                return None
+            age = time.monotonic() - entry["fetched_at"]
+            if not self._ttl <= age < self._hard_ttl:
+                return None
+            self._store.move_to_end(key)
+            entry["hits"] = entry.get("hits", 0) + 1
+            return entry["hits"]
+
     def get_stale(self, key: Union[str, Tuple]) -> Optional[Dict[str, Any]]:
         """Return cached payload even if stale (for fallback on fetch failure)."""
         with self._lock:
@@ -69,11 +140,15 @@ class YFinanceCache:
     def put(self, key: Union[str, Tuple], payload: Dict[str, Any]) -> None:
         """Insert or update a cache entry, evicting oldest if over capacity."""
         with self._lock:
+            hits = 0
             if key in self._store:
                 self._store.move_to_end(key)
+                # Keep the hit count across refreshes so hot keys stay hot
+                hits = self._store[key].get("hits", 0)
             self._store[key] = {
                 "payload": payload,
                 "fetched_at": time.monotonic(),
+                "hits": hits,
             }
             # Evict oldest entries if over capacity
             while len(self._store) > self._max_entries:
@@ -202,3 +277,222 @@ class CircuitBreaker:
                 "consecutive_failures": self._consecutive_failures,
                 "open_remaining_seconds": round(remaining) if is_open else None,
             }
+
+
+class SingleFlight:
+    """Coalesce concurrent fetches for the same key into a single call.
+
+    The first caller for a key runs ``fn``; callers arriving while it is
+    in flight share its future instead of queuing behind a lock and then
+    re-checking the cache. Sync callers block on the future, async callers
+    await it without tying up a worker thread. A caller that already holds
+    a stale payload can pass it as ``stale`` to get it back immediately
+    while the in-flight fetch revalidates the cache.
+
+    Args:
+        name: Human-readable name for log messages.
+    """
+
+    def __init__(self, name: str = "yfinance") -> None:
+        self._name = name
+        self._calls: Dict[Hashable, Future] = {}
+        self._lock = threading.Lock()
+        self._executions = 0
+        self._coalesced = 0
+        self._stale_served = 0
+
+    def _join(self, key: Hashable, has_stale: bool) -> Tuple[Optional[Future], bool]:
+        """Return ``(future, is_leader)``; ``(None, False)`` means serve stale."""
+        with self._lock:
+            future = self._calls.get(key)
+            if future is not None:
+                if has_stale:
+                    self._stale_served += 1
+                    return None, False
+                self._coalesced += 1
+                return future, False
+            future = Future()
+            self._calls[key] = future
+            self._executions += 1
+            return future, True
+
+    def _run(self, key: Hashable, future: Future, fn: Callable[[], Any]) -> None:
+        try:
+            future.set_result(fn())
+        except BaseException as exc:
+            future.set_exception(exc)
+        finally:
+            with self._lock:
+                if self._calls.get(key) is future:
+                    del self._calls[key]
+
+    def do(self, key: Hashable, fn: Callable[[], T], stale: Optional[T] = None) -> T:
+        """Run ``fn`` once for all concurrent sync callers of ``key``."""
+        future, leader = self._join(key, stale is not None)
+        if future is None:
+            logger.debug("%s single-flight: serving stale for %s", self._name, key)
+            return stale
+        if leader:
+            self._run(key, future, fn)
+        return future.result()
+
+    async def ado(
+        self, key: Hashable, fn: Callable[[], T], stale: Optional[T] = None
+    ) -> T:
+        """Async :meth:`do`: the leader runs ``fn`` in the default executor.
+
+        Cancelling one awaiting caller does not cancel the shared fetch.
+        """
+        future, leader = self._join(key, stale is not None)
+        if future is None:
+            logger.debug("%s single-flight: serving stale for %s", self._name, key)
+            return stale
+        if leader:
+            asyncio.get_running_loop().run_in_executor(None, self._run, key, future, fn)
+        return await asyncio.shield(asyncio.wrap_future(future))
+
+    def in_flight(self, key: Hashable) -> bool:
+        with self._lock:
+            return key in self._calls
+
+    def get_stats(self) -> Dict[str, int]:
+        """Return coalescing counters for health endpoints."""
+        with self._lock:
+            return {
+                "in_flight": len(self._calls),
+                "executions": self._executions,
+                "coalesced": self._coalesced,
+                "stale_served": self._stale_served,
+            }
+
+
+class RefreshPool:
+    """Bounded background workers for stale-while-revalidate refreshes.
+
+    Pending refreshes are keyed, so a key already queued or running is not
+    queued twice, and workers always pick the highest-priority key next
+    (callers pass the cache hit count, so hot keys refresh first). When
+    ``max_pending`` keys are queued, a new key only gets in by displacing
+    a colder one. Worker threads start on the first submit.
+
+    Args:
+        max_workers: Number of background refresh threads.
+        max_pending: Maximum number of queued (not yet running) refreshes.
+        name: Human-readable name for log messages and thread names.
+    """
+
+    def __init__(
+        self, max_workers: int = 2, max_pending: int = 64, name: str = "yfinance"
+    ) -> None:
+        self._max_workers = max_workers
+        self._max_pending = max_pending
+        self._name = name
+        # key -> (priority, sequence, fn)
+        self._pending: Dict[Hashable, Tuple[int, int, Callable[[], Any]]] = {}
+        self._running: Set[Hashable] = set()
+        self._workers: List[threading.Thread] = []
+        self._cond = threading.Condition()
+        self._seq = 0
+        self._closed = False
+        self._submitted = 0
+        self._deduplicated = 0
+        self._dropped = 0
+        self._completed = 0
+        self._failed = 0
+
+    def submit(self, key: Hashable, fn: Callable[[], Any], priority: int = 0) -> bool:
+        """Queue ``fn`` to refresh ``key``; return False if it was not queued."""
+        with self._cond:
+            if self._closed:
+                return False
+            if key in self._running or key in self._pending:
+                if key in self._pending:
+                    old_priority, seq, _ = self._pending[key]
+                    self._pending[key] = (max(old_priority, priority), seq, fn)
+                self._deduplicated += 1
+                return True
+            if len(self._pending) >= self._max_pending:
+                coldest = min(
+                    self._pending,
+                    key=lambda k: (self._pending[k][0], -self._pending[k][1]),
+                )
+                self._dropped += 1
+                if self._pending[coldest][0] >= priority:
+                    return False
+                del self._pending[coldest]
+            self._seq += 1
+            self._pending[key] = (priority, self._seq, fn)
+            self._submitted += 1
+            self._start_workers()
+            self._cond.notify_all()
+            return True
+
+    def _start_workers(self) -> None:
+        """Start worker threads up to ``max_workers`` (holding ``_cond``)."""
+        self._workers = [t for t in self._workers if t.is_alive()]
+        while len(self._workers) < self._max_workers:
+            thread = threading.Thread(
+                target=self._work,
+                name=f"{self._name}-refresh-{len(self._workers)}",
+                daemon=True,
+            )
+            thread.start()
+            self._workers.append(thread)
+
+    def _work(self) -> None:
+        while True:
+            with self._cond:
+                while not self._pending and not self._closed:
+                    self._cond.wait()
+                if self._closed:
+                    return
+                key = max(
+                    self._pending,
+                    key=lambda k: (self._pending[k][0], -self._pending[k][1]),
+                )
+                _, _, fn = self._pending.pop(key)
+                self._running.add(key)
+            ok = True
+            try:
+                fn()
+            except Exception as exc:
+                ok = False
+                logger.warning(
+                    "%s background refresh failed for %s: %s", self._name, key, exc
+                )
+            finally:
+                with self._cond:
+                    self._running.discard(key)
+                    if ok:
+                        self._completed += 1
+                    else:
+                        self._failed += 1
+                    self._cond.notify_all()
+
+    def wait_idle(self, timeout: Optional[float] = None) -> bool:
+        """Block until no refresh is queued or running; False on timeout."""
+        with self._cond:
+            return self._cond.wait_for(
+                lambda: not self._pending and not self._running, timeout
+            )
+
+    def shutdown(self) -> None:
+        """Drop queued refreshes and stop the workers after their current job."""
+        with self._cond:
+            self._closed = True
+            self._pending.clear()
+            self._cond.notify_all()
+
+    def get_stats(self) -> Dict[str, int]:
+        """Return refresh queue counters for health endpoints."""
+        with self._cond:
+            return {
+                "workers": self._max_workers,
+                "pending": len(self._pending),
+                "running": len(self._running),
+                "submitted": self._submitted,
+                "deduplicated": self._deduplicated,
+                "dropped": self._dropped,
+                "completed": self._completed,
+                "failed": self._failed,
+            }
@@ -29,6 +29,9 @@ if str(PROJECT_ROOT) not in sys.path:
 # via `python tests/test_app_assembly_v2.py`.
 collect_ignore = [str(Path(__file__).parent / "test_app_assembly_v2.py")]
 
+# The OHLCV warmup job downloads every listed ticker from the app lifespan
+os.environ.setdefault("OHLCV_WARMUP_ENABLED", "false")
+
 
 # ---------------------------------------------------------------------------
 # SQLite test database
@@ -0,0 +1,162 @@
+"""
+Middleware Overhead Benchmark
+=============================
+Measures the per-request latency the full middleware stack adds on top of a
+bare app (same routes, no middleware), driving both in-process through
+``httpx.ASGITransport`` so no network or server threads are involved.
+
+The stack mirrors app.py (outermost first): ChatAuth -> ErrorHandler ->
+RequestLogging -> RateLimit -> GZip -> CORS.
+
+Markers:
+  @pytest.mark.performance  — excluded from normal CI runs
+  @pytest.mark.slow         — excluded from normal CI runs
+
+Run explicitly (``-s`` prints the measured numbers):
+  pytest tests/performance/test_middleware_overhead.py -v -s -m performance
+"""
+
+import asyncio
+import logging
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+WARMUP = 50
+REQUESTS = 500
+
+# Generous per-request budget for the whole stack (CI machines are noisy)
+MAX_OVERHEAD_MS = 2.0
+
+
+def _make_app(with_stack: bool):
+    from fastapi import FastAPI
+    from fastapi.middleware.gzip import GZipMiddleware
+    from fastapi.responses import StreamingResponse
+
+    app = FastAPI()
+
+    @app.get("/api/v1/news/feed")
+    async def news_feed():
+        return {"articles": [], "total": 0, "limit": 20, "offset": 0}
+
+    @app.get("/api/v1/news/stream")
+    async def news_stream():
+        async def events():
+            yield "data: first\n\n"
+            await asyncio.sleep(0.3)
+            yield "data: second\n\n"
+
+        return StreamingResponse(events(), media_type="text/event-stream")
+
+    if not with_stack:
+        return app
+
+    from backend.middleware.rate_limiter import RateLimiter
+    from middleware.chat_auth import ChatAuthMiddleware
+    from middleware.cors import setup_cors
+    from middleware.error_handler import ErrorHandlerMiddleware
+    from middleware.rate_limit import RateLimitMiddleware
+    from middleware.request_logging import RequestLoggingMiddleware
+
+    setup_cors(app, ["http://localhost:3000"])
+    app.add_middleware(GZipMiddleware, minimum_size=1000)
+    app.add_middleware(
+        RateLimitMiddleware,
+        requests_per_minute=1_000_000,
+        limiter=RateLimiter(),
+    )
+    app.add_middleware(RequestLoggingMiddleware)
+    app.add_middleware(ErrorHandlerMiddleware)
+    app.add_middleware(ChatAuthMiddleware)
+    return app
+
+
+async def _latencies(app, path: str, n: int) -> list:
+    import httpx
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://testserver"
+    ) as client:
+        for _ in range(WARMUP):
+            await client.get(path)
+        samples = []
+        for _ in range(n):
+            start = time.perf_counter()
+            resp = await client.get(path)
+            samples.append((time.perf_counter() - start) * 1000)
+            assert resp.status_code == 200
+    return samples
+
+
+@pytest.fixture
+def quiet_request_log():
+    # Log formatting is part of the cost, but handler I/O to the terminal is not
+    log = logging.getLogger("tasi.access")
+    previous = log.level
+    log.setLevel(logging.WARNING)
+    yield
+    log.setLevel(previous)
+
+
+@pytest.mark.performance
+@pytest.mark.slow
+class TestMiddlewareOverhead:
+    def test_full_stack_overhead_per_request(self, quiet_request_log):
+        async def measure():
+            bare = await _latencies(_make_app(False), "/api/v1/news/feed", REQUESTS)
+            full = await _latencies(_make_app(True), "/api/v1/news/feed", REQUESTS)
+            return bare, full
+
+        bare, full = asyncio.run(measure())
+        bare_ms, full_ms = statistics.median(bare), statistics.median(full)
+        overhead = full_ms - bare_ms
+        print(
+            f"\n  median per request: bare={bare_ms:.3f}ms "
+            f"stack={full_ms:.3f}ms overhead={overhead:.3f}ms"
+        )
+        assert overhead < MAX_OVERHEAD_MS
+
+    def test_stream_not_buffered_by_stack(self, quiet_request_log):
+        # Driven at the ASGI level: httpx.ASGITransport buffers whole bodies
+        app = _make_app(True)
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": "GET",
+            "scheme": "http",
+            "path": "/api/v1/news/stream",
+            "raw_path": b"/api/v1/news/stream",
+            "query_string": b"",
+            "root_path": "",
+            "headers": [(b"host", b"testserver")],
+            "client": ("127.0.0.1", 50000),
+            "server": ("testserver", 80),
+        }
+        chunks = []
+
+        async def receive():
+            await asyncio.sleep(1)
+            return {"type": "http.disconnect"}
+
+        async def send(message):
+            if message["type"] == "http.response.body" and message.get("body"):
+                chunks.append((time.perf_counter(), message["body"]))
+
+        start = time.perf_counter()
+        asyncio.run(app(scope, receive, send))
+
+        # The second event is 0.3s behind the first; a buffering middleware
+        # would hold the first chunk until the stream ends.
+        assert len(chunks) == 2
+        assert b"first" in chunks[0][1]
+        assert chunks[0][0] - start < 0.25
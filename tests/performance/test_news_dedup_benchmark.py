@@ -0,0 +1,114 @@
+"""
+News Deduplication Benchmark
+============================
+Wall time of title deduplication for one scrape cycle, on a fixed synthetic
+corpus of stories with lightly edited copies, for:
+
+* ``pairwise`` — the previous implementation, every title against every kept
+  title (reproduced below as the reference);
+* ``lsh``      — :func:`_deduplicate`, which only compares MinHash/LSH
+  candidates.
+
+LSH recall is below 1, so ``lsh`` may keep a few duplicates the pairwise scan
+removes, but never fewer articles than it.
+
+Markers:
+  @pytest.mark.performance  — excluded from normal CI runs
+  @pytest.mark.slow         — excluded from normal CI runs
+
+Run explicitly (``-s`` prints the measured numbers):
+  pytest tests/performance/test_news_dedup_benchmark.py -v -s -m performance
+"""
+
+import random
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from services import news_scraper as ns  # noqa: E402
+from services.near_dedup import titles_similar  # noqa: E402
+
+STORIES = 200
+CORPUS_SEED = 20240601
+THRESHOLD = 0.55
+
+# Required speedup over the pairwise scan, and share of its removals kept
+MIN_SPEEDUP = 10.0
+MIN_RECALL = 0.9
+
+
+def _corpus():
+    rng = random.Random(CORPUS_SEED)
+    vocab = sorted(
+        set(
+            " ".join(
+                list(ns._FALLBACK_TICKER_MAP)
+                + ns.POSITIVE_KEYWORDS
+                + ns.NEGATIVE_KEYWORDS
+                + ns._HIGH_IMPACT_KEYWORDS
+                + ns._MEDIUM_IMPACT_KEYWORDS
+            ).split()
+        )
+    )
+    articles = []
+    for _ in range(STORIES):
+        words = [rng.choice(vocab) for _ in range(rng.randint(6, 12))]
+        articles.append({"title": " ".join(words), "priority": rng.randint(1, 5)})
+        for _ in range(rng.randint(0, 2)):
+            edited = list(words)
+            edited[rng.randrange(len(edited))] = rng.choice(vocab)
+            articles.append({"title": " ".join(edited), "priority": rng.randint(1, 5)})
+    rng.shuffle(articles)
+    return articles
+
+
+def _pairwise_dedup(articles, threshold=THRESHOLD):
+    """The pre-LSH implementation: compare with every kept article."""
+    unique = []
+    for article in articles:
+        is_dup = False
+        for existing in unique:
+            if titles_similar(article["title"], existing["title"], threshold):
+                is_dup = True
+                if article["priority"] < existing["priority"]:
+                    unique.remove(existing)
+                    unique.append(article)
+                break
+        if not is_dup:
+            unique.append(article)
+    return unique
+
+
+def _timed(fn, articles):
+    start = time.perf_counter()
+    result = fn(articles)
+    return time.perf_counter() - start, result
+
+
+@pytest.mark.performance
+@pytest.mark.slow
+class TestNewsDedupBenchmark:
+    def test_cycle_dedup_time(self):
+        articles = _corpus()
+        pairwise_s, expected = _timed(_pairwise_dedup, articles)
+        lsh_s, result = _timed(
+            lambda a: ns._deduplicate(a, threshold=THRESHOLD), articles
+        )
+
+        removed = len(articles) - len(expected)
+        recall = (len(articles) - len(result)) / removed
+        print(f"\n  {len(articles)} titles, {removed} duplicates (pairwise)")
+        print(f"  pairwise: {pairwise_s:7.3f} s")
+        print(
+            f"       lsh: {lsh_s:7.3f} s ({pairwise_s / lsh_s:5.1f}x), "
+            f"{recall:.0%} of duplicates removed"
+        )
+        assert len(result) >= len(expected)
+        assert recall >= MIN_RECALL
+        assert pairwise_s / lsh_s >= MIN_SPEEDUP
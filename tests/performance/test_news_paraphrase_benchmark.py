@@ -0,0 +1,115 @@
+"""
+News Paraphrase Benchmark
+=========================
+Per-article cost of :func:`paraphrase_article` on a fixed synthetic corpus,
+against the previous implementation (one ``in`` scan and ``str.replace`` per
+synonym key, and one opening regex search per variation, reproduced below as
+the reference).
+
+Markers:
+  @pytest.mark.performance  — excluded from normal CI runs
+  @pytest.mark.slow         — excluded from normal CI runs
+
+Run explicitly (``-s`` prints the measured numbers):
+  pytest tests/performance/test_news_paraphrase_benchmark.py -v -s -m performance
+"""
+
+import random
+import re
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from services import keyword_matcher  # noqa: E402
+from services import news_paraphraser as npp  # noqa: E402
+
+CORPUS_SIZE = 200
+CORPUS_SEED = 20240601
+ROUNDS = 7
+
+# Required speedup over the reference (native matcher backend)
+MIN_SPEEDUP = 5.0
+
+_FILLER = (
+    "السوق المالية السعودية تداول مؤشر الأسهم الشركة قطاع المستثمرين خلال "
+    "الجلسة اليوم بنسبة مليون ريال الربع الأول الثاني العام المالي مقارنة "
+    "بالفترة نفسها من العام السابق وأن مجلس الإدارة وافق على البنوك "
+    "الطاقة البتروكيماويات الاتصالات التأمين العقارات التجزئة الصناعة في "
+    "من على إلى عن مع بعد قبل حيث كما أيضا وقال الرئيس التنفيذي السهم"
+).split()
+
+
+def _corpus():
+    rng = random.Random(CORPUS_SEED)
+    terms = list(npp._SYNONYM_MAP) + [o for o, _ in npp.OPENING_VARIATIONS]
+    articles = []
+    for _ in range(CORPUS_SIZE):
+        words = [rng.choice(_FILLER) for _ in range(rng.randint(150, 400))]
+        for _ in range(rng.randint(2, 10)):
+            words.insert(rng.randrange(len(words)), rng.choice(terms))
+        for i in range(0, len(words), rng.randint(15, 30)):
+            words[i] += "."
+        cut = rng.randint(8, 14)
+        articles.append({"title": " ".join(words[:cut]), "body": " ".join(words[cut:])})
+    return articles
+
+
+def _reference_paraphrase(article):
+    """The pre-compiled implementation of paraphrase_article."""
+
+    def apply_synonyms(text):
+        for original, replacement in npp._SYNONYM_MAP.items():
+            if original in text and random.random() < 0.5:
+                text = text.replace(original, replacement, 1)
+        return text
+
+    def vary_openings(text):
+        for original, replacement in npp.OPENING_VARIATIONS:
+            pattern = rf"(^|[.\n]\s*){re.escape(original)}"
+            if re.search(pattern, text) and random.random() < 0.4:
+                text = re.sub(pattern, rf"\1{replacement}", text, count=1)
+        return text
+
+    modified = dict(article)
+    for field in ("title", "body"):
+        text = article.get(field) or ""
+        modified[field] = vary_openings(apply_synonyms(text)) if text else ""
+    return modified
+
+
+def _per_article_us(paraphrase, corpus):
+    rounds = []
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        for article in corpus:
+            paraphrase(article)
+        rounds.append((time.perf_counter() - start) / len(corpus) * 1e6)
+    return statistics.median(rounds)
+
+
+@pytest.mark.performance
+@pytest.mark.slow
+class TestNewsParaphraseBenchmark:
+    def test_per_article_paraphrase_time(self):
+        corpus = _corpus()
+        rng = random.Random(CORPUS_SEED)
+        reference = _per_article_us(_reference_paraphrase, corpus)
+        current = _per_article_us(lambda a: npp.paraphrase_article(a, rng), corpus)
+
+        chars = statistics.mean(len(a["title"]) + len(a["body"]) for a in corpus)
+        backend = "native" if npp._SYNONYM_MATCHER.native else "python"
+        print(f"\n  {len(corpus)} articles, {chars:.0f} chars avg")
+        print(f"  reference: {reference:8.1f} us/article")
+        print(
+            f"   compiled: {current:8.1f} us/article "
+            f"({reference / current:4.1f}x, {backend} matcher)"
+        )
+        if keyword_matcher.ahocorasick is not None:
+            assert reference / current >= MIN_SPEEDUP
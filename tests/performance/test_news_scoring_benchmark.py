@@ -0,0 +1,159 @@
+"""
+News Scoring Benchmark
+======================
+Per-article cost of ticker extraction plus sentiment and market-impact
+scoring, on a fixed synthetic corpus, for:
+
+* ``linear``  — the previous implementation, one ``kw in text`` scan per
+  company name and keyword (reproduced below as the reference);
+* ``python``  — :func:`score_article` on the pure-Python Aho-Corasick matcher;
+* ``native``  — :func:`score_article` on the pyahocorasick matcher.
+
+All three must agree on every article.
+
+Markers:
+  @pytest.mark.performance  — excluded from normal CI runs
+  @pytest.mark.slow         — excluded from normal CI runs
+
+Run explicitly (``-s`` prints the measured numbers):
+  pytest tests/performance/test_news_scoring_benchmark.py -v -s -m performance
+"""
+
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from services import keyword_matcher  # noqa: E402
+from services import news_scraper as ns  # noqa: E402
+
+CORPUS_SIZE = 200
+CORPUS_SEED = 20240601
+ROUNDS = 5
+
+# Required speedup of the native matcher over the linear scans
+MIN_NATIVE_SPEEDUP = 3.0
+
+_FILLER = (
+    "السوق المالية السعودية تداول مؤشر الأسهم الشركة قطاع المستثمرين خلال "
+    "الجلسة اليوم بنسبة مليون ريال الربع الأول الثاني العام المالي مقارنة "
+    "بالفترة نفسها من العام السابق وأعلنت أن مجلس الإدارة وافق على البنوك "
+    "الطاقة البتروكيماويات الاتصالات التأمين العقارات التجزئة الصناعة في "
+    "من على إلى عن مع بعد قبل حيث كما أيضا وقال الرئيس التنفيذي السهم"
+).split()
+
+
+def _corpus():
+    rng = random.Random(CORPUS_SEED)
+    names = list(ns._FALLBACK_TICKER_MAP)
+    keywords = (
+        ns.POSITIVE_KEYWORDS
+        + ns.NEGATIVE_KEYWORDS
+        + ns.STRONG_POSITIVE_KEYWORDS
+        + ns.STRONG_NEGATIVE_KEYWORDS
+        + ns._HIGH_IMPACT_KEYWORDS
+        + ns._MEDIUM_IMPACT_KEYWORDS
+    )
+    articles = []
+    for _ in range(CORPUS_SIZE):
+        words = [rng.choice(_FILLER) for _ in range(rng.randint(150, 400))]
+        for _ in range(rng.randint(0, 5)):
+            words.insert(rng.randrange(len(words)), rng.choice(keywords))
+        for _ in range(rng.randint(0, 2)):
+            words.insert(rng.randrange(len(words)), rng.choice(names))
+        cut = rng.randint(8, 14)
+        articles.append((" ".join(words[:cut]), " ".join(words[cut:])))
+    return articles
+
+
+def _linear_score(title, body):
+    """The pre-automaton implementation of ticker, sentiment and impact."""
+    text = f"{title} {body}"
+    ticker = None
+    for name, code in ns.COMPANY_TICKER_MAP.items():
+        if name in text:
+            ticker = code
+            break
+    pos = sum(1 for kw in ns.POSITIVE_KEYWORDS if kw in text)
+    pos += sum(2 for kw in ns.STRONG_POSITIVE_KEYWORDS if kw in text)
+    neg = sum(1 for kw in ns.NEGATIVE_KEYWORDS if kw in text)
+    neg += sum(2 for kw in ns.STRONG_NEGATIVE_KEYWORDS if kw in text)
+    score = (pos - neg) / (pos + neg + 1)
+    label = "إيجابي" if score > 0.1 else "سلبي" if score < -0.1 else "محايد"
+    lowered = text.lower()
+    impact = "low"
+    if any(kw.lower() in lowered for kw in ns._HIGH_IMPACT_KEYWORDS):
+        impact = "high"
+    elif any(kw.lower() in lowered for kw in ns._MEDIUM_IMPACT_KEYWORDS):
+        impact = "medium"
+    return ticker, score, label, impact
+
+
+def _per_article_us(score_fn, corpus):
+    rounds = []
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        for title, body in corpus:
+            score_fn(title, body)
+        rounds.append((time.perf_counter() - start) / len(corpus) * 1e6)
+    return statistics.median(rounds)
+
+
+@pytest.fixture
+def use_backend(monkeypatch):
+    """Return a setter that rebuilds the scraper matcher on a given backend."""
+
+    def _set(native):
+        build = ns._build_text_matcher
+
+        def _build(ticker_map):
+            matcher = build(ticker_map)
+            if matcher.native != native:
+                matcher.native = native
+                matcher.compile()
+            return matcher
+
+        monkeypatch.setattr(ns, "_build_text_matcher", _build)
+        monkeypatch.setattr(ns, "_text_matcher", None)
+        ns._get_text_matcher()
+
+    yield _set
+    ns._text_matcher = None
+
+
+@pytest.mark.performance
+@pytest.mark.slow
+class TestNewsScoringBenchmark:
+    def test_per_article_scoring_time(self, use_backend):
+        corpus = _corpus()
+        expected = [_linear_score(t, b) for t, b in corpus]
+        timings = {"linear": _per_article_us(_linear_score, corpus)}
+
+        backends = [False]
+        if keyword_matcher.ahocorasick is not None:
+            backends.append(True)
+        for native in backends:
+            use_backend(native)
+            assert [ns.score_article(t, b) for t, b in corpus] == expected
+            name = "native" if native else "python"
+            timings[name] = _per_article_us(ns.score_article, corpus)
+
+        chars = statistics.mean(len(t) + len(b) + 1 for t, b in corpus)
+        print(
+            f"\n  {len(corpus)} articles, {chars:.0f} chars avg, "
+            f"{len(ns.COMPANY_TICKER_MAP)} company names"
+        )
+        for name, us in timings.items():
+            print(
+                f"  {name:>6}: {us:8.1f} us/article "
+                f"({timings['linear'] / us:4.1f}x vs linear)"
+            )
+        if "native" in timings:
+            assert timings["linear"] / timings["native"] >= MIN_NATIVE_SPEEDUP
@@ -51,7 +51,7 @@ class TestInitPgPool:
 
         mock_tcp = MagicMock()
         with patch(
-            "psycopg2.pool.ThreadedConnectionPool", return_value=mock_tcp
+            "database.pool.FairConnectionPool", return_value=mock_tcp
         ) as mock_cls:
             from api.dependencies import init_pg_pool
 
@@ -92,7 +92,7 @@ class TestInitPgPool:
 
         mock_tcp = MagicMock()
         with patch(
-            "psycopg2.pool.ThreadedConnectionPool", return_value=mock_tcp
+            "database.pool.FairConnectionPool", return_value=mock_tcp
         ) as mock_cls:
             from api.dependencies import init_pg_pool
 
@@ -108,11 +108,11 @@ class TestInitPgPool:
 
         pool_mod._pool = None
 
-        # ThreadedConnectionPool will fail on bad credentials, but
+        # FairConnectionPool will fail on bad credentials, but
         # we're testing DSN parse - use an obviously bad scheme
         # The URL parse itself won't fail, but the pool creation might
         mock_tcp_cls = MagicMock(side_effect=Exception("connection refused"))
-        with patch("psycopg2.pool.ThreadedConnectionPool", mock_tcp_cls):
+        with patch("database.pool.FairConnectionPool", mock_tcp_cls):
             from api.dependencies import init_pg_pool
 
             with pytest.raises(Exception, match="connection refused"):
@@ -303,66 +303,44 @@ class TestWidgetsStream:
         assert headers["Connection"] == "keep-alive"
 
     @pytest.mark.asyncio
-    async def test_memory_generator_sends_snapshot(self):
-        """When a snapshot exists, the first yield is the snapshot event."""
-        from api.routes.widgets_stream import _memory_event_generator
+    async def test_generator_sends_latest_frame(self):
+        """When a snapshot exists, the first yield is its pre-encoded frame."""
+        import services.widgets.quotes_hub as hub
+        from api.routes.widgets_stream import _event_generator
 
         snapshot_json = '{"quotes": [{"symbol": "BTC", "price": 50000}]}'
         mock_request = MagicMock()
-        # Disconnect after first event
-        mock_request.is_disconnected = MagicMock(side_effect=[False, True])
 
-        import asyncio
-
-        event = asyncio.Event()
-
-        with (
-            patch(
-                "services.widgets.quotes_hub.get_latest_snapshot",
-                return_value=snapshot_json,
-            ),
-            patch(
-                "services.widgets.quotes_hub.get_snapshot_event",
-                return_value=event,
-            ),
+        with patch.multiple(
+            hub, _latest_frame=hub.encode_snapshot_frame(snapshot_json, 1), _seq=1
         ):
-            gen = _memory_event_generator(mock_request)
+            gen = _event_generator(mock_request)
             first = await gen.__anext__()
+            await gen.aclose()
 
         assert "event: snapshot" in first
         assert snapshot_json in first
 
     @pytest.mark.asyncio
-    async def test_memory_generator_waiting_when_no_snapshot(self):
-        """When snapshot is None, sends a 'waiting' comment."""
-        from api.routes.widgets_stream import _memory_event_generator
+    async def test_generator_waiting_when_no_snapshot(self):
+        """When there is no snapshot yet, sends a 'waiting' comment."""
+        import services.widgets.quotes_hub as hub
+        from api.routes.widgets_stream import _event_generator
 
         mock_request = MagicMock()
-        mock_request.is_disconnected = MagicMock(side_effect=[False, True])
-
-        import asyncio
 
-        event = asyncio.Event()
-
-        with (
-            patch(
-                "services.widgets.quotes_hub.get_latest_snapshot",
-                return_value=None,
-            ),
-            patch(
-                "services.widgets.quotes_hub.get_snapshot_event",
-                return_value=event,
-            ),
-        ):
-            gen = _memory_event_generator(mock_request)
+        with patch.object(hub, "_latest_frame", None):
+            gen = _event_generator(mock_request)
             first = await gen.__anext__()
+            await gen.aclose()
 
         assert "waiting" in first
 
     @pytest.mark.asyncio
-    async def test_memory_generator_stops_on_disconnect(self):
-        """Generator exits when client disconnects."""
-        from api.routes.widgets_stream import _memory_event_generator
+    async def test_generator_stops_on_disconnect(self):
+        """Generator exits (and unsubscribes) when client disconnects."""
+        import services.widgets.quotes_hub as hub
+        from api.routes.widgets_stream import _event_generator
 
         mock_request = MagicMock()
 
@@ -372,37 +350,56 @@ class TestWidgetsStream:
 
         mock_request.is_disconnected = always_disconnected
 
-        import asyncio
-
-        event = asyncio.Event()
-
-        with (
-            patch(
-                "services.widgets.quotes_hub.get_latest_snapshot",
-                return_value='{"data": 1}',
-            ),
-            patch(
-                "services.widgets.quotes_hub.get_snapshot_event",
-                return_value=event,
-            ),
+        with patch.object(
+            hub, "_latest_frame", 'event: snapshot\ndata: {"data": 1}\n\n'
         ):
-            gen = _memory_event_generator(mock_request)
-            items = []
-            async for item in gen:
-                items.append(item)
+            items = [item async for item in _event_generator(mock_request)]
 
         # Should have initial snapshot, then stop
         assert len(items) == 1
+        assert hub.get_quotes_hub().subscriber_count() == 0
+
+    @pytest.mark.asyncio
+    async def test_generator_forwards_published_frames(self):
+        """Frames published by the hub reach every connected client."""
+        import services.widgets.quotes_hub as hub
+        from api.routes.widgets_stream import _event_generator
+
+        async def connected():
+            return False
 
-    def test_get_redis_returns_none_on_import_error(self):
-        """_get_redis returns None when cache module is not available."""
-        from api.routes.widgets_stream import _get_redis
+        mock_request = MagicMock()
+        mock_request.is_disconnected = connected
 
-        with patch.dict("sys.modules", {"cache": None}):
-            result = _get_redis()
-            # When module is explicitly None in sys.modules, import raises
-            # ImportError which is caught, so result should be None
-            assert result is None
+        with patch.multiple(
+            hub, _latest_snapshot=None, _latest_quotes={}, _latest_frame=None, _seq=0
+        ):
+            gens = [_event_generator(mock_request) for _ in range(3)]
+            for gen in gens:
+                await gen.__anext__()
+            assert hub.get_quotes_hub().subscriber_count() == 3
+
+            hub._deliver('[{"symbol": "BTC", "price": 1.0}]')
+            hub._deliver('[{"symbol": "BTC", "price": 2.0}]')
+            keyframes = [await gen.__anext__() for gen in gens]
+            deltas = [await gen.__anext__() for gen in gens]
+            for gen in gens:
+                await gen.aclose()
+
+        assert (
+            keyframes
+            == ['id: 1\nevent: snapshot\ndata: [{"symbol": "BTC", "price": 1.0}]\n\n']
+            * 3
+        )
+        assert (
+            deltas
+            == [
+                'id: 2\nevent: delta\ndata: {"changed":[{"price":2.0,"symbol":"BTC"}],'
+                '"removed":[]}\n\n'
+            ]
+            * 3
+        )
+        assert hub.get_quotes_hub().subscriber_count() == 0
 
     def test_route_exists_and_is_get(self):
         """Verify the router has the expected widgets quotes stream GET route."""
@@ -430,14 +427,6 @@ class TestNewsStream:
         """The first yield should be a ':connected' comment."""
         from api.routes import news_stream
 
-        mock_store = MagicMock()
-
-        # aget_latest_news is async
-        async def fake_latest(*args, **kwargs):
-            return []
-
-        mock_store.aget_latest_news = fake_latest
-
         mock_request = MagicMock()
 
         # is_disconnected is awaited, must return coroutine
@@ -446,8 +435,7 @@ class TestNewsStream:
 
         mock_request.is_disconnected = always_disconnected
 
-        with patch.object(news_stream, "get_store", return_value=mock_store):
-            resp = await news_stream.news_stream(mock_request, source=None)
+        resp = await news_stream.news_stream(mock_request, source=None)
 
         # The response is a StreamingResponse; iterate its body_iterator
         items = []
@@ -459,60 +447,92 @@ class TestNewsStream:
 
     @pytest.mark.asyncio
     async def test_emits_new_articles_event(self):
-        """When new articles appear, a data event is emitted."""
+        """Articles published to the hub are pushed, filtered by source."""
         import json
 
         from api.routes import news_stream
+        from services.news_hub import get_news_hub, publish_new_articles
 
-        call_count = 0
+        disconnect_count = 0
 
-        async def fake_latest(*args, **kwargs):
-            nonlocal call_count
-            call_count += 1
-            if call_count == 1:
-                # First poll: set baseline
-                return [{"id": "a1", "title": "Old", "source_name": "src"}]
-            # Second poll: new article appears
-            return [
+        async def fake_disconnected():
+            nonlocal disconnect_count
+            disconnect_count += 1
+            # Connected until the first event has been delivered
+            return disconnect_count > 1
+
+        mock_request = MagicMock()
+        mock_request.is_disconnected = fake_disconnected
+
+        resp = await news_stream.news_stream(mock_request, source="src")
+        body = resp.body_iterator
+
+        first = await body.__anext__()
+        assert "connected" in first
+        assert get_news_hub().subscriber_count() == 1
+
+        publish_new_articles(
+            [
                 {"id": "a2", "title": "New", "source_name": "src"},
-                {"id": "a1", "title": "Old", "source_name": "src"},
+                {"id": "b1", "title": "Other", "source_name": "other"},
             ]
+        )
+        event = await body.__anext__()
+        payload = json.loads(event.replace("data: ", "").strip())
+        assert payload["count"] == 1
+        assert payload["items"][0]["id"] == "a2"
 
-        mock_store = MagicMock()
-        mock_store.aget_latest_news = fake_latest
+        rest = [chunk async for chunk in body]
+        assert rest == []
+        assert get_news_hub().subscriber_count() == 0
+
+    @pytest.mark.asyncio
+    async def test_malformed_hub_messages_are_skipped(self):
+        """A bad hub message is dropped and the stream keeps going."""
+        import json
+
+        from api.routes import news_stream
+        from services.news_hub import get_news_hub
 
         disconnect_count = 0
 
         async def fake_disconnected():
             nonlocal disconnect_count
             disconnect_count += 1
-            # Allow 2 polls then disconnect
-            return disconnect_count > 2
+            return disconnect_count > 3
 
         mock_request = MagicMock()
         mock_request.is_disconnected = fake_disconnected
 
-        with (
-            patch.object(news_stream, "get_store", return_value=mock_store),
-            patch("api.routes.news_stream.asyncio.sleep", return_value=None),
-        ):
+        resp = await news_stream.news_stream(mock_request, source=None)
+        body = resp.body_iterator
+        assert "connected" in await body.__anext__()
+
+        hub = get_news_hub()
+        hub.publish({"id": "not-a-list"})
+        hub.publish([None, "junk", {"title": "no id"}])
+        hub.publish([{"id": "ok", "title": "Fine", "source_name": "src"}])
+        event = await body.__anext__()
+        payload = json.loads(event.replace("data: ", "").strip())
+        assert [item["id"] for item in payload["items"]] == ["ok"]
+        assert [chunk async for chunk in body] == []
+
+    @pytest.mark.asyncio
+    async def test_no_store_queries_per_client(self):
+        """The stream never touches the NewsStore."""
+        from api.routes import news_stream
+
+        async def always_disconnected():
+            return True
+
+        mock_request = MagicMock()
+        mock_request.is_disconnected = always_disconnected
+
+        with patch("api.routes.news_feed.get_store") as mock_get_store:
             resp = await news_stream.news_stream(mock_request, source=None)
+            [chunk async for chunk in resp.body_iterator]
 
-            items = []
-            async for chunk in resp.body_iterator:
-                items.append(chunk)
-
-        # Should have: ": connected\n\n" + a data event
-        raw = "".join(items)
-        assert "connected" in raw
-        assert "data:" in raw
-        # Parse the data event
-        for item in items:
-            if item.startswith("data:"):
-                payload = json.loads(item.replace("data: ", "").strip())
-                assert payload["count"] == 1
-                assert payload["items"][0]["id"] == "a2"
-                break
+        mock_get_store.assert_not_called()
 
     def test_route_exists_and_is_get(self):
         """Verify the router has the expected news stream GET route."""
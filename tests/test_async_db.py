@@ -0,0 +1,207 @@
+"""
+Tests for api/async_db.py (dedicated reader-thread query executor).
+
+Covers:
+- fetchall/fetchone through reader threads on a real SQLite file
+- bounded concurrency (max_pending) and per-query timeouts
+- interrupting a long-running SQLite statement on timeout
+- reconnect after a driver-level disconnect
+- api.db_helper routing through the executor and /health pool stats
+"""
+
+from __future__ import annotations
+
+import asyncio
+import sqlite3
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from api import async_db
+from api.async_db import (
+    AsyncDBExecutor,
+    ExecutorClosedError,
+    QueryTimeoutError,
+    sqlite_connector,
+)
+from api.db_helper import fetchall, fetchone
+
+# Recursive CTE that keeps SQLite busy until interrupted.
+_SLOW_SQL = (
+    "WITH RECURSIVE c(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM c) "
+    "SELECT COUNT(*) FROM c"
+)
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = tmp_path / "async.db"
+    conn = sqlite3.connect(str(path))
+    conn.execute("CREATE TABLE t (id INTEGER, val TEXT)")
+    conn.executemany("INSERT INTO t VALUES (?, ?)", [(i, f"v{i}") for i in range(10)])
+    conn.commit()
+    conn.close()
+    return str(path)
+
+
+@pytest.fixture
+def executor(db_path):
+    ex = AsyncDBExecutor(sqlite_connector(db_path), workers=2, query_timeout=5)
+    yield ex
+    ex.close()
+
+
+def _sleepy(seconds):
+    def _fn(conn, sql, params):
+        time.sleep(seconds)
+        return seconds
+
+    return _fn
+
+
+class TestExecutorQueries:
+    @pytest.mark.asyncio
+    async def test_fetchall_and_fetchone(self, executor):
+        rows = await executor.run(fetchall, "SELECT * FROM t WHERE id < ?", (3,))
+        assert [r["id"] for r in rows] == [0, 1, 2]
+        row = await executor.run(fetchone, "SELECT val FROM t WHERE id = ?", (7,))
+        assert row == {"val": "v7"}
+
+    @pytest.mark.asyncio
+    async def test_runs_on_dedicated_threads(self, executor):
+        names = await asyncio.gather(
+            *[
+                executor.run(lambda c, s, p: threading.current_thread().name, "")
+                for _ in range(8)
+            ]
+        )
+        assert all(n.startswith("db-reader-") for n in names)
+        # One connection per reader thread, reused across queries.
+        assert executor.get_stats()["connects"] <= 2
+
+    @pytest.mark.asyncio
+    async def test_errors_propagate(self, executor):
+        with pytest.raises(sqlite3.OperationalError):
+            await executor.run(fetchall, "SELECT * FROM missing_table")
+        assert executor.get_stats()["failed"] == 1
+        # The reader survives and keeps serving.
+        assert await executor.run(fetchone, "SELECT 1 AS one") == {"one": 1}
+
+    @pytest.mark.asyncio
+    async def test_closed_executor_rejects(self, db_path):
+        ex = AsyncDBExecutor(sqlite_connector(db_path), workers=1)
+        ex.close()
+        with pytest.raises(ExecutorClosedError):
+            await ex.run(fetchone, "SELECT 1")
+
+
+class TestBoundsAndTimeouts:
+    @pytest.mark.asyncio
+    async def test_max_pending_bounds_in_flight(self, db_path):
+        ex = AsyncDBExecutor(sqlite_connector(db_path), workers=1, max_pending=1)
+        try:
+            await asyncio.gather(*[ex.run(_sleepy(0.02), "") for _ in range(4)])
+            stats = ex.get_stats()
+            assert stats["peak_in_flight"] == 1
+            assert stats["completed"] == 4
+        finally:
+            ex.close()
+
+    @pytest.mark.asyncio
+    async def test_query_timeout(self, executor):
+        with pytest.raises(QueryTimeoutError):
+            await executor.run(_sleepy(0.5), "", timeout=0.05)
+        assert executor.get_stats()["timeouts"] == 1
+
+    @pytest.mark.asyncio
+    async def test_timeout_interrupts_sqlite_statement(self, db_path):
+        ex = AsyncDBExecutor(sqlite_connector(db_path), workers=1)
+        try:
+            start = time.monotonic()
+            with pytest.raises(QueryTimeoutError):
+                await ex.run(fetchone, _SLOW_SQL, timeout=0.1)
+            # The single reader was freed by interrupt() and serves the next query.
+            row = await ex.run(fetchone, "SELECT COUNT(*) AS n FROM t", timeout=2)
+            assert row == {"n": 10}
+            assert time.monotonic() - start < 2
+        finally:
+            ex.close()
+
+    @pytest.mark.asyncio
+    async def test_slot_wait_counts_toward_timeout(self, db_path):
+        ex = AsyncDBExecutor(sqlite_connector(db_path), workers=1, max_pending=1)
+        try:
+            slow = asyncio.ensure_future(ex.run(_sleepy(0.3), ""))
+            await asyncio.sleep(0.01)
+            with pytest.raises(QueryTimeoutError):
+                await ex.run(fetchone, "SELECT 1", timeout=0.05)
+            assert await slow == 0.3
+        finally:
+            ex.close()
+
+
+class TestReconnect:
+    @pytest.mark.asyncio
+    async def test_reconnects_after_disconnect(self):
+        import psycopg2
+
+        conns = []
+
+        def connect():
+            conn = MagicMock()
+            conns.append(conn)
+            return conn
+
+        calls = {"n": 0}
+
+        def flaky(conn, sql, params):
+            calls["n"] += 1
+            if calls["n"] == 1:
+                raise psycopg2.OperationalError("server closed the connection")
+            return "ok"
+
+        ex = AsyncDBExecutor(connect, workers=1)
+        try:
+            with pytest.raises(psycopg2.OperationalError):
+                await ex.run(flaky, "SELECT 1")
+            assert await ex.run(flaky, "SELECT 1") == "ok"
+            assert len(conns) == 2
+            conns[0].close.assert_called_once()
+        finally:
+            ex.close()
+
+
+class TestDbHelperIntegration:
+    @pytest.fixture
+    def installed(self, db_path):
+        ex = async_db.init_executor(sqlite_connector(db_path), workers=1)
+        yield ex
+        async_db.close_executor()
+
+    @pytest.mark.asyncio
+    async def test_afetch_routes_through_executor(self, installed):
+        import api.db_helper as db_helper
+
+        with patch.object(db_helper, "_sync_fetchall") as sync_all:
+            rows = await db_helper.afetchall("SELECT id FROM t WHERE id = ?", (4,))
+        sync_all.assert_not_called()
+        assert rows == [{"id": 4}]
+        assert await db_helper.afetchone("SELECT val FROM t WHERE id = 1") == {
+            "val": "v1"
+        }
+        assert installed.get_stats()["completed"] == 2
+
+    def test_health_pool_stats_include_executor(self, installed):
+        from services.health_service import get_pool_stats
+
+        stats = get_pool_stats()
+        assert stats["async_executor"]["workers"] == 1
+        assert "timeouts" in stats["async_executor"]
+
+    def test_health_pool_stats_without_executor(self):
+        from services.health_service import get_pool_stats
+
+        async_db.close_executor()
+        assert "async_executor" not in get_pool_stats()
@@ -4,6 +4,8 @@ Covers: cost_controller, rate_limiter, rate_limit_config, rate_limit_middleware,
         models, register, and __init__ exports.
 """
 
+import asyncio
+import json
 import sys
 import time
 from pathlib import Path
@@ -199,6 +201,79 @@ class TestRateLimiterInMemory:
         assert result.allowed is True
 
 
+# ---------------------------------------------------------------------------
+# RateLimiter (Redis mode, GCRA script on fakeredis)
+# ---------------------------------------------------------------------------
+
+
+@pytest.fixture
+def redis_limiter():
+    """Build RateLimiters whose Redis clients share one in-process server."""
+    fakeredis = pytest.importorskip("fakeredis")
+    pytest.importorskip("lupa")  # fakeredis runs EVALSHA through lupa
+    server = fakeredis.FakeServer()
+    limiters = []
+
+    def make(**kwargs):
+        with (
+            patch(
+                "redis.Redis.from_url",
+                return_value=fakeredis.FakeRedis(server=server),
+            ),
+            patch(
+                "redis.asyncio.Redis.from_url",
+                return_value=fakeredis.FakeAsyncRedis(
+                    server=server, decode_responses=True
+                ),
+            ),
+        ):
+            limiter = RateLimiter(redis_url="redis://localhost:6379/1", **kwargs)
+        assert limiter.is_redis_available
+        limiters.append(limiter)
+        return limiter
+
+    yield make
+    for limiter in limiters:
+        limiter.close()
+
+
+class TestRateLimiterGcraRedis:
+    """The GCRA Lua script itself, run by fakeredis."""
+
+    @pytest.mark.asyncio
+    async def test_allows_exactly_limit_then_denies(self, redis_limiter):
+        limiter = redis_limiter(lease_fraction=0)
+        results = [await limiter.acheck("ip:1", limit=5, window=60) for _ in range(6)]
+
+        assert [r.allowed for r in results] == [True] * 5 + [False]
+        assert [r.remaining for r in results[:5]] == [4, 3, 2, 1, 0]
+        # One request frees up every window / limit = 12s
+        assert results[5].reset_after == 12
+
+    @pytest.mark.asyncio
+    async def test_denied_key_recovers_after_retry_after(self, redis_limiter):
+        limiter = redis_limiter(lease_fraction=0)
+        for _ in range(2):
+            await limiter.acheck("ip:2", limit=2, window=1)
+        denied = await limiter.acheck("ip:2", limit=2, window=1)
+        assert denied.allowed is False
+        assert denied.reset_after == 1
+
+        await asyncio.sleep(0.55)
+        assert (await limiter.acheck("ip:2", limit=2, window=1)).allowed is True
+
+    @pytest.mark.asyncio
+    async def test_leased_requests_are_debited_on_flush(self, redis_limiter):
+        leasing = redis_limiter(lease_fraction=0.5, flush_interval=60)
+        results = [await leasing.acheck("ip:3", limit=20, window=60) for _ in range(30)]
+        assert sum(r.allowed for r in results) == 20
+
+        await leasing.flush()
+        # Another worker sharing the Redis db sees the whole allowance spent
+        other = redis_limiter(lease_fraction=0)
+        assert (await other.acheck("ip:3", limit=20, window=60)).allowed is False
+
+
 # ---------------------------------------------------------------------------
 # CostController (in-memory mode)
 # ---------------------------------------------------------------------------
@@ -416,6 +491,19 @@ class TestRateLimitConfig:
         assert path_limits["/api/v1/query"] == (50, 3600)
         assert path_limits["/api/auth"] == (20, 60)
 
+    def test_redis_url_follows_the_shared_server_on_db_1(self, monkeypatch):
+        monkeypatch.delenv("RATELIMIT_REDIS_URL", raising=False)
+        cfg = RateLimitConfig(_env_file=None)
+        assert (
+            cfg.resolve_redis_url("redis://:secret@cache.internal:6380/0")
+            == "redis://:secret@cache.internal:6380/1"
+        )
+        assert cfg.resolve_redis_url(None) == "redis://localhost:6379/1"
+
+    def test_explicit_redis_url_wins(self):
+        cfg = RateLimitConfig(_env_file=None, redis_url="redis://limits:6379/3")
+        assert cfg.resolve_redis_url("redis://cache:6379/0") == "redis://limits:6379/3"
+
     def test_log_config_does_not_raise(self):
         cfg = RateLimitConfig(_env_file=None)
         cfg.log_config()  # Should not raise
@@ -427,24 +515,26 @@ class TestRateLimitConfig:
 
 
 class TestRateLimitMiddleware:
-    """Tests for the FastAPI RateLimitMiddleware."""
+    """Tests for the pure-ASGI RateLimitMiddleware."""
 
-    def _make_request(self, path="/api/v1/test", client_host="127.0.0.1", auth=None):
-        request = MagicMock()
-        request.url.path = path
-        request.client.host = client_host
-        request.headers = {}
+    def _make_scope(self, path="/api/v1/test", client_host="127.0.0.1", auth=None):
+        headers = []
         if auth:
-            request.headers["authorization"] = auth
-        request.state = MagicMock(spec=[])
-        return request
+            headers.append((b"authorization", auth.encode()))
+        return {
+            "type": "http",
+            "method": "GET",
+            "path": path,
+            "headers": headers,
+            "client": (client_host, 12345) if client_host else None,
+        }
 
     def _make_middleware(self, limiter=None, path_limits=None, skip_paths=None):
         if limiter is None:
             limiter = RateLimiter()
-        app = MagicMock()
+        self.app = AsyncMock()
         mw = RateLimitMiddleware(
-            app,
+            self.app,
             limiter=limiter,
             default_limit=5,
             default_window=60,
@@ -453,6 +543,16 @@ class TestRateLimitMiddleware:
         )
         return mw
 
+    async def _call(self, mw, scope):
+        """Run one request through ``mw``; return the sent ASGI messages."""
+        sent = []
+
+        async def send(message):
+            sent.append(message)
+
+        await mw(scope, AsyncMock(), send)
+        return sent
+
     def test_skip_health_path(self):
         mw = self._make_middleware()
         assert "/health" in mw.skip_paths
@@ -485,77 +585,95 @@ class TestRateLimitMiddleware:
 
     def test_extract_identifier_from_ip(self):
         mw = self._make_middleware()
-        request = self._make_request(client_host="10.0.0.1")
-        ident = mw._extract_identifier(request)
+        ident = mw._extract_identifier(self._make_scope(client_host="10.0.0.1"))
         assert ident == "ip:10.0.0.1"
 
     def test_extract_identifier_no_client(self):
         mw = self._make_middleware()
-        request = self._make_request()
-        request.client = None
-        ident = mw._extract_identifier(request)
+        ident = mw._extract_identifier(self._make_scope(client_host=None))
         assert ident == "ip:unknown"
 
     def test_extract_identifier_invalid_bearer(self):
         mw = self._make_middleware()
-        request = self._make_request(auth="Bearer invalid-token")
-        ident = mw._extract_identifier(request)
+        ident = mw._extract_identifier(self._make_scope(auth="Bearer invalid-token"))
         # Falls back to IP since token decode will fail
         assert ident.startswith("ip:")
 
+    def test_not_base_http_middleware(self):
+        from starlette.middleware.base import BaseHTTPMiddleware
+
+        assert not issubclass(RateLimitMiddleware, BaseHTTPMiddleware)
+
     @pytest.mark.asyncio
-    async def test_dispatch_skip_path(self):
+    async def test_non_http_scope_passes_through(self):
         mw = self._make_middleware()
-        request = self._make_request(path="/health")
-        call_next = AsyncMock()
-        call_next.return_value = MagicMock()
-        await mw.dispatch(request, call_next)
-        call_next.assert_awaited_once_with(request)
+        scope = {"type": "lifespan"}
+        await mw(scope, None, None)
+        self.app.assert_awaited_once_with(scope, None, None)
+
+    @pytest.mark.asyncio
+    async def test_skip_path_passes_through(self):
+        limiter = MagicMock(spec=RateLimiter)
+        mw = self._make_middleware(limiter=limiter)
+        await self._call(mw, self._make_scope(path="/health"))
+        self.app.assert_awaited_once()
+        limiter.acheck.assert_not_called()
 
     @pytest.mark.asyncio
-    async def test_dispatch_allowed_sets_headers(self):
+    async def test_allowed_sets_headers(self):
         mw = self._make_middleware()
-        request = self._make_request()
 
-        response = MagicMock()
-        response.headers = {}
-        call_next = AsyncMock(return_value=response)
+        async def downstream(scope, receive, send):
+            await send({"type": "http.response.start", "status": 200, "headers": []})
+            await send({"type": "http.response.body", "body": b"ok"})
 
-        result = await mw.dispatch(request, call_next)
-        assert "X-RateLimit-Limit" in result.headers
-        assert "X-RateLimit-Remaining" in result.headers
+        self.app.side_effect = downstream
+        sent = await self._call(mw, self._make_scope())
+        headers = dict(sent[0]["headers"])
+        assert headers[b"x-ratelimit-limit"] == b"5"
+        assert headers[b"x-ratelimit-remaining"] == b"4"
+        assert b"x-ratelimit-reset" in headers
 
     @pytest.mark.asyncio
-    async def test_dispatch_returns_429_when_exceeded(self):
-        limiter = RateLimiter()
-        mw = self._make_middleware(limiter=limiter)
+    async def test_returns_429_when_exceeded(self):
+        mw = self._make_middleware()
 
         for _ in range(5):
-            request = self._make_request(client_host="1.2.3.4")
-            call_next = AsyncMock(return_value=MagicMock(headers={}))
-            await mw.dispatch(request, call_next)
+            await self._call(mw, self._make_scope(client_host="1.2.3.4"))
+        self.app.reset_mock()
 
         # 6th request should be denied
-        request = self._make_request(client_host="1.2.3.4")
-        call_next = AsyncMock()
-        response = await mw.dispatch(request, call_next)
-        assert response.status_code == 429
-        call_next.assert_not_awaited()
+        sent = await self._call(mw, self._make_scope(client_host="1.2.3.4"))
+        assert sent[0]["status"] == 429
+        assert any(k == b"retry-after" for k, _ in sent[0]["headers"])
+        body = json.loads(sent[1]["body"])
+        assert body["error"]["message"] == "Too many requests. Please try again later."
+        self.app.assert_not_awaited()
 
     @pytest.mark.asyncio
-    async def test_dispatch_path_specific_limits(self):
-        path_limits = {"/api/auth": (2, 60)}
-        limiter = RateLimiter()
-        mw = self._make_middleware(limiter=limiter, path_limits=path_limits)
+    async def test_path_specific_limits(self):
+        mw = self._make_middleware(path_limits={"/api/auth": (2, 60)})
 
         for _ in range(2):
-            req = self._make_request(path="/api/auth/login", client_host="5.5.5.5")
-            await mw.dispatch(req, AsyncMock(return_value=MagicMock(headers={})))
+            await self._call(
+                mw, self._make_scope(path="/api/auth/login", client_host="5.5.5.5")
+            )
 
         # 3rd request to /api/auth should be denied
-        req = self._make_request(path="/api/auth/login", client_host="5.5.5.5")
-        resp = await mw.dispatch(req, AsyncMock())
-        assert resp.status_code == 429
+        sent = await self._call(
+            mw, self._make_scope(path="/api/auth/login", client_host="5.5.5.5")
+        )
+        assert sent[0]["status"] == 429
+
+    @pytest.mark.asyncio
+    async def test_request_id_from_scope_state(self):
+        mw = self._make_middleware(path_limits={"/x": (1, 60)})
+        scope = self._make_scope(path="/x")
+        scope["state"] = {"request_id": "req-1"}
+        await self._call(mw, scope)
+        sent = await self._call(mw, dict(scope))
+        body = b"".join(m.get("body", b"") for m in sent[1:])
+        assert b'"request_id":"req-1"' in body
 
 
 # ---------------------------------------------------------------------------
@@ -800,6 +800,9 @@ class TestListEntities:
 
     @pytest.fixture(autouse=True)
     def _setup(self):
+        from api.pagination import clear_total_cache
+
+        clear_total_cache()
         self.app = _entities_app()
         self.client = TestClient(self.app)
 
@@ -926,6 +929,86 @@ class TestListEntities:
         assert 10 in params_used
         assert 20 in params_used
 
+    def test_next_cursor_on_full_page(self):
+        rows = [
+            self._sample_row(),
+            self._sample_row(ticker="9999.SR", market_cap=None),
+        ]
+        with (
+            patch(
+                "api.routes.sqlite_entities.afetchone",
+                new_callable=AsyncMock,
+                return_value={"cnt": 5},
+            ),
+            patch(
+                "api.routes.sqlite_entities.afetchall",
+                new_callable=AsyncMock,
+                return_value=rows,
+            ),
+        ):
+            resp = self.client.get("/api/entities?limit=2")
+
+        cursor = resp.json()["next_cursor"]
+        assert cursor
+        from api.pagination import decode_cursor
+
+        assert decode_cursor(cursor, 2)["k"] == [-1, "9999.SR"]
+
+    def test_cursor_uses_keyset_predicate(self):
+        from api.pagination import encode_cursor
+
+        cursor = encode_cursor([3e11, "1010.SR"])
+        with (
+            patch(
+                "api.routes.sqlite_entities.afetchone",
+                new_callable=AsyncMock,
+                return_value={"cnt": 5},
+            ) as mock_count,
+            patch(
+                "api.routes.sqlite_entities.afetchall",
+                new_callable=AsyncMock,
+                return_value=[self._sample_row()],
+            ) as mock_fetch,
+        ):
+            resp = self.client.get(f"/api/entities?limit=2&offset=40&cursor={cursor}")
+
+        assert resp.status_code == 200
+        assert resp.json()["next_cursor"] is None
+        sql_used, params_used = mock_fetch.call_args[0]
+        assert "c.ticker > ?" in sql_used
+        assert params_used[-5:] == [3e11, 3e11, "1010.SR", 2, 0]
+        assert "c.ticker >" not in mock_count.call_args[0][0]
+
+    def test_total_cached_per_filter(self):
+        with (
+            patch(
+                "api.routes.sqlite_entities.afetchone",
+                new_callable=AsyncMock,
+                return_value={"cnt": 7},
+            ) as mock_count,
+            patch(
+                "api.routes.sqlite_entities.afetchall",
+                new_callable=AsyncMock,
+                return_value=[],
+            ),
+        ):
+            self.client.get("/api/entities?sector=Energy")
+            self.client.get("/api/entities?sector=Energy&offset=50")
+            self.client.get("/api/entities?sector=Banks")
+
+        assert mock_count.await_count == 2
+
+    def test_invalid_cursor_returns_400(self):
+        resp = self.client.get("/api/entities?cursor=%%%")
+        assert resp.status_code == 400
+
+    @pytest.mark.parametrize("key", [[True, "1010.SR"], [[1], "1010.SR"], [None, {}]])
+    def test_cursor_with_invalid_key_types_returns_400(self, key):
+        from api.pagination import encode_cursor
+
+        resp = self.client.get(f"/api/entities?cursor={encode_cursor(key)}")
+        assert resp.status_code == 400
+
     def test_limit_max_500(self):
         resp = self.client.get("/api/entities?limit=501")
         assert resp.status_code == 422
@@ -30,7 +30,7 @@ def reset_pool():
 class TestInitPool:
     """Tests for pool initialization."""
 
-    @patch("database.pool.ThreadedConnectionPool")
+    @patch("database.pool.FairConnectionPool")
     def test_init_pool_creates_pool(self, mock_pool_cls):
         from database.pool import init_pool, is_pool_initialized
 
@@ -46,6 +46,9 @@ class TestInitPool:
         mock_pool_cls.assert_called_once_with(
             minconn=1,
             maxconn=5,
+            acquire_timeout=30.0,
+            pre_ping=True,
+            recycle_seconds=1800.0,
             host="localhost",
             port=5432,
             dbname="testdb",
@@ -54,7 +57,7 @@ class TestInitPool:
         )
         assert is_pool_initialized() is True
 
-    @patch("database.pool.ThreadedConnectionPool")
+    @patch("database.pool.FairConnectionPool")
     def test_init_pool_skips_if_already_initialized(self, mock_pool_cls):
         from database.pool import init_pool
 
@@ -72,7 +75,7 @@ class TestInitPool:
 
         assert mock_pool_cls.call_count == 1
 
-    @patch("database.pool.ThreadedConnectionPool")
+    @patch("database.pool.FairConnectionPool")
     def test_init_pool_failure_leaves_pool_none(self, mock_pool_cls):
         import psycopg2
         from database.pool import init_pool, is_pool_initialized
@@ -101,7 +104,7 @@ class TestGetConnection:
             with get_connection():
                 pass
 
-    @patch("database.pool.ThreadedConnectionPool")
+    @patch("database.pool.FairConnectionPool")
     def test_get_connection_returns_and_commits(self, mock_pool_cls):
         from database.pool import init_pool, get_connection
 
@@ -124,12 +127,12 @@ class TestGetConnection:
 
         # Verify commit was called on clean exit
         mock_conn.commit.assert_called_once()
-        # Verify connection was returned to pool (with unique key)
+        # Verify connection was returned to pool
         mock_pool_instance.putconn.assert_called_once()
         call_args = mock_pool_instance.putconn.call_args
         assert call_args[0][0] is mock_conn
 
-    @patch("database.pool.ThreadedConnectionPool")
+    @patch("database.pool.FairConnectionPool")
     def test_get_connection_rollback_on_exception(self, mock_pool_cls):
         from database.pool import init_pool, get_connection
 
@@ -154,7 +157,7 @@ class TestGetConnection:
         # Verify rollback was called (not commit)
         mock_conn.rollback.assert_called_once()
         mock_conn.commit.assert_not_called()
-        # Connection should still be returned to pool (with unique key)
+        # Connection should still be returned to pool
         mock_pool_instance.putconn.assert_called_once()
         call_args = mock_pool_instance.putconn.call_args
         assert call_args[0][0] is mock_conn
@@ -169,7 +172,7 @@ class TestGetPoolConnection:
         with pytest.raises(RuntimeError, match="not initialized"):
             get_pool_connection()
 
-    @patch("database.pool.ThreadedConnectionPool")
+    @patch("database.pool.FairConnectionPool")
     def test_get_pool_connection_wraps_close(self, mock_pool_cls):
         from database.pool import init_pool, get_pool_connection
 
@@ -192,7 +195,7 @@ class TestGetPoolConnection:
         # close() on wrapper should return to pool
         conn.close()
 
-        # Should return to pool instead of truly closing (with unique key)
+        # Should return to pool instead of truly closing
         mock_pool_instance.putconn.assert_called_once()
         call_args = mock_pool_instance.putconn.call_args
         assert call_args[0][0] is mock_conn
@@ -201,7 +204,7 @@ class TestGetPoolConnection:
 class TestClosePool:
     """Tests for close_pool."""
 
-    @patch("database.pool.ThreadedConnectionPool")
+    @patch("database.pool.FairConnectionPool")
     def test_close_pool(self, mock_pool_cls):
         from database.pool import init_pool, close_pool, is_pool_initialized
 
@@ -229,7 +232,7 @@ class TestClosePool:
         close_pool()
         assert is_pool_initialized() is False
 
-    @patch("database.pool.ThreadedConnectionPool")
+    @patch("database.pool.FairConnectionPool")
     def test_close_pool_handles_exception(self, mock_pool_cls):
         from database.pool import init_pool, close_pool, is_pool_initialized
 
@@ -250,12 +253,192 @@ class TestClosePool:
         assert is_pool_initialized() is False
 
 
+# ===========================================================================
+# FairConnectionPool tests (blocking, FIFO, validated checkouts)
+# ===========================================================================
+
+import threading  # noqa: E402
+import time  # noqa: E402
+
+
+def _fake_conn():
+    conn = MagicMock()
+    conn.closed = 0
+    conn.get_transaction_status.return_value = 0  # TRANSACTION_STATUS_IDLE
+    return conn
+
+
+@pytest.fixture
+def fake_connect():
+    with patch(
+        "database.pool.psycopg2.connect", side_effect=lambda **_: _fake_conn()
+    ) as m:
+        yield m
+
+
+class TestFairConnectionPool:
+    def test_opens_min_connections_up_front(self, fake_connect):
+        from database.pool import FairConnectionPool
+
+        pool = FairConnectionPool(2, 4, host="h")
+        assert fake_connect.call_count == 2
+        stats = pool.get_stats()
+        assert stats["open"] == 2 and stats["idle"] == 2 and stats["in_use"] == 0
+
+    def test_grows_to_max_then_times_out(self, fake_connect):
+        from database.pool import FairConnectionPool, PoolTimeout
+
+        pool = FairConnectionPool(0, 2, acquire_timeout=0.05)
+        pool.getconn()
+        pool.getconn()
+        with pytest.raises(PoolTimeout):
+            pool.getconn()
+        stats = pool.get_stats()
+        assert stats["in_use"] == 2
+        assert stats["timeouts"] == 1
+        assert stats["waiting"] == 0
+
+    def test_waiter_receives_released_connection(self, fake_connect):
+        from database.pool import FairConnectionPool
+
+        pool = FairConnectionPool(0, 1, acquire_timeout=2, pre_ping=False)
+        conn = pool.getconn()
+        got = []
+        t = threading.Thread(target=lambda: got.append(pool.getconn()))
+        t.start()
+        time.sleep(0.05)
+        assert pool.get_stats()["waiting"] == 1
+        pool.putconn(conn)
+        t.join(2)
+        assert got == [conn]
+        assert pool.get_stats()["max_wait_ms"] >= 40
+
+    def test_waiters_served_in_fifo_order(self, fake_connect):
+        from database.pool import FairConnectionPool
+
+        pool = FairConnectionPool(0, 1, acquire_timeout=5, pre_ping=False)
+        held = pool.getconn()
+        order = []
+
+        def worker(i):
+            conn = pool.getconn()
+            order.append(i)
+            time.sleep(0.01)
+            pool.putconn(conn)
+
+        threads = []
+        for i in range(5):
+            t = threading.Thread(target=worker, args=(i,))
+            t.start()
+            threads.append(t)
+            time.sleep(0.02)  # enqueue in a known order
+        pool.putconn(held)
+        for t in threads:
+            t.join(5)
+        assert order == [0, 1, 2, 3, 4]
+
+    def test_pre_ping_replaces_dead_connection(self, fake_connect):
+        from database.pool import FairConnectionPool
+
+        pool = FairConnectionPool(1, 1, pre_ping=True)
+        dead = pool._idle[0]
+        dead.cursor.return_value.__enter__.return_value.execute.side_effect = Exception(
+            "server closed the connection"
+        )
+        conn = pool.getconn()
+        assert conn is not dead
+        dead.close.assert_called_once()
+        assert pool.get_stats()["ping_failures"] == 1
+
+    def test_recycles_old_connections(self, fake_connect):
+        from database.pool import FairConnectionPool
+
+        pool = FairConnectionPool(1, 1, pre_ping=False, recycle_seconds=60)
+        old = pool._idle[0]
+        pool._born[id(old)] -= 120
+        assert pool.getconn() is not old
+        assert pool.get_stats()["recycled"] == 1
+
+    def test_broken_connection_frees_its_slot(self, fake_connect):
+        from database.pool import FairConnectionPool
+
+        pool = FairConnectionPool(0, 1, acquire_timeout=0.05, pre_ping=False)
+        conn = pool.getconn()
+        conn.closed = 1
+        pool.putconn(conn)
+        stats = pool.get_stats()
+        assert stats["open"] == 0 and stats["in_use"] == 0
+        assert pool.getconn() is not conn
+
+    def test_putconn_rolls_back_open_transaction(self, fake_connect):
+        from database.pool import FairConnectionPool
+
+        pool = FairConnectionPool(0, 1, pre_ping=False)
+        conn = pool.getconn()
+        conn.get_transaction_status.return_value = 2  # INTRANS
+        pool.putconn(conn)
+        conn.rollback.assert_called_once()
+        assert pool.get_stats()["idle"] == 1
+
+    def test_closeall_wakes_waiters(self, fake_connect):
+        from psycopg2.pool import PoolError
+
+        from database.pool import FairConnectionPool
+
+        pool = FairConnectionPool(0, 1, acquire_timeout=5)
+        pool.getconn()
+        errors = []
+
+        def wait():
+            try:
+                pool.getconn()
+            except PoolError as exc:
+                errors.append(exc)
+
+        t = threading.Thread(target=wait)
+        t.start()
+        time.sleep(0.05)
+        pool.closeall()
+        t.join(2)
+        assert len(errors) == 1
+
+    def test_health_pool_stats_include_saturation(self, fake_connect):
+        import database.pool as pool_mod
+        from services.health_service import get_pool_stats
+
+        pool_mod._pool = pool_mod.FairConnectionPool(1, 3, pre_ping=False)
+        pool_mod._pool.getconn()
+        mock_settings = MagicMock()
+        mock_settings.db.backend = "postgres"
+        with patch("services.health_service.get_settings", return_value=mock_settings):
+            stats = get_pool_stats()
+        assert stats["backend"] == "postgres"
+        assert stats["max"] == 3
+        assert stats["in_use"] == 1
+        assert {"waiting", "timeouts", "avg_wait_ms", "wait_histogram_ms"} <= set(stats)
+
+    def test_metrics_wait_sum_is_not_rounded(self, fake_connect):
+        pytest.importorskip("prometheus_client")
+        import database.pool as pool_mod
+
+        pool = pool_mod.FairConnectionPool(0, 1, pre_ping=False)
+        for _ in range(3):
+            pool._record_wait(0.0004)  # avg_wait_ms rounds these to 0.0
+        with patch.object(pool_mod, "_pool", pool):
+            families = list(pool_mod._PoolCollector().collect())
+
+        histogram = next(
+            f for f in families if f.name == "pg_pool_acquire_wait_seconds"
+        )
+        (total,) = [s.value for s in histogram.samples if s.name.endswith("_sum")]
+        assert total == pytest.approx(0.0012 / 1000)
+
+
 # ===========================================================================
 # SQLitePool tests (services/sqlite_pool.py)
 # ===========================================================================
 
 import sqlite3  # noqa: E402
-import threading  # noqa: E402
 
 from services.sqlite_pool import SQLitePool, init_pool as sqlite_init_pool, get_pool  # noqa: E402
 
@@ -396,6 +579,85 @@ class TestSQLitePoolDataPersistence:
         pool.release(conn2)
 
 
+class TestSQLitePoolReadOnly:
+    """Test the read-optimized pool mode."""
+
+    @pytest.fixture
+    def db_path(self, tmp_path):
+        path = str(tmp_path / "test.db")
+        conn = sqlite3.connect(path)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("CREATE TABLE t (id INTEGER)")
+        conn.execute("INSERT INTO t VALUES (1)")
+        conn.commit()
+        conn.close()
+        return path
+
+    def test_rejects_writes(self, db_path):
+        pool = SQLitePool(db_path, pool_size=1, read_only=True)
+        with pool.connection() as conn:
+            assert conn.execute("SELECT id FROM t").fetchone()["id"] == 1
+            assert conn.execute("PRAGMA query_only").fetchone()[0] == 1
+            with pytest.raises(sqlite3.OperationalError):
+                conn.execute("INSERT INTO t VALUES (2)")
+
+    def test_applies_mmap_and_cache_pragmas(self, db_path):
+        pool = SQLitePool(
+            db_path,
+            pool_size=1,
+            read_only=True,
+            mmap_size=1 << 20,
+            cache_size_kib=4096,
+        )
+        with pool.connection() as conn:
+            assert conn.execute("PRAGMA mmap_size").fetchone()[0] == 1 << 20
+            assert conn.execute("PRAGMA cache_size").fetchone()[0] == -4096
+
+    def test_falls_back_when_read_only_open_fails(self, tmp_path):
+        # A missing file cannot be opened with mode=ro; query_only still applies.
+        pool = SQLitePool(str(tmp_path / "new.db"), pool_size=1, read_only=True)
+        with pool.connection() as conn:
+            assert conn.execute("PRAGMA query_only").fetchone()[0] == 1
+
+    def test_autoscaled_pool_size(self, db_path):
+        from services.sqlite_pool import default_pool_size
+
+        pool = SQLitePool(db_path, pool_size=None, read_only=True)
+        assert pool.pool_size == default_pool_size()
+        assert pool._pool.qsize() == default_pool_size()
+
+    def test_wait_histogram_and_timeouts(self, db_path):
+        pool = SQLitePool(db_path, pool_size=1, read_only=True)
+        conn = pool.acquire()
+        with pytest.raises(RuntimeError, match="pool exhausted"):
+            pool.acquire(timeout=0.05)
+        assert pool.get_stats()["in_use"] == 1
+        pool.release(conn)
+
+        stats = pool.get_stats()
+        assert stats["acquires"] == 1
+        assert stats["timeouts"] == 1
+        assert stats["in_use"] == 0
+        assert stats["peak_in_use"] == 1
+        assert sum(stats["wait_histogram_ms"].values()) == 1
+
+    def test_health_pool_stats_include_histogram(self, db_path):
+        import services.sqlite_pool as mod
+        from services.health_service import get_pool_stats
+
+        original = mod._pool
+        mod._pool = SQLitePool(db_path, pool_size=2, read_only=True)
+        try:
+            with patch("services.health_service.get_settings") as mock_settings:
+                mock_settings.return_value.db.backend = "sqlite"
+                stats = get_pool_stats()
+        finally:
+            mod._pool = original
+        assert stats["backend"] == "sqlite"
+        assert stats["pool_size"] == 2
+        assert "wait_histogram_ms" in stats
+
+
 # ---------------------------------------------------------------------------
 # Module-level init_pool / get_pool
 # ---------------------------------------------------------------------------
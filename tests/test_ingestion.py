@@ -642,6 +642,9 @@ class TestIngestionConfig:
         assert config.rate_limit_seconds == 2.0
         assert config.max_retries == 3
         assert config.backoff_factor == 2.0
+        assert config.max_workers == 1
+        assert config.requests_per_second == 5.0
+        assert config.xbrl_workers == 1
 
     def test_custom_config(self):
         from ingestion.config import IngestionConfig
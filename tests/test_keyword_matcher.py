@@ -0,0 +1,141 @@
+"""
+Keyword Matcher Tests
+=====================
+Tests for services/keyword_matcher.py, run against both the pyahocorasick
+backend (when installed) and the pure-Python automaton.
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from services import keyword_matcher
+from services.keyword_matcher import KeywordMatcher
+
+BACKENDS = [
+    pytest.param(False, id="python"),
+    pytest.param(
+        True,
+        id="native",
+        marks=pytest.mark.skipif(
+            keyword_matcher.ahocorasick is None, reason="pyahocorasick not installed"
+        ),
+    ),
+]
+
+
+@pytest.fixture(params=BACKENDS)
+def native(request):
+    return request.param
+
+
+def _matcher(native, *entries):
+    matcher = KeywordMatcher(native=native)
+    for entry in entries:
+        matcher.add(*entry)
+    return matcher
+
+
+class TestKeywordMatcher:
+    def test_finds_all_keywords_in_add_order(self, native):
+        matcher = _matcher(native, ("نمو", "a"), ("أرباح", "b"), ("خسائر", "c"))
+        assert matcher.find("أرباح قوية و نمو") == ["a", "b"]
+
+    def test_substring_semantics(self, native):
+        matcher = _matcher(native, ("ارتفاع", "up"))
+        assert matcher.find("والارتفاع") == ["up"]
+
+    def test_overlapping_and_nested_keywords(self, native):
+        matcher = _matcher(
+            native,
+            ("أرباح", "profit"),
+            ("أرباح نقدية", "dividend"),
+            ("نقدية", "cash"),
+        )
+        assert matcher.find("توزيع أرباح نقدية") == ["profit", "dividend", "cash"]
+
+    def test_suffix_keyword_via_failure_link(self, native):
+        matcher = _matcher(native, ("abcd", 1), ("bc", 2), ("c", 3))
+        assert matcher.find("xabcx") == [2, 3]
+
+    def test_case_sensitive_by_default(self, native):
+        matcher = _matcher(native, ("stc", "7010"))
+        assert matcher.find("STC results") == []
+        assert matcher.find("stc results") == ["7010"]
+
+    def test_ignore_case(self, native):
+        matcher = KeywordMatcher(native=native)
+        matcher.add("IPO", "high", ignore_case=True)
+        assert matcher.find("new ipo filed") == ["high"]
+        assert matcher.find("New IPO filed") == ["high"]
+
+    def test_duplicate_keyword_reported_per_entry(self, native):
+        matcher = _matcher(native, ("IPO", 1), ("IPO", 2))
+        assert matcher.find("IPO") == [1, 2]
+
+    def test_each_keyword_reported_once(self, native):
+        matcher = _matcher(native, ("نمو", 1))
+        assert matcher.find("نمو نمو نمو") == [1]
+
+    def test_text_whose_length_changes_when_lowered(self, native):
+        # "İ".lower() is two code points, so offsets shift after it
+        matcher = _matcher(native, ("Aramco", 1), ("aramco", 2))
+        assert matcher.find("İ Aramco") == [1]
+
+    def test_empty_matcher_and_pattern(self, native):
+        matcher = _matcher(native, ("", "empty"))
+        assert len(matcher) == 0
+        assert matcher.find("anything") == []
+
+    def test_add_after_compile_recompiles(self, native):
+        matcher = _matcher(native, ("نمو", 1))
+        assert matcher.find("نمو صعود") == [1]
+        matcher.add("صعود", 2)
+        assert matcher.find("نمو صعود") == [1, 2]
+
+
+class TestSpans:
+    def test_leftmost_longest_non_overlapping(self, native):
+        matcher = _matcher(
+            native,
+            ("ارتفع", "up"),
+            ("ارتفع بشكل حاد", "jump"),
+            ("بشكل", "manner"),
+        )
+        text = "ارتفع بشكل حاد ثم ارتفع بشكل طفيف"
+        assert matcher.spans(text) == [
+            (0, 14, "jump"),
+            (18, 23, "up"),
+            (24, 28, "manner"),
+        ]
+
+    def test_offsets_slice_the_text(self, native):
+        matcher = _matcher(native, ("أرباح", "a"), ("نمو", "b"))
+        text = "نمو الأرباح"
+        assert [text[s:e] for s, e, _ in matcher.spans(text)] == ["نمو", "أرباح"]
+
+    def test_first_added_entry_wins(self, native):
+        matcher = _matcher(native, ("نمو", 1), ("نمو", 2))
+        assert matcher.spans("نمو") == [(0, 3, 1)]
+
+    def test_case_rules(self, native):
+        matcher = _matcher(native, ("IPO", "ipo", True), ("Aramco", "aramco"))
+        assert matcher.spans("ipo aramco Aramco") == [(0, 3, "ipo"), (11, 17, "aramco")]
+
+    def test_text_whose_length_changes_when_lowered(self, native):
+        matcher = _matcher(native, ("aramco", 1, True))
+        assert matcher.spans("İ ARAMCO") == [(2, 8, 1)]
+
+    def test_empty(self, native):
+        assert _matcher(native).spans("نمو") == []
+        assert _matcher(native, ("نمو", 1)).spans("") == []
+
+
+def test_native_unavailable_raises(monkeypatch):
+    monkeypatch.setattr(keyword_matcher, "ahocorasick", None)
+    with pytest.raises(ImportError):
+        KeywordMatcher(native=True)
+    assert KeywordMatcher().native is False
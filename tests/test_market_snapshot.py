@@ -0,0 +1,246 @@
+"""
+Tests for services/market_snapshot.py.
+
+Differential tests run every SQL constant the snapshot replaces against a
+small SQLite database and compare with the vectorized NumPy answers, then
+verify the market routes use the snapshot instead of the database.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import sqlite3
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from database.queries import (  # noqa: E402
+    HEATMAP,
+    MARKET_BREADTH,
+    MARKET_SNAPSHOT,
+    MARKET_SUMMARY_AGGREGATES,
+    MOVERS_BASE,
+    SECTOR_ANALYTICS,
+)
+from services import market_snapshot as ms  # noqa: E402
+from services.market_snapshot import MarketSnapshot, MarketSnapshotStore  # noqa: E402
+
+# ticker, short_name, sector, price, prev_close, volume, market_cap, 52w high, 52w low
+_COMPANIES = [
+    ("2222.SR", "Aramco", "Energy", 32.5, 32.4, 15_000_000, 7e12, 32.5, 28.0),
+    ("2010.SR", "SABIC", "Materials", 70.0, 72.0, 3_000_000, 2.1e11, 90.0, 70.0),
+    ("1010.SR", "RIBL", "Financials", 80.0, 80.0, 5_000_000, 3e11, 90.0, 70.0),
+    ("1120.SR", "Rajhi", "Financials", 95.0, 90.0, 8_000_000, 4e11, 99.0, 60.0),
+    ("4001.SR", "Othaim", "Retail", 11.0, 0.0, None, 9e9, None, None),
+    ("4002.SR", "Mouwasat", None, 90.0, 91.0, 100_000, 1e10, 100.0, 80.0),
+    ("4003.SR", "NoPrice", "Retail", None, 10.0, 10, 5e9, 12.0, 8.0),
+    ("4004.SR", "NoCap", "Retail", 12.0, 11.0, 2_000, None, 12.0, 9.0),
+]
+# market_data rows with no matching company (count toward summary/breadth only)
+_ORPHANS = [("9999.SR", 5.0, 4.0, 1_000, 1e9, 6.0, 3.0)]
+
+
+@pytest.fixture
+def snapshot_db(tmp_path):
+    conn = sqlite3.connect(str(tmp_path / "snapshot.db"), check_same_thread=False)
+    conn.row_factory = sqlite3.Row
+    conn.executescript(
+        """
+        CREATE TABLE companies (ticker TEXT PRIMARY KEY, short_name TEXT, sector TEXT);
+        CREATE TABLE market_data (
+            ticker TEXT PRIMARY KEY, current_price REAL, previous_close REAL,
+            volume INTEGER, market_cap REAL, week_52_high REAL, week_52_low REAL
+        );
+        """
+    )
+    for t, name, sector, *md in _COMPANIES:
+        conn.execute("INSERT INTO companies VALUES (?, ?, ?)", (t, name, sector))
+        conn.execute("INSERT INTO market_data VALUES (?, ?, ?, ?, ?, ?, ?)", (t, *md))
+    for row in _ORPHANS:
+        conn.execute("INSERT INTO market_data VALUES (?, ?, ?, ?, ?, ?, ?)", row)
+    conn.commit()
+    yield conn
+    conn.close()
+
+
+def _rows(conn, sql, params=()):
+    return [dict(r) for r in conn.execute(sql, params).fetchall()]
+
+
+def _snapshot(conn) -> MarketSnapshot:
+    return MarketSnapshot(_rows(conn, MARKET_SNAPSHOT))
+
+
+class TestSnapshotMatchesSql:
+    @pytest.mark.parametrize("descending", [True, False])
+    @pytest.mark.parametrize("limit", [1, 3, 100])
+    def test_movers(self, snapshot_db, descending, limit):
+        order = "DESC" if descending else "ASC"
+        expected = _rows(
+            snapshot_db, MOVERS_BASE + f" ORDER BY change_pct {order} LIMIT ?", (limit,)
+        )
+        got = _snapshot(snapshot_db).movers(limit, descending=descending)
+        assert [r["ticker"] for r in got] == [r["ticker"] for r in expected]
+        for g, e in zip(got, expected):
+            assert g["change_pct"] == pytest.approx(e["change_pct"])
+            assert g["volume"] == e["volume"]
+            assert g["sector"] == e["sector"]
+
+    def test_summary_aggregates(self, snapshot_db):
+        expected = _rows(snapshot_db, MARKET_SUMMARY_AGGREGATES)[0]
+        got = _snapshot(snapshot_db).summary_aggregates()
+        assert got == pytest.approx(expected)
+
+    def test_sector_analytics(self, snapshot_db):
+        expected = _rows(snapshot_db, SECTOR_ANALYTICS)
+        got = _snapshot(snapshot_db).sector_analytics()
+        assert [r["sector"] for r in got] == [r["sector"] for r in expected]
+        for g, e in zip(got, expected):
+            assert g == pytest.approx(e)
+
+    def test_heatmap(self, snapshot_db):
+        expected = _rows(snapshot_db, HEATMAP)
+        got = _snapshot(snapshot_db).heatmap()
+        assert [r["ticker"] for r in got] == [r["ticker"] for r in expected]
+        for g, e in zip(got, expected):
+            assert g == pytest.approx(e)
+
+    def test_breadth(self, snapshot_db):
+        expected = _rows(snapshot_db, MARKET_BREADTH)[0]
+        got = _snapshot(snapshot_db).breadth()
+        assert got == expected
+
+    def test_empty_snapshot(self):
+        snap = MarketSnapshot([])
+        assert snap.movers(10) == []
+        assert snap.sector_analytics() == []
+        assert snap.heatmap() == []
+        assert snap.breadth()["advancing"] == 0
+        assert snap.summary_aggregates()["total_market_cap"] == 0.0
+
+
+class TestMarketSnapshotStore:
+    def test_rebuilds_only_on_version_bump(self, snapshot_db):
+        calls = []
+
+        def loader():
+            calls.append(1)
+            return _rows(snapshot_db, MARKET_SNAPSHOT)
+
+        store = MarketSnapshotStore(loader=loader, max_age=0)
+        first = store.get()
+        assert store.get() is first
+        assert len(calls) == 1
+
+        store.bump_version()
+        assert store.peek() is None
+        second = store.get()
+        assert second is not first
+        assert second.version == 1
+        assert len(calls) == 2
+
+    def test_rebuilds_after_max_age(self, snapshot_db):
+        store = MarketSnapshotStore(
+            loader=lambda: _rows(snapshot_db, MARKET_SNAPSHOT), max_age=60
+        )
+        first = store.get()
+        first.built_at -= 120
+        assert store.get() is not first
+        assert store.get_stats()["rebuilds"] == 2
+
+    def test_rebuilds_when_source_version_moves(self, snapshot_db):
+        source = {"version": 7}
+        store = MarketSnapshotStore(
+            loader=lambda: _rows(snapshot_db, MARKET_SNAPSHOT),
+            max_age=0,
+            source_version=lambda: source["version"],
+            check_interval=0,
+        )
+        first = asyncio.run(store.aget())
+        assert asyncio.run(store.aget()) is first
+
+        # An offline loader writes market_data; the trigger bumps the version
+        source["version"] += 1
+        second = asyncio.run(store.aget())
+        assert second is not first
+        assert asyncio.run(store.aget()) is second
+        assert store.get_stats()["source_version"] == 8
+
+    def test_unavailable_source_version_keeps_snapshot(self, snapshot_db):
+        def missing():
+            raise RuntimeError("no such table: screener_snapshot_meta")
+
+        store = MarketSnapshotStore(
+            loader=lambda: _rows(snapshot_db, MARKET_SNAPSHOT),
+            max_age=0,
+            source_version=missing,
+            check_interval=0,
+        )
+        first = store.get()
+        assert store.get() is first
+
+    def test_aget_failure_returns_none(self):
+        def broken():
+            raise RuntimeError("DB down")
+
+        ms.init_snapshot_store(loader=broken)
+        try:
+            assert asyncio.run(ms.aget_market_snapshot()) is None
+        finally:
+            ms.close_snapshot_store()
+
+    def test_uninitialized_returns_none(self):
+        ms.close_snapshot_store()
+        assert asyncio.run(ms.aget_market_snapshot()) is None
+
+
+class TestRoutesUseSnapshot:
+    @pytest.fixture
+    def client(self, snapshot_db):
+        from api.routes.market_analytics import router as analytics_router
+        from api.routes.market_breadth import router as breadth_router
+
+        ms.init_snapshot_store(loader=lambda: _rows(snapshot_db, MARKET_SNAPSHOT))
+        app = FastAPI()
+        app.include_router(analytics_router)
+        app.include_router(breadth_router)
+        yield TestClient(app)
+        ms.close_snapshot_store()
+
+    @patch("api.routes.market_analytics.afetchone")
+    @patch("api.routes.market_analytics.afetchall")
+    def test_analytics_routes_skip_database(self, mock_all, mock_one, client):
+        movers = client.get("/api/v1/market/movers", params={"limit": 2}).json()
+        assert [i["ticker"] for i in movers["items"]] == ["4004.SR", "1120.SR"]
+
+        summary = client.get("/api/v1/market/summary").json()
+        assert summary["gainers_count"] == 4  # includes the orphan row
+        assert summary["losers_count"] == 2
+        assert summary["top_losers"][0]["ticker"] == "2010.SR"
+
+        sectors = client.get("/api/v1/market/sectors").json()
+        assert sectors[0]["sector"] == "Energy"
+
+        heatmap = client.get("/api/v1/market/heatmap").json()
+        assert heatmap[0]["ticker"] == "2222.SR"
+        assert "4004.SR" not in {h["ticker"] for h in heatmap}
+
+        mock_all.assert_not_called()
+        mock_one.assert_not_called()
+
+    @patch("api.routes.market_breadth.afetchone")
+    def test_breadth_route_skips_database(self, mock_one, client):
+        with patch("services.cache_utils._cache_get", return_value=None):
+            data = client.get("/api/v1/market/breadth").json()
+        assert data["advancing"] == 4
+        assert data["declining"] == 2
+        assert data["new_52w_highs"] == 2
+        mock_one.assert_not_called()
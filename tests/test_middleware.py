@@ -178,6 +178,33 @@ class TestRateLimitMiddleware:
             response = client.get("/health")
             assert response.status_code == 200
 
+    def test_shared_limiter_counts_across_apps(self):
+        from backend.middleware.rate_limiter import RateLimiter
+        from middleware.rate_limit import RateLimitMiddleware
+
+        limiter = RateLimiter()
+        clients = []
+        for _ in range(2):
+            app = _create_test_app()
+            app.add_middleware(
+                RateLimitMiddleware, requests_per_minute=2, limiter=limiter
+            )
+            clients.append(TestClient(app))
+
+        assert clients[0].get("/test").status_code == 200
+        assert clients[1].get("/test").status_code == 200
+        assert clients[0].get("/test").status_code == 429
+
+    def test_allowed_response_has_rate_limit_headers(self):
+        from middleware.rate_limit import RateLimitMiddleware
+
+        app = _create_test_app()
+        app.add_middleware(RateLimitMiddleware, requests_per_minute=10)
+        response = TestClient(app).get("/test")
+
+        assert response.headers["X-RateLimit-Limit"] == "10"
+        assert response.headers["X-RateLimit-Remaining"] == "9"
+
 
 # ===========================================================================
 # Request logging middleware tests
@@ -287,3 +314,44 @@ class TestErrorHandlerMiddleware:
         assert "Traceback" not in body
         assert "RuntimeError" not in body
         assert "Intentional test error" not in body
+
+    def test_incoming_request_id_is_reused(self):
+        from middleware.error_handler import ErrorHandlerMiddleware
+        from middleware.request_logging import RequestLoggingMiddleware
+
+        app = _create_test_app()
+        app.add_middleware(RequestLoggingMiddleware)
+        app.add_middleware(ErrorHandlerMiddleware)
+        client = TestClient(app, raise_server_exceptions=False)
+
+        ok = client.get("/test", headers={"X-Request-ID": "abc123"})
+        assert ok.headers["x-request-id"] == "abc123"
+
+        err = client.get("/error", headers={"X-Request-ID": "def456"})
+        assert err.status_code == 500
+        assert err.json()["error"]["request_id"] == "def456"
+
+    def test_streamed_response_passes_through(self):
+        from fastapi.responses import StreamingResponse
+
+        from middleware.error_handler import ErrorHandlerMiddleware
+        from middleware.request_logging import RequestLoggingMiddleware
+
+        app = _create_test_app()
+
+        @app.get("/stream")
+        async def stream():
+            async def events():
+                for i in range(3):
+                    yield f"data: {i}\n\n"
+
+            return StreamingResponse(events(), media_type="text/event-stream")
+
+        app.add_middleware(RequestLoggingMiddleware)
+        app.add_middleware(ErrorHandlerMiddleware)
+        client = TestClient(app)
+
+        response = client.get("/stream")
+        assert response.status_code == 200
+        assert response.text == "data: 0\n\ndata: 1\n\ndata: 2\n\n"
+        assert response.headers["x-request-id"]
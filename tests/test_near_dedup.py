@@ -0,0 +1,133 @@
+"""
+Near-Duplicate Detection Tests
+==============================
+Tests for services/near_dedup.py: MinHash signatures, LSH buckets, the exact
+title checks, and the recall / comparison-count trade-off of the band count.
+"""
+
+import itertools
+import os
+import random
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from services.near_dedup import NearDuplicateIndex, title_word_overlap, titles_similar
+
+_LETTERS = "ابتثجحخدذرزسشصضطظعغفقكلمنهوي"
+
+
+def _corpus(seed=5, stories=120):
+    """Titles with 0-2 copies that differ by one word each, shuffled."""
+    rng = random.Random(seed)
+    vocab = [
+        "".join(rng.choice(_LETTERS) for _ in range(rng.randint(3, 7)))
+        for _ in range(400)
+    ]
+    titles = []
+    for _ in range(stories):
+        words = [rng.choice(vocab) for _ in range(rng.randint(6, 11))]
+        titles.append(" ".join(words))
+        for _ in range(rng.randint(0, 2)):
+            edited = list(words)
+            edited[rng.randrange(len(edited))] = rng.choice(vocab)
+            titles.append(" ".join(edited))
+    rng.shuffle(titles)
+    return titles
+
+
+def _similar_pairs(titles, threshold=0.55):
+    return {
+        (i, j)
+        for i, j in itertools.combinations(range(len(titles)), 2)
+        if titles_similar(titles[i], titles[j], threshold)
+    }
+
+
+def _recall_and_candidates(index, titles, truth):
+    keys = [index.buckets(t) for t in titles]
+    for i, buckets in enumerate(keys):
+        index.add(i, buckets)
+    candidates = {
+        (i, j)
+        for i, buckets in enumerate(keys)
+        for j in index.candidates(buckets)
+        if j > i
+    }
+    return len(truth & candidates) / len(truth), len(candidates)
+
+
+@pytest.fixture(scope="module")
+def corpus():
+    titles = _corpus()
+    return titles, _similar_pairs(titles)
+
+
+class TestTitleChecks:
+    def test_word_overlap(self):
+        assert title_word_overlap("a b c", "a b d") == 0.5
+        assert title_word_overlap("", "") == 0.0
+
+    def test_similar_by_sequence_ratio(self):
+        assert titles_similar("مؤشر تاسي يرتفع", "مؤشر تاسي يرتفع!", 0.55)
+
+    def test_similar_by_word_overlap(self):
+        a = "أرباح أرامكو ترتفع بشكل كبير جدا في الربع"
+        b = "أرباح أرامكو ترتفع بشكل ملحوظ جدا في الربع"
+        assert titles_similar(a, b, 0.99)
+
+    def test_unrelated_titles(self):
+        assert not titles_similar("أرامكو تعلن عن أرباح قياسية", "سابك تحقق نموا", 0.55)
+
+
+class TestNearDuplicateIndex:
+    def test_bands_must_divide_num_perm(self):
+        with pytest.raises(ValueError):
+            NearDuplicateIndex(num_perm=64, bands=10)
+
+    def test_buckets_are_stable_signed_64bit(self):
+        a = NearDuplicateIndex().buckets("مؤشر تاسي يرتفع بنسبة 2%")
+        b = NearDuplicateIndex().buckets("مؤشر تاسي يرتفع بنسبة 2%")
+        assert a == b
+        assert len(a) == 40
+        assert all(-(2**63) <= k < 2**63 for k in a)
+
+    def test_whitespace_and_case_do_not_change_signature(self):
+        index = NearDuplicateIndex()
+        assert index.buckets("Aramco  Q2 results") == index.buckets("aramco q2 results")
+
+    def test_parameters_partition_buckets(self):
+        title = "مؤشر تاسي يرتفع"
+        assert set(NearDuplicateIndex(seed=1).buckets(title)).isdisjoint(
+            NearDuplicateIndex(seed=2).buckets(title)
+        )
+
+    def test_candidates(self):
+        index = NearDuplicateIndex()
+        index.add("a", index.buckets("أرامكو تعلن عن أرباح قياسية في الربع الثاني"))
+        index.add("b", index.buckets("سابك تحقق نموا في الإيرادات السنوية"))
+        found = index.candidates(
+            index.buckets("أرامكو تعلن أرباح قياسية في الربع الثاني")
+        )
+        assert found == {"a"}
+
+    def test_short_and_empty_titles(self):
+        index = NearDuplicateIndex(shingle_size=3)
+        assert index.shingles("ab") == {"ab"}
+        assert index.buckets("") == index.buckets("")
+
+    def test_default_recall_on_edited_titles(self, corpus):
+        recall, _ = _recall_and_candidates(NearDuplicateIndex(), *corpus)
+        assert recall >= 0.95
+
+    def test_more_bands_trade_comparisons_for_recall(self, corpus):
+        titles, _truth = corpus
+        strict = _recall_and_candidates(NearDuplicateIndex(120, 20), *corpus)
+        default = _recall_and_candidates(NearDuplicateIndex(120, 40), *corpus)
+        loose = _recall_and_candidates(NearDuplicateIndex(120, 60), *corpus)
+        assert strict[0] <= default[0] <= loose[0]
+        assert strict[1] <= default[1] <= loose[1]
+        # The default compares a small fraction of all pairs
+        assert default[1] < len(titles) * (len(titles) - 1) / 2 * 0.1
@@ -17,6 +17,7 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
 from fastapi import FastAPI
 from fastapi.testclient import TestClient
 
+from api.pagination import clear_total_cache, encode_cursor
 from api.routes.news_feed import router
 from services.news_store import NewsStore
 
@@ -48,6 +49,7 @@ class NewsFeedAPITestCase(unittest.TestCase):
         self.db_path = self._tmpfile.name
         self._tmpfile.close()
         self.store = NewsStore(self.db_path)
+        clear_total_cache()
 
         # Patch get_store to use our temp store
         self._patcher = patch("api.routes.news_feed.get_store", return_value=self.store)
@@ -90,6 +92,55 @@ class TestGetNewsFeed(NewsFeedAPITestCase):
         data = resp.json()
         self.assertEqual(len(data["items"]), 3)
 
+    def test_cursor_walks_all_pages(self):
+        self.store.store_articles(
+            [_make_article(title=f"خبر {i}", priority=i % 3) for i in range(7)]
+        )
+        expected = [
+            a["id"]
+            for a in self.client.get("/api/v1/news/feed?limit=100").json()["items"]
+        ]
+        seen, pages = [], []
+        resp = self.client.get("/api/v1/news/feed?limit=3").json()
+        while True:
+            seen.extend(a["id"] for a in resp["items"])
+            pages.append(resp["page"])
+            self.assertEqual(resp["total"], 7)
+            if not resp["next_cursor"]:
+                break
+            resp = self.client.get(
+                f"/api/v1/news/feed?limit=3&cursor={resp['next_cursor']}"
+            ).json()
+        self.assertEqual(seen, expected)
+        self.assertEqual(pages, [1, 2, 3])
+
+    def test_cursor_matches_offset_page(self):
+        self.store.store_articles([_make_article(title=f"خبر {i}") for i in range(6)])
+        first = self.client.get("/api/v1/news/feed?limit=2").json()
+        by_cursor = self.client.get(
+            f"/api/v1/news/feed?limit=2&cursor={first['next_cursor']}"
+        ).json()
+        by_offset = self.client.get("/api/v1/news/feed?limit=2&offset=2").json()
+        self.assertEqual(by_cursor["items"], by_offset["items"])
+
+    def test_invalid_cursor_returns_400(self):
+        resp = self.client.get("/api/v1/news/feed?cursor=not-a-cursor")
+        self.assertEqual(resp.status_code, 400)
+
+    def test_cursor_with_non_scalar_key_returns_400(self):
+        cursor = encode_cursor([[1], {"a": 1}, "x"])
+        resp = self.client.get(f"/api/v1/news/feed?cursor={cursor}")
+        self.assertEqual(resp.status_code, 400)
+
+    def test_total_cached_per_filter(self):
+        self.store.store_articles([_make_article(title="خبر أ")])
+        self.assertEqual(self.client.get("/api/v1/news/feed").json()["total"], 1)
+        self.store.store_articles([_make_article(title="خبر ب")])
+        # Same filter signature: cached total; a new filter is counted fresh
+        self.assertEqual(self.client.get("/api/v1/news/feed").json()["total"], 1)
+        resp = self.client.get("/api/v1/news/feed?source=العربية")
+        self.assertEqual(resp.json()["total"], 2)
+
     def test_source_filter(self):
         self.store.store_articles(
             [
@@ -163,6 +214,17 @@ class TestSearchEndpoint(NewsFeedAPITestCase):
         data = resp.json()
         self.assertEqual(len(data["items"]), 1)
 
+    def test_search_total_counts_all_matches(self):
+        self.store.store_articles(
+            [_make_article(title=f"أرامكو خبر {i}") for i in range(3)]
+            + [_make_article(title="سابك تحقق نموا")]
+        )
+        resp = self.client.get("/api/v1/news/search?q=أرامكو&limit=2")
+        self.assertEqual(resp.status_code, 200)
+        data = resp.json()
+        self.assertEqual(len(data["items"]), 2)
+        self.assertEqual(data["total"], 3)
+
     def test_search_requires_query(self):
         resp = self.client.get("/api/v1/news/search")
         # FastAPI returns 422 for missing required query param
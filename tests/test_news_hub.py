@@ -0,0 +1,159 @@
+"""
+News Hub Tests
+==============
+Tests for services/broadcast.py and services/news_hub.py (push-based
+fan-out of newly stored articles to SSE subscribers).
+"""
+
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import threading
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from services import news_hub
+from services.broadcast import BroadcastHub
+from services.news_store import NewsStore
+
+
+def _article(url: str, source_name: str = "src") -> dict:
+    return {
+        "title": f"title {url}",
+        "body": "body",
+        "source_name": source_name,
+        "source_url": url,
+    }
+
+
+class TestBroadcastHub:
+    @pytest.mark.asyncio
+    async def test_fanout_to_all_subscribers(self):
+        hub = BroadcastHub("test")
+        with hub.subscribe() as a, hub.subscribe() as b:
+            assert hub.publish("x") == 2
+            assert await a.get(timeout=1) == "x"
+            assert await b.get(timeout=1) == "x"
+        assert hub.subscriber_count() == 0
+
+    @pytest.mark.asyncio
+    async def test_slow_subscriber_drops_oldest(self):
+        hub = BroadcastHub("test", queue_size=2)
+        with hub.subscribe() as sub:
+            for i in range(5):
+                hub.publish(i)
+            assert [sub.get_nowait(), sub.get_nowait()] == [3, 4]
+            assert sub.dropped == 3
+        assert hub.get_stats() == {"subscribers": 0, "published": 5, "dropped": 3}
+
+    @pytest.mark.asyncio
+    async def test_publish_from_other_thread(self):
+        hub = BroadcastHub("test")
+        with hub.subscribe() as sub:
+            t = threading.Thread(target=hub.publish, args=("threaded",))
+            t.start()
+            t.join()
+            assert await sub.get(timeout=1) == "threaded"
+
+    @pytest.mark.asyncio
+    async def test_get_timeout(self):
+        hub = BroadcastHub("test")
+        with hub.subscribe() as sub:
+            with pytest.raises(asyncio.TimeoutError):
+                await sub.get(timeout=0.01)
+
+
+class TestStorePublishesNewArticles:
+    @pytest.fixture
+    def store(self):
+        with tempfile.NamedTemporaryFile(suffix=".db", delete=False) as f:
+            db_path = f.name
+        yield NewsStore(db_path)
+        os.unlink(db_path)
+
+    @pytest.mark.asyncio
+    async def test_only_inserted_rows_are_published(self, store):
+        store.store_articles([_article("u1")])
+        with news_hub.get_news_hub().subscribe() as sub:
+            inserted = store.store_articles([_article("u1"), _article("u2")])
+            assert inserted == 1
+            batch = await sub.get(timeout=1)
+        assert [item["title"] for item in batch] == ["title u2"]
+        assert set(batch[0]) == {"id", "title", "source_name"}
+
+    @pytest.mark.asyncio
+    async def test_nothing_published_for_duplicates(self, store):
+        store.store_articles([_article("u1")])
+        with news_hub.get_news_hub().subscribe() as sub:
+            assert store.store_articles([_article("u1")]) == 0
+            assert sub.qsize() == 0
+
+
+class TestRedisRelay:
+    def teardown_method(self):
+        news_hub.stop_redis_listener()
+
+    def test_publish_goes_through_redis_when_listening(self):
+        redis_client = MagicMock()
+        redis_client.pubsub.return_value.get_message.return_value = None
+        news_hub.start_redis_listener(redis_client)
+
+        items = [{"id": "a", "title": "t", "source_name": "s"}]
+        news_hub.publish_new_articles(items)
+
+        redis_client.publish.assert_called_once_with(
+            news_hub.NEWS_CHANNEL, json.dumps(items)
+        )
+
+    @pytest.mark.asyncio
+    async def test_redis_failure_falls_back_to_local(self):
+        redis_client = MagicMock()
+        redis_client.pubsub.return_value.get_message.return_value = None
+        redis_client.publish.side_effect = ConnectionError("down")
+        news_hub.start_redis_listener(redis_client)
+
+        with news_hub.get_news_hub().subscribe() as sub:
+            news_hub.publish_new_articles([{"id": "a"}])
+            assert await sub.get(timeout=1) == [{"id": "a"}]
+
+    @pytest.mark.parametrize(
+        "data",
+        ["not json", json.dumps({"id": "x"}), json.dumps([1, "a", {"title": "t"}])],
+    )
+    def test_malformed_relay_messages_are_dropped(self, data, caplog):
+        hub = MagicMock()
+        with patch.object(news_hub, "_hub", hub), caplog.at_level("WARNING"):
+            news_hub._on_redis_message(data)
+        hub.publish.assert_not_called()
+        assert "News hub" in caplog.text
+
+    def test_relay_keeps_well_formed_articles(self):
+        hub = MagicMock()
+        with patch.object(news_hub, "_hub", hub):
+            news_hub._on_redis_message(json.dumps([{"id": "r1"}, "junk"]))
+        hub.publish.assert_called_once_with([{"id": "r1"}])
+
+    @pytest.mark.asyncio
+    async def test_listener_forwards_messages_to_hub(self):
+        delivered = threading.Event()
+        messages = [
+            {"type": "message", "data": json.dumps([{"id": "r1"}])},
+        ]
+
+        def get_message(timeout):
+            if messages:
+                delivered.set()
+                return messages.pop(0)
+            return None
+
+        redis_client = MagicMock()
+        redis_client.pubsub.return_value.get_message.side_effect = get_message
+
+        with news_hub.get_news_hub().subscribe() as sub:
+            news_hub.start_redis_listener(redis_client)
+            assert await sub.get(timeout=2) == [{"id": "r1"}]
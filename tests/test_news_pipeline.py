@@ -0,0 +1,281 @@
+"""
+News Pipeline Tests
+===================
+Tests for services/news_pipeline.py (concurrent scraping with per-host rate
+limits, bounded enrichment and process-pool parsing). Scrapers run against
+local stub HTTP servers; ``two_hosts`` serves the same state on 127.0.0.1
+and 127.0.0.2 so the pipeline sees two hosts.
+"""
+
+import asyncio
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from services.news_pipeline import HostRateLimiter, ScrapePipeline, StageTimings
+from services.news_scheduler import NewsScheduler
+from services.news_scraper import ArgaamScraper
+
+ARTICLE_DELAY = 0.1
+
+_ARTICLE_BODY = "نص المقال الكامل عن سوق الأسهم السعودية وأداء الشركات المدرجة " * 2
+
+
+def _listing_html(n: int) -> str:
+    links = "".join(
+        f'<article><a href="/article/{i}"><h3>خبر رقم {i} عن سوق الأسهم السعودية</h3></a></article>'
+        for i in range(n)
+    )
+    return f"<html><body>{links}</body></html>"
+
+
+class _StubState:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.requests = []  # (host, path, start, end)
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    state: _StubState
+
+    def do_GET(self):
+        state = self.server.state
+        start = time.monotonic()
+        if self.path.startswith("/article/"):
+            with state.lock:
+                state.in_flight += 1
+                state.max_in_flight = max(state.max_in_flight, state.in_flight)
+            time.sleep(ARTICLE_DELAY)
+            with state.lock:
+                state.in_flight -= 1
+            status, html = (
+                200,
+                f"<html><article><p>{_ARTICLE_BODY}</p></article></html>",
+            )
+        elif self.path == "/listing":
+            status, html = 200, _listing_html(4)
+        else:
+            status, html = 500, "boom"
+        body = html.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+        with state.lock:
+            state.requests.append(
+                (self.headers.get("Host", ""), self.path, start, time.monotonic())
+            )
+
+    def log_message(self, *args):
+        pass
+
+
+def _start_server(host: str, state: _StubState) -> ThreadingHTTPServer:
+    server = ThreadingHTTPServer((host, 0), _StubHandler)
+    server.daemon_threads = True
+    server.state = state
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server
+
+
+def _stop_server(server: ThreadingHTTPServer) -> None:
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def stub_server():
+    server = _start_server("127.0.0.1", _StubState())
+    yield server
+    _stop_server(server)
+
+
+@pytest.fixture
+def two_hosts(stub_server):
+    """Listing URLs on two loopback addresses sharing ``stub_server.state``."""
+    second = _start_server("127.0.0.2", stub_server.state)
+    yield [
+        f"http://127.0.0.1:{stub_server.server_address[1]}/listing",
+        f"http://127.0.0.2:{second.server_address[1]}/listing",
+    ]
+    _stop_server(second)
+
+
+def _scraper_for(url: str, name: str) -> type:
+    # Parsed in threads (parse_workers=0): dynamic classes don't pickle
+    return type(
+        f"Stub{name}Scraper",
+        (ArgaamScraper,),
+        {
+            "__module__": ArgaamScraper.__module__,
+            "source_name": name,
+            "source_url": url,
+        },
+    )
+
+
+class TestHostRateLimiter:
+    @pytest.mark.asyncio
+    async def test_same_host_is_spaced(self):
+        limiter = HostRateLimiter(0.05)
+        start = time.monotonic()
+        for _ in range(3):
+            await limiter.wait("http://a.example/x")
+        assert time.monotonic() - start >= 0.09
+
+    @pytest.mark.asyncio
+    async def test_other_hosts_do_not_wait(self):
+        limiter = HostRateLimiter(10.0)
+        start = time.monotonic()
+        await asyncio.gather(
+            limiter.wait("http://a.example/"),
+            limiter.wait("http://b.example/"),
+            limiter.wait("http://c.example/"),
+        )
+        assert time.monotonic() - start < 0.5
+
+
+class TestStageTimings:
+    def test_accumulates_per_stage(self):
+        timings = StageTimings()
+        timings.add("fetch", 0.010)
+        timings.add("fetch", 0.020)
+        with timings.measure("parse"):
+            pass
+        result = timings.as_dict()
+        assert result["fetch"] == pytest.approx(30.0)
+        assert set(result) == {"fetch", "parse"}
+
+
+class TestScrapePipeline:
+    def test_rejects_zero_enrichment_slots(self):
+        with pytest.raises(ValueError):
+            ScrapePipeline(max_concurrent_enrichment=0)
+
+    def test_fetches_and_enriches_in_process_pool(self, stub_server, monkeypatch):
+        # The pool pickles scraper classes by reference, so use the real class
+        port = stub_server.server_address[1]
+        monkeypatch.setattr(
+            ArgaamScraper, "source_url", f"http://127.0.0.1:{port}/listing"
+        )
+        pipeline = ScrapePipeline(per_host_min_interval=0, parse_workers=1)
+        try:
+            result = pipeline.run([ArgaamScraper])
+        finally:
+            pipeline.close()
+
+        assert result.counts == {ArgaamScraper.source_name: 4}
+        assert result.errors == {}
+        assert all(_ARTICLE_BODY.strip() in a["body"] for a in result.articles)
+        assert {"fetch", "parse", "enrich", "scrape"} <= set(result.timings)
+
+    def test_hosts_fetched_concurrently(self, stub_server, two_hosts):
+        scrapers = [
+            _scraper_for(two_hosts[0], "a"),
+            _scraper_for(two_hosts[1], "b"),
+        ]
+        pipeline = ScrapePipeline(
+            per_host_min_interval=0, max_concurrent_enrichment=8, parse_workers=0
+        )
+        result = pipeline.run(scrapers)
+
+        assert result.counts == {"a": 4, "b": 4}
+        assert stub_server.state.max_in_flight > 1
+
+    def test_per_host_interval_spaces_requests(self, stub_server):
+        port = stub_server.server_address[1]
+        scraper = _scraper_for(f"http://127.0.0.1:{port}/listing", "a")
+        pipeline = ScrapePipeline(per_host_min_interval=0.05, parse_workers=0)
+
+        # The limiter only decides when requests leave, so time its releases
+        # rather than their arrival at the stub server.
+        released = []
+        original_wait = HostRateLimiter.wait
+
+        async def recording_wait(limiter, url):
+            await original_wait(limiter, url)
+            released.append(time.monotonic())
+
+        with patch.object(HostRateLimiter, "wait", recording_wait):
+            pipeline.run([scraper])
+
+        assert len(released) == 5  # listing + 4 articles
+        released.sort()
+        # A late wake-up can shorten one gap but never pull a release ahead
+        # of its slot, so the n-th release is n intervals after the first.
+        for n, at in enumerate(released):
+            assert at - released[0] >= n * 0.05 - 0.001
+
+    def test_enrichment_is_bounded(self, stub_server, two_hosts):
+        scrapers = [
+            _scraper_for(two_hosts[0], "a"),
+            _scraper_for(two_hosts[1], "b"),
+        ]
+        pipeline = ScrapePipeline(
+            per_host_min_interval=0, max_concurrent_enrichment=2, parse_workers=0
+        )
+        result = pipeline.run(scrapers)
+
+        assert len(result.articles) == 8
+        assert stub_server.state.max_in_flight <= 2
+
+    def test_http_error_returns_empty_without_error_count(self, stub_server):
+        port = stub_server.server_address[1]
+        scraper = _scraper_for(f"http://127.0.0.1:{port}/broken", "a")
+        result = ScrapePipeline(per_host_min_interval=0, parse_workers=0).run([scraper])
+        assert result.articles == []
+        assert result.errors == {}
+
+    def test_raising_scraper_counted_as_error(self, stub_server):
+        port = stub_server.server_address[1]
+
+        class Raising:
+            source_name = "bad"
+
+            def fetch_articles(self):
+                raise ConnectionError("down")
+
+        good = _scraper_for(f"http://127.0.0.1:{port}/listing", "good")
+        pipeline = ScrapePipeline(per_host_min_interval=0, parse_workers=0)
+        result = pipeline.run([Raising, good])
+
+        assert result.errors == {"bad": 1}
+        assert result.counts == {"good": 4}
+
+
+class TestSchedulerStageTimings:
+    def test_get_stats_reports_stage_timings(self, stub_server, monkeypatch):
+        port = stub_server.server_address[1]
+        monkeypatch.setattr(
+            "services.news_scraper.ALL_SCRAPERS",
+            [_scraper_for(f"http://127.0.0.1:{port}/listing", "a")],
+        )
+        store = MagicMock()
+        store.store_articles.return_value = 4
+        scheduler = NewsScheduler(store)
+        scheduler._pipeline = ScrapePipeline(per_host_min_interval=0, parse_workers=0)
+
+        assert scheduler._fetch_cycle() == 4
+
+        timings = scheduler.get_stats()["stage_timings_ms"]
+        assert {
+            "fetch",
+            "parse",
+            "enrich",
+            "scrape",
+            "store",
+            "cleanup",
+            "total",
+        } <= set(timings)
+        assert timings["total"] >= timings["scrape"]
@@ -113,6 +113,10 @@ class TestFetchCycle:
         # Verify the articles passed to store
         args = mock_store.store_articles.call_args[0][0]
         assert len(args) == 2
+        # Near-duplicates of earlier cycles are skipped at the store
+        assert mock_store.store_articles.call_args.kwargs == {
+            "skip_near_duplicates": True
+        }
         assert args[0]["title"] == "Article 1"
 
     @patch("services.news_scheduler.time")
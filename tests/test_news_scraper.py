@@ -177,6 +177,45 @@ class TestDeduplication(unittest.TestCase):
         result = _deduplicate([])
         self.assertEqual(result, [])
 
+    def test_keeps_first_seen_order(self):
+        articles = [
+            {"title": "أرامكو تعلن عن أرباح قياسية", "priority": 2},
+            {"title": "سابك تحقق نموا في الإيرادات", "priority": 2},
+            {"title": "أرامكو تعلن أرباح قياسية", "priority": 1},
+            {"title": "الراجحي يوزع أرباحا نقدية", "priority": 3},
+        ]
+        result = _deduplicate(articles)
+        self.assertEqual(
+            [a["title"] for a in result],
+            [
+                "سابك تحقق نموا في الإيرادات",
+                "أرامكو تعلن أرباح قياسية",
+                "الراجحي يوزع أرباحا نقدية",
+            ],
+        )
+
+    def test_only_lsh_candidates_are_compared(self):
+        import random
+
+        import services.news_scraper as ns
+
+        # 50 unrelated titles: the pairwise scan made 1225 comparisons
+        rng = random.Random(3)
+        letters = "ابتثجحخدذرزسشصضطظعغفقكلمنهوي"
+        articles = [
+            {
+                "title": " ".join(
+                    "".join(rng.choice(letters) for _ in range(5)) for _ in range(6)
+                ),
+                "priority": 2,
+            }
+            for _ in range(50)
+        ]
+        with patch.object(ns, "titles_similar", wraps=ns.titles_similar) as similar:
+            result = _deduplicate(articles)
+        self.assertEqual(len(result), 50)
+        self.assertLess(similar.call_count, 50 * 49 // 2 // 4)
+
 
 # -----------------------------------------------------------------------
 # Error handling: mocked HTTP failures
@@ -231,16 +270,16 @@ class TestFetchAllNews(unittest.TestCase):
             "priority": 1,
             "language": "ar",
         }
-        with patch.object(
-            AlarabiyaScraper, "fetch_articles", return_value=[fake_article]
+        with (
+            patch.object(
+                AlarabiyaScraper, "afetch_articles", return_value=[fake_article]
+            ),
+            patch.object(AsharqBusinessScraper, "afetch_articles", return_value=[]),
+            patch.object(ArgaamScraper, "afetch_articles", return_value=[]),
+            patch.object(MaaalScraper, "afetch_articles", return_value=[]),
+            patch.object(MubasherScraper, "afetch_articles", return_value=[]),
         ):
-            with patch.object(AsharqBusinessScraper, "fetch_articles", return_value=[]):
-                with patch.object(ArgaamScraper, "fetch_articles", return_value=[]):
-                    with patch.object(MaaalScraper, "fetch_articles", return_value=[]):
-                        with patch.object(
-                            MubasherScraper, "fetch_articles", return_value=[]
-                        ):
-                            result = fetch_all_news()
+            result = fetch_all_news()
         self.assertIsInstance(result, list)
         self.assertGreater(len(result), 0)
 
@@ -264,16 +303,14 @@ class TestFetchAllNews(unittest.TestCase):
             "priority": 1,
             "language": "ar",
         }
-        with patch.object(AlarabiyaScraper, "fetch_articles", return_value=[]):
-            with patch.object(AsharqBusinessScraper, "fetch_articles", return_value=[]):
-                with patch.object(ArgaamScraper, "fetch_articles", return_value=[a1]):
-                    with patch.object(
-                        MaaalScraper, "fetch_articles", return_value=[a2]
-                    ):
-                        with patch.object(
-                            MubasherScraper, "fetch_articles", return_value=[]
-                        ):
-                            result = fetch_all_news()
+        with (
+            patch.object(AlarabiyaScraper, "afetch_articles", return_value=[]),
+            patch.object(AsharqBusinessScraper, "afetch_articles", return_value=[]),
+            patch.object(ArgaamScraper, "afetch_articles", return_value=[a1]),
+            patch.object(MaaalScraper, "afetch_articles", return_value=[a2]),
+            patch.object(MubasherScraper, "afetch_articles", return_value=[]),
+        ):
+            result = fetch_all_news()
         if len(result) >= 2:
             self.assertLessEqual(result[0]["priority"], result[1]["priority"])
 
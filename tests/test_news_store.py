@@ -14,7 +14,7 @@ from datetime import datetime, timedelta
 # Ensure project root is on sys.path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
 
-from services.news_store import NewsStore
+from services.news_store import FEED_KEY_COLUMNS, NewsStore
 
 
 def _make_article(
@@ -161,6 +161,14 @@ class TestGetLatestNews(unittest.TestCase):
         offset_articles = self.store.get_latest_news(limit=100, offset=2)
         self.assertEqual(len(offset_articles), len(all_articles) - 2)
 
+    def test_after_key_resumes_feed(self):
+        self._seed(6)
+        all_articles = self.store.get_latest_news(limit=100)
+        last = all_articles[2]
+        after = [last[c] for c in FEED_KEY_COLUMNS]
+        result = self.store.get_latest_news(limit=100, offset=4, after=after)
+        self.assertEqual([a["id"] for a in result], [a["id"] for a in all_articles[3:]])
+
     def test_source_filter(self):
         self._seed(6)
         result = self.store.get_latest_news(source="العربية")
@@ -342,5 +350,266 @@ class TestSearchArticles(unittest.TestCase):
         self.assertEqual(len(result), 0)
 
 
+class TestFullTextSearch(unittest.TestCase):
+    """search_page ranks FTS5 matches and returns the total in one query."""
+
+    def setUp(self):
+        self._tmpfile = tempfile.NamedTemporaryFile(suffix=".db", delete=False)
+        self.db_path = self._tmpfile.name
+        self._tmpfile.close()
+        self.store = NewsStore(self.db_path)
+
+    def tearDown(self):
+        self.store.close()
+        os.unlink(self.db_path)
+
+    def test_index_and_triggers_created(self):
+        import sqlite3
+
+        self.assertTrue(self.store.fts_enabled)
+        conn = sqlite3.connect(self.db_path)
+        names = {
+            row[0]
+            for row in conn.execute(
+                "SELECT name FROM sqlite_master WHERE name LIKE 'news_articles_fts%'"
+            )
+        }
+        conn.close()
+        self.assertIn("news_articles_fts", names)
+        self.assertTrue(
+            {"news_articles_fts_ai", "news_articles_fts_ad", "news_articles_fts_au"}
+            <= names
+        )
+
+    def test_page_and_total_in_one_call(self):
+        self.store.store_articles(
+            [_make_article(title=f"أرامكو خبر {i}") for i in range(5)]
+            + [_make_article(title="سابك تحقق نموا")]
+        )
+        items, total = self.store.search_page("أرامكو", limit=2, offset=0)
+        self.assertEqual(len(items), 2)
+        self.assertEqual(total, 5)
+        self.assertNotIn("_total", items[0])
+
+    def test_offset_past_last_page_keeps_total(self):
+        self.store.store_articles(
+            [_make_article(title=f"أرامكو {i}") for i in range(3)]
+        )
+        items, total = self.store.search_page("أرامكو", limit=2, offset=10)
+        self.assertEqual(items, [])
+        self.assertEqual(total, 3)
+
+    def test_title_hits_rank_above_body_hits(self):
+        self.store.store_articles(
+            [
+                _make_article(title="تقرير السوق", body="أرباح أرامكو ترتفع"),
+                _make_article(title="أرباح أرامكو ترتفع", body="تقرير السوق"),
+            ]
+        )
+        items, _ = self.store.search_page("أرامكو")
+        self.assertEqual(items[0]["title"], "أرباح أرامكو ترتفع")
+
+    def test_matches_arabic_words_with_attached_prefixes(self):
+        self.store.store_articles(
+            [
+                _make_article(title="ارتفاع الأرباح الفصلية"),
+                _make_article(title="وبالأرباح"),
+            ]
+        )
+        _, total = self.store.search_page("أرباح")
+        self.assertEqual(total, 2)
+
+    def test_english_case_insensitive_and_all_terms_required(self):
+        self.store.store_articles(
+            [
+                _make_article(title="Aramco Dividend Raised", language="en"),
+                _make_article(title="Aramco output steady", language="en"),
+            ]
+        )
+        self.assertEqual(self.store.search_page("aramco")[1], 2)
+        items, total = self.store.search_page("ARAMCO dividend")
+        self.assertEqual(total, 1)
+        self.assertEqual(items[0]["title"], "Aramco Dividend Raised")
+
+    def test_short_terms_use_like(self):
+        self.store.store_articles(
+            [
+                _make_article(title="Q3 results for Aramco"),
+                _make_article(title="Aramco"),
+            ]
+        )
+        self.assertEqual(self.store.search_page("q3")[1], 1)
+        self.assertEqual(self.store.search_page("Aramco Q3")[1], 1)
+
+    def test_quotes_in_query_are_literal(self):
+        self.store.store_articles([_make_article(title='He said "hello" today')])
+        self.assertEqual(self.store.search_page('"hello"')[1], 1)
+        self.assertEqual(self.store.search_page("hello OR")[1], 0)
+
+    def test_filters_apply(self):
+        self.store.store_articles(
+            [
+                _make_article(title="أرامكو أ", source_name="العربية"),
+                _make_article(title="أرامكو ب", source_name="أرقام"),
+            ]
+        )
+        items, total = self.store.search_page("أرامكو", source="أرقام")
+        self.assertEqual(total, 1)
+        self.assertEqual(items[0]["source_name"], "أرقام")
+
+    def test_delete_trigger_removes_from_index(self):
+        old = (datetime.utcnow() - timedelta(days=30)).isoformat()
+        self.store.store_articles([_make_article(title="أرامكو قديم")])
+        conn = self.store._connect()
+        conn.execute("UPDATE news_articles SET created_at = ?", (old,))
+        conn.commit()
+        self.store.cleanup_old(days=7)
+        self.assertEqual(self.store.search_page("أرامكو"), ([], 0))
+
+    def test_update_trigger_reindexes(self):
+        self.store.store_articles([_make_article(title="عنوان قديم")])
+        conn = self.store._connect()
+        conn.execute("UPDATE news_articles SET title = 'عنوان جديد'")
+        conn.commit()
+        self.assertEqual(self.store.search_page("قديم")[1], 0)
+        self.assertEqual(self.store.search_page("جديد")[1], 1)
+
+    def test_backfills_existing_database(self):
+        import sqlite3
+
+        self.store.close()
+        os.unlink(self.db_path)
+        # A database created before the FTS index existed
+        conn = sqlite3.connect(self.db_path)
+        from services.news_store import _CREATE_TABLE_SQL
+
+        conn.execute(_CREATE_TABLE_SQL)
+        conn.execute(
+            "INSERT INTO news_articles (id, title, body, source_name) "
+            "VALUES ('a1', 'أرامكو تعلن', '', 'العربية')"
+        )
+        conn.commit()
+        conn.close()
+
+        self.store = NewsStore(self.db_path)
+        self.assertEqual(self.store.search_page("أرامكو")[1], 1)
+        # Opening again does not rebuild or duplicate the index
+        NewsStore(self.db_path).close()
+        self.assertEqual(self.store.search_page("أرامكو")[1], 1)
+
+    def test_like_fallback_without_fts(self):
+        self.store.store_articles([_make_article(title="أرامكو تعلن عن أرباح")])
+        self.store.fts_enabled = False
+        items, total = self.store.search_page("أرامكو")
+        self.assertEqual(total, 1)
+        self.assertEqual(self.store.count_search("أرامكو"), 1)
+
+
+class TestNearDuplicateBuckets(unittest.TestCase):
+    """Title LSH buckets are stored and used to skip cross-batch near-dups."""
+
+    def setUp(self):
+        self._tmpfile = tempfile.NamedTemporaryFile(suffix=".db", delete=False)
+        self.db_path = self._tmpfile.name
+        self._tmpfile.close()
+        self.store = NewsStore(self.db_path)
+
+    def tearDown(self):
+        self.store.close()
+        os.unlink(self.db_path)
+
+    def _bucket_rows(self):
+        import sqlite3
+
+        conn = sqlite3.connect(self.db_path)
+        count = conn.execute("SELECT COUNT(*) FROM news_title_buckets").fetchone()[0]
+        conn.close()
+        return count
+
+    def test_buckets_written_per_article(self):
+        self.store.store_articles([_make_article(title="أرامكو تعلن عن أرباح قياسية")])
+        self.assertEqual(self._bucket_rows(), self.store.dedup_index.bands)
+
+    def test_near_duplicates_kept_by_default(self):
+        self.store.store_articles([_make_article(title="أرامكو تعلن عن أرباح قياسية")])
+        inserted = self.store.store_articles(
+            [_make_article(title="أرامكو تعلن أرباح قياسية", source_name="أرقام")]
+        )
+        self.assertEqual(inserted, 1)
+
+    def test_skips_near_duplicate_of_stored_article(self):
+        self.store.store_articles([_make_article(title="أرامكو تعلن عن أرباح قياسية")])
+        inserted = self.store.store_articles(
+            [
+                _make_article(title="أرامكو تعلن أرباح قياسية", source_name="أرقام"),
+                _make_article(title="سابك توقع اتفاقية جديدة", source_name="أرقام"),
+            ],
+            skip_near_duplicates=True,
+        )
+        self.assertEqual(inserted, 1)
+        self.assertEqual(self.store.count_articles(), 2)
+
+    def test_skips_near_duplicate_within_batch(self):
+        inserted = self.store.store_articles(
+            [
+                _make_article(title="أرامكو تعلن عن أرباح قياسية"),
+                _make_article(title="أرامكو تعلن أرباح قياسية", source_name="أرقام"),
+            ],
+            skip_near_duplicates=True,
+        )
+        self.assertEqual(inserted, 1)
+
+    def test_delete_trigger_removes_buckets(self):
+        self.store.store_articles([_make_article(title="خبر قديم", id="old-1")])
+        import sqlite3
+
+        old_date = (datetime.utcnow() - timedelta(days=30)).isoformat()
+        conn = sqlite3.connect(self.db_path)
+        conn.execute(
+            "UPDATE news_articles SET created_at = ? WHERE id = 'old-1'", (old_date,)
+        )
+        conn.commit()
+        conn.close()
+
+        self.store.cleanup_old(days=7)
+        self.assertEqual(self._bucket_rows(), 0)
+
+    def test_backfills_existing_database(self):
+        import sqlite3
+
+        self.store.close()
+        os.unlink(self.db_path)
+        # A database created before the bucket table existed
+        conn = sqlite3.connect(self.db_path)
+        from services.news_store import _CREATE_TABLE_SQL
+
+        conn.execute(_CREATE_TABLE_SQL)
+        conn.execute(
+            "INSERT INTO news_articles (id, title, body, source_name) "
+            "VALUES ('a1', 'أرامكو تعلن عن أرباح قياسية', '', 'العربية')"
+        )
+        conn.commit()
+        conn.close()
+
+        self.store = NewsStore(self.db_path)
+        bands = self.store.dedup_index.bands
+        self.assertEqual(self._bucket_rows(), bands)
+        NewsStore(self.db_path).close()
+        self.assertEqual(self._bucket_rows(), bands)
+        inserted = self.store.store_articles(
+            [_make_article(title="أرامكو تعلن أرباح قياسية", source_name="أرقام")],
+            skip_near_duplicates=True,
+        )
+        self.assertEqual(inserted, 0)
+
+    def test_rebuild_with_new_parameters(self):
+        from services.near_dedup import NearDuplicateIndex
+
+        self.store.store_articles([_make_article(title="أرامكو تعلن عن أرباح قياسية")])
+        self.store.dedup_index = NearDuplicateIndex(num_perm=64, bands=16)
+        self.store.rebuild_title_buckets()
+        self.assertEqual(self._bucket_rows(), 16)
+
+
 if __name__ == "__main__":
     unittest.main()
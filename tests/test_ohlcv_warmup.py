@@ -0,0 +1,151 @@
+"""
+Tests for services/ohlcv_warmup.py (batched OHLCV cache warmup job).
+
+Uses a local downloader stub in place of yf.download; no network access.
+"""
+
+import sys
+import time
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+import services.stock_ohlcv as ohlcv_mod  # noqa: E402
+from services.ohlcv_warmup import OhlcvWarmupJob, load_listed_tickers  # noqa: E402
+
+
+def _stub_download(calls):
+    def _download(symbols, period):
+        calls.append(list(symbols))
+        dates = pd.date_range(start="2024-01-01", periods=3, freq="B", name="Date")
+        frame = pd.DataFrame(
+            {
+                "Open": [10.0, 11.0, 12.0],
+                "High": [11.0, 12.0, 13.0],
+                "Low": [9.0, 10.0, 11.0],
+                "Close": [10.5, 11.5, 12.5],
+                "Volume": [100, 200, 300],
+            },
+            index=dates,
+        )
+        return pd.concat({s: frame for s in symbols}, axis=1)
+
+    return _download
+
+
+@pytest.fixture(autouse=True)
+def _reset_cache():
+    ohlcv_mod._cache.clear()
+    ohlcv_mod._breaker._consecutive_failures = 0
+    ohlcv_mod._breaker._open_until = 0.0
+    yield
+    ohlcv_mod._cache.clear()
+
+
+class TestRunOnce:
+    def test_warms_every_ticker_in_batches(self):
+        calls = []
+        job = OhlcvWarmupJob(
+            ticker_loader=lambda: ["2222", "1120", "2010"],
+            batch_size=2,
+            downloader=_stub_download(calls),
+        )
+        assert job.run_once() == 3
+        assert [len(c) for c in calls] == [2, 1]
+        assert ohlcv_mod.fetch_stock_ohlcv("1120")["source"] == "real"
+
+        stats = job.get_stats()
+        assert stats["run_count"] == 1
+        assert stats["last_requested"] == 3
+        assert stats["last_filled"] == 3
+
+    def test_servable_entries_are_not_refetched(self):
+        calls = []
+        job = OhlcvWarmupJob(
+            ticker_loader=lambda: ["2222", "1120"],
+            interval_seconds=600,
+            downloader=_stub_download(calls),
+        )
+        job.run_once()
+        # Past the soft TTL but still served while revalidating
+        ohlcv_mod._cache[("2222.SR", "1y")]["fetched_at"] -= 1800
+        assert job.run_once() == 0
+        assert len(calls) == 1
+
+    def test_entries_leaving_the_stale_window_are_refetched(self):
+        calls = []
+        job = OhlcvWarmupJob(
+            ticker_loader=lambda: ["2222", "1120"],
+            interval_seconds=600,
+            downloader=_stub_download(calls),
+        )
+        job.run_once()
+        # Would pass the hard TTL before the next run
+        ohlcv_mod._cache[("2222.SR", "1y")]["fetched_at"] -= 3100
+        assert job.run_once() == 1
+        assert calls[-1] == ["2222.SR"]
+
+    def test_loader_failure_is_counted(self):
+        def broken():
+            raise RuntimeError("DB down")
+
+        job = OhlcvWarmupJob(ticker_loader=broken, downloader=_stub_download([]))
+        assert job.run_once() == 0
+        assert job.get_stats()["failures"] == 1
+
+    def test_invalid_period_rejected(self):
+        with pytest.raises(ValueError):
+            OhlcvWarmupJob(period="10y")
+
+
+class TestBackgroundThread:
+    def test_start_warms_immediately_and_stop(self):
+        calls = []
+        job = OhlcvWarmupJob(
+            ticker_loader=lambda: ["2222"],
+            interval_seconds=3600,
+            downloader=_stub_download(calls),
+        )
+        job.start()
+        try:
+            deadline = time.monotonic() + 5
+            while job.get_stats()["run_count"] == 0 and time.monotonic() < deadline:
+                time.sleep(0.01)
+            assert job.get_stats()["is_running"] is True
+        finally:
+            job.stop()
+        job._thread.join(5)
+        assert calls == [["2222.SR"]]
+        assert job.get_stats()["is_running"] is False
+
+
+class TestLoadListedTickers:
+    def test_orders_by_market_cap(self, tmp_path, monkeypatch):
+        import sqlite3
+
+        db = tmp_path / "warmup.db"
+        conn = sqlite3.connect(str(db))
+        conn.executescript(
+            """
+            CREATE TABLE companies (ticker TEXT PRIMARY KEY);
+            CREATE TABLE market_data (ticker TEXT PRIMARY KEY, market_cap REAL);
+            INSERT INTO companies VALUES ('1010.SR'), ('2222.SR'), ('4001.SR');
+            INSERT INTO market_data VALUES ('1010.SR', 5e10), ('2222.SR', 7e12);
+            """
+        )
+        conn.commit()
+        conn.close()
+
+        import api.db_helper as db_helper
+        import services.sqlite_pool as sqlite_pool
+
+        monkeypatch.setattr(db_helper, "is_postgres", lambda: False)
+        monkeypatch.setattr(
+            sqlite_pool, "_pool", sqlite_pool.SQLitePool(str(db), pool_size=1)
+        )
+        assert load_listed_tickers() == ["2222.SR", "1010.SR", "4001.SR"]
@@ -1273,3 +1273,466 @@ class TestMultiTickerPipeline:
 
         # With 3 tickers and batch_size=1, sleep is called 2 times (not after last)
         assert len(sleep_calls) == 2
+
+
+# ===========================================================================
+# Incremental mode: high-water marks, COPY staging and merge
+# ===========================================================================
+
+
+def _copy_conn(high_water=None, merged=0):
+    """Mock PG connection recording the CSV streamed through copy_expert."""
+    conn = MagicMock()
+    cur = MagicMock()
+    conn.cursor.return_value = cur
+    cur.fetchall.return_value = list((high_water or {}).items())
+    cur.rowcount = merged
+    cur.copied = []
+    cur.copy_expert.side_effect = lambda sql, buf: cur.copied.append(buf.read())
+    return conn, cur
+
+
+class TestDfToInsertTuplesVectorized:
+    """df_to_insert_tuples returns plain Python values in INSERT_COLUMNS order."""
+
+    def test_python_scalars_and_nulls(self):
+        from ingestion.price_loader import df_to_insert_tuples
+
+        df = pd.DataFrame(
+            {
+                "ticker": ["2222.SR", "2222.SR"],
+                "trade_date": [date(2024, 1, 15), date(2024, 1, 16)],
+                "open_price": [32.0, np.nan],
+                "high_price": [33.0, 34.0],
+                "low_price": [31.5, 32.0],
+                "close_price": [32.5, 33.5],
+                "volume": pd.array([1_000_000, None], dtype="Int64"),
+                "change_amount": [None, 1.0],
+                "change_pct": [None, np.inf],
+            }
+        )
+        tuples = df_to_insert_tuples(df)
+        assert tuples == [
+            (
+                "2222.SR",
+                date(2024, 1, 15),
+                32.0,
+                33.0,
+                31.5,
+                32.5,
+                1_000_000,
+                None,
+                None,
+            ),
+            ("2222.SR", date(2024, 1, 16), None, 34.0, 32.0, 33.5, None, 1.0, None),
+        ]
+        assert type(tuples[0][6]) is int
+        assert type(tuples[0][2]) is float
+
+    def test_missing_optional_columns_become_none(self):
+        from ingestion.price_loader import df_to_insert_tuples
+
+        df = _make_ohlcv_df().drop(columns=["volume"])
+        tuples = df_to_insert_tuples(df)
+        assert [t[6] for t in tuples] == [None, None]
+        assert [t[7] for t in tuples] == [None, None]
+
+    def test_matches_row_by_row_conversion(self):
+        from ingestion.price_loader import (
+            INSERT_COLUMNS,
+            _clean_val,
+            compute_changes,
+            df_to_insert_tuples,
+        )
+
+        df = _make_ohlcv_df(
+            tickers=["2222.SR"] * 4 + ["1010.SR"] * 3,
+            dates=[date(2024, 1, d) for d in (1, 2, 3, 4, 1, 2, 3)],
+            close_prices=[32.0, 0.0, 33.0, np.nan, 10.0, 11.0, 12.5],
+        )
+        df = compute_changes(df)
+        expected = [
+            tuple(_clean_val(row[c]) for c in INSERT_COLUMNS)
+            for _, row in df.iterrows()
+        ]
+        assert df_to_insert_tuples(df) == expected
+
+
+class TestCopyPrices:
+    """Tests for the COPY-into-staging bulk path."""
+
+    def test_dry_run_and_empty(self):
+        from ingestion.price_loader import copy_prices
+
+        assert copy_prices(None, [], dry_run=False) == 0
+        assert copy_prices(None, [("2222.SR",)] * 3, dry_run=True) == 3
+
+    def test_copies_csv_then_merges(self):
+        from ingestion.price_loader import (
+            COPY_SQL,
+            MERGE_SQL,
+            STAGING_DDL,
+            copy_prices,
+        )
+
+        conn, cur = _copy_conn(merged=1)
+        rows = [
+            ("2222.SR", date(2024, 1, 15), 32.0, 33.0, 31.5, 32.5, 100, None, None),
+            ("2222.SR", date(2024, 1, 16), 32.5, 33.5, 32.0, 33.0, 200, 0.5, 1.5),
+        ]
+        timings = {}
+        assert copy_prices(conn, rows, timings=timings) == 1
+
+        executed = [c.args[0] for c in cur.execute.call_args_list]
+        assert executed == [STAGING_DDL, MERGE_SQL]
+        assert cur.copy_expert.call_args.args[0] == COPY_SQL
+        assert cur.copied == [
+            "2222.SR,2024-01-15,32.0,33.0,31.5,32.5,100,,\r\n"
+            "2222.SR,2024-01-16,32.5,33.5,32.0,33.0,200,0.5,1.5\r\n"
+        ]
+        conn.commit.assert_called_once()
+        assert set(timings) == {"copy", "merge"}
+
+    def test_rolls_back_on_failure(self):
+        from ingestion.price_loader import copy_prices
+
+        conn, cur = _copy_conn()
+        cur.copy_expert.side_effect = RuntimeError("COPY failed")
+        with pytest.raises(RuntimeError):
+            copy_prices(conn, [("2222.SR", date(2024, 1, 15)) + (None,) * 7])
+        conn.rollback.assert_called_once()
+        conn.commit.assert_not_called()
+
+
+class TestIncrementalLoad:
+    """Tests for PriceLoader(incremental=True)."""
+
+    def _loader(self, conn, **kwargs):
+        from ingestion.config import IngestionConfig
+        from ingestion.price_loader import PriceLoader
+
+        config = IngestionConfig(batch_size=10, rate_limit_seconds=0.0)
+        return PriceLoader(pg_conn=conn, config=config, incremental=True, **kwargs)
+
+    def test_high_water_marks_read_in_one_query(self):
+        from ingestion.price_loader import HIGH_WATER_SQL
+
+        conn, cur = _copy_conn({"2222.SR": date(2024, 1, 15)})
+        marks = self._loader(conn)._high_water_marks(["2222.SR", "1010.SR"])
+        assert marks == {"2222.SR": date(2024, 1, 15)}
+        cur.execute.assert_called_once_with(HIGH_WATER_SQL, (["2222.SR", "1010.SR"],))
+
+    def test_fetches_only_the_missing_tail(self):
+        conn, cur = _copy_conn({"2222.SR": date(2024, 1, 16)}, merged=2)
+        loader = self._loader(conn)
+
+        with patch("ingestion.price_loader.yf") as mock_yf:
+            # yfinance returns the overlap day (16th) plus two new days
+            mock_yf.Ticker.return_value.history.return_value = _make_yfinance_df(4)
+            total = loader.load_prices(
+                ["2222.SR"], from_date=date(2024, 1, 1), to_date=date(2024, 1, 18)
+            )
+
+        # Fetch starts at the high-water mark, not at from_date
+        history_kwargs = mock_yf.Ticker.return_value.history.call_args.kwargs
+        assert history_kwargs["start"] == "2024-01-16"
+
+        lines = cur.copied[0].splitlines()
+        assert [line.split(",")[1] for line in lines] == ["2024-01-17", "2024-01-18"]
+        # First new row's change is computed from the overlap day's close
+        assert lines[0].split(",")[7] == "0.5"
+        assert total == 2
+        assert loader.stats["tickers_processed"] == 1
+
+    def test_up_to_date_tickers_are_skipped(self):
+        conn, cur = _copy_conn({"2222.SR": date(2024, 1, 18)})
+        loader = self._loader(conn)
+
+        with patch("ingestion.price_loader.yf") as mock_yf:
+            total = loader.load_prices(
+                ["2222.SR"], from_date=date(2024, 1, 1), to_date=date(2024, 1, 18)
+            )
+
+        mock_yf.Ticker.assert_not_called()
+        cur.copy_expert.assert_not_called()
+        assert total == 0
+        assert loader.stats["tickers_up_to_date"] == 1
+
+    def test_new_ticker_uses_from_date(self):
+        conn, cur = _copy_conn({}, merged=2)
+        loader = self._loader(conn)
+
+        with patch("ingestion.price_loader.yf") as mock_yf:
+            mock_yf.Ticker.return_value.history.return_value = _make_yfinance_df(2)
+            loader.load_prices(["1010.SR"], from_date=date(2024, 1, 15))
+
+        history_kwargs = mock_yf.Ticker.return_value.history.call_args.kwargs
+        assert history_kwargs["start"] == "2024-01-15"
+        assert len(cur.copied[0].splitlines()) == 2
+
+    def test_one_copy_per_batch(self):
+        conn, cur = _copy_conn({}, merged=4)
+        loader = self._loader(conn)
+
+        with patch("ingestion.price_loader.yf") as mock_yf:
+            mock_yf.Ticker.return_value.history.return_value = _make_yfinance_df(2)
+            total = loader.load_prices(["2222.SR", "1010.SR"], date(2024, 1, 15))
+
+        assert cur.copy_expert.call_count == 1
+        assert len(cur.copied[0].splitlines()) == 4
+        assert total == 4
+
+    def test_copy_failure_marks_batch_failed(self):
+        conn, cur = _copy_conn({})
+        cur.copy_expert.side_effect = RuntimeError("COPY failed")
+        loader = self._loader(conn)
+
+        with patch("ingestion.price_loader.yf") as mock_yf:
+            mock_yf.Ticker.return_value.history.return_value = _make_yfinance_df(2)
+            total = loader.load_prices(["2222.SR", "1010.SR"], date(2024, 1, 15))
+
+        assert total == 0
+        assert loader.stats["tickers_failed"] == 2
+        assert loader.stats["tickers_processed"] == 0
+        conn.rollback.assert_called_once()
+
+    def test_records_phase_timings(self):
+        conn, _ = _copy_conn({"2222.SR": date(2024, 1, 15)}, merged=1)
+        loader = self._loader(conn)
+
+        with patch("ingestion.price_loader.yf") as mock_yf:
+            mock_yf.Ticker.return_value.history.return_value = _make_yfinance_df(2)
+            loader.load_prices(["2222.SR"], date(2024, 1, 1), date(2024, 1, 16))
+
+        timings = loader.stats["timings_ms"]
+        assert set(timings) == {"high_water", "fetch", "transform", "copy", "merge"}
+        assert all(ms >= 0 for ms in timings.values())
+
+
+class TestParseArgsIncremental:
+    def test_incremental_flag(self):
+        from ingestion.price_loader import parse_args
+
+        with patch("sys.argv", ["prog", "--all", "--incremental"]):
+            assert parse_args().incremental is True
+        with patch("sys.argv", ["prog", "--all"]):
+            assert parse_args().incremental is False
+
+
+# ===========================================================================
+# Concurrent mode: worker pool, shared token bucket, single writer
+# ===========================================================================
+
+
+class TestTokenBucket:
+    def test_rejects_non_positive_rate(self):
+        from ingestion.price_loader import TokenBucket
+
+        with pytest.raises(ValueError):
+            TokenBucket(0)
+
+    def test_burst_then_paced(self):
+        from ingestion.price_loader import TokenBucket
+
+        bucket = TokenBucket(rate=2.0, capacity=2)
+        with patch("ingestion.price_loader.time.sleep") as mock_sleep:
+            assert bucket.acquire() == 0.0
+            assert bucket.acquire() == 0.0
+            # Bucket is empty: the third token needs ~0.5s of refill
+            bucket._updated -= 0.5
+            assert bucket.acquire() == 0.0
+            mock_sleep.assert_not_called()
+
+    def test_waits_for_refill_when_empty(self):
+        from ingestion.price_loader import TokenBucket
+
+        bucket = TokenBucket(rate=1000.0, capacity=1)
+        bucket.acquire()
+        waited = bucket.acquire()
+        assert waited > 0
+
+
+class TestConcurrentLoad:
+    """Tests for PriceLoader with config.max_workers > 1."""
+
+    def _loader(self, conn, incremental=False, batch_size=10):
+        from ingestion.config import IngestionConfig
+        from ingestion.price_loader import PriceLoader
+
+        config = IngestionConfig(
+            batch_size=batch_size,
+            rate_limit_seconds=5.0,
+            max_workers=4,
+            requests_per_second=1000,
+        )
+        return PriceLoader(pg_conn=conn, config=config, incremental=incremental)
+
+    @patch("ingestion.price_loader.time.sleep")
+    @patch("ingestion.price_loader.insert_prices")
+    def test_fetches_all_tickers_without_batch_sleep(self, mock_insert, mock_sleep):
+        mock_insert.side_effect = lambda conn, rows, dry_run: len(rows)
+        loader = self._loader(MagicMock(), batch_size=2)
+        tickers = ["2222.SR", "1010.SR", "2010.SR", "1120.SR", "7010.SR"]
+
+        with patch("ingestion.price_loader.yf") as mock_yf:
+            mock_yf.Ticker.return_value.history.return_value = _make_yfinance_df(2)
+            total = loader.load_prices(tickers, date(2024, 1, 15), date(2024, 1, 16))
+
+        fetched = sorted(c.args[0] for c in mock_yf.Ticker.call_args_list)
+        assert fetched == sorted(tickers)
+        # Writes are grouped by batch_size: 2 + 2 + 1 tickers
+        assert mock_insert.call_count == 3
+        assert total == 10
+        assert loader.stats["tickers_processed"] == 5
+        assert loader.stats["rows_inserted"] == 10
+        # The token bucket paces requests; no inter-batch sleeps
+        assert 5.0 not in [c.args[0] for c in mock_sleep.call_args_list]
+        assert loader._bucket is None
+
+    @patch("ingestion.price_loader.insert_prices")
+    def test_writes_happen_on_calling_thread(self, mock_insert):
+        import threading
+
+        writer_threads = set()
+
+        def record(conn, rows, dry_run):
+            writer_threads.add(threading.current_thread())
+            return len(rows)
+
+        mock_insert.side_effect = record
+        loader = self._loader(MagicMock(), batch_size=1)
+
+        with patch("ingestion.price_loader.yf") as mock_yf:
+            mock_yf.Ticker.return_value.history.return_value = _make_yfinance_df(2)
+            loader.load_prices(["2222.SR", "1010.SR", "2010.SR"], date(2024, 1, 15))
+
+        assert writer_threads == {threading.current_thread()}
+
+    @patch("ingestion.price_loader.insert_prices", return_value=2)
+    def test_every_attempt_takes_a_token(self, mock_insert):
+        from ingestion.price_loader import TokenBucket
+
+        loader = self._loader(MagicMock())
+        acquired = []
+        original = TokenBucket.acquire
+
+        def counting_acquire(bucket):
+            acquired.append(1)
+            return original(bucket)
+
+        with (
+            patch("ingestion.price_loader.yf") as mock_yf,
+            patch.object(TokenBucket, "acquire", counting_acquire),
+            patch("ingestion.price_loader.time.sleep"),
+        ):
+            mock_yf.Ticker.return_value.history.side_effect = [
+                Exception("429 Too Many Requests"),
+                _make_yfinance_df(2),
+            ]
+            loader.load_prices(["2222.SR"], date(2024, 1, 15))
+
+        # One failed attempt plus the retry, each paced by the bucket
+        assert len(acquired) == 2
+        assert loader.stats["tickers_processed"] == 1
+        assert "rate_wait" in loader.stats["timings_ms"]
+
+    @patch("ingestion.price_loader.insert_prices", return_value=2)
+    def test_fetch_failure_counted(self, mock_insert):
+        loader = self._loader(MagicMock())
+
+        with (
+            patch("ingestion.price_loader.yf") as mock_yf,
+            patch.object(
+                loader, "_fetch_tail", side_effect=[RuntimeError("boom"), None]
+            ),
+        ):
+            mock_yf.Ticker.return_value.history.return_value = _make_yfinance_df(2)
+            total = loader.load_prices(["2222.SR", "1010.SR"], date(2024, 1, 15))
+
+        assert total == 0
+        assert loader.stats["tickers_failed"] == 1
+        assert loader.stats["tickers_processed"] == 1
+
+    @patch("ingestion.price_loader.insert_prices", side_effect=RuntimeError("down"))
+    def test_write_failure_rolls_back_and_marks_failed(self, mock_insert):
+        conn = MagicMock()
+        loader = self._loader(conn)
+
+        with patch("ingestion.price_loader.yf") as mock_yf:
+            mock_yf.Ticker.return_value.history.return_value = _make_yfinance_df(2)
+            total = loader.load_prices(["2222.SR", "1010.SR"], date(2024, 1, 15))
+
+        assert total == 0
+        assert loader.stats["tickers_failed"] == 2
+        conn.rollback.assert_called_once()
+
+    @patch("ingestion.price_loader.insert_prices", return_value=2)
+    def test_transform_failure_marks_batch_failed(self, mock_insert):
+        loader = self._loader(MagicMock(), batch_size=1)
+
+        with (
+            patch("ingestion.price_loader.yf") as mock_yf,
+            patch(
+                "ingestion.price_loader.df_to_insert_tuples",
+                side_effect=[ValueError("bad frame"), [("row",)]],
+            ),
+        ):
+            mock_yf.Ticker.return_value.history.return_value = _make_yfinance_df(2)
+            total = loader.load_prices(["2222.SR", "1010.SR"], date(2024, 1, 15))
+
+        assert total == 2
+        assert loader.stats["tickers_failed"] == 1
+        assert loader.stats["tickers_processed"] == 1
+
+    def test_writer_error_does_not_hang_on_full_queue(self):
+        import threading
+
+        loader = self._loader(MagicMock(), batch_size=1)
+        tickers = [f"{n}.SR" for n in range(1000, 1040)]
+        outcome = {}
+
+        def run():
+            try:
+                loader.load_prices(tickers, date(2024, 1, 15))
+            except Exception as e:
+                outcome["error"] = e
+
+        with (
+            patch("ingestion.price_loader.yf") as mock_yf,
+            patch.object(loader, "_write_frames", side_effect=RuntimeError("bug")),
+        ):
+            mock_yf.Ticker.return_value.history.return_value = _make_yfinance_df(2)
+            thread = threading.Thread(target=run, daemon=True)
+            thread.start()
+            thread.join(timeout=10)
+
+        # Fetchers blocked on the bounded queue are drained, not waited on
+        assert not thread.is_alive()
+        assert str(outcome["error"]) == "bug"
+        assert mock_yf.Ticker.call_count < len(tickers)
+        assert loader._bucket is None
+
+    def test_incremental_skips_up_to_date_and_copies(self):
+        conn, cur = _copy_conn({"2222.SR": date(2024, 1, 18)}, merged=2)
+        loader = self._loader(conn, incremental=True)
+
+        with patch("ingestion.price_loader.yf") as mock_yf:
+            mock_yf.Ticker.return_value.history.return_value = _make_yfinance_df(2)
+            total = loader.load_prices(
+                ["2222.SR", "1010.SR"], date(2024, 1, 15), date(2024, 1, 18)
+            )
+
+        mock_yf.Ticker.assert_called_once_with("1010.SR")
+        assert cur.copy_expert.call_count == 1
+        assert total == 2
+        assert loader.stats["tickers_up_to_date"] == 1
+
+
+class TestParseArgsConcurrent:
+    def test_workers_and_rps(self):
+        from ingestion.price_loader import parse_args
+
+        with patch("sys.argv", ["prog", "--all", "--workers", "8", "--rps", "5"]):
+            args = parse_args()
+        assert args.workers == 8
+        assert args.rps == 5.0
@@ -687,14 +687,83 @@ class TestJobProcessXbrl:
         mock_xbrl_module.insert_facts.return_value = 5
         mock_xbrl_module.create_filing.return_value = 1
         mock_xbrl_module.mark_filing_complete = MagicMock()
+        mock_xbrl_module.check_filing_exists.return_value = False
+        mock_xbrl_module.SUPPORTED_EXTENSIONS = {".xml"}
+        mock_xbrl_module.ticker_from_filename.return_value = "2222.SR"
 
         with patch.object(sched_module, "_get_pg_conn", return_value=mock_conn):
             with patch.object(sched_module, "PROJECT_DIR", tmp_path):
-                with patch.dict(
-                    "sys.modules", {"ingestion.xbrl_processor": mock_xbrl_module}
+                with (
+                    patch.dict(
+                        "sys.modules", {"ingestion.xbrl_processor": mock_xbrl_module}
+                    ),
+                    patch.dict("os.environ", {"INGESTION_XBRL_WORKERS": "1"}),
                 ):
                     sched_module.job_process_xbrl()
 
+        mock_xbrl_module.insert_facts.assert_called_once()
+        mock_xbrl_module.mark_filing_complete.assert_called_once()
+        mock_conn.close.assert_called_once()
+
+    def test_single_worker_skips_processed_filings(self, tmp_path):
+        """Without a pool, completed filings are skipped just like with one."""
+        import ingestion.scheduler as sched_module
+
+        filings_dir = tmp_path / "data" / "filings"
+        filings_dir.mkdir(parents=True)
+        (filings_dir / "2222.SR_annual.xml").write_text("<xbrl/>")
+
+        mock_conn = MagicMock()
+        mock_xbrl_module = MagicMock()
+        mock_xbrl_module.SUPPORTED_EXTENSIONS = {".xml"}
+        mock_xbrl_module.ticker_from_filename.return_value = "2222.SR"
+        mock_xbrl_module.check_filing_exists.return_value = True
+
+        with (
+            patch.object(sched_module, "_get_pg_conn", return_value=mock_conn),
+            patch.object(sched_module, "PROJECT_DIR", tmp_path),
+            patch.dict("os.environ", {"INGESTION_XBRL_WORKERS": "1"}),
+            patch.dict("sys.modules", {"ingestion.xbrl_processor": mock_xbrl_module}),
+        ):
+            sched_module.job_process_xbrl()
+
+        mock_xbrl_module.check_filing_exists.assert_called_once_with(
+            mock_conn, "2222.SR", str(filings_dir / "2222.SR_annual.xml")
+        )
+        mock_xbrl_module.create_filing.assert_not_called()
+        mock_xbrl_module.XBRLProcessor.assert_not_called()
+        mock_conn.close.assert_called_once()
+
+    def test_uses_process_pool_when_workers_configured(self, tmp_path):
+        """INGESTION_XBRL_WORKERS > 1 routes the filings through the pool."""
+        import ingestion.scheduler as sched_module
+
+        filings_dir = tmp_path / "data" / "filings"
+        filings_dir.mkdir(parents=True)
+        (filings_dir / "2222.SR_annual.xml").write_text("<xbrl/>")
+        (filings_dir / "1010.SR_annual.xml").write_text("<xbrl/>")
+        (filings_dir / "nonticker.xml").write_text("<xbrl/>")
+
+        mock_conn = MagicMock()
+        mock_xbrl_module = MagicMock()
+        mock_xbrl_module.SUPPORTED_EXTENSIONS = {".xml"}
+        mock_xbrl_module.ticker_from_filename.side_effect = lambda p: (
+            p.name.split("_")[0] if ".SR" in p.name else None
+        )
+        mock_xbrl_module.process_files_parallel.return_value = (6, [], {})
+
+        with (
+            patch.object(sched_module, "_get_pg_conn", return_value=mock_conn),
+            patch.object(sched_module, "PROJECT_DIR", tmp_path),
+            patch.dict("os.environ", {"INGESTION_XBRL_WORKERS": "2"}),
+            patch.dict("sys.modules", {"ingestion.xbrl_processor": mock_xbrl_module}),
+        ):
+            sched_module.job_process_xbrl()
+
+        jobs, *_, workers = mock_xbrl_module.process_files_parallel.call_args.args
+        assert [ticker for _, ticker in jobs] == ["1010.SR", "2222.SR"]
+        assert workers == 2
+        mock_xbrl_module.XBRLProcessor.assert_not_called()
         mock_conn.close.assert_called_once()
 
     def test_connection_closed_on_exception(self, tmp_path):
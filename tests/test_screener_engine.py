@@ -0,0 +1,229 @@
+"""
+Tests for services/screener_engine.py (NumPy screener engine).
+
+The engine must return exactly what the SQL path returns, so most tests
+here are differential: the same filters, sort and page are run through
+``SCREENER_BASE`` on the SQLite test database from test_screener_snapshot
+and through the engine loaded from ``screener_snapshot``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import random
+import sqlite3
+import sys
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from api.routes.screener import _FILTER_SPECS, _order_by  # noqa: E402
+from database.queries import SCREENER_BASE, SCREENER_SORT_COLUMNS  # noqa: E402
+from services import screener_engine as se  # noqa: E402
+from services import screener_snapshot as ss  # noqa: E402
+from services.screener_engine import ScreenerEngine  # noqa: E402
+from tests.test_screener_snapshot import (  # noqa: E402
+    _CASES,
+    _SCHEMA,
+    _rows,
+    _seed,
+    _store,
+)
+
+# (column, op, candidate values) mirroring the route's _FILTER_SPECS
+_PREDICATES = [
+    ("sector", "=", ["Energy", "Banks", "Materials", "Nope"]),
+    ("trailing_pe", ">=", [5.0, 8, 12.5, 24]),
+    ("trailing_pe", "<=", [5.0, 10, 18, 30]),
+    ("price_to_book", ">=", [1.0, 1.5, 2.5]),
+    ("price_to_book", "<=", [1.0, 2.0]),
+    ("roe", ">=", [0.0, 0.08, 0.2]),
+    ("roe", "<=", [0.02, 0.1]),
+    ("dividend_yield", ">=", [0.0, 0.03]),
+    ("dividend_yield", "<=", [0.05]),
+    ("market_cap", ">=", [0, 1e9, 5e9]),
+    ("market_cap", "<=", [2e9, 8e9]),
+    ("revenue_growth", ">=", [-0.02, 0.0, 0.02]),
+    ("revenue_growth", "<=", [0.0, 0.03]),
+    ("debt_to_equity", "<=", [0.0, 0.6, 1.2]),
+    ("current_ratio", ">=", [0.9, 1.3]),
+    ("recommendation", "ieq", ["buy", "HOLD", "Sell", "strong_buy"]),
+]
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = str(tmp_path / "screener.db")
+    conn = sqlite3.connect(path)
+    conn.executescript(_SCHEMA)
+    _seed(conn)
+    conn.close()
+    return path
+
+
+@pytest.fixture
+def route_db(db_path, monkeypatch):
+    import api.async_db as async_db
+    import api.db_helper as db_helper
+    import services.sqlite_pool as sqlite_pool
+
+    monkeypatch.setattr(db_helper, "_DB_BACKEND", "sqlite")
+    monkeypatch.setattr(async_db, "get_executor", lambda: None)
+    monkeypatch.setattr(sqlite_pool, "_pool", sqlite_pool.SQLitePool(db_path, 2))
+    monkeypatch.setattr(se, "_engine", None)
+    store = _store(db_path)
+    store.ensure_fresh()
+    return store
+
+
+def _sql(db_path, predicates, sort_by, descending, limit, offset):
+    """The route's SQL for the same predicates, run on the join."""
+    refs = {column: f"{alias}.{column}" for _, alias, column, _ in _FILTER_SPECS}
+    clauses, params = [], []
+    for column, op, value in predicates:
+        ref = refs[column]
+        if op == "ieq":
+            clauses.append(f"LOWER({ref}) = LOWER(?)")
+        else:
+            clauses.append(f"{ref} {op} ?")
+        params.append(value)
+    where = "".join(f" AND {c}" for c in clauses)
+    order = _order_by(sort_by, "DESC" if descending else "ASC", qualified=True)
+    conn = sqlite3.connect(db_path)
+    conn.row_factory = sqlite3.Row
+    try:
+        total = conn.execute(
+            f"SELECT COUNT(*) FROM ({SCREENER_BASE}{where}) sub", params
+        ).fetchone()[0]
+        rows = conn.execute(
+            f"{SCREENER_BASE}{where}{order} LIMIT ? OFFSET ?",
+            params + [limit, offset],
+        ).fetchall()
+        return [dict(r) for r in rows], total
+    finally:
+        conn.close()
+
+
+@pytest.fixture
+def engine(db_path):
+    _store(db_path).ensure_fresh()
+    return ScreenerEngine(_rows(db_path, "SELECT * FROM screener_snapshot"))
+
+
+class TestScreenerEngine:
+    def test_null_never_matches_a_range(self, engine, db_path):
+        rows, total = engine.search(
+            [("trailing_pe", ">=", -1e18)], "ticker", False, 100
+        )
+        nulls = _rows(
+            db_path,
+            "SELECT COUNT(*) AS n FROM screener_snapshot WHERE trailing_pe IS NULL",
+        )[0]["n"]
+        assert nulls > 0
+        assert total == engine.size - nulls
+        assert all(r["trailing_pe"] is not None for r in rows)
+
+    def test_recommendation_bitmap_is_case_insensitive(self, engine):
+        _, upper = engine.search([("recommendation", "ieq", "BUY")], "ticker", False, 1)
+        _, lower = engine.search([("recommendation", "ieq", "buy")], "ticker", False, 1)
+        assert upper == lower == 10
+
+    def test_unknown_sector_matches_nothing(self, engine):
+        assert engine.search([("sector", "=", "Nope")], "ticker", False, 10) == ([], 0)
+
+    def test_ties_at_page_boundary_follow_ticker(self, engine):
+        # market_cap has many ties; every page boundary must cut the same
+        # ticker-ordered sequence as one full sort
+        full, _ = engine.search([], "market_cap", True, engine.size)
+        for k in range(1, engine.size):
+            page, _ = engine.search([], "market_cap", True, k)
+            assert page == full[:k]
+
+    def test_infinite_values_sort_before_nulls(self):
+        rows = [
+            {"ticker": "A", "trailing_pe": None},
+            {"ticker": "B", "trailing_pe": float("inf")},
+            {"ticker": "C", "trailing_pe": 3.0},
+            {"ticker": "D", "trailing_pe": float("-inf")},
+        ]
+        engine = ScreenerEngine(rows)
+        asc, _ = engine.search([], "trailing_pe", False, 4)
+        desc, _ = engine.search([], "trailing_pe", True, 2)
+        assert [r["ticker"] for r in asc] == ["D", "C", "B", "A"]
+        assert [r["ticker"] for r in desc] == ["B", "C"]
+
+    def test_rejects_unknown_sort_column(self, engine):
+        with pytest.raises(ValueError):
+            engine.search([], "price; DROP TABLE companies", True, 10)
+
+    def test_empty_table(self):
+        assert ScreenerEngine([]).search([], "market_cap", True, 10) == ([], 0)
+
+
+class TestDifferential:
+    @pytest.mark.parametrize("sort_by", SCREENER_SORT_COLUMNS)
+    @pytest.mark.parametrize("descending", [True, False], ids=["desc", "asc"])
+    def test_every_sort_column(self, engine, db_path, sort_by, descending):
+        for limit, offset in [(100, 0), (5, 0), (7, 11), (10, 35)]:
+            expected = _sql(db_path, [], sort_by, descending, limit, offset)
+            assert engine.search([], sort_by, descending, limit, offset) == expected
+
+    def test_random_filter_combinations(self, engine, db_path):
+        rng = random.Random(20240601)
+        for _ in range(300):
+            chosen = rng.sample(_PREDICATES, rng.randint(0, 4))
+            predicates = [(c, op, rng.choice(values)) for c, op, values in chosen]
+            sort_by = rng.choice(SCREENER_SORT_COLUMNS)
+            descending = rng.random() < 0.5
+            limit, offset = rng.randint(1, 20), rng.choice([0, 0, 3, 10, 30])
+            expected = _sql(db_path, predicates, sort_by, descending, limit, offset)
+            actual = engine.search(predicates, sort_by, descending, limit, offset)
+            assert actual == expected, (predicates, sort_by, descending, limit, offset)
+
+
+# ---------------------------------------------------------------------------
+# Route: engine path vs SCREENER_BASE path
+# ---------------------------------------------------------------------------
+
+
+def _search(store, monkeypatch, engine_enabled, **kwargs):
+    from api.routes.screener import ScreenerFilters, search_stocks
+
+    monkeypatch.setattr(ss, "_store", store)
+    monkeypatch.setattr(se, "_enabled", engine_enabled)
+    return asyncio.run(search_stocks(ScreenerFilters(**kwargs)))
+
+
+class TestScreenerRouteEngine:
+    @pytest.mark.parametrize("case", _CASES, ids=lambda c: ",".join(c) or "none")
+    def test_engine_matches_join(self, route_db, monkeypatch, case):
+        from_join = _search(None, monkeypatch, False, **case)
+        from_engine = _search(route_db, monkeypatch, True, **case)
+        assert se._engine is not None
+        assert from_engine == from_join
+
+    def test_engine_reloads_after_snapshot_rebuild(
+        self, route_db, db_path, monkeypatch
+    ):
+        _search(route_db, monkeypatch, True)
+        first = se._engine
+
+        conn = sqlite3.connect(db_path)
+        conn.execute(
+            "UPDATE market_data SET market_cap = 1e15 WHERE ticker = '1003.SR'"
+        )
+        conn.commit()
+        conn.close()
+
+        page = _search(route_db, monkeypatch, True, limit=1)
+        assert se._engine is not first
+        assert page.items[0].ticker == "1003.SR"
+
+    def test_disabled_engine_is_not_used(self, route_db, monkeypatch):
+        monkeypatch.setattr(ss, "_store", route_db)
+        monkeypatch.setattr(se, "_enabled", False)
+        assert asyncio.run(se.aget_screener_engine()) is None
@@ -0,0 +1,314 @@
+"""
+Tests for services/screener_snapshot.py and the screener route's snapshot path.
+
+A small SQLite database with the seven SCREENER_BASE tables backs both the
+materialized table and the join, so the route can be compared across the
+two paths (same items, same total_count).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import sqlite3
+import sys
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from database.queries import SCREENER_BASE, SCREENER_SORT_COLUMNS  # noqa: E402
+from services import screener_snapshot as ss  # noqa: E402
+from services.screener_snapshot import ScreenerSnapshotStore  # noqa: E402
+
+_SCHEMA = """
+CREATE TABLE companies (ticker TEXT PRIMARY KEY, short_name TEXT, sector TEXT, industry TEXT);
+CREATE TABLE market_data (ticker TEXT PRIMARY KEY, current_price REAL, previous_close REAL,
+                          market_cap REAL, volume REAL);
+CREATE TABLE valuation_metrics (ticker TEXT PRIMARY KEY, trailing_pe REAL, forward_pe REAL,
+                                price_to_book REAL, price_to_sales REAL);
+CREATE TABLE profitability_metrics (ticker TEXT PRIMARY KEY, roe REAL, profit_margin REAL,
+                                    revenue_growth REAL, earnings_growth REAL);
+CREATE TABLE dividend_data (ticker TEXT PRIMARY KEY, dividend_yield REAL);
+CREATE TABLE financial_summary (ticker TEXT PRIMARY KEY, debt_to_equity REAL,
+                                current_ratio REAL, total_revenue REAL);
+CREATE TABLE analyst_data (ticker TEXT PRIMARY KEY, recommendation TEXT,
+                           target_mean_price REAL, analyst_count REAL);
+"""
+
+_SECTORS = ["Energy", "Banks", "Materials", None]
+_RECS = ["buy", "Hold", "SELL", None]
+
+
+def _seed(conn: sqlite3.Connection, n: int = 40) -> None:
+    for i in range(n):
+        t = f"{1000 + i}.SR"
+        nullable = lambda v: None if i % 7 == 0 else v  # noqa: E731
+        conn.execute(
+            "INSERT INTO companies VALUES (?, ?, ?, ?)",
+            (t, f"Co {i}", _SECTORS[i % 4], "Ind"),
+        )
+        conn.execute(
+            "INSERT INTO market_data VALUES (?, ?, ?, ?, ?)",
+            (
+                t,
+                None if i == 39 else 10.0 + i,
+                0 if i == 5 else 10.0 + (i % 5),
+                nullable(1e9 * (i % 9)),  # ties on market_cap
+                1000.0 * i,
+            ),
+        )
+        conn.execute(
+            "INSERT INTO valuation_metrics VALUES (?, ?, ?, ?, ?)",
+            (t, nullable(5.0 + i % 20), 12.0, 1.0 + (i % 4) * 0.5, 2.0),
+        )
+        conn.execute(
+            "INSERT INTO profitability_metrics VALUES (?, ?, ?, ?, ?)",
+            (t, nullable(0.02 * (i % 11)), 0.1, 0.01 * (i % 6) - 0.02, 0.05),
+        )
+        if i % 3:
+            conn.execute("INSERT INTO dividend_data VALUES (?, ?)", (t, 0.01 * (i % 8)))
+        conn.execute(
+            "INSERT INTO financial_summary VALUES (?, ?, ?, ?)",
+            (t, nullable(0.3 * (i % 5)), 0.5 + (i % 4) * 0.4, 1e8 * i),
+        )
+        conn.execute(
+            "INSERT INTO analyst_data VALUES (?, ?, ?, ?)",
+            (t, _RECS[i % 4], 20.0 + i, float(i % 6)),
+        )
+    conn.commit()
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = str(tmp_path / "screener.db")
+    conn = sqlite3.connect(path)
+    conn.executescript(_SCHEMA)
+    _seed(conn)
+    conn.close()
+    return path
+
+
+def _store(db_path: str, **kwargs) -> ScreenerSnapshotStore:
+    kwargs.setdefault("check_interval", 0)
+    kwargs.setdefault("max_age", 0)
+    return ScreenerSnapshotStore(
+        connect=lambda: sqlite3.connect(db_path), postgres=False, **kwargs
+    )
+
+
+def _rows(db_path: str, sql: str):
+    conn = sqlite3.connect(db_path)
+    conn.row_factory = sqlite3.Row
+    try:
+        return [dict(r) for r in conn.execute(sql).fetchall()]
+    finally:
+        conn.close()
+
+
+class TestScreenerSnapshotStore:
+    def test_build_matches_screener_base(self, db_path):
+        store = _store(db_path)
+        store.ensure_fresh()
+
+        expected = _rows(db_path, f"{SCREENER_BASE} ORDER BY c.ticker")
+        actual = _rows(db_path, "SELECT * FROM screener_snapshot ORDER BY ticker")
+        assert actual == expected
+        assert store.get_stats()["rows"] == len(expected) == 39
+
+    def test_sort_columns_are_indexed(self, db_path):
+        _store(db_path).ensure_fresh()
+        indexed = {
+            r["name"]
+            for r in _rows(
+                db_path,
+                "SELECT name FROM sqlite_master "
+                "WHERE type = 'index' AND tbl_name = 'screener_snapshot'",
+            )
+        }
+        for column in SCREENER_SORT_COLUMNS:
+            assert f"idx_screener_snapshot_{column}" in indexed
+
+    def test_unchanged_sources_do_not_rebuild(self, db_path):
+        store = _store(db_path)
+        store.ensure_fresh()
+        store.ensure_fresh()
+        assert store.get_stats()["rebuilds"] == 1
+
+    def test_source_write_triggers_rebuild(self, db_path):
+        store = _store(db_path)
+        store.ensure_fresh()
+
+        conn = sqlite3.connect(db_path)
+        conn.execute(
+            "UPDATE market_data SET current_price = 999 WHERE ticker = '1000.SR'"
+        )
+        conn.commit()
+        conn.close()
+
+        store.ensure_fresh()
+        assert store.get_stats()["rebuilds"] == 2
+        price = _rows(
+            db_path,
+            "SELECT current_price FROM screener_snapshot WHERE ticker = '1000.SR'",
+        )
+        assert price == [{"current_price": 999}]
+
+    def test_check_interval_skips_version_reads(self, db_path):
+        calls = []
+
+        def connect():
+            calls.append(1)
+            return sqlite3.connect(db_path)
+
+        store = ScreenerSnapshotStore(
+            connect=connect, postgres=False, check_interval=60, max_age=0
+        )
+        store.ensure_fresh()
+        store.ensure_fresh()
+        assert len(calls) == 1
+        store.mark_stale()
+        store.ensure_fresh()
+        assert len(calls) == 2
+
+    def test_failed_check_is_reported_as_unavailable(self, monkeypatch):
+        def connect():
+            raise sqlite3.OperationalError("unable to open database file")
+
+        store = ScreenerSnapshotStore(connect=connect, postgres=False)
+        monkeypatch.setattr(ss, "_store", store)
+
+        assert asyncio.run(ss.aget_screener_snapshot()) is None
+        assert store.recently_failed()
+
+
+class _RecordingConn:
+    """DB-API stand-in that records statements; pg_trigger lists ``triggered``."""
+
+    def __init__(self, triggered):
+        self.triggered = triggered
+        self.statements = []
+
+    def cursor(self):
+        conn = self
+
+        class _Cursor:
+            def execute(self, sql):
+                conn.statements.append(sql)
+                self._rows = (
+                    [(t,) for t in conn.triggered] if "pg_trigger" in sql else []
+                )
+
+            def fetchall(self):
+                return self._rows
+
+        return _Cursor()
+
+    def commit(self):
+        pass
+
+
+class TestPostgresSchema:
+    def _created_triggers(self, triggered):
+        conn = _RecordingConn(triggered)
+        store = ScreenerSnapshotStore(connect=lambda: conn, postgres=True)
+        store._create_schema(conn)
+        assert not any("DROP TRIGGER" in sql for sql in conn.statements)
+        return [sql.split()[2] for sql in conn.statements if "CREATE TRIGGER" in sql]
+
+    def test_first_start_creates_every_trigger(self):
+        created = self._created_triggers([])
+        assert created == [f"trg_screener_{t}" for t in ss.SOURCE_TABLES]
+
+    def test_existing_triggers_are_left_alone(self):
+        assert self._created_triggers(list(ss.SOURCE_TABLES)) == []
+
+    def test_only_missing_triggers_are_created(self):
+        # e.g. a loader dropped and recreated market_data
+        present = [t for t in ss.SOURCE_TABLES if t != "market_data"]
+        assert self._created_triggers(present) == ["trg_screener_market_data"]
+
+
+# ---------------------------------------------------------------------------
+# Route: snapshot path vs SCREENER_BASE path
+# ---------------------------------------------------------------------------
+
+_CASES = [
+    {},
+    {"sector": "Energy"},
+    {"pe_min": 8, "pe_max": 18, "sort_by": "trailing_pe", "sort_dir": "asc"},
+    {"recommendation": "BUY", "sort_by": "change_pct"},
+    {"dividend_yield_min": 0.02, "roe_max": 0.1, "sort_by": "ticker"},
+    {"market_cap_min": 1e9, "debt_to_equity_max": 0.6, "current_ratio_min": 0.9},
+    {"revenue_growth_min": 0.0, "pb_min": 1.2, "pb_max": 2.0, "sort_by": "sector"},
+    {"sort_by": "analyst_count", "limit": 7, "offset": 14},
+    {"limit": 10, "offset": 500},
+]
+
+
+@pytest.fixture
+def route_db(db_path, monkeypatch):
+    import api.async_db as async_db
+    import api.db_helper as db_helper
+    import services.sqlite_pool as sqlite_pool
+
+    # Route reads go through the SQLite pool on the test database
+    monkeypatch.setattr(db_helper, "_DB_BACKEND", "sqlite")
+    monkeypatch.setattr(async_db, "get_executor", lambda: None)
+    monkeypatch.setattr(sqlite_pool, "_pool", sqlite_pool.SQLitePool(db_path, 2))
+    store = _store(db_path)
+    store.ensure_fresh()
+    return store
+
+
+class TestReadSourceVersion:
+    def test_follows_source_writes(self, route_db, db_path):
+        before = ss.read_source_version()
+        assert before is not None
+
+        conn = sqlite3.connect(db_path)
+        conn.execute("UPDATE companies SET sector = 'Banks' WHERE ticker = '1001.SR'")
+        conn.commit()
+        conn.close()
+        assert ss.read_source_version() == before + 1
+
+    def test_missing_meta_table_is_none(self, db_path, monkeypatch):
+        import api.db_helper as db_helper
+        import services.sqlite_pool as sqlite_pool
+
+        monkeypatch.setattr(db_helper, "_DB_BACKEND", "sqlite")
+        monkeypatch.setattr(sqlite_pool, "_pool", sqlite_pool.SQLitePool(db_path, 1))
+        assert ss.read_source_version() is None
+
+
+def _search(store, monkeypatch, **kwargs):
+    from api.routes.screener import ScreenerFilters, search_stocks
+
+    monkeypatch.setattr(ss, "_store", store)
+    return asyncio.run(search_stocks(ScreenerFilters(**kwargs)))
+
+
+class TestScreenerRouteSnapshot:
+    @pytest.mark.parametrize("case", _CASES, ids=lambda c: ",".join(c) or "none")
+    def test_snapshot_matches_join(self, route_db, monkeypatch, case):
+        from_join = _search(None, monkeypatch, **case)
+        from_snapshot = _search(route_db, monkeypatch, **case)
+        assert from_snapshot == from_join
+
+    def test_paging_through_everything_is_complete(self, route_db, monkeypatch):
+        seen = []
+        offset = 0
+        while True:
+            page = _search(route_db, monkeypatch, limit=6, offset=offset)
+            if not page.items:
+                break
+            seen.extend(item.ticker for item in page.items)
+            offset += 6
+        assert len(seen) == len(set(seen)) == page.total_count == 39
+
+    def test_total_count_past_the_last_page(self, route_db, monkeypatch):
+        page = _search(route_db, monkeypatch, sector="Banks", offset=100)
+        assert page.items == []
+        assert page.total_count == 10
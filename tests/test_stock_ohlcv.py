@@ -10,10 +10,14 @@ Covers:
   exception fallback, stale-cache fallback, mock fallback
 - get_cache_status
 - get_circuit_breaker_status
-- _get_ticker_lock (lock creation, LRU eviction at MAX_LOCKS)
+- single-flight coalescing (sync/async callers, stale serving, stats)
+- stale-while-revalidate (soft/hard TTL, background refresh priority)
+- fetch_stock_ohlcv_batch (multi-symbol download split into per-ticker cache)
 """
 
+import asyncio
 import sys
+import threading
 import time
 from datetime import datetime
 from pathlib import Path
@@ -30,17 +34,19 @@ if str(PROJECT_ROOT) not in sys.path:
 # Module-level imports (after path setup)
 # ---------------------------------------------------------------------------
 import services.stock_ohlcv as ohlcv_mod  # noqa: E402
+from services.yfinance_base import RefreshPool, SingleFlight, YFinanceCache  # noqa: E402
 from services.stock_ohlcv import (  # noqa: E402
     _normalize_ticker,
     _generate_mock_data,
-    _get_ticker_lock,
     _get_cached,
     _get_stale_cached,
     _set_cache,
     _is_circuit_open,
     _record_failure,
     _record_success,
+    afetch_stock_ohlcv,
     fetch_stock_ohlcv,
+    fetch_stock_ohlcv_batch,
     get_stock_ohlcv,
     get_cache_status,
     get_circuit_breaker_status,
@@ -72,19 +78,20 @@ def _make_ohlcv_df(n_rows: int = 5) -> pd.DataFrame:
 
 @pytest.fixture(autouse=True)
 def _reset_module_state():
-    """Reset the module-level cache, circuit breaker, and lock dict before each test."""
+    """Reset the module-level cache, circuit breaker, and single-flight before each test."""
     ohlcv_mod._cache.clear()
 
     # Reset circuit breaker by patching internal state directly
     ohlcv_mod._breaker._consecutive_failures = 0
     ohlcv_mod._breaker._open_until = 0.0
 
-    # Clear the ticker locks dict
-    with ohlcv_mod._locks_guard:
-        ohlcv_mod._ticker_locks.clear()
+    ohlcv_mod._flight = SingleFlight(name="stock_ohlcv")
 
     yield
 
+    # Let background revalidations finish before the next test's patches
+    ohlcv_mod._refresher.wait_idle(5)
+
 
 # ===========================================================================
 # 1. Ticker normalization
@@ -275,40 +282,414 @@ class TestCircuitBreakerHelpers:
 
 
 # ===========================================================================
-# 6. Ticker lock helpers
+# 6. Single-flight coalescing
+# ===========================================================================
+
+
+def _slow_ticker(df, gate: threading.Event, calls: list):
+    """Return a yf.Ticker stand-in whose history() blocks until *gate* is set."""
+
+    def _history(**kwargs):
+        calls.append(kwargs)
+        gate.wait(5)
+        return df
+
+    ticker = MagicMock()
+    ticker.history.side_effect = _history
+    return ticker
+
+
+class TestSingleFlight:
+    def test_concurrent_sync_callers_share_one_fetch(self):
+        gate, calls = threading.Event(), []
+        mock_yf = MagicMock()
+        mock_yf.Ticker.return_value = _slow_ticker(_make_ohlcv_df(), gate, calls)
+        results = []
+
+        with patch.dict("sys.modules", {"yfinance": mock_yf}):
+            threads = [
+                threading.Thread(
+                    target=lambda: results.append(fetch_stock_ohlcv("2222", "1y"))
+                )
+                for _ in range(8)
+            ]
+            for t in threads:
+                t.start()
+            while ohlcv_mod._flight.get_stats()["coalesced"] < 7:
+                time.sleep(0.005)
+            gate.set()
+            for t in threads:
+                t.join(5)
+
+        assert len(calls) == 1
+        assert len(results) == 8
+        assert all(r is results[0] for r in results)
+        stats = get_cache_status()["singleflight"]
+        assert stats["executions"] == 1
+        assert stats["coalesced"] == 7
+        assert stats["in_flight"] == 0
+
+    @pytest.mark.asyncio
+    async def test_async_and_sync_callers_share_one_fetch(self):
+        gate, calls = threading.Event(), []
+        mock_yf = MagicMock()
+        mock_yf.Ticker.return_value = _slow_ticker(_make_ohlcv_df(), gate, calls)
+
+        with patch.dict("sys.modules", {"yfinance": mock_yf}):
+            tasks = [
+                asyncio.ensure_future(afetch_stock_ohlcv("2222", "1y"))
+                for _ in range(5)
+            ]
+            tasks.append(
+                asyncio.ensure_future(asyncio.to_thread(fetch_stock_ohlcv, "2222"))
+            )
+            while ohlcv_mod._flight.get_stats()["coalesced"] < 5:
+                await asyncio.sleep(0.005)
+            gate.set()
+            results = await asyncio.gather(*tasks)
+
+        assert len(calls) == 1
+        assert {r["source"] for r in results} == {"real"}
+
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_does_not_cancel_fetch(self):
+        gate, calls = threading.Event(), []
+        mock_yf = MagicMock()
+        mock_yf.Ticker.return_value = _slow_ticker(_make_ohlcv_df(), gate, calls)
+
+        with patch.dict("sys.modules", {"yfinance": mock_yf}):
+            first = asyncio.ensure_future(afetch_stock_ohlcv("2222", "1y"))
+            second = asyncio.ensure_future(afetch_stock_ohlcv("2222", "1y"))
+            while ohlcv_mod._flight.get_stats()["coalesced"] < 1:
+                await asyncio.sleep(0.005)
+            first.cancel()
+            gate.set()
+            result = await second
+
+        assert result["source"] == "real"
+        assert first.cancelled()
+
+    def test_stale_value_served_while_fetch_in_flight(self):
+        flight = SingleFlight(name="test")
+        gate = threading.Event()
+        leader = threading.Thread(target=flight.do, args=("k", lambda: gate.wait(5)))
+        leader.start()
+        while not flight.in_flight("k"):
+            time.sleep(0.005)
+
+        assert flight.do("k", lambda: "fresh", stale="old") == "old"
+        assert flight.get_stats()["stale_served"] == 1
+
+        gate.set()
+        leader.join(5)
+        assert flight.do("k", lambda: "fresh", stale="old") == "fresh"
+
+    def test_leader_exception_propagates_to_followers(self):
+        flight = SingleFlight(name="test")
+        gate = threading.Event()
+        errors = []
+
+        def boom():
+            gate.wait(5)
+            raise ValueError("upstream down")
+
+        def call():
+            try:
+                flight.do("k", boom)
+            except ValueError as exc:
+                errors.append(exc)
+
+        threads = [threading.Thread(target=call) for _ in range(3)]
+        for t in threads:
+            t.start()
+        while flight.get_stats()["coalesced"] < 2:
+            time.sleep(0.005)
+        gate.set()
+        for t in threads:
+            t.join(5)
+
+        assert len(errors) == 3
+        assert not flight.in_flight("k")
+
+
+# ===========================================================================
+# 6b. Stale-while-revalidate
 # ===========================================================================
 
 
-class TestGetTickerLock:
-    def test_returns_lock_object(self):
-        lock = _get_ticker_lock("2222.SR", "1y")
-        # threading.Lock() returns an instance of _thread.lock; check via acquire/release
-        assert hasattr(lock, "acquire") and hasattr(lock, "release")
+def _age_entry(symbol: str, period: str, seconds: float) -> None:
+    with ohlcv_mod._cache._lock:
+        ohlcv_mod._cache._store[(symbol, period)]["fetched_at"] = (
+            time.monotonic() - seconds
+        )
+
+
+_OLD_PAYLOAD = {
+    "data": [],
+    "source": "real",
+    "last_updated": "2024-01-01T00:00:00Z",
+    "symbol": "2222.SR",
+    "period": "1y",
+    "count": 0,
+}
+
 
-    def test_same_key_returns_same_lock(self):
-        lock1 = _get_ticker_lock("2222.SR", "1y")
-        lock2 = _get_ticker_lock("2222.SR", "1y")
-        assert lock1 is lock2
+class TestStaleWhileRevalidate:
+    def test_soft_expired_entry_served_and_refreshed(self):
+        _set_cache("2222.SR", "1y", dict(_OLD_PAYLOAD))
+        _age_entry("2222.SR", "1y", ohlcv_mod._cache.ttl + 10)
 
-    def test_different_key_returns_different_lock(self):
-        lock1 = _get_ticker_lock("2222.SR", "1y")
-        lock2 = _get_ticker_lock("1120.SR", "1y")
-        assert lock1 is not lock2
+        gate, calls = threading.Event(), []
+        mock_yf = MagicMock()
+        mock_yf.Ticker.return_value = _slow_ticker(_make_ohlcv_df(), gate, calls)
+        with patch.dict("sys.modules", {"yfinance": mock_yf}):
+            result = fetch_stock_ohlcv("2222", "1y")
+            # Served from cache without waiting for the (blocked) refresh
+            assert result["source"] == "cached"
+            assert result["last_updated"] == "2024-01-01T00:00:00Z"
+            gate.set()
+            assert ohlcv_mod._refresher.wait_idle(5)
+
+        assert len(calls) == 1
+        assert _get_cached("2222.SR", "1y")["source"] == "real"
+        assert get_cache_status()["refresh"]["completed"] >= 1
+
+    @pytest.mark.asyncio
+    async def test_async_path_serves_stale(self):
+        _set_cache("2222.SR", "1y", dict(_OLD_PAYLOAD))
+        _age_entry("2222.SR", "1y", ohlcv_mod._cache.ttl + 10)
+
+        mock_yf = MagicMock()
+        mock_yf.Ticker.return_value.history.return_value = _make_ohlcv_df()
+        with patch.dict("sys.modules", {"yfinance": mock_yf}):
+            result = await afetch_stock_ohlcv("2222", "1y")
+            await asyncio.to_thread(ohlcv_mod._refresher.wait_idle, 5)
+
+        assert result["source"] == "cached"
+        assert _get_cached("2222.SR", "1y")["source"] == "real"
+
+    def test_hard_expired_entry_fetched_in_foreground(self):
+        _set_cache("2222.SR", "1y", dict(_OLD_PAYLOAD))
+        _age_entry("2222.SR", "1y", ohlcv_mod._cache.hard_ttl + 10)
+
+        submitted = ohlcv_mod._refresher.get_stats()["submitted"]
+        mock_yf = MagicMock()
+        mock_yf.Ticker.return_value.history.return_value = _make_ohlcv_df()
+        with patch.dict("sys.modules", {"yfinance": mock_yf}):
+            result = fetch_stock_ohlcv("2222", "1y")
 
-    def test_evicts_oldest_at_max_locks(self):
-        max_locks = ohlcv_mod._MAX_LOCKS
-        # Fill to capacity
-        for i in range(max_locks):
-            _get_ticker_lock(f"T{i:04d}.SR", "1y")
+        assert result["source"] == "real"
+        assert ohlcv_mod._refresher.get_stats()["submitted"] == submitted
+
+    def test_stale_priority_counts_hits_within_window(self):
+        cache = YFinanceCache(ttl=10, hard_ttl=100)
+        cache.put("k", {"v": 1})
+        assert cache.stale_priority("k") is None  # still fresh
+        cache.get("k")
+        with cache._lock:
+            cache._store["k"]["fetched_at"] -= 50
+        assert cache.stale_priority("k") == 2
+        with cache._lock:
+            cache._store["k"]["fetched_at"] -= 100
+        assert cache.stale_priority("k") is None
+        # Hit counts survive a refresh
+        cache.put("k", {"v": 2})
+        assert cache["k"]["hits"] == 2
+
+    def test_stale_priority_disabled_without_hard_ttl(self):
+        cache = YFinanceCache(ttl=10)
+        cache.put("k", {"v": 1})
+        with cache._lock:
+            cache._store["k"]["fetched_at"] -= 50
+        assert cache.stale_priority("k") is None
+
+
+class TestRefreshPool:
+    def _blocked_pool(self, **kwargs):
+        pool = RefreshPool(max_workers=1, name="test", **kwargs)
+        gate = threading.Event()
+        pool.submit("blocker", lambda: gate.wait(5), priority=0)
+        while pool.get_stats()["running"] == 0:
+            time.sleep(0.005)
+        return pool, gate
+
+    def test_hot_keys_refreshed_first(self):
+        pool, gate = self._blocked_pool()
+        order = []
+        for key, hits in [("cold", 1), ("hot", 50), ("warm", 5)]:
+            pool.submit(key, lambda k=key: order.append(k), priority=hits)
+        gate.set()
+        assert pool.wait_idle(5)
+        assert order == ["hot", "warm", "cold"]
+        pool.shutdown()
+
+    def test_duplicate_keys_not_queued_twice(self):
+        pool, gate = self._blocked_pool()
+        calls = []
+        assert pool.submit("k", lambda: calls.append(1), priority=1)
+        assert pool.submit("k", lambda: calls.append(2), priority=3)
+        assert pool.submit("blocker", lambda: calls.append(3))
+        gate.set()
+        assert pool.wait_idle(5)
+        assert calls == [2]
+        assert pool.get_stats()["deduplicated"] == 2
+        pool.shutdown()
+
+    def test_full_queue_displaces_colder_keys(self):
+        pool, gate = self._blocked_pool(max_pending=2)
+        done = []
+        pool.submit("a", lambda: done.append("a"), priority=1)
+        pool.submit("b", lambda: done.append("b"), priority=5)
+        assert pool.submit("c", lambda: done.append("c"), priority=0) is False
+        assert pool.submit("d", lambda: done.append("d"), priority=9) is True
+        gate.set()
+        assert pool.wait_idle(5)
+        assert done == ["d", "b"]
+        assert pool.get_stats()["dropped"] == 2
+        pool.shutdown()
+
+    def test_failed_refresh_counted(self):
+        pool = RefreshPool(max_workers=1, name="test")
+
+        def boom():
+            raise RuntimeError("down")
+
+        pool.submit("k", boom)
+        assert pool.wait_idle(5)
+        assert pool.get_stats()["failed"] == 1
+        pool.shutdown()
+        assert pool.submit("k", boom) is False
+
+
+# ===========================================================================
+# 6c. Batched multi-ticker fetch
+# ===========================================================================
 
-        with ohlcv_mod._locks_guard:
-            assert len(ohlcv_mod._ticker_locks) == max_locks
 
-        # Adding one more should evict the oldest
-        _get_ticker_lock("OVERFLOW.SR", "1y")
-        with ohlcv_mod._locks_guard:
-            assert len(ohlcv_mod._ticker_locks) == max_locks
-            assert "T0000.SR:1y" not in ohlcv_mod._ticker_locks
+def _download_frame(symbols, n_rows: int = 5, missing=()) -> pd.DataFrame:
+    """Build a yf.download(group_by="ticker")-shaped frame for *symbols*."""
+    frames = {}
+    for i, symbol in enumerate(symbols):
+        if symbol in missing:
+            continue
+        df = _make_ohlcv_df(n_rows) + i
+        frames[symbol] = df
+    return pd.concat(frames, axis=1)
+
+
+class StubDownloader:
+    """Local stand-in for yf.download that records each batch request."""
+
+    def __init__(self, missing=(), fail_batches=()):
+        self.calls = []
+        self.missing = set(missing)
+        self.fail_batches = set(fail_batches)
+
+    def __call__(self, symbols, period):
+        self.calls.append(list(symbols))
+        if len(self.calls) - 1 in self.fail_batches:
+            raise ConnectionError("network down")
+        return _download_frame(symbols, missing=self.missing)
+
+
+class TestFetchStockOhlcvBatch:
+    def test_fills_cache_with_one_request_per_batch(self):
+        tickers = [f"{1000 + i}" for i in range(7)]
+        stub = StubDownloader()
+        filled = fetch_stock_ohlcv_batch(tickers, "1y", batch_size=3, downloader=stub)
+
+        assert [len(c) for c in stub.calls] == [3, 3, 1]
+        assert len(filled) == 7
+        for i, t in enumerate(tickers):
+            cached = _get_cached(f"{t}.SR", "1y")
+            assert cached["source"] == "real"
+            assert cached["count"] == 5
+            assert cached["data"][0]["close"] == 102.0 + (i % 3)
+
+    def test_batch_payload_matches_single_fetch(self):
+        stub = StubDownloader()
+        batch = fetch_stock_ohlcv_batch(["2222"], "1y", downloader=stub)["2222.SR"]
+        ohlcv_mod._cache.clear()
+
+        mock_yf = MagicMock()
+        mock_yf.Ticker.return_value.history.return_value = _make_ohlcv_df()
+        with patch.dict("sys.modules", {"yfinance": mock_yf}):
+            single = fetch_stock_ohlcv("2222", "1y")
+
+        assert batch["data"] == single["data"]
+        assert set(batch) == set(single)
+
+    def test_skips_fresh_entries_unless_forced(self):
+        stub = StubDownloader()
+        fetch_stock_ohlcv_batch(["2222", "1120"], "1y", downloader=stub)
+        assert fetch_stock_ohlcv_batch(["2222", "1120"], "1y", downloader=stub) == {}
+        assert len(stub.calls) == 1
+
+        refreshed = fetch_stock_ohlcv_batch(
+            ["2222", "1120"], "1y", downloader=stub, force=True
+        )
+        assert len(refreshed) == 2
+        assert len(stub.calls) == 2
+
+    def test_servable_for_skips_entries_served_while_revalidating(self):
+        stub = StubDownloader()
+        fetch_stock_ohlcv_batch(["2222", "1120"], "1y", downloader=stub)
+        ohlcv_mod._cache[("2222.SR", "1y")]["fetched_at"] -= 1000
+        ohlcv_mod._cache[("1120.SR", "1y")]["fetched_at"] -= 3300
+
+        filled = fetch_stock_ohlcv_batch(
+            ["2222", "1120", "2010"], "1y", downloader=stub, servable_for=600
+        )
+        assert set(filled) == {"1120.SR", "2010.SR"}
+        assert stub.calls[-1] == ["1120.SR", "2010.SR"]
+
+    def test_missing_symbols_and_sparse_rows(self):
+        stub = StubDownloader(missing={"1120.SR"})
+        df = _download_frame(["2222.SR", "2010.SR"])
+        # Dates one symbol did not trade on are NaN in the aligned frame
+        df.loc[df.index[0], ("2010.SR", "Close")] = float("nan")
+        df.loc[df.index[1], ("2010.SR", "Volume")] = float("nan")
+        frames = ohlcv_mod._split_download(df, ["2222.SR", "2010.SR"])
+        assert len(frames["2222.SR"]) == 5
+        assert len(frames["2010.SR"]) == 4
+
+        filled = fetch_stock_ohlcv_batch(["2222", "1120"], "1y", downloader=stub)
+        assert set(filled) == {"2222.SR"}
+        assert _get_cached("1120.SR", "1y") is None
+
+    def test_failed_batch_does_not_stop_others(self):
+        stub = StubDownloader(fail_batches={0})
+        filled = fetch_stock_ohlcv_batch(
+            ["1", "2", "3", "4"], "1y", batch_size=2, downloader=stub
+        )
+        assert set(filled) == {"3.SR", "4.SR"}
+        # The successful batch reset the failure streak
+        assert get_circuit_breaker_status()["consecutive_failures"] == 0
+
+    def test_circuit_open_skips_download(self):
+        for _ in range(ohlcv_mod._breaker.threshold):
+            _record_failure()
+        stub = StubDownloader()
+        assert fetch_stock_ohlcv_batch(["2222"], "1y", downloader=stub) == {}
+        assert stub.calls == []
+
+    def test_stop_event_aborts_between_batches(self):
+        stop = threading.Event()
+        stub = StubDownloader()
+
+        def stopping(symbols, period):
+            stop.set()
+            return stub(symbols, period)
+
+        filled = fetch_stock_ohlcv_batch(
+            ["1", "2", "3"], "1y", batch_size=1, downloader=stopping, stop_event=stop
+        )
+        assert filled == {}
+        assert len(stub.calls) == 1
+
+    def test_invalid_period_rejected(self):
+        with pytest.raises(ValueError):
+            fetch_stock_ohlcv_batch(["2222"], "10y", downloader=StubDownloader())
 
 
 # ===========================================================================
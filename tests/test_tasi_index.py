@@ -181,6 +181,7 @@ class TestFetchTasiIndex(unittest.TestCase):
         mock_yf.Ticker.side_effect = Exception("down")
         with patch.dict("sys.modules", {"yfinance": mock_yf}):
             result = mod.fetch_tasi_index("6mo")
+            mod._refresher.wait_idle(5)
 
         self.assertEqual(result["source"], "cached")
 
@@ -286,6 +287,44 @@ class TestThreadSafety(unittest.TestCase):
         for r in results[1:]:
             self.assertEqual(r["data"], first_data)
 
+    def test_concurrent_misses_share_one_yfinance_call(self):
+        """Concurrent cache misses for one period coalesce into a single fetch."""
+        import threading
+
+        import services.tasi_index as mod
+
+        gate = threading.Event()
+        calls = []
+
+        def _history(**kwargs):
+            calls.append(kwargs)
+            gate.wait(5)
+            return pd.DataFrame(
+                {
+                    "Open": [1.0],
+                    "High": [2.0],
+                    "Low": [0.5],
+                    "Close": [1.5],
+                    "Volume": [100],
+                },
+                index=pd.DatetimeIndex(["2024-01-02"], name="Date"),
+            )
+
+        mock_yf = MagicMock()
+        mock_yf.Ticker.return_value.history.side_effect = _history
+        coalesced_before = mod._flight.get_stats()["coalesced"]
+
+        with patch.dict("sys.modules", {"yfinance": mock_yf}):
+            with concurrent.futures.ThreadPoolExecutor(max_workers=6) as pool:
+                futures = [pool.submit(mod.fetch_tasi_index, "6mo") for _ in range(6)]
+                while mod._flight.get_stats()["coalesced"] - coalesced_before < 5:
+                    time.sleep(0.005)
+                gate.set()
+                results = [f.result() for f in futures]
+
+        self.assertEqual(len(calls), 1)
+        self.assertTrue(all(r["source"] == "real" for r in results))
+
 
 class TestStructuredLogging(unittest.TestCase):
     """Verify that fetch_tasi_index emits structured log messages."""
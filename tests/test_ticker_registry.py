@@ -0,0 +1,245 @@
+"""
+Tests for services/ticker_registry.py and the per-stock routes that use it.
+
+Route tests count database calls: with the registry warm, a registry hit
+replaces the COMPANY_EXISTS round-trip, and the trend endpoint's three
+statement queries run as a single batch.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import sqlite3
+import sys
+from pathlib import Path
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from services import ticker_registry as tr  # noqa: E402
+from services.ticker_registry import TickerRegistryStore  # noqa: E402
+
+_ROWS = [
+    {"ticker": "2222.SR", "sector": "Energy", "market_cap": 7e12},
+    {"ticker": "1120.SR", "sector": "Banks", "market_cap": None},
+    {"ticker": "4321.SR", "sector": None, "market_cap": 1e9},
+]
+
+
+def _store(rows=None, **kwargs) -> TickerRegistryStore:
+    calls = []
+
+    def loader():
+        calls.append(1)
+        return list(_ROWS if rows is None else rows)
+
+    store = TickerRegistryStore(loader=loader, **kwargs)
+    store.loads = calls
+    return store
+
+
+class TestTickerRegistryStore:
+    def test_lookup(self):
+        registry = _store().refresh()
+        assert "2222.SR" in registry
+        assert "9999.SR" not in registry
+        assert registry.get("2222.SR") == ("Energy", 7e12)
+        assert registry.get("1120.SR").market_cap is None
+        assert registry.size == 3
+
+    def test_fresh_registry_is_reused(self):
+        store = _store(max_age=0)
+        store.refresh()
+        assert asyncio.run(store.aget()) is store.peek()
+        assert len(store.loads) == 1
+
+    def test_bump_version_rebuilds(self):
+        store = _store(max_age=0)
+        first = store.refresh()
+        store.bump_version()
+        assert store.peek() is None
+        assert store.refresh() is not first
+        assert store.get_stats()["rebuilds"] == 2
+
+    def test_new_listing_is_picked_up_when_the_data_version_moves(self):
+        rows = list(_ROWS)
+        source = {"version": 1}
+        store = _store(
+            rows,
+            max_age=0,
+            source_version=lambda: source["version"],
+            check_interval=0,
+        )
+        assert "1211.SR" not in asyncio.run(store.aget())
+
+        # An offline loader adds a company; its trigger bumps the version
+        rows.append({"ticker": "1211.SR", "sector": "Materials", "market_cap": 2e11})
+        assert "1211.SR" not in asyncio.run(store.aget())
+        source["version"] += 1
+        assert asyncio.run(store.aget()).get("1211.SR") == ("Materials", 2e11)
+
+    def test_failed_load_reports_none(self, monkeypatch):
+        def loader():
+            raise sqlite3.OperationalError("no such table: companies")
+
+        monkeypatch.setattr(tr, "_store", TickerRegistryStore(loader=loader))
+        assert asyncio.run(tr.aget_ticker_registry()) is None
+
+
+# ---------------------------------------------------------------------------
+# Routes
+# ---------------------------------------------------------------------------
+
+
+@pytest.fixture
+def warm_registry(monkeypatch):
+    store = _store(max_age=0)
+    store.refresh()
+    monkeypatch.setattr(tr, "_store", store)
+    return store
+
+
+def _client(router) -> TestClient:
+    app = FastAPI()
+    app.include_router(router)
+    return TestClient(app)
+
+
+class TestStockDataRoutes:
+    @patch("api.routes.stock_data.afetchone", new_callable=AsyncMock)
+    def test_registry_hit_skips_exists_query(self, mock_fetchone, warm_registry):
+        from api.routes.stock_data import router
+
+        mock_fetchone.return_value = None
+        resp = _client(router).get("/api/v1/stocks/2222.SR/dividends")
+        assert resp.status_code == 200
+        # Only DIVIDEND_DATA_BY_TICKER; no COMPANY_EXISTS
+        assert mock_fetchone.await_count == 1
+
+    @patch("api.routes.stock_data.afetchone", new_callable=AsyncMock)
+    def test_registry_miss_falls_back_to_sql(self, mock_fetchone, warm_registry):
+        from api.routes.stock_data import router
+
+        mock_fetchone.side_effect = [{"1": 1}, None]
+        resp = _client(router).get("/api/v1/stocks/5555.SR/summary")
+        assert resp.status_code == 200
+        assert mock_fetchone.await_count == 2
+
+        mock_fetchone.side_effect = [None]
+        resp = _client(router).get("/api/v1/stocks/5556.SR/summary")
+        assert resp.status_code == 404
+
+    @patch("api.routes.stock_data.afetchall_many", new_callable=AsyncMock)
+    @patch("api.routes.stock_data.afetchone", new_callable=AsyncMock)
+    def test_trend_is_one_batched_call(self, mock_fetchone, mock_many, warm_registry):
+        from api.routes.stock_data import _TREND_METRICS, router
+
+        mock_many.return_value = [[], [{"period_date": "2024", "total_assets": 5}], []]
+        resp = _client(router).get("/api/v1/stocks/2222.SR/financials/trend")
+        assert resp.status_code == 200
+        assert [m["name"] for m in resp.json()["metrics"]] == ["Total Assets"]
+        mock_fetchone.assert_not_awaited()
+        mock_many.assert_awaited_once()
+        (statements,), _ = mock_many.await_args
+        assert len(statements) == len(_TREND_METRICS)
+
+
+class TestStockPeersRoute:
+    @pytest.fixture(autouse=True)
+    def _no_response_cache(self):
+        # get_stock_peers is wrapped in cache_response
+        with patch("services.cache_utils._cache_get", return_value=None):
+            yield
+
+    @patch("api.routes.stock_peers.afetchall", new_callable=AsyncMock)
+    @patch("api.routes.stock_peers.afetchone", new_callable=AsyncMock)
+    def test_registry_hit_runs_only_peer_query(
+        self, mock_fetchone, mock_fetchall, warm_registry
+    ):
+        from api.routes.stock_peers import router
+
+        mock_fetchall.return_value = [{"ticker": "2030.SR", "sector": "Energy"}]
+        resp = _client(router).get("/api/v1/stocks/2222.SR/peers?limit=3")
+        assert resp.status_code == 200
+        assert resp.json()["sector"] == "Energy"
+        mock_fetchone.assert_not_awaited()
+        (_, params), _ = mock_fetchall.await_args
+        assert params == ("Energy", "2222.SR", 7e12, 3)
+
+    @patch("api.routes.stock_peers.afetchall", new_callable=AsyncMock)
+    @patch("api.routes.stock_peers.afetchone", new_callable=AsyncMock)
+    def test_registry_miss_uses_one_lookup(
+        self, mock_fetchone, mock_fetchall, warm_registry
+    ):
+        from api.routes.stock_peers import router
+
+        mock_fetchone.return_value = {"sector": "Banks", "market_cap": 5e10}
+        mock_fetchall.return_value = []
+        resp = _client(router).get("/api/v1/stocks/6666.SR/peers")
+        assert resp.status_code == 200
+        assert mock_fetchone.await_count == 1
+
+        mock_fetchone.return_value = None
+        resp = _client(router).get("/api/v1/stocks/6667.SR/peers")
+        assert resp.status_code == 404
+
+    @patch("api.routes.stock_peers.afetchall", new_callable=AsyncMock)
+    @patch("api.routes.stock_peers.afetchone", new_callable=AsyncMock)
+    def test_no_sector_returns_empty(self, mock_fetchone, mock_fetchall, warm_registry):
+        from api.routes.stock_peers import router
+
+        resp = _client(router).get("/api/v1/stocks/4321.SR/peers")
+        assert resp.status_code == 200
+        assert resp.json()["peers"] == []
+        mock_fetchall.assert_not_awaited()
+
+
+# ---------------------------------------------------------------------------
+# db_helper.afetchall_many
+# ---------------------------------------------------------------------------
+
+
+class TestFetchallMany:
+    def test_runs_batch_on_one_pooled_connection(self, tmp_path, monkeypatch):
+        import api.async_db as async_db
+        import api.db_helper as db_helper
+        import services.sqlite_pool as sqlite_pool
+
+        path = str(tmp_path / "batch.db")
+        conn = sqlite3.connect(path)
+        conn.executescript(
+            "CREATE TABLE a (x INTEGER); INSERT INTO a VALUES (1), (2);"
+            "CREATE TABLE b (y TEXT); INSERT INTO b VALUES ('z');"
+        )
+        conn.commit()
+        conn.close()
+
+        pool = sqlite_pool.SQLitePool(path, 2)
+        checkouts = []
+        original = pool.connection
+
+        def counting_connection():
+            checkouts.append(1)
+            return original()
+
+        monkeypatch.setattr(pool, "connection", counting_connection)
+        monkeypatch.setattr(db_helper, "_DB_BACKEND", "sqlite")
+        monkeypatch.setattr(async_db, "get_executor", lambda: None)
+        monkeypatch.setattr(sqlite_pool, "_pool", pool)
+
+        results = asyncio.run(
+            db_helper.afetchall_many(
+                [
+                    ("SELECT x FROM a WHERE x >= ? ORDER BY x", (1,)),
+                    ("SELECT y FROM b", None),
+                ]
+            )
+        )
+        assert results == [[{"x": 1}, {"x": 2}], [{"y": "z"}]]
+        assert len(checkouts) == 1
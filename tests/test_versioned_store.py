@@ -0,0 +1,105 @@
+"""
+Tests for services/versioned_store.py (the rebuild-on-demand store behind
+the market snapshot and the ticker registry).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from services.versioned_store import VersionedStore  # noqa: E402
+
+
+class _Value:
+    def __init__(self, rows, version):
+        self.rows = rows
+        self.version = version
+        self.built_at = time.monotonic()
+
+
+class _Store(VersionedStore[_Value]):
+    name = "Test store"
+
+    def build(self, rows, version):
+        return _Value(rows, version)
+
+
+def _store(**kwargs):
+    loads = []
+
+    def loader():
+        loads.append(1)
+        return [{"n": len(loads)}]
+
+    store = _Store(loader, **kwargs)
+    store.loads = loads
+    return store
+
+
+class TestVersionedStore:
+    def test_source_version_is_polled_at_most_every_interval(self):
+        reads = []
+
+        def source():
+            reads.append(1)
+            return 1
+
+        store = _store(max_age=0, source_version=source, check_interval=60)
+        for _ in range(5):
+            asyncio.run(store.aget())
+        # One read when building, one poll, then nothing within the interval
+        assert len(reads) == 2
+        assert len(store.loads) == 1
+
+    def test_write_during_rebuild_triggers_another(self):
+        source = {"version": 1}
+        store = _store(
+            max_age=0, source_version=lambda: source["version"], check_interval=0
+        )
+
+        def loader():
+            store.loads.append(1)
+            source["version"] += 1  # a load lands while we read the rows
+            return []
+
+        store._loader = loader
+        store.get()
+        store.get()
+        assert len(store.loads) == 2
+
+    def test_unavailable_source_falls_back_to_max_age(self):
+        def source():
+            raise RuntimeError("no such table: screener_snapshot_meta")
+
+        store = _store(max_age=60, source_version=source, check_interval=0)
+        first = store.get()
+        assert store.get() is first
+        first.built_at -= 120
+        assert store.get() is not first
+
+    def test_concurrent_refreshes_build_once(self):
+        store = _store(max_age=0)
+        threads = [threading.Thread(target=store.get) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert len(store.loads) == 1
+        assert store.get_stats()["rebuilds"] == 1
+
+    def test_subclass_without_build_cannot_be_created(self):
+        class Incomplete(VersionedStore[_Value]):
+            pass
+
+        with pytest.raises(TypeError):
+            Incomplete(lambda: [], max_age=0)
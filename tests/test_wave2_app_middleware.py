@@ -1,7 +1,7 @@
 """
 Wave 2 coverage tests for:
   - app.py (FastAPI assembly, lifespan, routes, JWTUserResolver, SystemPromptBuilder)
-  - backend/middleware/rate_limiter.py (sliding window, cleanup, Redis fallback)
+  - backend/middleware/rate_limiter.py (sliding window, cleanup, GCRA/Redis, fallback)
   - backend/middleware/cost_controller.py (cost calc, limits, Redis fallback)
   - backend/services/cache/compression.py (compress/decompress, middleware)
 
@@ -42,6 +42,16 @@ from backend.services.cache.compression import (  # noqa: E402
 # =========================================================================
 
 
+def _redis_limiter(lease=0.1, **script_kwargs):
+    """RateLimiter wired to a mock async Redis whose GCRA script is an AsyncMock."""
+    limiter = RateLimiter(lease_fraction=lease)
+    limiter._redis = MagicMock()
+    limiter._redis.aclose = AsyncMock()
+    limiter._redis_healthy = True
+    limiter._script = AsyncMock(**script_kwargs)
+    return limiter, limiter._script
+
+
 class TestRateLimiterCleanup:
     """Cover cleanup logic, edge cases, and close with mock Redis."""
 
@@ -84,37 +94,32 @@ class TestRateLimiterCleanup:
     def test_close_with_mock_redis(self):
         limiter = RateLimiter()
         mock_redis = MagicMock()
+        mock_redis.aclose = AsyncMock()
         limiter._redis = mock_redis
 
         limiter.close()
 
-        mock_redis.close.assert_called_once()
+        mock_redis.aclose.assert_awaited_once()
         assert limiter._redis is None
 
     def test_close_redis_error_still_clears(self):
         limiter = RateLimiter()
         mock_redis = MagicMock()
-        mock_redis.close.side_effect = ConnectionError("closed")
+        mock_redis.aclose = AsyncMock(side_effect=ConnectionError("closed"))
         limiter._redis = mock_redis
 
         limiter.close()
         assert limiter._redis is None
 
-    def test_is_redis_available_ping_fails(self):
-        limiter = RateLimiter()
-        mock_redis = MagicMock()
-        mock_redis.ping.side_effect = ConnectionError("unreachable")
-        limiter._redis = mock_redis
+    def test_is_redis_available_after_failure(self):
+        limiter, _ = _redis_limiter(side_effect=ConnectionError("unreachable"))
+        assert limiter.is_redis_available is True
 
+        asyncio.run(limiter.acheck("user:x", limit=10, window=60))
         assert limiter.is_redis_available is False
 
-    def test_is_redis_available_ping_succeeds(self):
-        limiter = RateLimiter()
-        mock_redis = MagicMock()
-        mock_redis.ping.return_value = True
-        limiter._redis = mock_redis
-
-        assert limiter.is_redis_available is True
+    def test_is_redis_available_without_client(self):
+        assert RateLimiter().is_redis_available is False
 
     def test_check_memory_rate_limit_reset_after_value(self):
         """When rate limited in memory mode, reset_after should be >= 1."""
@@ -127,62 +132,18 @@ class TestRateLimiterCleanup:
         assert result.reset_after >= 1
 
     def test_check_with_redis_failure_falls_back_to_memory(self):
-        """When Redis check raises, fall back to in-memory."""
-        limiter = RateLimiter()
-        mock_redis = MagicMock()
-        mock_redis.pipeline.side_effect = ConnectionError("Redis down")
-        limiter._redis = mock_redis
+        """When the Redis script raises, fall back to in-memory."""
+        limiter, _ = _redis_limiter(side_effect=ConnectionError("Redis down"))
 
-        result = limiter.check("user:fallback", limit=10, window=60)
+        result = asyncio.run(limiter.acheck("user:fallback", limit=10, window=60))
         assert result.allowed is True
         assert result.identifier == "user:fallback"
+        assert limiter._requests["rl:_default:user:fallback"]
 
-    def test_check_redis_over_limit(self):
-        """Test Redis path when request exceeds limit."""
-        limiter = RateLimiter()
-        mock_redis = MagicMock()
-        mock_pipe = MagicMock()
-        # zcard returns count >= limit (simulating over limit)
-        mock_pipe.execute.return_value = [None, 10, None, None]
-        mock_redis.pipeline.return_value = mock_pipe
-        # oldest entry for reset_after calculation
-        mock_redis.zrange.return_value = [("1234567890.0", time.time() - 30)]
-        mock_redis.zrem.return_value = 1
-        limiter._redis = mock_redis
-
-        result = limiter.check("user:over", limit=10, window=60)
-        assert result.allowed is False
-        assert result.remaining == 0
-        mock_redis.zrem.assert_called_once()
-
-    def test_check_redis_over_limit_no_oldest(self):
-        """Test Redis path when over limit but zrange returns empty."""
-        limiter = RateLimiter()
-        mock_redis = MagicMock()
-        mock_pipe = MagicMock()
-        mock_pipe.execute.return_value = [None, 10, None, None]
-        mock_redis.pipeline.return_value = mock_pipe
-        mock_redis.zrange.return_value = []
-        mock_redis.zrem.return_value = 1
-        limiter._redis = mock_redis
-
-        result = limiter.check("user:over2", limit=10, window=60)
-        assert result.allowed is False
-        assert result.reset_after == 60  # Falls back to window
-
-    def test_check_redis_under_limit(self):
-        """Test Redis path when request is within limit."""
-        limiter = RateLimiter()
-        mock_redis = MagicMock()
-        mock_pipe = MagicMock()
-        # zcard=5, limit=10 => allowed
-        mock_pipe.execute.return_value = [None, 5, None, None]
-        mock_redis.pipeline.return_value = mock_pipe
-        limiter._redis = mock_redis
-
-        result = limiter.check("user:under", limit=10, window=60)
-        assert result.allowed is True
-        assert result.remaining == 4  # 10 - 5 - 1
+    def test_sync_check_never_touches_redis(self):
+        limiter, script = _redis_limiter(return_value=[1, 9, 0, 6000])
+        assert limiter.check("user:sync", limit=10, window=60).allowed is True
+        script.assert_not_called()
 
 
 # =========================================================================
@@ -944,8 +905,25 @@ class TestCustomRoutes:
 class TestLifespan:
     """Test the lifespan context manager from app.py."""
 
+    @pytest.fixture(autouse=True)
+    def lifespan_db(self, tmp_path):
+        """Run startup against a copy of the database, not the tracked file.
+
+        The lifespan creates the screener snapshot table and triggers, and the
+        news store schema, in whatever SQLite file it opens.
+        """
+        import shutil
+
+        db_path = tmp_path / "saudi_stocks.db"
+        shutil.copyfile(PROJECT_ROOT / "saudi_stocks.db", db_path)
+        with (
+            patch("app._HERE", tmp_path),
+            patch("api.db_helper._SQLITE_PATH", str(db_path)),
+        ):
+            yield db_path
+
     @pytest.mark.asyncio
-    async def test_lifespan_sqlite_mode(self):
+    async def test_lifespan_sqlite_mode(self, lifespan_db):
         """Lifespan should complete without errors in SQLite mode."""
         from app import lifespan
 
@@ -967,7 +945,8 @@ class TestLifespan:
             patch("services.news_scheduler.NewsScheduler") as mock_sched_cls,
         ):
             mock_settings.cache.enabled = False
-            mock_settings.db.resolved_sqlite_path = Path("/tmp/test.db")
+            mock_settings.ohlcv_warmup.enabled = False
+            mock_settings.db.resolved_sqlite_path = lifespan_db
 
             mock_sched = MagicMock()
             mock_sched_cls.return_value = mock_sched
@@ -979,7 +958,7 @@ class TestLifespan:
             mock_sched.stop.assert_called_once()
 
     @pytest.mark.asyncio
-    async def test_lifespan_handles_import_errors(self):
+    async def test_lifespan_handles_import_errors(self, lifespan_db):
         """Lifespan should handle missing optional modules gracefully."""
         from app import lifespan
 
@@ -992,6 +971,8 @@ class TestLifespan:
             patch("app.asyncio.create_task", side_effect=ImportError("no module")),
         ):
             mock_settings.cache.enabled = False
+            mock_settings.ohlcv_warmup.enabled = False
+            mock_settings.db.resolved_sqlite_path = lifespan_db
 
             # Should not raise even if imports fail
             try:
@@ -1029,41 +1010,84 @@ class TestPgStubRoutes:
 
 
 class TestRateLimiterRedisCheck:
-    """Comprehensive tests for the Redis-backed rate limit check."""
+    """GCRA script path, local pre-check and bulk flush."""
 
-    def test_redis_check_pipeline_operations(self):
-        """Verify correct pipeline operations are called."""
-        limiter = RateLimiter()
-        mock_redis = MagicMock()
-        mock_pipe = MagicMock()
-        # Under limit: zcard returns 3, limit is 10
-        mock_pipe.execute.return_value = [None, 3, None, None]
-        mock_redis.pipeline.return_value = mock_pipe
-        limiter._redis = mock_redis
+    @pytest.mark.asyncio
+    async def test_one_script_call_per_miss(self):
+        limiter, script = _redis_limiter(return_value=[1, 3, 0, 42000], lease=0)
 
-        result = limiter.check("user:pipe", limit=10, window=60)
+        result = await limiter.acheck("user:gcra", limit=10, window=60)
 
         assert result.allowed is True
-        # Verify pipeline operations
-        mock_pipe.zremrangebyscore.assert_called_once()
-        mock_pipe.zcard.assert_called_once()
-        mock_pipe.zadd.assert_called_once()
-        mock_pipe.expire.assert_called_once()
-
-    def test_redis_check_over_limit_removes_added_entry(self):
-        """When over limit, the just-added entry should be removed."""
-        limiter = RateLimiter()
-        mock_redis = MagicMock()
-        mock_pipe = MagicMock()
-        mock_pipe.execute.return_value = [None, 5, None, None]  # at limit=5
-        mock_redis.pipeline.return_value = mock_pipe
-        mock_redis.zrange.return_value = [("12345", time.time() - 10)]
-        limiter._redis = mock_redis
+        assert result.remaining == 3
+        assert result.reset_after == 42
+        script.assert_awaited_once_with(
+            keys=["rl:_default:user:gcra"], args=[6000.0, 60000, 1, 0]
+        )
 
-        result = limiter.check("user:overlimit", limit=5, window=60)
+    @pytest.mark.asyncio
+    async def test_denied_key_rejected_locally_until_retry(self):
+        limiter, script = _redis_limiter(return_value=[0, 0, 5000, 60000], lease=0)
 
-        assert result.allowed is False
-        mock_redis.zrem.assert_called_once()
+        first = await limiter.acheck("user:over", limit=10, window=60)
+        second = await limiter.acheck("user:over", limit=10, window=60)
+
+        assert first.allowed is False and second.allowed is False
+        assert first.remaining == 0
+        assert first.reset_after == 5
+        assert second.reset_after <= 5
+        script.assert_awaited_once()  # second answered by the local pre-check
+
+    @pytest.mark.asyncio
+    async def test_lease_admits_locally_and_flush_debits_in_bulk(self):
+        limiter, script = _redis_limiter(return_value=[1, 50, 0, 1000], lease=0.1)
+
+        results = [
+            await limiter.acheck("ip:hot", limit=100, window=60) for _ in range(6)
+        ]
+
+        assert all(r.allowed for r in results)
+        # 1 round-trip, then a lease of 5 (10% of 50 remaining) served locally
+        assert script.await_count == 1
+        assert [r.remaining for r in results] == [50, 49, 48, 47, 46, 45]
+
+        pipe = limiter._redis.pipeline.return_value
+        pipe.execute = AsyncMock(return_value=[[1, 44, 0, 2000]])
+        assert await limiter.flush() == 1
+
+        flush_call = script.await_args_list[-1]
+        assert flush_call.kwargs["args"] == [600.0, 60000, 0, 5]
+        assert flush_call.kwargs["client"] is pipe
+        state = limiter._local["rl:_default:ip:hot"]
+        assert state.pending == 0
+        assert state.lease == 4  # renewed from the flushed remaining
+        await limiter.aclose()
+
+    @pytest.mark.asyncio
+    async def test_failed_flush_keeps_pending(self):
+        limiter, _ = _redis_limiter(return_value=[1, 50, 0, 1000], lease=0.1)
+        for _ in range(3):
+            await limiter.acheck("ip:retry", limit=100, window=60)
+
+        pipe = limiter._redis.pipeline.return_value
+        pipe.execute = AsyncMock(side_effect=ConnectionError("down"))
+        with pytest.raises(ConnectionError):
+            await limiter.flush()
+
+        assert limiter._local["rl:_default:ip:retry"].pending == 2
+        assert "rl:_default:ip:retry" in limiter._dirty
+        limiter._redis.aclose = AsyncMock()
+        pipe.execute = AsyncMock(return_value=[[1, 40, 0, 1000]])
+        await limiter.aclose()
+        pipe.execute.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_lease_fraction_zero_checks_every_request(self):
+        limiter, script = _redis_limiter(return_value=[1, 50, 0, 1000], lease=0)
+        for _ in range(3):
+            await limiter.acheck("ip:strict", limit=100, window=60)
+        assert script.await_count == 3
+        assert limiter._flush_task is None
 
 
 # =========================================================================
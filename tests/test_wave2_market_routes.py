@@ -367,12 +367,13 @@ class TestStockDataFinancialTrend:
         app.include_router(router)
         return TestClient(app)
 
-    @patch("api.routes.stock_data.afetchall")
+    @patch("api.routes.stock_data.afetchall_many")
     @patch("api.routes.stock_data.afetchone")
     def test_trend_success(self, mock_fetchone, mock_fetchall):
         mock_fetchone.return_value = {"1": 1}
-        # One call per statement table: income_statement, balance_sheet, cash_flow
-        mock_fetchall.side_effect = [
+        # One batch, one result per statement table: income_statement,
+        # balance_sheet, cash_flow
+        mock_fetchall.return_value = [
             # income_statement
             [
                 {
@@ -427,23 +428,23 @@ class TestStockDataFinancialTrend:
         resp = client.get("/api/v1/stocks/9999.SR/financials/trend")
         assert resp.status_code == 404
 
-    @patch("api.routes.stock_data.afetchall")
+    @patch("api.routes.stock_data.afetchall_many")
     @patch("api.routes.stock_data.afetchone")
     def test_trend_no_data(self, mock_fetchone, mock_fetchall):
         mock_fetchone.return_value = {"1": 1}
         # All empty results
-        mock_fetchall.side_effect = [[], [], []]
+        mock_fetchall.return_value = [[], [], []]
         client = self._make_client()
         resp = client.get("/api/v1/stocks/2222.SR/financials/trend")
         assert resp.status_code == 200
         assert resp.json()["metrics"] == []
 
-    @patch("api.routes.stock_data.afetchall")
+    @patch("api.routes.stock_data.afetchall_many")
     @patch("api.routes.stock_data.afetchone")
     def test_trend_all_null_values_skipped(self, mock_fetchone, mock_fetchall):
         """Metrics with all-None values should NOT appear in output."""
         mock_fetchone.return_value = {"1": 1}
-        mock_fetchall.side_effect = [
+        mock_fetchall.return_value = [
             # income_statement: all values null
             [
                 {
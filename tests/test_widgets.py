@@ -839,10 +839,28 @@ class TestRunQuotesHub:
         assert quotes[0].symbol == "XAU"
 
 
-class TestGetSnapshotEvent:
-    def test_returns_asyncio_event(self):
-        """get_snapshot_event() returns an asyncio.Event instance."""
-        from services.widgets.quotes_hub import get_snapshot_event
+class TestSnapshotFrames:
+    def test_frame_encoded_once_per_snapshot(self):
+        """A new snapshot is stored together with its SSE frame."""
+        import services.widgets.quotes_hub as hub
+
+        with patch.multiple(
+            hub, _latest_snapshot=None, _latest_quotes={}, _latest_frame=None, _seq=0
+        ):
+            assert hub._deliver('[{"symbol": "X"}]') is True
+            assert hub.get_keyframe() == (
+                1,
+                'id: 1\nevent: snapshot\ndata: [{"symbol": "X"}]\n\n',
+            )
+            assert hub.get_latest_snapshot() == '[{"symbol": "X"}]'
+
+    def test_stream_stats_keys(self):
+        from services.widgets.quotes_hub import get_stream_stats
 
-        event = get_snapshot_event()
-        assert isinstance(event, asyncio.Event)
+        stats = get_stream_stats()
+        assert set(stats) == {
+            "connected_clients",
+            "frames_published",
+            "dropped_frames",
+            "seq",
+        }
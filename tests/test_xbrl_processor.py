@@ -1799,3 +1799,335 @@ class TestFullPipeline:
         proc = XBRLProcessor(ticker="2222.SR", source_url="https://tadawul.com/f.xml")
         facts = proc.process_filing(f)
         assert all(fa.source_url == "https://tadawul.com/f.xml" for fa in facts)
+
+
+# ===========================================================================
+# Streaming parser (iter_xml_facts)
+# ===========================================================================
+
+
+def _fact_key(fact):
+    return (
+        fact.concept,
+        fact.content_hash,
+        fact.unit,
+        fact.decimals,
+        fact.label_en,
+    )
+
+
+class TestIterXmlFacts:
+    """iter_xml_facts yields the same facts as process_xml, in chunks."""
+
+    @pytest.mark.parametrize(
+        "xml",
+        [
+            MINIMAL_XBRL_XML,
+            XBRL_XML_WITH_DIMENSIONS,
+            XBRL_XML_BOOLEAN_AND_TEXT,
+            XBRL_XML_DECIMALS_INF,
+            XBRL_XML_NO_UNIT_NO_CONTEXT,
+            XBRL_XML_FALLBACK_NSMAP,
+            XBRL_XML_COMMA_NUMBER,
+            XBRL_XML_UNIT_NO_COLON,
+            XBRL_XML_CONTEXT_DATES_SLASH,
+        ],
+        ids=[
+            "minimal",
+            "dimensions",
+            "boolean_text",
+            "decimals_inf",
+            "no_unit_no_context",
+            "fallback_nsmap",
+            "comma_number",
+            "unit_no_colon",
+            "dates_slash",
+        ],
+    )
+    def test_matches_process_xml(self, tmp_path, xml):
+        from ingestion.xbrl_processor import XBRLProcessor
+
+        f = tmp_path / "filing.xml"
+        f.write_text(xml, encoding="utf-8")
+        expected = XBRLProcessor(ticker="2222.SR").process_xml(f)
+
+        proc = XBRLProcessor(ticker="2222.SR")
+        streamed = [fact for chunk in proc.iter_xml_facts(f) for fact in chunk]
+        assert [_fact_key(x) for x in streamed] == [_fact_key(x) for x in expected]
+        assert proc.facts == []
+
+    def test_chunks_bounded_by_chunk_size(self, tmp_path):
+        from ingestion.xbrl_processor import XBRLProcessor
+
+        f = tmp_path / "filing.xml"
+        f.write_text(MINIMAL_XBRL_XML, encoding="utf-8")
+        proc = XBRLProcessor(ticker="2222.SR")
+        chunks = list(proc.iter_xml_facts(f, chunk_size=2))
+        assert [len(c) for c in chunks] == [2, 1]
+
+    def test_contexts_resolved_when_declared_after_facts(self, tmp_path):
+        from ingestion.xbrl_processor import XBRLProcessor
+
+        xml = """\
+<?xml version="1.0" encoding="UTF-8"?>
+<xbrli:xbrl xmlns:xbrli="http://www.xbrl.org/2003/instance"
+            xmlns:ifrs-full="http://xbrl.ifrs.org/taxonomy/2023-03-23/ifrs-full">
+  <ifrs-full:Revenue contextRef="c1" unitRef="u1">100</ifrs-full:Revenue>
+  <xbrli:context id="c1">
+    <xbrli:period><xbrli:instant>2024-12-31</xbrli:instant></xbrli:period>
+  </xbrli:context>
+  <xbrli:unit id="u1"><xbrli:measure>iso4217:SAR</xbrli:measure></xbrli:unit>
+</xbrli:xbrl>
+"""
+        f = tmp_path / "filing.xml"
+        f.write_text(xml, encoding="utf-8")
+        proc = XBRLProcessor(ticker="2222.SR")
+        (chunk,) = proc.iter_xml_facts(f)
+        assert chunk[0].period_instant == date(2024, 12, 31)
+        assert chunk[0].unit == "SAR"
+        assert proc.stream_stats["deferred"] == 1
+
+    def test_records_stream_stats(self, tmp_path):
+        from ingestion.xbrl_processor import XBRLProcessor
+
+        f = tmp_path / "filing.xml"
+        f.write_text(MINIMAL_XBRL_XML, encoding="utf-8")
+        proc = XBRLProcessor(ticker="2222.SR")
+        list(proc.iter_xml_facts(f))
+        stats = proc.stream_stats
+        assert stats["facts"] == 3
+        assert stats["facts_per_second"] > 0
+        assert stats["peak_rss_mb"] is None or stats["peak_rss_mb"] > 0
+
+    def test_malformed_xml_records_error(self, tmp_path):
+        from ingestion.xbrl_processor import XBRLProcessor
+
+        f = tmp_path / "bad.xml"
+        f.write_text(MALFORMED_XML, encoding="utf-8")
+        proc = XBRLProcessor(ticker="2222.SR")
+        assert list(proc.iter_xml_facts(f)) == []
+        assert any("XML syntax error" in e for e in proc.errors)
+        assert proc.stream_stats["facts"] == 0
+
+    def test_no_lxml_raises(self, tmp_path):
+        from ingestion.xbrl_processor import XBRLProcessor
+
+        with patch("ingestion.xbrl_processor.etree", None):
+            with pytest.raises(ImportError, match="lxml"):
+                list(XBRLProcessor(ticker="2222.SR").iter_xml_facts(tmp_path / "x"))
+
+    def test_process_single_file_streams_chunks_into_insert(self, tmp_path):
+        from ingestion.xbrl_processor import STREAM_CHUNK_SIZE, process_single_file
+
+        f = tmp_path / "filing.xml"
+        f.write_text(MINIMAL_XBRL_XML, encoding="utf-8")
+
+        with (
+            patch("ingestion.xbrl_processor.check_filing_exists", return_value=False),
+            patch("ingestion.xbrl_processor.create_filing", return_value="filing-1"),
+            patch(
+                "ingestion.xbrl_processor.insert_facts",
+                side_effect=lambda conn, facts, dry_run: len(facts),
+            ) as mock_insert,
+            patch("ingestion.xbrl_processor.mark_filing_complete") as mock_complete,
+            patch("ingestion.xbrl_processor.mark_filing_failed"),
+            patch("ingestion.xbrl_processor.XBRLProcessor.process_xml") as mock_full,
+        ):
+            count, errors = process_single_file(
+                f, "2222.SR", "annual", "Tadawul", MagicMock(), False, stream=True
+            )
+
+        mock_full.assert_not_called()
+        assert count == 3
+        assert len(mock_insert.call_args.args[1]) <= STREAM_CHUNK_SIZE
+        assert all(
+            fact.filing_id == "filing-1" for fact in mock_insert.call_args.args[1]
+        )
+        mock_complete.assert_called_once()
+
+
+# ===========================================================================
+# Multi-file parallel mode and existing-hash pre-filter
+# ===========================================================================
+
+
+def _write_filings(directory, names, xml=MINIMAL_XBRL_XML):
+    paths = []
+    for name in names:
+        path = directory / name
+        path.write_text(xml, encoding="utf-8")
+        paths.append(path)
+    return paths
+
+
+class TestFilterNewFacts:
+    def _facts(self, *values):
+        from ingestion.xbrl_processor import XBRLFact
+
+        return [
+            XBRLFact(ticker="2222.SR", concept="ifrs-full:Revenue", value_numeric=v)
+            for v in values
+        ]
+
+    def test_drops_stored_and_repeated_hashes(self):
+        from ingestion.xbrl_processor import EXISTING_HASHES_SQL, filter_new_facts
+
+        facts = self._facts(1.0, 2.0, 2.0, 3.0)
+        conn = MagicMock()
+        cur = conn.cursor.return_value
+        cur.fetchall.return_value = [(facts[0].content_hash,)]
+
+        new = filter_new_facts(conn, facts)
+
+        assert [f.value_numeric for f in new] == [2.0, 3.0]
+        sql, (hashes,) = cur.execute.call_args.args
+        assert sql == EXISTING_HASHES_SQL
+        assert hashes == [
+            facts[0].content_hash,
+            facts[1].content_hash,
+            facts[3].content_hash,
+        ]
+
+    def test_looks_up_in_batches(self):
+        from ingestion.xbrl_processor import filter_new_facts
+
+        conn = MagicMock()
+        conn.cursor.return_value.fetchall.return_value = []
+        with patch("ingestion.xbrl_processor.HASH_LOOKUP_SIZE", 2):
+            new = filter_new_facts(conn, self._facts(1.0, 2.0, 3.0))
+        assert len(new) == 3
+        assert conn.cursor.return_value.execute.call_count == 2
+
+    def test_insert_skip_existing_sends_only_new_rows(self):
+        from ingestion.xbrl_processor import insert_facts
+
+        facts = self._facts(1.0, 2.0)
+        conn = MagicMock()
+        conn.cursor.return_value.fetchall.return_value = [(facts[0].content_hash,)]
+
+        with patch("ingestion.xbrl_processor.psycopg2") as mock_pg:
+            count = insert_facts(conn, facts, skip_existing=True)
+
+        assert count == 1
+        rows = mock_pg.extras.execute_batch.call_args.args[2]
+        assert [r[-1] for r in rows] == [facts[1].content_hash]
+
+    def test_insert_skip_existing_all_known(self):
+        from ingestion.xbrl_processor import insert_facts
+
+        facts = self._facts(1.0)
+        conn = MagicMock()
+        conn.cursor.return_value.fetchall.return_value = [(facts[0].content_hash,)]
+
+        with patch("ingestion.xbrl_processor.psycopg2") as mock_pg:
+            assert insert_facts(conn, facts, skip_existing=True) == 0
+        mock_pg.extras.execute_batch.assert_not_called()
+        conn.commit.assert_not_called()
+
+
+class TestParallelDirectory:
+    def test_parse_filing_reports_worker(self, tmp_path):
+        import os
+
+        from ingestion.xbrl_processor import parse_filing
+
+        (path,) = _write_filings(tmp_path, ["2222.SR_annual.xml"])
+        result = parse_filing(path, "2222.SR", "f-1", "src")
+        assert len(result.facts) == 3
+        assert all(f.filing_id == "f-1" for f in result.facts)
+        assert result.worker_pid == os.getpid()
+        assert result.elapsed_s >= 0
+
+    def test_process_directory_workers_matches_sequential(self, tmp_path):
+        from ingestion.xbrl_processor import XBRLProcessor
+
+        _write_filings(tmp_path, ["a.xml", "b.xml", "c.xml"])
+        (tmp_path / "d.xml").write_text(XBRL_XML_WITH_DIMENSIONS, encoding="utf-8")
+
+        sequential = XBRLProcessor(ticker="2222.SR").process_directory(tmp_path)
+        parallel = XBRLProcessor(ticker="2222.SR").process_directory(
+            tmp_path, workers=2
+        )
+        assert [f.content_hash for f in parallel] == [
+            f.content_hash for f in sequential
+        ]
+
+    def test_process_directory_workers_collects_errors(self, tmp_path):
+        from ingestion.xbrl_processor import XBRLProcessor
+
+        _write_filings(tmp_path, ["good.xml"])
+        (tmp_path / "bad.xml").write_text(MALFORMED_XML, encoding="utf-8")
+        proc = XBRLProcessor(ticker="2222.SR")
+        facts = proc.process_directory(tmp_path, workers=2)
+        assert len(facts) == 3
+        assert any("bad.xml" in e for e in proc.errors)
+
+    def test_process_files_parallel(self, tmp_path):
+        from ingestion.xbrl_processor import process_files_parallel
+
+        paths = _write_filings(tmp_path, ["2222.SR_a.xml", "1010.SR_a.xml"])
+        (tmp_path / "2010.SR_a.xml").write_text(MALFORMED_XML, encoding="utf-8")
+        jobs = [(p, p.name.split("_")[0]) for p in paths]
+        jobs.append((tmp_path / "2010.SR_a.xml", "2010.SR"))
+
+        with (
+            patch("ingestion.xbrl_processor.check_filing_exists", return_value=False),
+            patch(
+                "ingestion.xbrl_processor.create_filing",
+                side_effect=lambda conn, ticker, *a: f"filing-{ticker}",
+            ),
+            patch(
+                "ingestion.xbrl_processor.insert_facts",
+                side_effect=lambda conn, facts, dry_run, skip_existing: len(facts),
+            ) as mock_insert,
+            patch("ingestion.xbrl_processor.mark_filing_complete") as mock_complete,
+            patch("ingestion.xbrl_processor.mark_filing_failed") as mock_failed,
+        ):
+            total, errors, worker_stats = process_files_parallel(
+                jobs, "annual", "Tadawul", MagicMock(), False, workers=2
+            )
+
+        assert total == 6
+        assert all(c.kwargs["skip_existing"] for c in mock_insert.call_args_list)
+        inserted = {
+            c.args[1][0].filing_id for c in mock_insert.call_args_list if c.args[1]
+        }
+        assert inserted == {"filing-2222.SR", "filing-1010.SR"}
+        assert mock_complete.call_count == 2
+        mock_failed.assert_called_once()
+        assert any("2010.SR_a.xml" in e for e in errors)
+        assert sum(s["files"] for s in worker_stats.values()) == 3
+        assert sum(s["facts"] for s in worker_stats.values()) == 6
+        assert all("facts_per_second" in s for s in worker_stats.values())
+
+    def test_process_files_parallel_skips_processed(self, tmp_path):
+        from ingestion.xbrl_processor import process_files_parallel
+
+        paths = _write_filings(tmp_path, ["2222.SR_a.xml", "1010.SR_a.xml"])
+        with (
+            patch("ingestion.xbrl_processor.check_filing_exists", return_value=True),
+            patch("ingestion.xbrl_processor.create_filing") as mock_create,
+        ):
+            total, _, worker_stats = process_files_parallel(
+                [(p, "2222.SR") for p in paths],
+                "annual",
+                "Tadawul",
+                MagicMock(),
+                False,
+                workers=2,
+            )
+        assert total == 0
+        assert worker_stats == {}
+        mock_create.assert_not_called()
+
+    def test_ticker_from_filename(self):
+        from ingestion.xbrl_processor import ticker_from_filename
+
+        assert ticker_from_filename(Path("2222.SR_annual.xml")) == "2222.SR"
+        assert ticker_from_filename(Path("filing.xml")) is None
+
+    def test_parse_args_workers(self):
+        from ingestion.xbrl_processor import parse_args
+
+        with patch("sys.argv", ["prog", "--dir", "d", "--workers", "4"]):
+            assert parse_args().workers == 4